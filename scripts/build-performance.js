@@ -53,6 +53,7 @@ class BuildPerformanceTracker {
     this.failedPages = 0;
     this.buildType = 'full';
     this.violations = [];
+    this.phases = {};
   }
 
   /**
@@ -92,6 +93,36 @@ class BuildPerformanceTracker {
     this.failedPages = failed;
   }
 
+  /**
+   * Record the duration and page count of one build phase.
+   * @param {string} name - Phase name (the generator's function name)
+   * @param {number} elapsedMs - Phase duration in milliseconds
+   * @param {number} [pages=0] - Pages the phase wrote
+   */
+  recordPhase(name, elapsedMs, pages = 0) {
+    this.phases[name] = { elapsedMs, pages };
+  }
+
+  /**
+   * Run an async build phase and record its timing. Phases may overlap
+   * (shared pages are generated alongside school pages), so each one is
+   * timed on its own clock. A `{ successful, failed }` result sets the
+   * phase's page count.
+   * @param {string} name - Phase name
+   * @param {Function} phaseFn - Async function performing the phase
+   * @returns {Promise<*>} The phase result
+   */
+  async timePhase(name, phaseFn) {
+    const started = Date.now();
+    const result = await phaseFn();
+    const pages =
+      result && Number.isFinite(result.successful)
+        ? result.successful + (result.failed || 0)
+        : 0;
+    this.recordPhase(name, Date.now() - started, pages);
+    return result;
+  }
+
   /**
    * Calculate elapsed build time in milliseconds.
    * @returns {number}
@@ -228,6 +259,19 @@ class BuildPerformanceTracker {
         memoryDelta: this.formatBytes(this.getMemoryDelta()),
         peakRss: this.formatBytes(this.getPeakRss()),
       },
+      phases: Object.fromEntries(
+        Object.entries(this.phases).map(([name, phase]) => [
+          name,
+          {
+            elapsedMs: phase.elapsedMs,
+            pages: phase.pages,
+            throughput:
+              phase.elapsedMs > 0
+                ? Math.round((phase.pages / (phase.elapsedMs / 1000)) * 100) / 100
+                : 0,
+          },
+        ])
+      ),
       budgets: {
         maxBuildTimeMs: this.budgets.MAX_BUILD_TIME_MS,
         maxBuildTimeFormatted: this.formatDuration(this.budgets.MAX_BUILD_TIME_MS),
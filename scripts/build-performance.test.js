@@ -31,6 +31,7 @@ test('constructor initializes state correctly', () => {
   assert.strictEqual(tracker.failedPages, 0);
   assert.strictEqual(tracker.buildType, 'full');
   assert.deepStrictEqual(tracker.violations, []);
+  assert.deepStrictEqual(tracker.phases, {});
 });
 
 // ── start / stop ────────────────────────────────────────────────────────────
@@ -402,6 +403,41 @@ test('generateReport shows violations when budgets exceed', () => {
   assert.ok(report.violations.length > 0);
 });
 
+// ── phases ──────────────────────────────────────────────────────────────────
+
+test('timePhase records duration and pages from a {successful, failed} result', async () => {
+  const tracker = new BuildPerformanceTracker();
+  const result = await tracker.timePhase('generateKecamatanPages', async () => {
+    await new Promise(resolve => setTimeout(resolve, 20));
+    return { successful: 40, failed: 2 };
+  });
+  assert.deepStrictEqual(result, { successful: 40, failed: 2 });
+  assert.strictEqual(tracker.phases.generateKecamatanPages.pages, 42);
+  assert.ok(tracker.phases.generateKecamatanPages.elapsedMs >= 15);
+});
+
+test('timePhase records zero pages for other results', async () => {
+  const tracker = new BuildPerformanceTracker();
+  await tracker.timePhase('writeSearchData', async () => undefined);
+  assert.strictEqual(tracker.phases.writeSearchData.pages, 0);
+});
+
+test('generateReport includes per-phase throughput', () => {
+  const tracker = new BuildPerformanceTracker();
+  tracker.startTime = Date.now() - 500;
+  tracker.endTime = Date.now();
+  tracker.recordPhase('writeSchoolPagesConcurrently', 2000, 500);
+  tracker.recordPhase('instant', 0, 10);
+
+  const { phases } = tracker.generateReport();
+  assert.deepStrictEqual(phases.writeSchoolPagesConcurrently, {
+    elapsedMs: 2000,
+    pages: 500,
+    throughput: 250,
+  });
+  assert.strictEqual(phases.instant.throughput, 0);
+});
+
 // ── getGitHubSummary ────────────────────────────────────────────────────────
 
 test('getGitHubSummary returns markdown string', () => {
@@ -0,0 +1,75 @@
+/**
+ * Schema Export
+ *
+ * Writes the data schema from src/core/data-schema.js (getSchemaInfo) to
+ * src/core/data-schema.json so non-JavaScript tooling — the Python data
+ * checks in tests/ — reads the same fields, patterns, allowed values and
+ * bounds instead of keeping its own copies.
+ *
+ * Usage:
+ *   node scripts/export-schema.js            # Rewrite src/core/data-schema.json
+ *   node scripts/export-schema.js --check    # Exit 1 when the file is out of date
+ */
+
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const SCHEMA = require('../src/core/data-schema');
+const logger = require('../src/core/logger');
+const { terminate } = require('../src/core/utils');
+
+const SCHEMA_JSON_PATH = path.join(__dirname, '..', 'src', 'core', 'data-schema.json');
+
+/**
+ * Render the schema as the exact text of data-schema.json.
+ * @returns {string}
+ */
+function renderSchemaJson() {
+  return `${JSON.stringify(SCHEMA.getSchemaInfo(), null, 2)}\n`;
+}
+
+/**
+ * Check whether the exported file matches the current schema.
+ * @param {string} [filePath]
+ * @returns {boolean}
+ */
+function isSchemaJsonCurrent(filePath = SCHEMA_JSON_PATH) {
+  try {
+    return fs.readFileSync(filePath, 'utf8') === renderSchemaJson();
+  } catch {
+    return false;
+  }
+}
+
+/**
+ * Write the exported schema.
+ * @param {string} [filePath]
+ */
+function writeSchemaJson(filePath = SCHEMA_JSON_PATH) {
+  fs.writeFileSync(filePath, renderSchemaJson(), 'utf8');
+}
+
+function main(argv = process.argv.slice(2)) {
+  const relative = path.relative(process.cwd(), SCHEMA_JSON_PATH);
+  if (argv.includes('--check')) {
+    if (!isSchemaJsonCurrent()) {
+      terminate(`${relative} is out of date; run: node scripts/export-schema.js`);
+    }
+    logger.info(`${relative} matches data-schema.js`);
+    return;
+  }
+  writeSchemaJson();
+  logger.info(`Wrote ${relative} (schema version ${SCHEMA.SCHEMA_VERSION})`);
+}
+
+module.exports = {
+  SCHEMA_JSON_PATH,
+  renderSchemaJson,
+  isSchemaJsonCurrent,
+  writeSchemaJson,
+};
+
+if (require.main === module) {
+  main();
+}
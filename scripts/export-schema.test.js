@@ -0,0 +1,52 @@
+'use strict';
+
+const { describe, it } = require('node:test');
+const assert = require('node:assert');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const SCHEMA = require('../src/core/data-schema');
+const {
+  renderSchemaJson,
+  isSchemaJsonCurrent,
+  writeSchemaJson,
+} = require('./export-schema');
+
+describe('export-schema', () => {
+  it('committed data-schema.json matches data-schema.js', () => {
+    assert.ok(
+      isSchemaJsonCurrent(),
+      'src/core/data-schema.json is stale; run: node scripts/export-schema.js'
+    );
+  });
+
+  it('exports every field with its raw mappings and constraints', () => {
+    const exported = JSON.parse(renderSchemaJson());
+    assert.deepStrictEqual(
+      exported.fields.map(field => field.name),
+      Object.keys(SCHEMA.FIELDS)
+    );
+    const npsn = exported.fields.find(field => field.name === 'npsn');
+    assert.deepStrictEqual(npsn.rawMappings, SCHEMA.FIELDS.npsn.rawMappings);
+    assert.strictEqual(npsn.constraints.pattern, SCHEMA.FIELDS.npsn.pattern.source);
+    const lat = exported.fields.find(field => field.name === 'lat');
+    assert.deepStrictEqual(lat.constraints, { min: -11, max: 6 });
+    assert.deepStrictEqual(exported.requiredSchoolFields, SCHEMA.REQUIRED_SCHOOL_FIELDS);
+    assert.strictEqual(exported.coordinatePattern, SCHEMA.COORDINATE_PATTERN.source);
+  });
+
+  it('writes a file that reads back as current', () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'schema-export-'));
+    const filePath = path.join(dir, 'data-schema.json');
+    try {
+      assert.strictEqual(isSchemaJsonCurrent(filePath), false);
+      writeSchemaJson(filePath);
+      assert.strictEqual(isSchemaJsonCurrent(filePath), true);
+      fs.writeFileSync(filePath, '{}\n');
+      assert.strictEqual(isSchemaJsonCurrent(filePath), false);
+    } finally {
+      fs.rmSync(dir, { recursive: true, force: true });
+    }
+  });
+});
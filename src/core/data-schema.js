@@ -31,6 +31,12 @@ const INDONESIA_BOUNDS = {
   LON_MAX: 141,
 };
 
+/**
+ * Plain decimal coordinate (no exponent, sign only for negatives).
+ * Strict full-string numeric match — parseFloat('12abc') would otherwise pass.
+ */
+const COORDINATE_PATTERN = /^-?\d+(\.\d+)?$/;
+
 // ── Allowed Categorical Values ─────────────────────────────────────────────
 
 const ALLOWED_VALUES = {
@@ -222,8 +228,7 @@ function matchesPattern(value, pattern) {
 function isValidCoordinate(value, min, max) {
   if (!isNonEmpty(value)) return false;
   const str = String(value).trim();
-  // Strict full-string numeric match — parseFloat('12abc') would otherwise pass
-  if (!/^-?\d+(\.\d+)?$/.test(str)) return false;
+  if (!COORDINATE_PATTERN.test(str)) return false;
   const num = Number(str);
   if (isNaN(num)) return false;
   if (num === 0) return false; // zero typically means unset
@@ -413,11 +418,14 @@ function getSchemaInfo() {
         ...(def.min !== undefined ? { min: def.min } : {}),
         ...(def.max !== undefined ? { max: def.max } : {}),
       },
+      rawMappings: def.rawMappings,
     })),
     csvFieldOrder: CSV_FIELD_ORDER,
     searchDataFields: SEARCH_DATA_FIELDS,
     requiredFields: REQUIRED_FIELDS,
+    requiredSchoolFields: REQUIRED_SCHOOL_FIELDS,
     indonesiaBounds: { ...INDONESIA_BOUNDS },
+    coordinatePattern: COORDINATE_PATTERN.source,
   };
 }
 
@@ -426,6 +434,7 @@ function getSchemaInfo() {
 module.exports = {
   SCHEMA_VERSION,
   INDONESIA_BOUNDS,
+  COORDINATE_PATTERN,
   ALLOWED_VALUES,
   FIELDS,
   CSV_FIELD_ORDER,
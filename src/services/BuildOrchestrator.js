@@ -508,6 +508,18 @@ async function writeSchoolPagesConcurrently(
   return { successful, failed };
 }
 
+/**
+ * Run a build phase through the tracker's phase timer when one is given.
+ *
+ * @param {BuildPerformanceTracker|undefined} tracker
+ * @param {string} name - Phase name recorded in the performance report
+ * @param {Function} phaseFn - Async function performing the phase
+ * @returns {Promise<*>} The phase result
+ */
+function timePhase(tracker, name, phaseFn) {
+  return tracker ? tracker.timePhase(name, phaseFn) : phaseFn();
+}
+
 /**
  * Prepare the build environment and generate shared pages.
  * Extracted to eliminate duplication between full and incremental builds.
@@ -517,9 +529,10 @@ async function writeSchoolPagesConcurrently(
  * the background as `sharedPagesPromise`. The caller can overlap school
  * page writing with shared page generation, saving ~60-80ms on a full build.
  *
+ * @param {BuildPerformanceTracker} [tracker] - Records per-phase timings when given
  * @returns {Promise<{schools: Array, enrichmentMap: Object, sharedPagesPromise: Promise<void>}>}
  */
-async function prepareBuildEnvironment() {
+async function prepareBuildEnvironment(tracker) {
   await ensureDistDir();
   await generateExternalStyles();
   await generateRobotsTxt(CONFIG.SITE_URL);
@@ -554,9 +567,9 @@ async function prepareBuildEnvironment() {
       logger.info('Generated homepage (index.html)');
     })(),
     writeSearchDataFile(schools),
-    generateProvincePages(schools),
-    generateKabupatenPages(schools),
-    generateKecamatanPages(schools),
+    timePhase(tracker, 'generateProvincePages', () => generateProvincePages(schools)),
+    timePhase(tracker, 'generateKabupatenPages', () => generateKabupatenPages(schools)),
+    timePhase(tracker, 'generateKecamatanPages', () => generateKecamatanPages(schools)),
   ]);
 
   return { schools, enrichmentMap, sharedPagesPromise };
@@ -564,6 +577,8 @@ async function prepareBuildEnvironment() {
 
 /**
  * Log the build performance report with optional GITHUB_STEP_SUMMARY.
+ * With BUILD_PERF_REPORT set, the report is also appended to that file as
+ * one JSON line, the history tests/perf_history.py ingests.
  *
  * @param {BuildPerformanceTracker} tracker
  */
@@ -571,6 +586,17 @@ function finalizeBuild(tracker) {
   tracker.stop();
   tracker.logReport();
 
+  if (process.env.BUILD_PERF_REPORT) {
+    try {
+      fs.appendFileSync(
+        process.env.BUILD_PERF_REPORT,
+        JSON.stringify(tracker.generateReport()) + '\n'
+      );
+    } catch (reportError) {
+      logger.debug(`Could not write BUILD_PERF_REPORT: ${reportError.message}`);
+    }
+  }
+
   if (process.env.GITHUB_STEP_SUMMARY) {
     try {
       fs.appendFileSync(process.env.GITHUB_STEP_SUMMARY, tracker.getGitHubSummary() + '\n');
@@ -605,7 +631,7 @@ async function build(options = {}) {
   tracker.setBuildType(incremental ? 'incremental' : 'full');
 
   try {
-    const { schools, enrichmentMap, sharedPagesPromise } = await prepareBuildEnvironment();
+    const { schools, enrichmentMap, sharedPagesPromise } = await prepareBuildEnvironment(tracker);
 
     // Filter to changed schools for incremental builds
     let schoolsToBuild = schools;
@@ -632,7 +658,9 @@ async function build(options = {}) {
     } else {
       const [, writeResult] = await Promise.all([
         sharedPagesPromise,
-        writeSchoolPagesConcurrently(schoolsToBuild, CONFIG.BUILD_CONCURRENCY_LIMIT, enrichmentMap),
+        timePhase(tracker, 'writeSchoolPagesConcurrently', () =>
+          writeSchoolPagesConcurrently(schoolsToBuild, CONFIG.BUILD_CONCURRENCY_LIMIT, enrichmentMap)
+        ),
       ]);
       const { successful, failed } = writeResult;
       logger.info(`Generated ${successful} school pages (${failed} failed)`);
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the Python data checks in tests/data_checks.py.
+
+Generates synthetic schools.csv files (CSV_FIELD_ORDER columns) at one or
+more sizes, with configurable duplicate, malformed and out-of-bounds rates,
+then measures:
+
+- every data check on its own (streaming, one file read per check)
+- each validator with all checks (streaming, columnar, incremental cold/warm)
+- the check phase alone (rows or typed columns already in memory), since
+  CSV tokenizing is shared by both modes and dominates end-to-end time
+- the near-duplicate school detector (tests/near_duplicates.py), whose
+  rows/s across sizes shows whether it stays linear up to national scale
+- decode throughput of the CSV compressed with each codec in
+  tests/compressed.py (gzip, bz2, xz, zstd when installed) against the
+  plain file, alone and under the streaming validator
+
+Each measurement runs in a fresh process, so peak RSS belongs to that
+measurement only. Throughput is rows/s over wall time. With --trace-alloc
+each workload is run a second time under tracemalloc to report peak traced
+bytes and the net number of memory blocks it left allocated; tracing slows
+the run, so that pass is never used for timing.
+
+Results are written as JSON (--output) and can be compared with an earlier
+run (--compare), e.g. one saved from the main branch.
+
+Usage:
+    python3 tests/benchmark.py                              # 10k and 100k rows
+    python3 tests/benchmark.py --sizes 10k,100k,1m,5m --output bench.json
+    python3 tests/benchmark.py --dup-rate 0.02 --malformed-rate 0.01 --oob-rate 0.03
+    python3 tests/benchmark.py --compare bench-main.json --output bench.json
+    python3 tests/benchmark.py --sizes 10k,100k,440k --near-dup-rate 0.01
+    python3 tests/benchmark.py --sizes 440k --codecs gz,xz   # compressed inputs only
+"""
+
+import argparse
+import csv
+import functools
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import CODECS, READ_BUFFER, open_text  # noqa: E402
+from tests.data_checks import (  # noqa: E402
+    HAS_NUMPY,
+    REQUIRED_COLUMNS,
+    ColumnarValidator,
+    StreamingValidator,
+    default_checks,
+    load_columns,
+)
+from tests.incremental import IncrementalValidator  # noqa: E402
+from tests.near_duplicates import find_near_duplicates  # noqa: E402
+
+NATIONAL_ROWS = 440000
+DEFAULT_SIZES = '10k,100k'
+RESULTS_VERSION = 1
+SECTIONS = ('checks', 'validators', 'analyses', 'decode')
+DEFAULT_CODECS = ','.join(suffix[1:] for suffix in CODECS)
+
+
+def parse_size(text: str) -> int:
+    """Parse '10k', '1m' or '440000' into a row count."""
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    digits = text[:-1] if multiplier > 1 else text
+    return int(float(digits) * multiplier)
+
+
+def generate_schools_csv(path: str, rows: int, seed: int = 42, dup_rate: float = 0.0,
+                         malformed_rate: float = 0.0, oob_rate: float = 0.0,
+                         near_dup_rate: float = 0.0) -> None:
+    """Write a schools.csv-shaped file with ``rows`` plausible records.
+
+    ``dup_rate`` of the rows reuse an earlier NPSN, ``oob_rate`` get
+    coordinates outside Indonesia and ``malformed_rate`` get one defect:
+    a non-numeric NPSN, a non-numeric lat, an empty nama or a short row.
+    ``near_dup_rate`` of the rows re-list a recent school under their own
+    NPSN, with the name reworded ("SDN 07 ..." for "SD Negeri 7 ...") and
+    the coordinates moved by up to ~100 m.
+    """
+    rng = random.Random(seed)
+    recent: deque = deque(maxlen=1000)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(REQUIRED_COLUMNS)
+        for i in range(rows):
+            npsn = str(10000000 + i)
+            if i and dup_rate and rng.random() < dup_rate:
+                npsn = str(10000000 + rng.randrange(i))
+            lat = f"{rng.uniform(-10.5, 5.5):.6f}"
+            lon = f"{rng.uniform(95.5, 140.5):.6f}"
+            if oob_rate and rng.random() < oob_rate:
+                lat = f"{rng.uniform(20, 60):.6f}"
+                lon = f"{rng.uniform(0, 90):.6f}"
+            if recent and near_dup_rate and rng.random() < near_dup_rate:
+                record = list(rng.choice(recent))
+                number, rest = record[1][len('SD Negeri '):].split(' ', 1)
+                record[0] = npsn
+                record[1] = f"SDN {int(number):02d} {rest.upper()}"
+                record[9] = f"{float(record[9]) + rng.uniform(-0.0007, 0.0007):.6f}"
+                record[10] = f"{float(record[10]) + rng.uniform(-0.0007, 0.0007):.6f}"
+                writer.writerow(record)
+                continue
+            record = [
+                npsn,
+                f"SD Negeri {i % 500} Contoh",
+                rng.choice(('SD', 'SMP', 'SMA', 'SMK')),
+                rng.choice(('N', 'S')),
+                f"Jl. Pendidikan No. {i % 200}, RT {i % 9}",
+                '',
+                f"Kecamatan {i % 7000}",
+                f"Kabupaten {i % 514}",
+                f"Provinsi {i % 38}",
+                lat,
+                lon,
+                '2026-07-20',
+            ]
+            if malformed_rate and rng.random() < malformed_rate:
+                defect = rng.randrange(4)
+                if defect == 0:
+                    record[0] = 'X' + npsn[1:]
+                elif defect == 1:
+                    record[9] = 'not-a-number'
+                elif defect == 2:
+                    record[1] = ''
+                else:
+                    record = record[:3]
+            elif near_dup_rate:
+                recent.append(record)
+            writer.writerow(record)
+
+
+def compress_copy(path: str, target: str) -> None:
+    """Compress ``path`` into ``target`` with the codec its suffix names."""
+    stem, suffix = os.path.splitext(target)
+    partial = f"{stem}.partial{suffix}"
+    with open(path, 'rb') as src, CODECS[suffix](partial, 'wb') as dst:
+        shutil.copyfileobj(src, dst, READ_BUFFER)
+    os.replace(partial, target)
+
+
+def decode_all(path: str) -> int:
+    """Read ``path`` as text to the end; return the characters decoded."""
+    count = 0
+    with open_text(path) as f:
+        for chunk in iter(lambda: f.read(READ_BUFFER), ''):
+            count += len(chunk)
+    return count
+
+
+def _timed(func):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def _check_named(name: str):
+    for check in default_checks():
+        if check.name == name:
+            return check
+    raise KeyError(name)
+
+
+def _workload(kind: str, path: str, target: Optional[str]):
+    """Return a zero-argument callable for one measured workload."""
+    if kind == 'check':
+        return lambda: StreamingValidator([_check_named(target)]).run(path)
+    if kind == 'streaming':
+        return lambda: StreamingValidator(default_checks()).run(path)
+    if kind == 'columnar':
+        return lambda: ColumnarValidator(default_checks()).run(path)
+    if kind == 'incremental':
+        return lambda: IncrementalValidator(target).run(path)
+    if kind == 'near_duplicates':
+        return lambda: find_near_duplicates(path)
+    if kind == 'decode':
+        return lambda: decode_all(path)
+    raise ValueError(f"unknown workload: {kind}")
+
+
+def _peak_rss_bytes() -> int:
+    # ru_maxrss survives fork+exec on Linux, so a spawned worker would report
+    # the parent's high-water mark; VmHWM belongs to this address space only.
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _measure(kind: str, path: str, target: Optional[str], rows: int,
+             trace: bool) -> Dict[str, Any]:
+    """Run one workload (inside a fresh worker process) and report its cost."""
+    work = _workload(kind, path, target)
+    cpu_start = time.process_time()
+    _, elapsed = _timed(work)
+    result = {
+        'seconds': round(elapsed, 4),
+        'cpu_seconds': round(time.process_time() - cpu_start, 4),
+        'rows_per_second': round(rows / elapsed) if elapsed else None,
+        'peak_rss_bytes': _peak_rss_bytes(),
+    }
+    if trace:
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        work()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['alloc_peak_bytes'] = peak
+        result['alloc_net_blocks'] = sys.getallocatedblocks() - blocks_before
+    return result
+
+
+def measure_isolated(kind: str, path: str, rows: int, trace: bool = False,
+                     target: Optional[str] = None) -> Dict[str, Any]:
+    """Run ``_measure`` in a freshly spawned process."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        return pool.submit(_measure, kind, path, target, rows, trace).result()
+
+
+def bench_check_phase(path: str) -> Dict[str, Any]:
+    """Time only the checks, given rows/columns already in memory."""
+    def read_rows():
+        with open_text(path) as f:
+            reader = csv.DictReader(f)
+            return reader.fieldnames or [], list(reader)
+
+    (fieldnames, rows), load_s = _timed(read_rows)
+    streaming, streaming_s = _timed(
+        functools.partial(StreamingValidator(default_checks()).feed_rows, fieldnames, rows))
+    del rows
+
+    result = {'rows': streaming.rows, 'streaming_load_s': round(load_s, 4),
+              'streaming_checks_s': round(streaming_s, 4)}
+    if HAS_NUMPY:
+        checks = default_checks()
+        names = ColumnarValidator(checks).needed_columns()
+        (_, columns, count), columnar_load_s = _timed(lambda: load_columns(path, names))
+        result['columnar_load_s'] = round(columnar_load_s, 4)
+
+        def run_columnar():
+            for check in checks:
+                check.begin(fieldnames)
+                check.feed_columns(columns, count)
+
+        _, columnar_s = _timed(run_columnar)
+        result['columnar_checks_s'] = round(columnar_s, 4)
+        result['speedup'] = round(streaming_s / columnar_s, 2) if columnar_s else None
+    return result
+
+
+def bench_decode(path: str, rows: int, codecs: Sequence[str],
+                 data_dir: str) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Decode throughput of ``path`` and of a copy compressed with each codec.
+
+    Returns (measurements, compressed size per codec). The compressed copies
+    are written to ``data_dir`` once and reused.
+    """
+    size = os.path.getsize(path)
+    print(f"  [{rows}] decode plain", file=sys.stderr)
+    results = {'decode plain': measure_isolated('decode', path, rows)}
+    sizes = {}
+    for codec in codecs:
+        target = os.path.join(data_dir, f"{os.path.basename(path)}.{codec}")
+        if not os.path.exists(target):
+            print(f"  [{rows}] compressing with {codec}", file=sys.stderr)
+            compress_copy(path, target)
+        sizes[codec] = os.path.getsize(target)
+        print(f"  [{rows}] decode {codec}", file=sys.stderr)
+        results[f"decode {codec}"] = measure_isolated('decode', target, rows)
+        results[f"streaming validator ({codec})"] = measure_isolated('streaming', target, rows)
+    for measurement in results.values():
+        seconds = measurement['seconds']
+        measurement['mb_per_second'] = round(size / 1e6 / seconds, 1) if seconds else None
+    return results, sizes
+
+
+def bench_file(path: str, rows: int, trace: bool = False,
+               state_dir: Optional[str] = None, codecs: Sequence[str] = ()) -> Dict[str, Any]:
+    """Measure every check and every validator against one CSV."""
+    result: Dict[str, Any] = {
+        'rows': rows,
+        'file_bytes': os.path.getsize(path),
+        'checks': {},
+        'validators': {},
+        'analyses': {},
+        'decode': {},
+    }
+    for check in default_checks():
+        print(f"  [{rows}] {check.name}", file=sys.stderr)
+        result['checks'][check.name] = measure_isolated('check', path, rows, trace,
+                                                        target=check.name)
+
+    kinds = ['streaming'] + (['columnar'] if HAS_NUMPY else [])
+    for kind in kinds:
+        print(f"  [{rows}] {kind} validator", file=sys.stderr)
+        result['validators'][kind] = measure_isolated(kind, path, rows, trace)
+
+    print(f"  [{rows}] incremental validator", file=sys.stderr)
+    state = os.path.join(state_dir or os.path.dirname(path), f"incremental-{rows}.pickle")
+    if os.path.exists(state):
+        os.unlink(state)
+    for phase in ('incremental_cold', 'incremental_warm'):
+        result['validators'][phase] = measure_isolated('incremental', path, rows,
+                                                       target=state)
+
+    print(f"  [{rows}] near-duplicate detector", file=sys.stderr)
+    result['analyses']['near_duplicates'] = measure_isolated('near_duplicates', path, rows,
+                                                             trace)
+
+    result['check_phase'] = bench_check_phase(path)
+    if codecs:
+        result['decode'], result['compressed_bytes'] = bench_decode(
+            path, rows, codecs, state_dir or os.path.dirname(path))
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the commit and interpreter so results can be compared."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    info = {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': None,
+    }
+    if HAS_NUMPY:
+        import numpy
+        info['numpy'] = numpy.__version__
+    return info
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Describe throughput changes against ``baseline`` for matching sizes."""
+    lines = []
+    previous = {entry['rows']: entry for entry in baseline.get('sizes', [])}
+    for entry in current['sizes']:
+        before = previous.get(entry['rows'])
+        if not before:
+            continue
+        for section in SECTIONS:
+            for name, now in entry.get(section, {}).items():
+                then = before.get(section, {}).get(name)
+                if not then or not then.get('rows_per_second') or not now.get('rows_per_second'):
+                    continue
+                ratio = now['rows_per_second'] / then['rows_per_second']
+                lines.append(f"  {entry['rows']:>9} {name:<40} {ratio:6.2f}x "
+                             f"({then['rows_per_second']} -> {now['rows_per_second']} rows/s)")
+    return lines
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    trace = results['params']['trace_alloc']
+    for entry in results['sizes']:
+        print()
+        print(f"{entry['rows']} rows ({entry['file_bytes'] / 1e6:.1f} MB)")
+        header = f"  {'workload':<40} {'seconds':>9} {'rows/s':>10} {'peak RSS MB':>12}"
+        print(header + (f" {'alloc peak MB':>14}" if trace else ''))
+        for section in SECTIONS:
+            for name, m in entry.get(section, {}).items():
+                line = (f"  {name:<40} {m['seconds']:>9.3f} {m['rows_per_second'] or 0:>10} "
+                        f"{m['peak_rss_bytes'] / 1e6:>12.1f}")
+                if 'alloc_peak_bytes' in m:
+                    line += f" {m['alloc_peak_bytes'] / 1e6:>14.1f}"
+                print(line)
+        phase = entry['check_phase']
+        line = f"  check phase only: streaming {phase['streaming_checks_s']:.3f}s"
+        if 'columnar_checks_s' in phase:
+            line += f", columnar {phase['columnar_checks_s']:.3f}s ({phase['speedup']}x)"
+        print(line)
+        decode = entry.get('decode', {})
+        for codec, size in entry.get('compressed_bytes', {}).items():
+            print(f"  {codec}: {size / 1e6:.1f} MB ({entry['file_bytes'] / size:.1f}x smaller), "
+                  f"decodes at {decode[f'decode {codec}']['mb_per_second']} MB/s "
+                  f"vs {decode['decode plain']['mb_per_second']} MB/s plain")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Python data checks')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'Comma-separated row counts, k/m suffixes allowed '
+                             f'(default {DEFAULT_SIZES}; national scale is ~{NATIONAL_ROWS})')
+    parser.add_argument('--csv', help='Benchmark an existing CSV instead of generating one')
+    parser.add_argument('--dup-rate', type=float, default=0.0,
+                        help='Fraction of rows reusing an earlier NPSN')
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='Fraction of rows with one malformed field or a short row')
+    parser.add_argument('--oob-rate', type=float, default=0.0,
+                        help='Fraction of rows with coordinates outside Indonesia')
+    parser.add_argument('--near-dup-rate', type=float, default=0.0,
+                        help='Fraction of rows re-listing a recent school under a new NPSN')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for generated data')
+    parser.add_argument('--trace-alloc', action='store_true',
+                        help='Also measure allocations with tracemalloc (slow)')
+    parser.add_argument('--codecs', default=DEFAULT_CODECS,
+                        help=f'Compressed copies to measure decoding of, comma-separated '
+                             f'(default {DEFAULT_CODECS}; empty to skip)')
+    parser.add_argument('--data-dir', help='Keep generated CSVs here and reuse them')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--compare', help='Earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print("NumPy not installed: the columnar validator is not measured.", file=sys.stderr)
+    codecs = [codec.strip().lstrip('.') for codec in args.codecs.split(',') if codec.strip()]
+    unknown = [codec for codec in codecs if f".{codec}" not in CODECS]
+    if unknown:
+        parser.error(f"unknown or unavailable codec(s): {', '.join(unknown)} "
+                     f"(available: {DEFAULT_CODECS})")
+
+    results: Dict[str, Any] = {
+        'version': RESULTS_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': environment(),
+        'params': {
+            'csv': args.csv,
+            'dup_rate': args.dup_rate,
+            'malformed_rate': args.malformed_rate,
+            'oob_rate': args.oob_rate,
+            'near_dup_rate': args.near_dup_rate,
+            'seed': args.seed,
+            'trace_alloc': args.trace_alloc,
+            'codecs': codecs,
+        },
+        'sizes': [],
+    }
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='bench-checks-')
+    os.makedirs(data_dir, exist_ok=True)
+    try:
+        if args.csv:
+            with open_text(args.csv) as f:
+                rows = max(sum(1 for _ in csv.reader(f)) - 1, 0)
+            results['sizes'].append(bench_file(args.csv, rows, args.trace_alloc, data_dir,
+                                               codecs))
+        else:
+            for size in args.sizes.split(','):
+                rows = parse_size(size)
+                path = os.path.join(data_dir, f"schools-{rows}-s{args.seed}-d{args.dup_rate}"
+                                              f"-m{args.malformed_rate}-o{args.oob_rate}"
+                                              f"-n{args.near_dup_rate}.csv")
+                if not os.path.exists(path):
+                    print(f"Generating {rows} rows...", file=sys.stderr)
+                    generate_schools_csv(path, rows, args.seed, args.dup_rate,
+                                         args.malformed_rate, args.oob_rate,
+                                         args.near_dup_rate)
+                results['sizes'].append(bench_file(path, rows, args.trace_alloc, data_dir,
+                                                   codecs))
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nThroughput vs {args.compare} "
+              f"(commit {baseline.get('environment', {}).get('commit')}):")
+        for line in compare(results, baseline) or ['  no matching sizes']:
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
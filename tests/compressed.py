@@ -0,0 +1,100 @@
+"""
+Transparent reading of compressed CSV inputs.
+
+data/schools.csv and external/raw.csv may be stored as ``.gz``, ``.bz2`` or
+``.xz`` (and ``.zst`` when the ``zstandard`` module is installed), e.g.
+when they come out of a CI cache or an artifact store. The codec is picked
+from the file suffix and the data is decompressed as it is read through a
+1 MB buffer: nothing is expanded to a temporary file, and memory does not
+grow with the file. The data checks open their CSV with ``open_text`` or
+``open_binary``, and ``find_input`` resolves a default path such as
+data/schools.csv to data/schools.csv.gz when only the compressed copy
+exists.
+
+A compressed stream cannot be seeked into, so tests/parallel_csv.py
+validates compressed files in a single process.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import BinaryIO, Optional, TextIO, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip, bz2 and xz are in the stdlib
+    zstandard = None
+
+HAS_ZSTD = zstandard is not None
+
+SUFFIXES = ('.gz', '.bz2', '.xz', '.zst')
+
+READ_BUFFER = 1 << 20
+
+
+class UnsupportedCompression(Exception):
+    """Raised for a compressed input whose codec module is not installed."""
+
+
+def _open_zstd(path: str, mode: str = 'rb'):
+    if mode == 'rb':
+        # pzstd and zstd -T write several frames; read them all
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(path, 'rb'), read_across_frames=True, closefd=True)
+    return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+
+
+CODECS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+if HAS_ZSTD:
+    CODECS['.zst'] = _open_zstd
+
+
+def compression_of(path: str) -> Optional[str]:
+    """The compression suffix of ``path`` ('.gz', ...), or None for a plain file."""
+    for suffix in SUFFIXES:
+        if path.endswith(suffix):
+            return suffix
+    return None
+
+
+def open_compressed(path: str, mode: str = 'rb'):
+    """Open ``path`` for streaming decompression ('rb') or compression ('wb')."""
+    suffix = compression_of(path)
+    if suffix not in CODECS:
+        raise UnsupportedCompression(f"No {suffix} codec for {path} (pip install zstandard)")
+    return CODECS[suffix](path, mode)
+
+
+def open_binary(path: str) -> BinaryIO:
+    """The decompressed bytes of ``path``; a plain file is opened as it is."""
+    if compression_of(path) is None:
+        return open(path, 'rb')
+    return io.BufferedReader(open_compressed(path), buffer_size=READ_BUFFER)
+
+
+def open_text(path: str) -> TextIO:
+    """``path`` as UTF-8 text with newlines untranslated, for csv readers."""
+    if compression_of(path) is None:
+        return open(path, 'r', encoding='utf-8', newline='')
+    return io.TextIOWrapper(open_binary(path), encoding='utf-8', newline='')
+
+
+def input_variants(path: str) -> Tuple[str, ...]:
+    """``path`` followed by its compressed names (``path``.gz, ...)."""
+    return (path,) + tuple(path + suffix for suffix in SUFFIXES)
+
+
+def find_input(path: str) -> str:
+    """``path`` if it exists, else its first compressed copy that can be read.
+
+    Returns ``path`` unchanged when neither exists, so the caller reports
+    the name it asked for.
+    """
+    if compression_of(path) is not None or os.path.exists(path):
+        return path
+    for candidate in input_variants(path)[1:]:
+        if compression_of(candidate) in CODECS and os.path.exists(candidate):
+            return candidate
+    return path
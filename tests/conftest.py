@@ -0,0 +1,39 @@
+"""
+Shared pytest fixtures for the sekolah-pseo Python suites.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dataset import DEFAULT_CACHE_DIR, DEFAULT_SCHOOLS_PATH, load_schools  # noqa: E402
+
+# Read before dataset_cache_dir redirects the variable for the suites
+SCHOOLS_CACHE_DIR = os.environ.get('DATASET_CACHE_DIR') or DEFAULT_CACHE_DIR
+
+
+@pytest.fixture(scope='session', autouse=True)
+def dataset_cache_dir(tmp_path_factory):
+    """Keep the snapshots of the suites' temporary CSVs out of .cache/datasets.
+
+    schools.csv itself is still snapshotted in the real cache; see
+    ``schools_dataset``.
+    """
+    previous = os.environ.get('DATASET_CACHE_DIR')
+    os.environ['DATASET_CACHE_DIR'] = str(tmp_path_factory.mktemp('datasets'))
+    yield os.environ['DATASET_CACHE_DIR']
+    if previous is None:
+        del os.environ['DATASET_CACHE_DIR']
+    else:
+        os.environ['DATASET_CACHE_DIR'] = previous
+
+
+@pytest.fixture(scope='session')
+def schools_dataset():
+    """schools.csv parsed once per session (and snapshotted across runs)."""
+    if not os.path.exists(DEFAULT_SCHOOLS_PATH):
+        pytest.skip("schools.csv not found")
+    return load_schools(DEFAULT_SCHOOLS_PATH, cache_dir=SCHOOLS_CACHE_DIR)
@@ -0,0 +1,561 @@
+"""
+Single-pass streaming data-quality checks for data/schools.csv.
+
+The CSV is read exactly once. Every row is fed to each registered check,
+and each check keeps only the small amount of state it needs (counters and
+a handful of samples) to produce its verdict when the stream ends.
+
+Usage:
+    from tests.data_checks import default_checks, StreamingValidator
+
+    report = StreamingValidator(default_checks()).run('data/schools.csv')
+    report.error_for('NPSN values are unique')  # None when the check passed
+
+When NumPy is installed, ``ColumnarValidator`` loads only the columns the
+checks read into compact arrays and runs each check as whole-column
+operations. Without NumPy it falls back to ``StreamingValidator``.
+
+Every check can also ``merge`` the state of a twin fed the rows that
+follow its own, so tests/parallel_csv.py can validate byte ranges of the
+file in separate processes and fold the results in file order.
+
+Both validators read schools.csv.gz (.bz2, .xz, .zst) as well, decompressing
+while they stream (tests/compressed.py).
+"""
+
+import csv
+import os
+import warnings
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the stdlib path always works
+    np = None
+
+from tests.compressed import find_input, open_text
+from tests.npsn_index import NpsnSet
+from tests.schema_validator import load_schema
+
+HAS_NUMPY = np is not None
+
+_SCHEMA = load_schema()
+
+# Indonesia geographic bounds (INDONESIA_BOUNDS in src/core/data-schema.json)
+INDONESIA_LAT_MIN = _SCHEMA.bounds['LAT_MIN']
+INDONESIA_LAT_MAX = _SCHEMA.bounds['LAT_MAX']
+INDONESIA_LON_MIN = _SCHEMA.bounds['LON_MIN']
+INDONESIA_LON_MAX = _SCHEMA.bounds['LON_MAX']
+
+# Columns written by scripts/etl.js (CSV_FIELD_ORDER in src/core/data-schema.json)
+REQUIRED_COLUMNS = list(_SCHEMA.csv_field_order)
+
+# Fields that must be non-empty in (almost) every row
+REQUIRED_FIELDS = ['npsn', 'nama', 'provinsi', 'kab_kota']
+
+SAMPLE_SIZE = 5
+
+
+def _field(row: Dict[str, Optional[str]], name: str) -> str:
+    """Return a stripped cell value, treating missing cells as empty."""
+    return (row.get(name) or '').strip()
+
+
+def _bulk_parse(values: Any, dtype: Any):
+    """Parse a string array of plain numbers in one C-level pass.
+
+    ``np.fromstring`` over the space-joined text is several times faster
+    than ``astype`` from a unicode array. Returns None when any value is
+    not a single plain number, so callers can fall back to per-cell parsing.
+    """
+    if not len(values):
+        return np.zeros(0, dtype=dtype)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            parsed = np.fromstring(' '.join(values.tolist()), dtype=dtype, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+    return parsed if len(parsed) == len(values) else None
+
+
+def _parse_floats(values: Any):
+    """Parse a stripped string column into (floats, parsed_ok mask)."""
+    present = values != ''
+    if present.all():
+        parsed = _bulk_parse(values, np.float64)
+        if parsed is not None:
+            return parsed, present
+    out = np.full(values.shape, np.nan)
+    parsed = _bulk_parse(values[present], np.float64)
+    if parsed is not None:
+        out[present] = parsed
+        return out, present
+    else:
+        ok = np.zeros(values.shape, dtype=bool)
+        for i in np.flatnonzero(present):
+            try:
+                out[i] = float(values[i])
+                ok[i] = True
+            except ValueError:
+                pass
+        return out, ok
+
+
+class DataCheck:
+    """Base class for a check that consumes rows one at a time.
+
+    Subclasses override ``feed`` (and optionally ``begin``) to accumulate
+    bounded state, and ``error`` to return a failure message or None.
+    Checks that run on tests/parallel_csv.py workers must also define
+    ``merge(other)``, folding in a twin that was fed the rows following this
+    check's rows; it must be associative so chunks can be combined in any
+    grouping. The base class has no ``merge``, and ``ParallelValidator``
+    refuses checks without one before any worker starts (``supports_merge``).
+    ``columns`` names the CSV columns ``feed_columns`` reads (None means all);
+    checks with a vectorized implementation override ``feed_columns``.
+    """
+
+    name = 'data check'
+    columns: Optional[Sequence[str]] = None
+
+    def begin(self, fieldnames: Sequence[str]) -> None:
+        """Called once with the CSV header before any rows are fed."""
+
+    def feed(self, row: Dict[str, Optional[str]]) -> None:
+        """Called once per data row."""
+
+    def feed_columns(self, columns: Dict[str, Any], rows: int) -> None:
+        """Consume a whole column store at once.
+
+        ``columns`` maps column name to a stripped NumPy string array of
+        length ``rows``; numeric columns also carry ``<name>.value`` (float64,
+        NaN when unparsable) and ``<name>.ok`` (parsed mask). The default
+        rebuilds rows and calls ``feed``.
+        """
+        names = [name for name in columns if '.' not in name]
+        for i in range(rows):
+            self.feed({name: str(columns[name][i]) for name in names})
+
+    def error(self) -> Optional[str]:
+        """Return a failure message, or None when the check passed."""
+        return None
+
+
+def supports_merge(check: DataCheck) -> bool:
+    """Whether ``check`` defines the ``merge`` that parallel validation needs."""
+    return callable(getattr(check, 'merge', None))
+
+
+class RowCountCheck(DataCheck):
+    """The ETL output must contain at least one data row."""
+
+    name = 'ETL output has content'
+    columns = ()
+
+    def __init__(self):
+        self.rows = 0
+
+    def feed(self, row):
+        self.rows += 1
+
+    def feed_columns(self, columns, rows):
+        self.rows = rows
+
+    def merge(self, other):
+        self.rows += other.rows
+
+    def error(self):
+        if self.rows < 1:
+            return f"schools.csv should have data rows, found {self.rows}"
+        return None
+
+
+class RequiredColumnsCheck(DataCheck):
+    """Every column written by the ETL must be present in the header."""
+
+    name = 'CSV has all required columns'
+    columns = ()
+
+    def __init__(self, columns: Sequence[str] = REQUIRED_COLUMNS):
+        self.required = list(columns)
+        self.missing: List[str] = []
+
+    def begin(self, fieldnames):
+        self.missing = [c for c in self.required if c not in fieldnames]
+
+    def feed_columns(self, columns, rows):
+        pass
+
+    def merge(self, other):
+        pass  # both saw the same header
+
+    def error(self):
+        if self.missing:
+            return f"Required column '{self.missing[0]}' should exist"
+        return None
+
+
+class LatLonNumericCheck(DataCheck):
+    """The first ``sample_rows`` rows must have numeric lat/lon when set."""
+
+    name = 'CSV lat/lon are numeric'
+    columns = ('lat', 'lon')
+
+    def __init__(self, sample_rows: int = 10):
+        self.sample_rows = sample_rows
+        self.seen = 0
+        self.first_error: Optional[str] = None
+
+    def feed(self, row):
+        if self.seen >= self.sample_rows or self.first_error:
+            return
+        self.seen += 1
+        for key in ('lat', 'lon'):
+            value = _field(row, key)
+            if not value:
+                continue
+            try:
+                float(value)
+            except ValueError:
+                self.first_error = f"{key} '{value}' should be numeric"
+                return
+
+    def feed_columns(self, columns, rows):
+        lat, lon = columns['lat'], columns['lon']
+        for i in range(min(rows, self.sample_rows)):
+            self.feed({'lat': str(lat[i]), 'lon': str(lon[i])})
+
+    def merge(self, other):
+        budget = self.sample_rows - self.seen
+        if self.first_error or budget <= 0:
+            return
+        # other's error only counts if it falls within the rows still sampled
+        if other.first_error and other.seen <= budget:
+            self.first_error = other.first_error
+        self.seen += min(other.seen, budget)
+
+    def error(self):
+        return self.first_error
+
+
+class CoordinateBoundsCheck(DataCheck):
+    """At most ``max_ratio`` of coordinates may fall outside Indonesia."""
+
+    name = 'Coordinates within Indonesia bounds'
+    columns = ('lat', 'lon')
+
+    def __init__(self, max_ratio: float = 0.05):
+        self.max_ratio = max_ratio
+        self.with_coords = 0
+        self.invalid = 0
+        self.samples: List[str] = []
+
+    def _flag(self, message: str) -> None:
+        self.invalid += 1
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append(message)
+
+    def feed(self, row):
+        if row.get('lat') and row.get('lon'):
+            self.with_coords += 1
+        lat_str = _field(row, 'lat')
+        lon_str = _field(row, 'lon')
+        if not (lat_str and lon_str):
+            return
+        try:
+            lat = float(lat_str)
+            lon = float(lon_str)
+        except ValueError:
+            return
+        if not (INDONESIA_LAT_MIN <= lat <= INDONESIA_LAT_MAX):
+            self._flag(f"lat {lat} out of bounds")
+        if not (INDONESIA_LON_MIN <= lon <= INDONESIA_LON_MAX):
+            self._flag(f"lon {lon} out of bounds")
+
+    def feed_columns(self, columns, rows):
+        # Stripped columns: the streaming path counts raw non-empty cells,
+        # which differs only for whitespace-only cells.
+        lat, lat_ok = columns['lat.value'], columns['lat.ok']
+        lon, lon_ok = columns['lon.value'], columns['lon.ok']
+        self.with_coords = int(np.count_nonzero((columns['lat'] != '') & (columns['lon'] != '')))
+        both = lat_ok & lon_ok
+        with np.errstate(invalid='ignore'):
+            lat_bad = both & ~((lat >= INDONESIA_LAT_MIN) & (lat <= INDONESIA_LAT_MAX))
+            lon_bad = both & ~((lon >= INDONESIA_LON_MIN) & (lon <= INDONESIA_LON_MAX))
+        self.invalid = int(np.count_nonzero(lat_bad) + np.count_nonzero(lon_bad))
+        for i in np.flatnonzero(lat_bad | lon_bad)[:SAMPLE_SIZE]:
+            if lat_bad[i] and len(self.samples) < SAMPLE_SIZE:
+                self.samples.append(f"lat {float(lat[i])} out of bounds")
+            if lon_bad[i] and len(self.samples) < SAMPLE_SIZE:
+                self.samples.append(f"lon {float(lon[i])} out of bounds")
+
+    def merge(self, other):
+        self.with_coords += other.with_coords
+        self.invalid += other.invalid
+        self.samples = (self.samples + other.samples)[:SAMPLE_SIZE]
+
+    def error(self):
+        if self.invalid and self.invalid > self.with_coords * self.max_ratio:
+            return (f"Too many invalid coordinates: {self.invalid}/{self.with_coords}. "
+                    f"Sample: {self.samples}")
+        return None
+
+
+class NpsnUniquenessCheck(DataCheck):
+    """At most ``max_pct`` percent of non-empty NPSNs may be duplicates.
+
+    Seen NPSNs are tracked in an ``NpsnSet`` bitmap, so memory stays fixed
+    regardless of row count; only the first few repeats are kept as samples.
+    """
+
+    name = 'NPSN values are unique'
+    columns = ('npsn',)
+
+    def __init__(self, max_pct: float = 1.0):
+        self.max_pct = max_pct
+        self.total = 0
+        self.duplicates = 0
+        self.samples: List[str] = []
+        self.seen = NpsnSet()
+
+    def feed(self, row):
+        npsn = _field(row, 'npsn')
+        if not npsn:
+            return
+        self.total += 1
+        if not self.seen.add(npsn):
+            self.duplicates += 1
+            if len(self.samples) < SAMPLE_SIZE:
+                self.samples.append(npsn)
+
+    def feed_columns(self, columns, rows):
+        values = columns['npsn']
+        values = values[values != '']
+        self.total = len(values)
+        # A stable sort keeps the first occurrence of each value first in
+        # its run, so the rest are the repeats, in file order once re-sorted.
+        order = np.argsort(values, kind='stable')
+        ordered = values[order]
+        repeats = np.sort(order[1:][ordered[1:] == ordered[:-1]])
+        self.duplicates = len(repeats)
+        self.samples = [str(v) for v in values[repeats[:SAMPLE_SIZE]]]
+
+    def merge(self, other):
+        # Values in both halves repeat at their first occurrence in other's
+        # rows; their samples come after other's own repeats, in key order.
+        shared, sample = self.seen.merge(other.seen, SAMPLE_SIZE)
+        self.total += other.total
+        self.duplicates += other.duplicates + shared
+        self.samples = (self.samples + other.samples + sample)[:SAMPLE_SIZE]
+
+    def error(self):
+        duplicates = self.duplicates
+        if duplicates > 0:
+            dup_pct = (duplicates / self.total) * 100
+            if dup_pct > self.max_pct:
+                return (f"Found {duplicates} duplicate NPSN values ({dup_pct:.2f}% of total). "
+                        f"Sample: {self.samples}")
+        return None
+
+
+class RequiredFieldsCheck(DataCheck):
+    """No required field may be empty in more than ``max_pct`` percent of rows."""
+
+    name = 'Required fields have data'
+
+    def __init__(self, fields: Sequence[str] = REQUIRED_FIELDS, max_pct: float = 10.0):
+        self.fields = list(fields)
+        self.columns = tuple(self.fields)
+        self.max_pct = max_pct
+        self.rows = 0
+        self.empty_counts = {field: 0 for field in self.fields}
+
+    def feed(self, row):
+        self.rows += 1
+        for field in self.fields:
+            if not _field(row, field):
+                self.empty_counts[field] += 1
+
+    def feed_columns(self, columns, rows):
+        self.rows = rows
+        for field in self.fields:
+            self.empty_counts[field] = int(np.count_nonzero(columns[field] == ''))
+
+    def merge(self, other):
+        self.rows += other.rows
+        for field, empty_count in other.empty_counts.items():
+            self.empty_counts[field] += empty_count
+
+    def error(self):
+        if not self.rows:
+            return None
+        for field, empty_count in self.empty_counts.items():
+            empty_pct = (empty_count / self.rows) * 100
+            if empty_pct > self.max_pct:
+                return f"Field '{field}' has {empty_count} empty values ({empty_pct:.2f}%)"
+        return None
+
+
+class NpsnNumericCheck(DataCheck):
+    """At most ``max_pct`` percent of rows may carry a non-numeric NPSN."""
+
+    name = 'NPSN values are numeric'
+    columns = ('npsn',)
+
+    def __init__(self, max_pct: float = 1.0):
+        self.max_pct = max_pct
+        self.rows = 0
+        self.non_numeric = 0
+        self.samples: List[str] = []
+
+    def feed(self, row):
+        self.rows += 1
+        npsn = _field(row, 'npsn')
+        if npsn and not npsn.isdigit():
+            self.non_numeric += 1
+            if len(self.samples) < SAMPLE_SIZE:
+                self.samples.append(npsn)
+
+    def feed_columns(self, columns, rows):
+        values = columns['npsn']
+        self.rows = rows
+        bad = (values != '') & ~np.char.isdigit(values)
+        self.non_numeric = int(np.count_nonzero(bad))
+        self.samples = [str(v) for v in values[bad][:SAMPLE_SIZE]]
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.non_numeric += other.non_numeric
+        self.samples = (self.samples + other.samples)[:SAMPLE_SIZE]
+
+    def error(self):
+        pct = (self.non_numeric / self.rows) * 100 if self.rows else 0
+        if pct > self.max_pct:
+            return (f"Found {self.non_numeric} non-numeric NPSN values ({pct:.2f}% of total). "
+                    f"Sample: {self.samples}")
+        return None
+
+
+def default_checks() -> List[DataCheck]:
+    """Return a fresh instance of every check run against schools.csv."""
+    return [
+        RowCountCheck(),
+        RequiredColumnsCheck(),
+        LatLonNumericCheck(),
+        CoordinateBoundsCheck(),
+        NpsnUniquenessCheck(),
+        RequiredFieldsCheck(),
+        NpsnNumericCheck(),
+    ]
+
+
+class ValidationReport:
+    """Outcome of one streaming pass: row count plus each check's verdict."""
+
+    def __init__(self, rows: int, checks: Sequence[DataCheck]):
+        self.rows = rows
+        self.checks = {check.name: check for check in checks}
+        self.errors = {check.name: check.error() for check in checks}
+
+    def error_for(self, name: str) -> Optional[str]:
+        return self.errors[name]
+
+    @property
+    def passed(self) -> bool:
+        return all(err is None for err in self.errors.values())
+
+
+class StreamingValidator:
+    """Feeds every row of a CSV to a set of checks in a single pass."""
+
+    def __init__(self, checks: Iterable[DataCheck]):
+        self.checks = list(checks)
+
+    def feed_rows(self, fieldnames: Sequence[str],
+                  rows: Iterable[Dict[str, Optional[str]]]) -> ValidationReport:
+        for check in self.checks:
+            check.begin(fieldnames)
+        feeders = [check.feed for check in self.checks]
+        count = 0
+        for row in rows:
+            count += 1
+            for feed in feeders:
+                feed(row)
+        return ValidationReport(count, self.checks)
+
+    def run(self, path: str) -> ValidationReport:
+        path = find_input(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV not found: {path}")
+        with open_text(path) as f:
+            reader = csv.DictReader(f)
+            return self.feed_rows(reader.fieldnames or [], reader)
+
+    def run_dataset(self, dataset) -> ValidationReport:
+        """Validate an already-loaded ``tests.dataset.Dataset``."""
+        return self.feed_rows(dataset.fieldnames, dataset.iter_rows())
+
+
+NUMERIC_COLUMNS = ('lat', 'lon')
+
+
+def load_columns(path: str, names: Optional[Sequence[str]] = None):
+    """Read ``names`` (default: every header column) from a CSV into arrays.
+
+    Returns ``(fieldnames, columns, rows)`` where each column is a stripped
+    NumPy unicode array. Missing columns and short rows read as ''. Columns
+    in ``NUMERIC_COLUMNS`` are parsed once here into ``<name>.value`` and
+    ``<name>.ok`` so the checks only do array arithmetic.
+    """
+    with open_text(find_input(path)) as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, [])
+        wanted = list(fieldnames) if names is None else list(names)
+        index = {name: i for i, name in enumerate(fieldnames)}
+        cells: Dict[str, List[str]] = {name: [] for name in wanted}
+        positions = [(cells[name], index.get(name, -1)) for name in wanted]
+        rows = 0
+        for record in reader:
+            if not record:
+                continue
+            rows += 1
+            width = len(record)
+            for column, pos in positions:
+                column.append(record[pos] if 0 <= pos < width else '')
+    columns = {name: np.char.strip(np.array(values, dtype=str))
+               for name, values in cells.items()}
+    for name in NUMERIC_COLUMNS:
+        if name in columns:
+            columns[f'{name}.value'], columns[f'{name}.ok'] = _parse_floats(columns[name])
+    return fieldnames, columns, rows
+
+
+class ColumnarValidator:
+    """Runs checks as whole-column NumPy operations over one file read.
+
+    Falls back to ``StreamingValidator`` when NumPy is not installed.
+    """
+
+    def __init__(self, checks: Iterable[DataCheck]):
+        self.checks = list(checks)
+
+    def needed_columns(self) -> Optional[List[str]]:
+        needed: List[str] = []
+        for check in self.checks:
+            if check.columns is None:
+                return None
+            needed.extend(c for c in check.columns if c not in needed)
+        return needed
+
+    def run(self, path: str) -> ValidationReport:
+        if not HAS_NUMPY:
+            return StreamingValidator(self.checks).run(path)
+        path = find_input(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV not found: {path}")
+        fieldnames, columns, rows = load_columns(path, self.needed_columns())
+        for check in self.checks:
+            check.begin(fieldnames)
+            check.feed_columns(columns, rows)
+        return ValidationReport(rows, self.checks)
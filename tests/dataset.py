@@ -0,0 +1,230 @@
+"""
+Shared, cached loader for data/schools.csv.
+
+Both the pytest suites and tests/run_tests.py load the dataset through
+``load_schools``. The CSV is parsed at most once per process, and the parsed
+records are snapshotted to disk (pickle) keyed by file size, mtime and a
+SHA-256 of the contents. A later run whose CSV is unchanged loads the
+snapshot instead of re-parsing.
+
+Invalidation:
+    - size and mtime match the snapshot     -> reuse without hashing
+    - size matches but mtime differs        -> hash; reuse if the hash matches
+    - otherwise                             -> re-parse and rewrite the snapshot
+
+The snapshot directory defaults to .cache/datasets/ at the repository root
+and can be moved with the DATASET_CACHE_DIR environment variable. Each
+snapshot starts with a small header naming its CSV, and whenever a snapshot
+is written, the snapshots whose CSV no longer exists (or that an older
+version wrote) are deleted, so CSVs in temporary directories do not pile
+up. The pytest suites keep their snapshots in a temporary directory
+(tests/conftest.py).
+
+A compressed CSV (schools.csv.gz, .bz2, .xz, .zst) is decompressed while it
+is parsed, and a missing schools.csv falls back to its compressed copy
+(tests/compressed.py). The snapshot is keyed by the compressed file.
+"""
+
+import csv
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tests.compressed import find_input, open_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCHOOLS_PATH = os.path.join(ROOT, 'data', 'schools.csv')
+DEFAULT_CACHE_DIR = os.path.join(ROOT, '.cache', 'datasets')
+
+SNAPSHOT_VERSION = 2
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class Dataset:
+    """Parsed CSV: header plus one tuple per data row."""
+
+    def __init__(self, path: str, fieldnames: Sequence[str],
+                 records: List[Tuple[str, ...]], from_cache: bool = False):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.records = records
+        self.from_cache = from_cache
+        self._rows: Optional[List[Dict[str, str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def iter_rows(self) -> Iterator[Dict[str, str]]:
+        """Yield rows as dicts without materializing them all at once."""
+        fieldnames = self.fieldnames
+        for record in self.records:
+            yield dict(zip(fieldnames, record))
+
+    @property
+    def rows(self) -> List[Dict[str, str]]:
+        """All rows as dicts, shaped like ``list(csv.DictReader(f))``."""
+        if self._rows is None:
+            self._rows = list(self.iter_rows())
+        return self._rows
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_csv(path: str) -> Tuple[List[str], List[Tuple[str, ...]]]:
+    """Parse a CSV into (fieldnames, records), skipping blank lines.
+
+    Short rows are padded with '' so every record matches the header width.
+    A compressed ``path`` (.gz, .bz2, .xz, .zst) is decompressed as it is read.
+    """
+    with open_text(path) as f:
+        reader = csv.reader(f)
+        fieldnames = next(reader, [])
+        width = len(fieldnames)
+        records = []
+        for record in reader:
+            if not record:
+                continue
+            if len(record) < width:
+                record = record + [''] * (width - len(record))
+            records.append(tuple(record[:width]))
+    return fieldnames, records
+
+
+def _snapshot_path(path: str, cache_dir: str) -> str:
+    key = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{key}.pickle")
+
+
+_SNAPSHOT_ERRORS = (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError)
+
+
+def _read_header(f) -> Optional[dict]:
+    """The {version, source} header a snapshot starts with; None when unusable."""
+    header = pickle.load(f)
+    if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION:
+        return None
+    return header
+
+
+def _read_snapshot(snapshot: str) -> Optional[dict]:
+    try:
+        with open(snapshot, 'rb') as f:
+            if _read_header(f) is None:
+                return None
+            data = pickle.load(f)
+    except _SNAPSHOT_ERRORS:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def prune_snapshots(cache_dir: str) -> int:
+    """Delete the snapshots in ``cache_dir`` whose CSV is gone; returns how many.
+
+    Only the header of each snapshot is read. Unreadable snapshots and
+    those of another SNAPSHOT_VERSION are deleted too.
+    """
+    removed = 0
+    try:
+        names = [name for name in os.listdir(cache_dir) if name.endswith('.pickle')]
+    except OSError:
+        return 0
+    for name in names:
+        snapshot = os.path.join(cache_dir, name)
+        try:
+            with open(snapshot, 'rb') as f:
+                header = _read_header(f)
+        except _SNAPSHOT_ERRORS:
+            header = None
+        if header is None or not os.path.exists(header.get('source', '')):
+            try:
+                os.remove(snapshot)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def _write_snapshot(snapshot: str, source: str, data: dict) -> None:
+    """Write atomically so a concurrent reader never sees a partial file."""
+    directory = os.path.dirname(snapshot)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'version': SNAPSHOT_VERSION, 'source': source}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot)
+    except OSError:
+        # A read-only checkout must still be able to run the tests
+        return
+    prune_snapshots(directory)
+
+
+_memory: Dict[str, Tuple[Tuple[int, int], Dataset]] = {}
+
+
+def load_dataset(path: str, cache_dir: Optional[str] = None,
+                 use_disk_cache: bool = True) -> Dataset:
+    """Load any CSV through the in-process and on-disk caches."""
+    path = os.path.abspath(find_input(path))
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+
+    cached = _memory.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    dataset = None
+    snapshot = None
+    if use_disk_cache:
+        cache_dir = cache_dir or os.environ.get('DATASET_CACHE_DIR') or DEFAULT_CACHE_DIR
+        snapshot = _snapshot_path(path, cache_dir)
+        data = _read_snapshot(snapshot)
+        if data and data['size'] == stat.st_size:
+            if data['mtime_ns'] == stat.st_mtime_ns:
+                dataset = Dataset(path, data['fieldnames'], data['records'], from_cache=True)
+            else:
+                digest = file_sha256(path)
+                if digest == data['sha256']:
+                    dataset = Dataset(path, data['fieldnames'], data['records'], from_cache=True)
+                    data['mtime_ns'] = stat.st_mtime_ns
+                    _write_snapshot(snapshot, path, data)
+
+    if dataset is None:
+        fieldnames, records = parse_csv(path)
+        dataset = Dataset(path, fieldnames, records)
+        if snapshot:
+            _write_snapshot(snapshot, path, {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': file_sha256(path),
+                'fieldnames': fieldnames,
+                'records': records,
+            })
+
+    _memory[path] = (signature, dataset)
+    return dataset
+
+
+def load_schools(path: Optional[str] = None, **kwargs) -> Dataset:
+    """Load data/schools.csv (or ``path``) through the shared caches."""
+    return load_dataset(path or DEFAULT_SCHOOLS_PATH, **kwargs)
+
+
+def remember_dataset(dataset: Dataset, signature: Tuple[int, int]) -> None:
+    """Serve ``dataset`` from the in-process cache while its file keeps
+    ``signature`` (size, mtime_ns); the watch mode keeps it up to date."""
+    _memory[os.path.abspath(dataset.path)] = (signature, dataset)
+
+
+def clear_memory_cache() -> None:
+    _memory.clear()
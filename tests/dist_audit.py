@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Parallel auditor for the generated HTML in dist/.
+
+Checks every page for:
+
+- broken internal links, with scripts/validate-links.js semantics: the
+  same href extraction and relative-link filter, ``?``/``#`` stripped, ``/``
+  resolved against dist/ and anything else against the page's directory,
+  and a target counts when it is a file or a directory
+- a missing <title>, meta description or canonical link, and a canonical
+  URL whose path is not the page's own URL
+- pages over the byte budget for their tier (school, kecamatan, kabupaten,
+  province, homepage, other)
+
+dist/ is walked once up front, so link targets are looked up in an
+in-memory set instead of being stat'ed. Pages are then scanned in batches
+on a process pool. Each page is mmap'ed and searched with byte regexes,
+with the head-only checks limited to the part before </head>.
+
+Usage:
+    python3 tests/dist_audit.py                       # audit dist/ on all cores
+    python3 tests/dist_audit.py --dist build --jobs 8 --json
+    python3 tests/dist_audit.py --budget school=40000 --budget kecamatan=300000
+"""
+
+import argparse
+import html
+import json
+import mmap
+import os
+import posixpath
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dataset import ROOT  # noqa: E402
+
+DEFAULT_DIST_DIR = os.path.join(ROOT, 'dist')
+BATCH_SIZE = 500
+SAMPLE_SIZE = 10
+
+PAGE_TIERS = ('homepage', 'province', 'kabupaten', 'kecamatan', 'school', 'other')
+DEFAULT_BUDGETS = {
+    'homepage': 64 * 1024,
+    'province': 512 * 1024,
+    'kabupaten': 512 * 1024,
+    'kecamatan': 512 * 1024,
+    'school': 64 * 1024,
+    'other': 512 * 1024,
+}
+
+# Same extraction as validate-links.js::extractLinks
+_HREF = re.compile(rb'href="([^"]+)"')
+_TITLE = re.compile(rb'<title>([^<]*)</title>')
+_DESCRIPTION = re.compile(rb'<meta name="description" content="([^"]*)"')
+_CANONICAL = re.compile(rb'<link rel="canonical" href="([^"]*)"')
+_SCHEME = re.compile(r'^[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+
+
+def page_tier(relative_path: str) -> str:
+    """Classify a dist/-relative page path by the template that built it."""
+    parts = relative_path.split('/')
+    if relative_path == 'index.html':
+        return 'homepage'
+    if parts[0] != 'provinsi' or not parts[-1].endswith('.html'):
+        return 'other'
+    if parts[-1] == 'index.html':
+        return {3: 'province', 5: 'kabupaten', 7: 'kecamatan'}.get(len(parts), 'other')
+    return 'school' if len(parts) == 7 else 'other'
+
+
+def page_url(relative_path: str) -> str:
+    """URL path a page is served at (index.html maps to its directory)."""
+    if relative_path == 'index.html':
+        return '/'
+    if relative_path.endswith('/index.html'):
+        return '/' + relative_path[:-len('index.html')]
+    return '/' + relative_path
+
+
+def is_relative_link(link: str) -> bool:
+    """Match validate-links.js::isRelativeLink."""
+    if not link or link.startswith('#'):
+        return False
+    if _SCHEME.match(link):  # also covers http(s):
+        return False
+    return not link.startswith('//')
+
+
+def link_target(page: str, link: str) -> str:
+    """dist/-relative target of ``link`` on ``page`` ('.' is dist/ itself)."""
+    clean = re.split(r'[?#]', link, maxsplit=1)[0]
+    if clean.startswith('/'):
+        return posixpath.normpath(clean.lstrip('/') or '.')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(page), clean))
+
+
+def walk_dist(dist_dir: str) -> Tuple[List[str], Set[str], Set[str]]:
+    """Return (html pages, all files, all directories), relative to dist/."""
+    pages: List[str] = []
+    files: Set[str] = set()
+    dirs: Set[str] = {'.'}
+    stack = ['']
+    while stack:
+        relative = stack.pop()
+        with os.scandir(os.path.join(dist_dir, relative)) as entries:
+            for entry in entries:
+                path = f"{relative}/{entry.name}" if relative else entry.name
+                if entry.is_dir():
+                    dirs.add(path)
+                    stack.append(path)
+                else:
+                    files.add(path)
+                    if entry.name.endswith('.html'):
+                        pages.append(path)
+    pages.sort()
+    return pages, files, dirs
+
+
+# Set per worker process by _init_worker (inherited, not pickled, under fork)
+_targets: FrozenSet[str] = frozenset()
+_dist_dir = ''
+_budgets: Dict[str, int] = {}
+
+
+def _init_worker(dist_dir: str, targets: FrozenSet[str], budgets: Dict[str, int]) -> None:
+    global _dist_dir, _targets, _budgets
+    _dist_dir, _targets, _budgets = dist_dir, targets, budgets
+
+
+def _read(path: str):
+    """mmap a page read-only (empty files cannot be mapped)."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def audit_page(page: str, data, problems: List[Tuple[str, str, str]]) -> None:
+    """Append (problem, page, detail) for every issue found in ``data``."""
+    tier = page_tier(page)
+    size = len(data)
+    if size > _budgets.get(tier, DEFAULT_BUDGETS[tier]):
+        problems.append(('over_budget', page, f"{size} bytes ({tier})"))
+
+    head_end = data.find(b'</head>')
+    head_end = size if head_end < 0 else head_end
+    if not _TITLE.search(data, 0, head_end):
+        problems.append(('missing_title', page, ''))
+    description = _DESCRIPTION.search(data, 0, head_end)
+    if not description or not description.group(1).strip():
+        problems.append(('missing_description', page, ''))
+    canonical = _CANONICAL.search(data, 0, head_end)
+    if not canonical:
+        problems.append(('missing_canonical', page, ''))
+    else:
+        href = html.unescape(canonical.group(1).decode('utf-8', 'replace'))
+        if urlsplit(href).path != page_url(page):
+            problems.append(('wrong_canonical', page, href))
+
+    seen = set()
+    for match in _HREF.finditer(data):
+        link = match.group(1).decode('utf-8', 'replace')
+        if link in seen or not is_relative_link(link):
+            continue
+        seen.add(link)
+        if link_target(page, link) not in _targets:
+            problems.append(('broken_link', page, link))
+
+
+def audit_batch(pages: List[str]) -> Tuple[Dict[str, List[int]], List[Tuple[str, str, str]]]:
+    """Audit a batch of pages; returns ({tier: [pages, bytes]}, problems)."""
+    tiers: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    problems: List[Tuple[str, str, str]] = []
+    for page in pages:
+        try:
+            data = _read(os.path.join(_dist_dir, page))
+        except OSError as e:
+            problems.append(('unreadable', page, str(e)))
+            continue
+        try:
+            audit_page(page, data, problems)
+            stats = tiers[page_tier(page)]
+            stats[0] += 1
+            stats[1] += len(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    return dict(tiers), problems
+
+
+class AuditReport:
+    """Totals, per-tier sizes and problems found in one audit."""
+
+    def __init__(self):
+        self.pages = 0
+        self.seconds = 0.0
+        self.jobs = 1
+        self.tiers: Dict[str, Dict[str, int]] = {}
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, problem: str, page: str, detail: str) -> None:
+        self.counts[problem] += 1
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(f"{page} -> {detail}" if detail else page)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    @property
+    def passed(self) -> bool:
+        return not self.counts
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{count} {problem.replace('_', ' ')}. Sample: {self.samples[problem]}"
+                for problem, count in sorted(self.counts.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pages': self.pages,
+            'seconds': round(self.seconds, 3),
+            'pages_per_second': round(self.pages_per_second, 1),
+            'jobs': self.jobs,
+            'passed': self.passed,
+            'tiers': self.tiers,
+            'problems': dict(self.counts),
+            'errors': self.errors,
+        }
+
+
+def _batches(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def audit_dist(dist_dir: str, jobs: Optional[int] = None,
+               budgets: Optional[Dict[str, int]] = None,
+               batch_size: int = BATCH_SIZE) -> AuditReport:
+    """Audit every HTML page under ``dist_dir``."""
+    start = time.perf_counter()
+    report = AuditReport()
+    report.jobs = max(1, jobs or os.cpu_count() or 1)
+    merged_budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+
+    pages, files, dirs = walk_dist(dist_dir)
+    targets = frozenset(files | dirs)
+    del files, dirs
+    tiers: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+    def collect(result) -> None:
+        batch_tiers, problems = result
+        for tier, (count, size) in batch_tiers.items():
+            tiers[tier][0] += count
+            tiers[tier][1] += size
+        for problem in problems:
+            report.add(*problem)
+
+    batches = list(_batches(pages, batch_size))
+    if report.jobs == 1 or len(batches) <= 1:
+        _init_worker(dist_dir, targets, merged_budgets)
+        for batch in batches:
+            collect(audit_batch(batch))
+    else:
+        # fork shares the target set copy-on-write; spawn has to pickle it
+        method = 'fork' if 'fork' in get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=report.jobs, mp_context=get_context(method),
+                                 initializer=_init_worker,
+                                 initargs=(dist_dir, targets, merged_budgets)) as pool:
+            for result in pool.map(audit_batch, batches):
+                collect(result)
+
+    report.pages = len(pages)
+    report.tiers = {tier: {'pages': count, 'bytes': size,
+                           'average_bytes': size // count if count else 0,
+                           'budget': merged_budgets[tier]}
+                    for tier, (count, size) in sorted(tiers.items())}
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def parse_budget(text: str) -> Tuple[str, int]:
+    """Parse 'tier=bytes' from the command line."""
+    tier, _, value = text.partition('=')
+    if tier not in PAGE_TIERS or not value.isdigit():
+        raise argparse.ArgumentTypeError(
+            f"expected TIER=BYTES with TIER in {', '.join(PAGE_TIERS)}")
+    return tier, int(value)
+
+
+def print_report(report: AuditReport, dist_dir: str) -> None:
+    print(f"{dist_dir}: {report.pages} pages in {report.seconds:.2f}s "
+          f"({report.pages_per_second:.0f} pages/s, {report.jobs} jobs)")
+    print(f"  {'tier':<10} {'pages':>9} {'avg KB':>9} {'budget KB':>10}")
+    for tier, stats in report.tiers.items():
+        print(f"  {tier:<10} {stats['pages']:>9} {stats['average_bytes'] / 1024:>9.1f} "
+              f"{stats['budget'] / 1024:>10.0f}")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+    if report.passed:
+        print("  ✓ No problems found")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit the generated HTML in dist/')
+    parser.add_argument('--dist', default=DEFAULT_DIST_DIR, help='Build output directory')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: all cores)')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[],
+                        metavar='TIER=BYTES', help='Override a page-size budget')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dist):
+        print(f"dist directory not found: {args.dist} (run the build first)", file=sys.stderr)
+        sys.exit(2)
+    report = audit_dist(args.dist, args.jobs, dict(args.budget))
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, args.dist)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Enrichment store audit: does data/enrichment.json still match schools.csv?
+
+scripts/enrichment.js saves Wikipedia enrichment keyed by NPSN
+(``saveEnrichmentData``), and every build parses the whole file
+(``loadEnrichmentData``) before looking each school up in it, so entries
+no page renders still cost read, parse and memory in every build. The
+store is streamed member by member (``iter_members`` from
+tests/manifest_inspect.py) and hash-joined against the NPSNs of
+schools.csv, held in the fixed-size ``NpsnSet`` bitmap from
+tests/npsn_index.py; neither side becomes a dictionary. Each entry is
+costed by the bytes it occupies in the file and judged, first match wins:
+
+- orphaned: no school in schools.csv has its NPSN
+- stale: holds no source the school page renders (``generateEnrichmentSection``
+  only shows Wikipedia data with a URL), has no ``enrichedAt``, or was
+  enriched more than ``max_age_days`` ago
+- oversized: larger than ``max_entry_bytes``; enrichSchoolViaWikipedia
+  caps the extract at 500 characters, so these come from older runs or
+  other writers
+
+A repeated NPSN key is resolved like JSON.parse resolves it: the last
+entry is judged and the earlier ones are counted as duplicates, dead bytes
+until the store is saved again. A store
+that is not a valid JSON object fails the audit, since loadEnrichmentData
+then returns {} and the build drops every entry.
+
+The prune list holds the NPSNs of orphaned, stale and oversized entries.
+Deleting them leaves only entries that pages render, and the next
+``--enrich`` run fetches fresh data for the schools that remain.
+
+Usage:
+    python3 tests/enrichment_audit.py                      # data/enrichment.json vs schools.csv
+    python3 tests/enrichment_audit.py --max-age-days 180 --max-entry-bytes 1500 --json
+    python3 tests/enrichment_audit.py --prune-list > prune.txt
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import DEFAULT_SCHOOLS_PATH, ROOT, load_schools  # noqa: E402
+from tests.manifest_inspect import JsonStreamError, iter_members  # noqa: E402
+from tests.npsn_index import NpsnSet  # noqa: E402
+
+# Same file as ENRICHMENT_DATA_PATH in scripts/enrichment.js
+DEFAULT_STORE_PATH = os.path.join(ROOT, 'data', 'enrichment.json')
+DEFAULT_MAX_AGE_DAYS = 365
+DEFAULT_MAX_ENTRY_BYTES = 2048
+SAMPLE_SIZE = 5
+PROBLEMS = ('orphaned', 'stale', 'oversized', 'duplicate')
+
+# Sources generateEnrichmentSection renders, and the field each one needs
+RENDERED_SOURCES = {'wikipedia': 'wikipediaUrl'}
+
+
+def school_npsns(csv_path: str) -> NpsnSet:
+    """NPSNs of schools.csv, trimmed as parseCsv trims them."""
+    dataset = load_schools(csv_path)
+    npsns = NpsnSet()
+    if 'npsn' in dataset.fieldnames:
+        column = dataset.fieldnames.index('npsn')
+        for record in dataset.records:
+            npsns.add(record[column].strip())
+    return npsns
+
+
+def renders(entry: Any) -> bool:
+    """Whether the school page shows anything from ``entry``."""
+    if not isinstance(entry, dict):
+        return False
+    return any(isinstance(entry.get(source), dict) and entry[source].get(field)
+               for source, field in RENDERED_SOURCES.items())
+
+
+def enriched_at(entry: Any) -> Optional[datetime]:
+    """The oldest ``enrichedAt`` among the entry's sources; None when undated."""
+    oldest = None
+    for data in (entry.values() if isinstance(entry, dict) else ()):
+        text = data.get('enrichedAt') if isinstance(data, dict) else None
+        try:
+            when = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            continue
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        oldest = when if oldest is None or when < oldest else oldest
+    return oldest
+
+
+def judge(entry: Any, known: bool, size: int, cutoff: datetime,
+          max_entry_bytes: int) -> Tuple[Optional[str], str, str]:
+    """(problem or None, stale reason, sample detail) for one store entry."""
+    if not known:
+        return 'orphaned', '', ''
+    when = enriched_at(entry)
+    if not renders(entry):
+        reason = 'renders nothing'
+    elif when is None:
+        reason = 'undated'
+    elif when < cutoff:
+        return 'stale', 'expired', f"enriched {when.date()}"
+    elif size > max_entry_bytes:
+        return 'oversized', '', ''
+    else:
+        return None, '', ''
+    return 'stale', reason, reason
+
+
+class EnrichmentReport:
+    """Entries of the enrichment store that no school page needs."""
+
+    def __init__(self, max_age_days: int = DEFAULT_MAX_AGE_DAYS,
+                 max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES):
+        self.max_age_days = max_age_days
+        self.max_entry_bytes = max_entry_bytes
+        self.store_bytes = 0
+        self.entries = 0
+        self.schools = 0
+        self.matched = 0
+        self.malformed: Optional[str] = None
+        self.seconds = 0.0
+        self.counts: Counter = Counter()
+        self.bytes: Counter = Counter()
+        self.stale_reasons: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+        self.prune: List[str] = []
+
+    def add(self, problem: str, npsn: str, size: int, detail: str = '') -> None:
+        self.counts[problem] += 1
+        self.bytes[problem] += size
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(f"{npsn}: {detail}, {size} bytes" if detail
+                                         else f"{npsn}: {size} bytes")
+        if problem != 'duplicate':
+            self.prune.append(npsn)
+
+    @property
+    def prune_bytes(self) -> int:
+        return sum(self.bytes[problem] for problem in PROBLEMS if problem != 'duplicate')
+
+    @property
+    def projected_bytes(self) -> int:
+        """Store size once the prune list is applied and the store is saved again."""
+        return self.store_bytes - self.prune_bytes - self.bytes['duplicate']
+
+    @property
+    def passed(self) -> bool:
+        return self.malformed is None and not self.counts
+
+    @property
+    def errors(self) -> List[str]:
+        errors = [f"Store is not valid JSON ({self.malformed}); loadEnrichmentData "
+                  f"returns {{}} for it"] if self.malformed else []
+        return errors + [
+            f"{self.counts[problem]} {problem} entries ({self.bytes[problem]} bytes). "
+            f"Sample: {self.samples[problem]}"
+            for problem in PROBLEMS if self.counts[problem]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'store_bytes': self.store_bytes,
+            'entries': self.entries,
+            'schools': self.schools,
+            'matched': self.matched,
+            'coverage': round(self.matched / self.schools, 4) if self.schools else 0.0,
+            'max_age_days': self.max_age_days,
+            'max_entry_bytes': self.max_entry_bytes,
+            'problems': {problem: {'entries': self.counts[problem],
+                                   'bytes': self.bytes[problem]}
+                         for problem in PROBLEMS},
+            'stale_reasons': dict(self.stale_reasons),
+            'prune_entries': len(self.prune),
+            'prune_bytes': self.prune_bytes,
+            'projected_bytes': self.projected_bytes,
+            'malformed': self.malformed,
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'errors': self.errors,
+        }
+
+
+def audit_enrichment(store_path: str, csv_path: str,
+                     max_age_days: int = DEFAULT_MAX_AGE_DAYS,
+                     max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+                     now: Optional[datetime] = None) -> EnrichmentReport:
+    """Join the enrichment store at ``store_path`` to the schools of ``csv_path``."""
+    start = time.perf_counter()
+    report = EnrichmentReport(max_age_days, max_entry_bytes)
+    report.store_bytes = os.path.getsize(store_path)
+    schools = school_npsns(csv_path)
+    report.schools = len(schools)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=max_age_days)
+    verdicts = []
+    try:
+        with open(store_path, 'rb') as f:
+            for npsn, entry, size in iter_members(f, what='enrichment store'):
+                verdicts.append((npsn, size) + judge(entry, npsn in schools, size,
+                                                     cutoff, max_entry_bytes))
+    except JsonStreamError as e:
+        report.malformed = str(e)
+    # Like JSON.parse, a repeated key keeps its last entry: judge that one
+    last = [False] * len(verdicts)
+    seen = NpsnSet()
+    for index in range(len(verdicts) - 1, -1, -1):
+        last[index] = seen.add(verdicts[index][0])
+    for (npsn, size, problem, reason, detail), is_last in zip(verdicts, last):
+        report.entries += 1
+        if not is_last:
+            report.add('duplicate', npsn, size)
+            continue
+        if problem != 'orphaned':
+            report.matched += 1
+        if reason:
+            report.stale_reasons[reason] += 1
+        if problem:
+            report.add(problem, npsn, size, detail)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: EnrichmentReport, store_path: str) -> None:
+    print(f"{store_path}: {report.entries} entries, {report.store_bytes / 1e6:.1f} MB, "
+          f"joined to {report.schools} schools in {report.seconds:.2f}s")
+    print(f"  matched    {report.matched:>8}")
+    for problem in PROBLEMS:
+        print(f"  {problem:<10} {report.counts[problem]:>8}  ({report.bytes[problem]} bytes)")
+    if report.prune:
+        print(f"  pruning {len(report.prune)} entries brings the store to "
+              f"{report.projected_bytes / 1e6:.1f} MB")
+    if report.passed:
+        print("  ✓ Every entry belongs to a school and is rendered")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Join the enrichment store to schools.csv and list prunable entries'
+    )
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='Enrichment store (JSON)')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='Current schools.csv')
+    parser.add_argument('--max-age-days', type=int, default=DEFAULT_MAX_AGE_DAYS,
+                        help=f'Entries enriched longer ago are stale '
+                             f'(default {DEFAULT_MAX_AGE_DAYS})')
+    parser.add_argument('--max-entry-bytes', type=int, default=DEFAULT_MAX_ENTRY_BYTES,
+                        help=f'Larger entries are oversized (default {DEFAULT_MAX_ENTRY_BYTES})')
+    parser.add_argument('--prune-list', action='store_true',
+                        help='Print the NPSNs of entries to prune, one per line')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    for path, what in ((args.store, 'Enrichment store'), (args.csv, 'schools.csv')):
+        if not os.path.exists(path):
+            print(f"{what} not found: {path}", file=sys.stderr)
+            sys.exit(2)
+    report = audit_enrichment(args.store, args.csv, args.max_age_days, args.max_entry_bytes)
+    if args.prune_list:
+        if report.prune:
+            print('\n'.join(report.prune))
+    elif args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, args.store)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Change impact for the standalone runner's ``--changed-since`` and
+``--watch`` modes.
+
+``GROUPS`` maps every test group in tests/run_tests.py to the files it
+reads. A group re-runs when one of its ``reads`` patterns matches a path
+changed since the given git revision; ``requires`` paths are only checked
+for existence, so only deleting (or renaming away) something under them
+re-runs the group. Changes to the runner or to this map re-run everything.
+
+Changes are ``git diff --name-status -M <rev>`` (working tree against the
+revision, staged or not) plus untracked files. Inputs git does not track,
+such as dist/schools.json, cannot show up in a diff, so a group reading one
+that exists always runs. When git cannot answer (no repository, unknown
+revision) every group runs and the plan says why. The watch mode passes
+the changes its mtime poller saw instead (tests/watch.py).
+"""
+
+import fnmatch
+import os
+import subprocess
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from tests.compressed import input_variants
+
+RUNNER_FILES = ('tests/run_tests.py', 'tests/impact.py')
+
+# pytest modules and fixtures are never imported by the runner
+IGNORED = ('tests/test_*.py', 'tests/conftest.py')
+
+# Python modules the data checks are built from
+DATA_CHECK_CODE = ('tests/*.py', 'src/core/data-schema.json')
+
+
+class TestGroup(NamedTuple):
+    name: str
+    reads: Tuple[str, ...]
+    requires: Tuple[str, ...] = ()
+
+
+GROUPS = (
+    TestGroup('Project Structure Tests',
+              reads=('package.json',),
+              requires=('src', 'scripts', 'data', 'docs', 'data/schools.csv')),
+    TestGroup('Configuration Tests',
+              reads=('README.md',),
+              requires=('.env.example',)),
+    TestGroup('JavaScript Tests Check',
+              reads=(),
+              requires=('scripts/*.test.js',)),
+    TestGroup('GitHub Workflows Tests',
+              reads=(),
+              requires=('.github/workflows', '.github/workflows/*')),
+    TestGroup('Data Validation Tests',
+              reads=input_variants('data/schools.csv')
+              + ('dist/schools.json', 'data/enrichment.json') + DATA_CHECK_CODE,
+              requires=('external',)),
+    TestGroup('Functional Data Tests',
+              reads=input_variants('data/schools.csv') + DATA_CHECK_CODE),
+    TestGroup('Raw Data Tests',
+              reads=input_variants('external/raw.csv') + DATA_CHECK_CODE),
+)
+
+Change = Tuple[str, str]
+
+
+class ImpactError(Exception):
+    """Raised when git cannot list the changes since a revision."""
+
+
+def _git(root: str, *args: str) -> List[str]:
+    try:
+        result = subprocess.run(['git', *args], cwd=root, capture_output=True,
+                                text=True, check=False)
+    except OSError as e:
+        raise ImpactError(str(e)) from e
+    if result.returncode != 0:
+        raise ImpactError(result.stderr.strip() or f"git {args[0]} failed")
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def changed_paths(root: str, rev: str) -> List[Change]:
+    """(status, path) for every path changed since ``rev``.
+
+    Status is git's letter (A, M, D, T) or ``?`` for an untracked file. A
+    rename is reported as a deletion of the old path and an addition of the
+    new one, so ``requires`` patterns see the old side disappear.
+    """
+    changes: List[Change] = []
+    for line in _git(root, 'diff', '--name-status', '-M', rev, '--'):
+        status, *paths = line.split('\t')
+        if status[0] in 'RC':
+            if status[0] == 'R':
+                changes.append(('D', paths[0]))
+            changes.append(('A', paths[1]))
+        else:
+            changes.append((status[0], paths[0]))
+    changes += [('?', path) for path in _git(root, 'ls-files', '--others', '--exclude-standard')]
+    return changes
+
+
+def _matches(path: str, pattern: str) -> bool:
+    # A pattern names a file, a glob or a directory (matching everything below it)
+    return fnmatch.fnmatchcase(path, pattern) or path.startswith(pattern.rstrip('/') + '/')
+
+
+def _describe(paths: List[str]) -> str:
+    if len(paths) == 1:
+        return f"{paths[0]} changed"
+    return f"{paths[0]} and {len(paths) - 1} more changed"
+
+
+def decide(group: TestGroup, changes: List[Change], since: str) -> Tuple[bool, str]:
+    """Whether ``changes`` affect ``group``, and why."""
+    changed = [path for _, path in changes
+               if not any(fnmatch.fnmatchcase(path, p) for p in IGNORED)]
+    runner = [path for path in changed if path in RUNNER_FILES]
+    if runner:
+        return True, _describe(runner)
+    read = [path for path in changed if any(_matches(path, p) for p in group.reads)]
+    if read:
+        return True, _describe(read)
+    removed = [path for status, path in changes if status == 'D'
+               and any(_matches(path, p) for p in group.requires)]
+    if removed:
+        return True, f"{removed[0]} was removed" if len(removed) == 1 else \
+            f"{removed[0]} and {len(removed) - 1} more were removed"
+    reason = f"no changes to its inputs since {since}"
+    if group.reads:
+        reason += f" ({', '.join(group.reads)})"
+    return False, reason
+
+
+class ImpactPlan:
+    """Which test groups to run for the changes since ``rev``.
+
+    ``changes`` skips git when the caller already knows what changed (the
+    watch mode's mtime poller); ``rev`` then only names the baseline.
+    """
+
+    def __init__(self, root: str, rev: str, groups=GROUPS,
+                 changes: Optional[List[Change]] = None):
+        self.rev = rev
+        self.groups = groups
+        self.changes: List[Change] = []
+        self.error: Optional[str] = None
+        self.decisions: Dict[str, Tuple[bool, str]] = {}
+        if changes is not None:
+            self.changes = changes
+            for group in groups:
+                self.decisions[group.name] = decide(group, changes, rev)
+            return
+        try:
+            self.changes = changed_paths(root, rev)
+            tracked = set(_git(root, 'ls-files'))
+        except ImpactError as e:
+            self.error = str(e)
+            for group in groups:
+                self.decisions[group.name] = (True, f"git diff against {rev} failed: {e}")
+            return
+        for group in groups:
+            self.decisions[group.name] = self._decide(root, group, tracked)
+
+    def _decide(self, root: str, group: TestGroup, tracked) -> Tuple[bool, str]:
+        run, reason = decide(group, self.changes, self.rev)
+        if run:
+            return run, reason
+        for pattern in group.reads:
+            if not any(ch in pattern for ch in '*?[') and pattern not in tracked \
+                    and os.path.exists(os.path.join(root, pattern)):
+                return True, f"{pattern} is not tracked by git"
+        return run, reason
+
+    def runs(self, name: str) -> bool:
+        return self.decisions.get(name, (True, ''))[0]
+
+    @property
+    def skipped(self) -> Dict[str, str]:
+        return {name: reason for name, (run, reason) in self.decisions.items() if not run}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rev': self.rev,
+            'error': self.error,
+            'changed': [path for _, path in self.changes],
+            'groups': {name: {'run': run, 'reason': reason}
+                       for name, (run, reason) in self.decisions.items()},
+        }
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Incremental validation of data/schools.csv.
+
+The nightly ETL usually changes a few thousand of ~440k rows. This module
+remembers, per row keyed by NPSN, an MD5 of the raw CSV record text and
+the compact per-row facts the data checks need (only for rows with a
+problem; clean rows, almost every row, store nothing). The raw record text
+is an unambiguous serialization of the row, like the length-prefixed input
+of scripts/manifest.js::computeSchoolHash, and digesting it skips the CSV
+parser entirely for unchanged rows.
+
+On the next run only new or changed rows are re-validated. The aggregates
+behind each check (coordinate and completeness percentages, NPSN
+duplicates, non-numeric NPSNs) are rebuilt from the stored facts, and the
+verdicts match a full run. Work per unchanged row is a digest and a set
+lookup, both done in list comprehensions rather than a Python loop.
+
+State lives under .cache/validation/ by default.
+
+Usage:
+    python3 tests/incremental.py                  # validate data/schools.csv
+    python3 tests/incremental.py --csv path.csv --state state.pickle
+    python3 tests/incremental.py --json
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input, open_text  # noqa: E402
+from tests.data_checks import (  # noqa: E402
+    INDONESIA_LAT_MAX,
+    INDONESIA_LAT_MIN,
+    INDONESIA_LON_MAX,
+    INDONESIA_LON_MIN,
+    REQUIRED_FIELDS,
+    SAMPLE_SIZE,
+    CoordinateBoundsCheck,
+    DataCheck,
+    LatLonNumericCheck,
+    NpsnNumericCheck,
+    NpsnUniquenessCheck,
+    RequiredFieldsCheck,
+    RowCountCheck,
+    ValidationReport,
+    default_checks,
+)
+from tests.dataset import DEFAULT_SCHOOLS_PATH, ROOT  # noqa: E402
+
+DEFAULT_STATE_DIR = os.path.join(ROOT, '.cache', 'validation')
+
+STATE_VERSION = 1
+DIGEST_SIZE = 16
+# Stored facts are only valid for the rules that produced them
+FACTS_SIGNATURE = (INDONESIA_LAT_MIN, INDONESIA_LAT_MAX, INDONESIA_LON_MIN,
+                   INDONESIA_LON_MAX, tuple(REQUIRED_FIELDS))
+
+
+class RowFacts(NamedTuple):
+    """Threshold-independent outcome of validating one row."""
+    with_coords: bool
+    coord_errors: Tuple[str, ...]
+    empty_mask: int  # bit i set when REQUIRED_FIELDS[i] is empty
+    non_numeric_npsn: bool
+
+
+CLEAN = RowFacts(True, (), 0, False)
+
+
+def row_facts(row: Dict[str, str]) -> Optional[RowFacts]:
+    """Validate one row; mirrors the per-row logic of the streaming checks.
+
+    Returns None for a clean row (coordinates present and in bounds, no
+    empty required field, numeric NPSN).
+    """
+    coords = CoordinateBoundsCheck()
+    coords.feed(row)
+    empty_mask = 0
+    for bit, field in enumerate(REQUIRED_FIELDS):
+        if not (row.get(field) or '').strip():
+            empty_mask |= 1 << bit
+    npsn = (row.get('npsn') or '').strip()
+    facts = RowFacts(
+        with_coords=coords.with_coords == 1,
+        coord_errors=tuple(coords.samples),
+        empty_mask=empty_mask,
+        non_numeric_npsn=bool(npsn) and not npsn.isdigit(),
+    )
+    return None if facts == CLEAN else facts
+
+
+def split_records(text: str) -> List[str]:
+    """Split CSV text into raw record strings, without line terminators.
+
+    Quoted fields may span lines; a record is complete once its count of
+    '"' characters is even (escaped quotes are doubled, so they pair up).
+    Blank lines are dropped, as csv.reader does.
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    if '"' in text:
+        open_lines = [i for i, line in enumerate(lines)
+                      if '"' in line and line.count('"') % 2]
+        if open_lines:
+            merged: List[str] = []
+            pending: Optional[str] = None
+            for line in lines:
+                if pending is not None:
+                    pending += '\n' + line
+                    if pending.count('"') % 2 == 0:
+                        merged.append(pending)
+                        pending = None
+                elif '"' in line and line.count('"') % 2:
+                    pending = line
+                else:
+                    merged.append(line)
+            if pending is not None:
+                merged.append(pending)
+            lines = merged
+    return [line for line in lines if line]
+
+
+def parse_record(text: str) -> List[str]:
+    return next(csv.reader([text]), [])
+
+
+def _leading_field(text: str, index: int) -> Optional[str]:
+    """Return field ``index`` when it lies before any quote, else None."""
+    quote = text.find('"')
+    prefix = text if quote < 0 else text[:quote]
+    parts = prefix.split(',', index + 1)
+    if len(parts) > index + 1 or (quote < 0 and len(parts) == index + 1):
+        return parts[index]
+    if quote < 0:
+        return ''  # short row: the field is missing
+    return None
+
+
+def extract_npsns(records: Sequence[str], index: int) -> List[str]:
+    """Stripped NPSN of every record, parsing with csv only when quoted."""
+    if index < 0:
+        return [''] * len(records)
+    if index == 0:
+        npsns = [record.partition(',')[0] for record in records]
+    else:
+        npsns = [_leading_field(record, index) for record in records]
+    for i in [i for i, npsn in enumerate(npsns) if npsn is None or '"' in npsn]:
+        fields = parse_record(records[i])
+        npsns[i] = fields[index] if index < len(fields) else ''
+    return [npsn.strip() for npsn in npsns]
+
+
+class IncrementalStats:
+    """How much work an incremental run did."""
+
+    def __init__(self):
+        self.rows = 0
+        self.rechecked = 0
+        self.new = 0
+        self.changed = 0
+        self.removed = 0
+        self.state_loaded = False
+
+    @property
+    def reused(self) -> int:
+        return self.rows - self.rechecked
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'rows': self.rows,
+            'rechecked': self.rechecked,
+            'reused': self.reused,
+            'new': self.new,
+            'changed': self.changed,
+            'removed': self.removed,
+            'state_loaded': self.state_loaded,
+        }
+
+
+def default_state_path(csv_path: str) -> str:
+    key = hashlib.sha256(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(DEFAULT_STATE_DIR, f"{os.path.basename(csv_path)}.{key}.state")
+
+
+def _load_state(path: str, fieldnames: Sequence[str]) -> Optional[dict]:
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if (not isinstance(state, dict) or state.get('version') != STATE_VERSION
+            or state.get('signature') != FACTS_SIGNATURE
+            or state.get('fieldnames') != list(fieldnames)):
+        return None
+    return state
+
+
+def _save_state(path: str, state: dict) -> None:
+    directory = os.path.dirname(path) or '.'
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def _split_digests(blob: bytes) -> List[bytes]:
+    return [blob[i:i + DIGEST_SIZE] for i in range(0, len(blob), DIGEST_SIZE)]
+
+
+class IncrementalValidator:
+    """Re-validates only rows whose content hash changed since the last run."""
+
+    def __init__(self, state_path: Optional[str] = None):
+        self.state_path = state_path
+
+    def run(self, path: str) -> Tuple[ValidationReport, IncrementalStats]:
+        path = find_input(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV not found: {path}")
+        state_path = self.state_path or default_state_path(path)
+        stats = IncrementalStats()
+
+        with open_text(path) as f:
+            records = split_records(f.read())
+        fieldnames = parse_record(records[0]) if records else []
+        records = records[1:]
+        width = len(fieldnames)
+
+        def parse_row(text: str) -> Dict[str, str]:
+            record = parse_record(text)
+            if len(record) < width:
+                record = record + [''] * (width - len(record))
+            return dict(zip(fieldnames, record))
+
+        md5 = hashlib.md5
+        digests = [md5(record.encode('utf-8')).digest() for record in records]
+        npsns = extract_npsns(records, fieldnames.index('npsn') if 'npsn' in fieldnames else -1)
+        stats.rows = len(records)
+
+        state = _load_state(state_path, fieldnames)
+        stats.state_loaded = state is not None
+        previous_hashes: Dict[str, bytes] = {}
+        previous_facts: Dict[bytes, RowFacts] = {}
+        known = set()
+        if state:
+            previous_hashes = dict(zip(state['npsns'], _split_digests(state['digests'])))
+            previous_facts = state['facts']
+            known = set(previous_hashes.values())
+
+        facts: Dict[bytes, RowFacts] = {}
+        for i in [i for i, digest in enumerate(digests) if digest not in known]:
+            stats.rechecked += 1
+            if npsns[i] in previous_hashes:
+                stats.changed += 1
+            else:
+                stats.new += 1
+            found = row_facts(parse_row(records[i]))
+            if found is not None:
+                facts[digests[i]] = found
+        facts.update((digest, found) for digest, found in previous_facts.items()
+                     if digest not in facts)
+        if state:
+            stats.removed = len(previous_hashes.keys() - set(npsns))
+
+        checks = default_checks()
+        agg = CheckAggregates(stats.rows)
+        agg.add_npsns(npsns)
+        for i in [i for i, digest in enumerate(digests) if digest in facts]:
+            agg.add_facts(npsns[i], facts[digests[i]])
+        for check in checks:
+            check.begin(fieldnames)
+            agg.apply(check)
+            if isinstance(check, LatLonNumericCheck):
+                for record in records[:check.sample_rows]:
+                    check.feed(parse_row(record))
+
+        in_use = set(digests)
+        _save_state(state_path, {
+            'version': STATE_VERSION,
+            'signature': FACTS_SIGNATURE,
+            'fieldnames': fieldnames,
+            'npsns': npsns,
+            'digests': b''.join(digests),
+            'facts': {digest: found for digest, found in facts.items() if digest in in_use},
+        })
+        return ValidationReport(stats.rows, checks), stats
+
+
+class CheckAggregates:
+    """Global check state rebuilt from per-row facts, in file order."""
+
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.without_coords = 0
+        self.invalid_coords = 0
+        self.coord_samples: List[str] = []
+        self.empty_counts = [0] * len(REQUIRED_FIELDS)
+        self.npsn_total = 0
+        self.duplicates = 0
+        self.duplicate_samples: List[str] = []
+        self.non_numeric = 0
+        self.non_numeric_samples: List[str] = []
+
+    def add_npsns(self, npsns: Sequence[str]) -> None:
+        self.npsn_total = len(npsns) - npsns.count('')
+        self.duplicates = self.npsn_total - len(set(npsns) - {''})
+        if self.duplicates:
+            seen = set()
+            for npsn in npsns:
+                if not npsn:
+                    continue
+                if npsn in seen:
+                    self.duplicate_samples.append(npsn)
+                    if len(self.duplicate_samples) == SAMPLE_SIZE:
+                        break
+                else:
+                    seen.add(npsn)
+
+    def add_facts(self, npsn: str, facts: RowFacts) -> None:
+        self.without_coords += not facts.with_coords
+        if facts.coord_errors:
+            self.invalid_coords += len(facts.coord_errors)
+            room = SAMPLE_SIZE - len(self.coord_samples)
+            self.coord_samples.extend(facts.coord_errors[:max(room, 0)])
+        if facts.empty_mask:
+            for bit in range(len(REQUIRED_FIELDS)):
+                if facts.empty_mask >> bit & 1:
+                    self.empty_counts[bit] += 1
+        if facts.non_numeric_npsn:
+            self.non_numeric += 1
+            if len(self.non_numeric_samples) < SAMPLE_SIZE:
+                self.non_numeric_samples.append(npsn)
+
+    def apply(self, check: DataCheck) -> None:
+        if isinstance(check, RowCountCheck):
+            check.rows = self.rows
+        elif isinstance(check, CoordinateBoundsCheck):
+            check.with_coords = self.rows - self.without_coords
+            check.invalid = self.invalid_coords
+            check.samples = list(self.coord_samples)
+        elif isinstance(check, NpsnUniquenessCheck):
+            check.total = self.npsn_total
+            check.duplicates = self.duplicates
+            check.samples = list(self.duplicate_samples)
+        elif isinstance(check, RequiredFieldsCheck):
+            check.rows = self.rows
+            check.empty_counts = {field: self.empty_counts[REQUIRED_FIELDS.index(field)]
+                                  for field in check.fields}
+        elif isinstance(check, NpsnNumericCheck):
+            check.rows = self.rows
+            check.non_numeric = self.non_numeric
+            check.samples = list(self.non_numeric_samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate schools.csv, re-checking only rows changed since the last run'
+    )
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='CSV to validate')
+    parser.add_argument('--state', help='State file (default: under .cache/validation/)')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    args = parser.parse_args()
+
+    report, stats = IncrementalValidator(args.state).run(args.csv)
+    if args.json:
+        print(json.dumps({'errors': report.errors, 'passed': report.passed,
+                          'stats': stats.to_dict()}, indent=2))
+    else:
+        print(f"Rows: {stats.rows}  re-checked: {stats.rechecked} "
+              f"(new {stats.new}, changed {stats.changed})  "
+              f"reused: {stats.reused}  removed: {stats.removed}")
+        for name, error in report.errors.items():
+            print(f"{'✓ PASS' if error is None else '✗ FAIL'} {name}")
+            if error:
+                print(f"    Error: {error}")
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Build-manifest inspector: what will the next incremental build do?
+
+Reads .build-manifest.json (written by scripts/manifest.js) as a stream and
+recomputes ``computeSchoolHash`` for every row of schools.csv, then reports
+the sets the incremental build would act on:
+
+- changed: schools getChangedSchools rebuilds (new NPSN or different hash)
+- unchanged: schools it skips
+- orphaned: manifest paths getOrphanedSchoolPaths deletes because no
+  current school produces them
+
+A manifest that is missing or not version 2 is discarded by loadManifest,
+so every school counts as changed and nothing as orphaned.
+
+With --dist the expected pages are also reconciled against the school
+pages actually present in dist/, flagging what an incremental build will
+never fix on its own:
+
+- unchanged schools whose page is missing (they are skipped, not rebuilt)
+- pages that no current school produces and the manifest does not record
+  (orphan cleanup only deletes manifest paths)
+
+Every comparison is a merge join over lists sorted once, instead of
+dictionaries and sets keyed by 440k NPSNs and paths.
+
+Usage:
+    python3 tests/manifest_inspect.py                     # .build-manifest.json vs data/schools.csv
+    python3 tests/manifest_inspect.py --dist --pages-per-second 250
+    python3 tests/manifest_inspect.py --list changed > changed.txt
+"""
+
+import argparse
+import codecs
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import DEFAULT_SCHOOLS_PATH, ROOT, load_schools  # noqa: E402
+from tests.dist_audit import DEFAULT_DIST_DIR, page_tier  # noqa: E402
+from tests.school_hash import SCHOOL_HASH_FIELDS, record_hash  # noqa: E402
+from tests.site_paths import relative_path  # noqa: E402
+
+# Same name and version as scripts/manifest.js
+MANIFEST_FILE = '.build-manifest.json'
+MANIFEST_VERSION = 2
+DEFAULT_MANIFEST_PATH = os.path.join(ROOT, MANIFEST_FILE)
+READ_CHUNK_SIZE = 1 << 20
+SAMPLE_SIZE = 5
+LISTS = ('changed', 'unchanged', 'orphaned')
+
+
+class JsonStreamError(ValueError):
+    """A JSON document is not an object that can be read member by member."""
+
+
+class ManifestError(JsonStreamError):
+    """The manifest is not a JSON object that can be read entry by entry."""
+
+
+def _utf8_size(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def iter_members(f, container: Optional[str] = None, header: Optional[Dict[str, Any]] = None,
+                 chunk_size: int = READ_CHUNK_SIZE, what: str = 'JSON document',
+                 error: type = JsonStreamError) -> Iterator[Tuple[str, Any, int]]:
+    """Yield (key, value, bytes) for each member of the object in binary file ``f``.
+
+    With ``container`` the members of that top-level member's object are
+    yielded instead, and the other top-level members are stored in
+    ``header``. ``bytes`` is what the member occupies in the file: from the
+    whitespace before its key up to and including its trailing comma (the
+    last member also takes the whitespace before the closing brace), so
+    the members add up to the object minus its braces. Only the current
+    member and one read chunk are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    pos = 0
+    eof = False
+    mark = 0  # where the current member starts in buf
+    spent = 0  # bytes of the current member already dropped from buf
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof, mark, spent
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        spent += _utf8_size(buf[mark:pos])
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = mark = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ''
+
+    def value() -> Any:
+        nonlocal pos
+        while True:
+            if not skip_whitespace():
+                raise error(f"truncated or invalid JSON in {what}")
+            try:
+                result, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise error(f"truncated or invalid JSON in {what}")
+                continue
+            if end == len(buf) and not eof:
+                # A number or literal may continue in the next chunk
+                fill()
+                continue
+            pos = end
+            return result
+
+    def expect(char: str) -> None:
+        nonlocal pos
+        if skip_whitespace() != char:
+            raise error(f"expected {char!r} in {what}")
+        pos += 1
+
+    def members(nested: Optional[str]) -> Iterator[Tuple[str, Any, int]]:
+        nonlocal pos, mark, spent
+        expect('{')
+        mark, spent = pos, 0
+        if skip_whitespace() == '}':
+            pos += 1
+            return
+        while True:
+            key = value()
+            if not isinstance(key, str):
+                raise error(f"object keys in {what} must be strings")
+            expect(':')
+            if nested is None:
+                member = value()
+                separator = skip_whitespace()
+                yield key, member, spent + _utf8_size(buf[mark:pos + (separator == ',')])
+            elif key == nested and skip_whitespace() == '{':
+                yield from members(None)
+                separator = skip_whitespace()
+            else:
+                content = value()
+                if header is not None:
+                    header[key] = content
+                separator = skip_whitespace()
+            pos += 1
+            mark, spent = pos, 0
+            if separator == '}':
+                return
+            if separator != ',':
+                raise error(f"expected ',' or '}}' in {what}")
+
+    yield from members(container)
+    if skip_whitespace():
+        raise error(f"unexpected data after the {what} object")
+
+
+def iter_manifest(f, header: Dict[str, Any],
+                  chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Yield (npsn, entry) from the ``schools`` object of binary file ``f``.
+
+    The other top-level members (version, lastBuild) are stored in ``header``.
+    """
+    for npsn, entry, _ in iter_members(f, 'schools', header, chunk_size, 'manifest',
+                                       ManifestError):
+        yield npsn, entry
+
+
+def merge_join(left: List[Tuple],
+               right: List[Tuple]) -> Iterator[Tuple[Optional[Tuple], Optional[Tuple]]]:
+    """Full outer join of two lists sorted on their first item.
+
+    Yields (left row, right row) with None for the side that has no match.
+    ``right`` keys must be unique; repeated ``left`` keys each meet the
+    same right row.
+    """
+    i = j = 0
+    while i < len(left) or j < len(right):
+        if j == len(right) or (i < len(left) and left[i][0] < right[j][0]):
+            yield left[i], None
+            i += 1
+        elif i == len(left) or right[j][0] < left[i][0]:
+            yield None, right[j]
+            j += 1
+        else:
+            key = left[i][0]
+            while i < len(left) and left[i][0] == key:
+                yield left[i], right[j]
+                i += 1
+            j += 1
+
+
+def read_manifest(path: str) -> Tuple[List[Tuple[str, str, str]], Dict[str, Any]]:
+    """(sorted [(npsn, hash, path)], header) from a manifest file.
+
+    Like JSON.parse, a repeated NPSN key keeps its last entry.
+    """
+    header: Dict[str, Any] = {}
+    entries = []
+    with open(path, 'rb') as f:
+        for npsn, entry in iter_manifest(f, header):
+            if not isinstance(entry, dict):
+                entry = {}
+            entries.append((npsn, entry.get('hash') or '', entry.get('path') or ''))
+    entries.reverse()
+    entries.sort(key=lambda entry: entry[0])  # stable: last occurrence first
+    unique = [entry for index, entry in enumerate(entries)
+              if index == 0 or entry[0] != entries[index - 1][0]]
+    return unique, header
+
+
+def current_schools(csv_path: str) -> List[Tuple[str, str, Optional[str]]]:
+    """[(npsn, computeSchoolHash, page path or None)] for every CSV row, in file order."""
+    dataset = load_schools(csv_path)
+    index = {name: position for position, name in enumerate(dataset.fieldnames)}
+    # Missing columns read the '' appended to every record, like parseCsv's fill
+    columns = itemgetter(*(index.get(field, -1) for field in SCHOOL_HASH_FIELDS))
+    rows = []
+    for record in dataset.records:
+        # parseCsv trims every value
+        values = [value.strip() for value in columns(record + ('',))]
+        npsn, nama, kecamatan, kab_kota, provinsi = (values[0], values[1], values[5],
+                                                      values[6], values[7])
+        path = (relative_path(provinsi, kab_kota, kecamatan, npsn, nama)
+                if npsn and nama and kecamatan and kab_kota and provinsi else None)
+        rows.append((npsn, record_hash(values), path))
+    return rows
+
+
+def school_pages(dist_dir: str) -> List[str]:
+    """Sorted school page paths (relative to dist/) present on disk."""
+    pages = []
+    stack = ['provinsi']
+    while stack:
+        relative = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(dist_dir, relative))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                path = f"{relative}/{entry.name}"
+                if entry.is_dir():
+                    stack.append(path)
+                elif page_tier(path) == 'school':
+                    pages.append(path)
+    pages.sort()
+    return pages
+
+
+class ManifestReport:
+    """Incremental-build sets and dist/ reconciliation problems."""
+
+    def __init__(self):
+        self.manifest_status = 'missing'
+        self.manifest_entries = 0
+        self.last_build: Optional[str] = None
+        self.schools = 0
+        self.seconds = 0.0
+        self.lists: Dict[str, List[str]] = {name: [] for name in LISTS}
+        self.new = 0
+        self.unpathable = 0
+        self.pages_checked: Optional[int] = None
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, problem: str, sample: str) -> None:
+        self.counts[problem] += 1
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(sample)
+
+    @property
+    def passed(self) -> bool:
+        return not self.counts
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{count} {problem.replace('_', ' ')}. Sample: {self.samples[problem]}"
+                for problem, count in sorted(self.counts.items())]
+
+    def estimate_seconds(self, pages_per_second: Optional[float]) -> Optional[float]:
+        """Time to write the changed pages at a throughput seen in earlier builds."""
+        if not pages_per_second:
+            return None
+        return len(self.lists['changed']) / pages_per_second
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'manifest': self.manifest_status,
+            'manifest_entries': self.manifest_entries,
+            'last_build': self.last_build,
+            'schools': self.schools,
+            'changed': len(self.lists['changed']),
+            'new': self.new,
+            'unchanged': len(self.lists['unchanged']),
+            'orphaned': len(self.lists['orphaned']),
+            'unpathable': self.unpathable,
+            'pages_checked': self.pages_checked,
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'problems': dict(self.counts),
+            'errors': self.errors,
+        }
+
+
+def reconcile_dist(report: ManifestReport, dist_dir: str,
+                   expected: List[Tuple[str, bool]], recorded: Iterable[str]) -> None:
+    """Compare expected pages [(path, changed)] and manifest paths with dist/."""
+    pages = [(page,) for page in school_pages(dist_dir)]
+    report.pages_checked = len(pages)
+    stray = []
+    for want, have in merge_join(expected, pages):
+        if want is None:
+            stray.append(have)
+        elif have is None and not want[1]:
+            report.add('unchanged_pages_missing', want[0])
+    recorded_paths = sorted({(path,) for path in recorded})
+    for page, entry in merge_join(stray, recorded_paths):
+        if page is not None and entry is None:
+            report.add('untracked_pages', page[0])
+
+
+def inspect_manifest(manifest_path: str, csv_path: str,
+                     dist_dir: Optional[str] = None) -> ManifestReport:
+    """Predict the next incremental build from the manifest and schools.csv."""
+    start = time.perf_counter()
+    report = ManifestReport()
+    entries: List[Tuple[str, str, str]] = []
+    if os.path.exists(manifest_path):
+        entries, header = read_manifest(manifest_path)
+        report.manifest_entries = len(entries)
+        report.last_build = header.get('lastBuild')
+        if header.get('version') == MANIFEST_VERSION:
+            report.manifest_status = 'ok'
+        else:
+            # loadManifest discards it and the build starts fresh
+            report.manifest_status = f"version {header.get('version')} discarded"
+            entries = []
+
+    schools = current_schools(csv_path)
+    report.schools = len(schools)
+    # Keep CSV order for each NPSN so repeated rows list in file order
+    schools.sort(key=lambda school: school[0])
+    expected: List[Tuple[str, bool]] = []
+    manifest_rows = [(npsn, digest) for npsn, digest, _ in entries]
+    for school, entry in merge_join(schools, manifest_rows):
+        if school is None:
+            continue
+        npsn, digest, path = school
+        # getChangedSchools treats an empty manifest slot as a new school
+        changed = entry is None or not entry[1] or entry[1] != digest
+        if entry is None:
+            report.new += 1
+        report.lists['changed' if changed else 'unchanged'].append(npsn)
+        if path is None:
+            report.unpathable += 1
+        else:
+            expected.append((path, changed))
+
+    # getOrphanedSchoolPaths: recorded paths that no current school produces
+    expected.sort()
+    recorded = sorted((path, npsn) for npsn, _, path in entries if path)
+    current = [(path,) for path, _ in expected]
+    for entry, match in merge_join(recorded, _unique(current)):
+        if entry is not None and match is None:
+            report.lists['orphaned'].append(entry[0])
+
+    if dist_dir is not None:
+        reconcile_dist(report, dist_dir, _unique(expected), (path for path, _ in recorded))
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _unique(rows: List[Tuple]) -> List[Tuple]:
+    """Drop rows repeating the previous key (input sorted on the first item).
+
+    Two schools can map to one page; the row that rebuilds it wins.
+    """
+    unique: List[Tuple] = []
+    for row in rows:
+        if unique and unique[-1][0] == row[0]:
+            if len(row) > 1 and row[1]:
+                unique[-1] = row
+            continue
+        unique.append(row)
+    return unique
+
+
+def print_report(report: ManifestReport, pages_per_second: Optional[float]) -> None:
+    print(f"Manifest: {report.manifest_status} ({report.manifest_entries} entries, "
+          f"last build {report.last_build or 'unknown'})")
+    print(f"Schools: {report.schools} in {report.seconds:.2f}s")
+    print(f"  changed    {len(report.lists['changed']):>8}  ({report.new} new)")
+    print(f"  unchanged  {len(report.lists['unchanged']):>8}")
+    print(f"  orphaned   {len(report.lists['orphaned']):>8}")
+    if report.unpathable:
+        print(f"  {report.unpathable} rows lack path fields (getSchoolRelativePath throws)")
+    estimate = report.estimate_seconds(pages_per_second)
+    if estimate is not None:
+        print(f"  estimated page writing: {estimate / 60:.1f} min at {pages_per_second:g} pages/s")
+    if report.pages_checked is not None:
+        print(f"dist/: {report.pages_checked} school pages")
+    if report.passed:
+        print("  ✓ dist/ is consistent with the manifest" if report.pages_checked is not None
+              else "  ✓ Manifest read")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predict the next incremental build')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH, help='Build manifest path')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='Current schools.csv')
+    parser.add_argument('--dist', nargs='?', const=DEFAULT_DIST_DIR,
+                        help='Also reconcile against the pages in dist/ (or the given directory)')
+    parser.add_argument('--pages-per-second', type=float,
+                        help='Page-writing throughput of earlier builds, for a time estimate')
+    parser.add_argument('--list', choices=LISTS,
+                        help='Print one set in full (NPSNs or paths), one per line')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    if not os.path.exists(args.csv):
+        print(f"schools.csv not found: {args.csv}", file=sys.stderr)
+        sys.exit(2)
+    if args.dist and not os.path.isdir(args.dist):
+        print(f"dist directory not found: {args.dist} (run the build first)", file=sys.stderr)
+        sys.exit(2)
+    try:
+        report = inspect_manifest(args.manifest, args.csv, args.dist)
+    except ManifestError as e:
+        print(f"{args.manifest}: {e}", file=sys.stderr)
+        sys.exit(2)
+    if args.list:
+        print('\n'.join(report.lists[args.list]))
+    elif args.json:
+        data = report.to_dict()
+        data['estimated_seconds'] = report.estimate_seconds(args.pages_per_second)
+        print(json.dumps(data, indent=2))
+    else:
+        print_report(report, args.pages_per_second)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
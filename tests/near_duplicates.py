@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate school detector for data/schools.csv.
+
+The NPSN checks only catch exact repeats; this finds the same school
+listed twice under different NPSNs with a slightly different name, e.g.
+"SD Negeri 4 Sukamaju" and "SDN 04 SUKAMAJU" a few metres apart.
+
+Candidates never cross a block of (provinsi, kab_kota, kecamatan,
+bentuk_pendidikan); kecamatan names repeat across the country, so the
+region is keyed as PageBuilder.groupSchoolsByKecamatan keys it. Inside a block only names with the same school numbers ("4" and "04"
+match, "4" and "5" do not) are compared. Names are normalised to their
+distinguishing words (case, punctuation, the bentuk and negeri/swasta
+prefixes, and "SDN"-style abbreviations dropped) and cut into character
+3-gram shingles. Schools are then bucketed into coordinate cells of
+``max_km`` and only pairs in neighbouring cells are compared; a school
+without coordinates meets every name in its group. Groups of more than
+``PAIRWISE_LIMIT`` names first go through MinHash LSH (``NUM_HASHES``
+min-hashes in ``BANDS`` bands), so only names sharing a band bucket are
+paired at all. Total work is linear in the number of rows for a bounded
+block size.
+
+A candidate is reported when the shingle Jaccard similarity reaches the
+threshold and the two schools are within ``max_km`` of each other (or
+either has no coordinates; zero means unset, as in the ETL).
+
+Usage:
+    python3 tests/near_duplicates.py                 # data/schools.csv
+    python3 tests/near_duplicates.py --threshold 0.8 --max-km 0.5 --json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+import zlib
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import DEFAULT_SCHOOLS_PATH, load_schools  # noqa: E402
+from tests.schema_validator import load_schema  # noqa: E402
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_MAX_KM = 1.0
+PAIRWISE_LIMIT = 32
+SMALL_SET = 16
+NUM_HASHES = 32
+BANDS = 8
+SHINGLE = 3
+SAMPLE_SIZE = 5
+# Kilometres per degree of longitude at Indonesia's widest latitude (11 S);
+# a degree of latitude is longer, so cells of max_km / KM_PER_DEGREE
+# degrees keep every pair within max_km in neighbouring cells.
+KM_PER_DEGREE = 109.0
+EARTH_RADIUS_KM = 6371.0
+
+_BENTUK = tuple(value.lower() for value in load_schema().allowed_values['bentuk_pendidikan'])
+_STOP_WORDS = frozenset(_BENTUK + ('negeri', 'swasta', 'n', 's'))
+_ABBREVIATION = re.compile(rf"^(?:{'|'.join(_BENTUK)})[ns]$")
+_WORD = re.compile(r'[a-z0-9]+')
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20260720)
+_HASH_PARAMS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_HASHES)]
+
+
+def normalize_name(nama: str) -> Tuple[str, Tuple[int, ...]]:
+    """Return (distinguishing words, school numbers) of a school name."""
+    words = []
+    numbers = []
+    for word in _WORD.findall(nama.lower()):
+        if word.isdigit():
+            numbers.append(int(word))
+            words.append(str(int(word)))
+        elif word not in _STOP_WORDS and not _ABBREVIATION.match(word):
+            words.append(word)
+    return ' '.join(words), tuple(numbers)
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Character 3-grams of ``text`` padded with spaces."""
+    padded = f" {text} "
+    return frozenset(padded[i:i + SHINGLE] for i in range(len(padded) - SHINGLE + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    common = len(a & b)
+    return common / (len(a) + len(b) - common) if common else 0.0
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def parse_coordinate(value: str) -> Optional[float]:
+    """A lat/lon cell as a float; None when it is unparsable, 0 or not finite."""
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if number and math.isfinite(number) else None
+
+
+class MinHasher:
+    """MinHash signatures over shingles, memoising each shingle's hashes."""
+
+    def __init__(self):
+        self._hashes: Dict[str, Tuple[int, ...]] = {}
+
+    def _shingle_hashes(self, shingle: str) -> Tuple[int, ...]:
+        hashes = self._hashes.get(shingle)
+        if hashes is None:
+            base = zlib.crc32(shingle.encode('utf-8'))
+            hashes = self._hashes[shingle] = tuple((a * base + b) % _PRIME
+                                                   for a, b in _HASH_PARAMS)
+        return hashes
+
+    def signature(self, grams: FrozenSet[str]) -> Tuple[int, ...]:
+        return tuple(map(min, zip(*map(self._shingle_hashes, grams))))
+
+
+class NearDuplicateReport:
+    """Pairs of different NPSNs that look like one school."""
+
+    def __init__(self):
+        self.rows = 0
+        self.blocks = 0
+        self.groups = Counter()  # 'pairwise' / 'lsh' groups of two or more names
+        self.comparisons = 0
+        self.seconds = 0.0
+        self.pairs: List[Dict[str, Any]] = []
+
+    @property
+    def passed(self) -> bool:
+        return not self.pairs
+
+    @property
+    def errors(self) -> List[str]:
+        if not self.pairs:
+            return []
+        sample = [f"{pair['npsn'][0]}~{pair['npsn'][1]}" for pair in self.pairs[:SAMPLE_SIZE]]
+        return [f"{len(self.pairs)} near-duplicate pairs. Sample: {sample}"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'blocks': self.blocks,
+            'groups': dict(self.groups),
+            'comparisons': self.comparisons,
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'pairs': self.pairs,
+            'errors': self.errors,
+        }
+
+
+class _School:
+    __slots__ = ('row', 'npsn', 'nama', 'region', 'grams', 'point')
+
+    def __init__(self, row: int, npsn: str, nama: str, region: Tuple[str, str, str],
+                 grams: FrozenSet[str], point: Optional[Tuple[float, float]]):
+        self.row = row
+        self.npsn = npsn
+        self.nama = nama
+        self.region = region  # (provinsi, kab_kota, kecamatan)
+        self.grams = grams
+        self.point = point
+
+
+def _nearby_pairs(schools: Sequence[_School], cell_size: float,
+                  pairs: Dict[Tuple[int, int], Tuple[_School, _School]]) -> None:
+    """Add pairs of ``schools`` in neighbouring coordinate cells to ``pairs``.
+
+    A school without coordinates cannot be ruled out by distance, so it is
+    paired with every other school in ``schools``. Small sets skip the
+    cells: comparing each pair's degree offsets is cheaper than nine cell
+    lookups per school.
+    """
+    if len(schools) <= SMALL_SET:
+        for i, a in enumerate(schools):
+            for b in schools[i + 1:]:
+                if (a.point is None or b.point is None
+                        or abs(a.point[0] - b.point[0]) <= cell_size
+                        and abs(a.point[1] - b.point[1]) <= cell_size):
+                    first, second = (a, b) if a.row < b.row else (b, a)
+                    pairs[first.row, second.row] = (first, second)
+        return
+    cells: Dict[Tuple[int, int], List[_School]] = defaultdict(list)
+    unlocated = []
+    for school in schools:
+        point = school.point
+        if point is None:
+            unlocated.append(school)
+        else:
+            cells[int(point[0] // cell_size), int(point[1] // cell_size)].append(school)
+    for (y, x), members in cells.items():
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                for b in cells.get((y + dy, x + dx), ()):
+                    for a in members:
+                        if a.row < b.row:
+                            pairs[a.row, b.row] = (a, b)
+    for a in unlocated:
+        for b in schools:
+            if a is not b:
+                first, second = (a, b) if a.row < b.row else (b, a)
+                pairs[first.row, second.row] = (first, second)
+
+
+def _candidate_pairs(group: Sequence[_School], hasher: Optional[MinHasher],
+                     cell_size: float) -> List[Tuple[_School, _School]]:
+    """Nearby pairs of ``group``; with ``hasher``, only those sharing an LSH band bucket."""
+    pairs: Dict[Tuple[int, int], Tuple[_School, _School]] = {}
+    if hasher is None:
+        _nearby_pairs(group, cell_size, pairs)
+        return list(pairs.values())
+    rows = NUM_HASHES // BANDS
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[_School]] = defaultdict(list)
+    for school in group:
+        signature = hasher.signature(school.grams)
+        for band in range(BANDS):
+            buckets[band, signature[band * rows:(band + 1) * rows]].append(school)
+    for bucket in buckets.values():
+        if len(bucket) > 1:
+            _nearby_pairs(bucket, cell_size, pairs)
+    return list(pairs.values())
+
+
+def find_near_duplicates(csv_path: str, threshold: float = DEFAULT_THRESHOLD,
+                         max_km: float = DEFAULT_MAX_KM) -> NearDuplicateReport:
+    """Report pairs of schools in one block that look like the same school."""
+    start = time.perf_counter()
+    report = NearDuplicateReport()
+    dataset = load_schools(csv_path)
+    index = {name: position for position, name in enumerate(dataset.fieldnames)}
+    positions = [index.get(name, -1) for name in ('npsn', 'nama', 'provinsi', 'kab_kota',
+                                                   'kecamatan', 'bentuk_pendidikan',
+                                                   'lat', 'lon')]
+
+    records = dataset.records
+    if -1 in positions:
+        records = [record + ('',) for record in records]  # a missing column reads ''
+    fields = itemgetter(*positions)
+
+    # Most groups hold a single school, so the first pass keeps row numbers only
+    groups: Dict[Tuple[str, str, str, str, Tuple[int, ...]], List[int]] = defaultdict(list)
+    blocks = set()
+    normalized: Dict[str, Tuple[FrozenSet[str], Tuple[int, ...]]] = {}
+    for row, record in enumerate(records):
+        npsn, nama, provinsi, kab_kota, kecamatan, bentuk, _, _ = fields(record)
+        nama = nama.strip()
+        region = (provinsi.strip(), kab_kota.strip(), kecamatan.strip())
+        if not (nama and all(region) and npsn.strip()):
+            continue
+        name = normalized.get(nama)
+        if name is None:
+            text, numbers = normalize_name(nama)
+            name = normalized[nama] = (shingles(text) if text else frozenset(), numbers)
+        if not name[0]:
+            continue
+        block = tuple(part.lower() for part in region) + (bentuk.strip().upper(),)
+        blocks.add(block)
+        groups[block + (name[1],)].append(row)
+
+    hasher = MinHasher()
+    cell_size = max_km / KM_PER_DEGREE
+    for (_, _, _, bentuk, _), rows in groups.items():
+        if len(rows) < 2:
+            continue
+        group = []
+        for row in rows:
+            npsn, nama, provinsi, kab_kota, kecamatan, _, lat, lon = (
+                value.strip() for value in fields(records[row]))
+            latitude, longitude = parse_coordinate(lat), parse_coordinate(lon)
+            point = None if latitude is None or longitude is None else (latitude, longitude)
+            group.append(_School(row, npsn, nama, (provinsi, kab_kota, kecamatan),
+                                 normalized[nama][0], point))
+        lsh = len(group) > PAIRWISE_LIMIT
+        report.groups['lsh' if lsh else 'pairwise'] += 1
+        candidates = _candidate_pairs(group, hasher if lsh else None, cell_size)
+        report.comparisons += len(candidates)
+        for a, b in candidates:
+            if a.npsn == b.npsn:
+                continue  # an exact repeat, reported by the NPSN uniqueness check
+            similarity = jaccard(a.grams, b.grams)
+            if similarity < threshold:
+                continue
+            distance = None
+            if a.point is not None and b.point is not None:
+                distance = haversine_km(a.point, b.point)
+                if distance > max_km:
+                    continue
+            report.pairs.append({
+                'npsn': [a.npsn, b.npsn],
+                'nama': [a.nama, b.nama],
+                'rows': [a.row + 2, b.row + 2],
+                # Blocks ignore case, so the pair is labelled with a's spelling
+                'provinsi': a.region[0],
+                'kab_kota': a.region[1],
+                'kecamatan': a.region[2],
+                'bentuk_pendidikan': bentuk,
+                'similarity': round(similarity, 3),
+                'distance_km': None if distance is None else round(distance, 3),
+            })
+
+    report.pairs.sort(key=lambda pair: pair['rows'])
+    report.rows = len(records)
+    report.blocks = len(blocks)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: NearDuplicateReport, csv_path: str) -> None:
+    groups = ', '.join(f"{count} {kind}" for kind, count in sorted(report.groups.items()))
+    print(f"{csv_path}: {report.rows} rows in {report.blocks} blocks "
+          f"({groups or 'no'} groups), {report.comparisons} comparisons "
+          f"in {report.seconds:.2f}s")
+    for pair in report.pairs:
+        distance = ('no coordinates' if pair['distance_km'] is None
+                    else f"{pair['distance_km'] * 1000:.0f} m")
+        print(f"  {pair['npsn'][0]} {pair['nama'][0]!r} ~ {pair['npsn'][1]} "
+              f"{pair['nama'][1]!r} ({pair['kecamatan']}, {pair['kab_kota']}, "
+              f"{pair['provinsi']}, {pair['bentuk_pendidikan']}; "
+              f"similarity {pair['similarity']:.2f}, {distance})")
+    if report.passed:
+        print("  ✓ No near-duplicate schools")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find schools listed twice under different NPSNs'
+    )
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='schools.csv to check')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum name similarity, 0-1 (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--max-km', type=float, default=DEFAULT_MAX_KM,
+                        help=f'Maximum distance between the two schools '
+                             f'(default {DEFAULT_MAX_KM} km)')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    if not os.path.exists(args.csv):
+        print(f"schools.csv not found: {args.csv}", file=sys.stderr)
+        sys.exit(2)
+    report = find_near_duplicates(args.csv, args.threshold, args.max_km)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.csv)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Compact NPSN membership set for national-scale uniqueness checks.
+
+NPSN is an 8-digit numeric identifier, so every canonical NPSN maps to one
+bit in a 10^8-bit bitmap (12.5 MB, allocated once). Membership tests and
+inserts cost a shift and a mask, and memory does not grow with the number
+of rows. Anything that is not exactly 8 ASCII digits (non-numeric values,
+short or long numbers) lives in a small side set of strings, so values
+like '01234567' and '1234567' stay distinct.
+
+Usage:
+    from tests.npsn_index import NpsnSet
+
+    seen = NpsnSet()
+    seen.add('12345678')   # True: newly added
+    seen.add('12345678')   # False: already present
+
+Sets built over separate parts of a file combine with ``merge``, which
+also reports the values the parts have in common (cross-part duplicates).
+A set pickles as its sorted keys rather than the bitmap, so a worker
+process sends back a few hundred KB instead of 12.5 MB.
+"""
+
+import sys
+from array import array
+from itertools import compress
+from typing import List, Optional, Set, Tuple
+
+NPSN_DIGITS = 8
+KEYSPACE = 10 ** NPSN_DIGITS
+
+
+def npsn_key(npsn: str) -> Optional[int]:
+    """Return the bitmap key for a canonical 8-digit NPSN, else None."""
+    if len(npsn) == NPSN_DIGITS and npsn.isascii() and npsn.isdigit():
+        return int(npsn)
+    return None
+
+
+class NpsnSet:
+    """Set of NPSN strings backed by a fixed-size bitmap plus a side set."""
+
+    def __init__(self):
+        self._bits: Optional[bytearray] = None  # allocated on first numeric add
+        self._count = 0
+        self.side: Set[str] = set()
+        self._pending: Optional[array] = None  # keys of an unpickled set, until first use
+
+    def add(self, npsn: str) -> bool:
+        """Insert ``npsn``; return False when it was already present."""
+        key = npsn_key(npsn)
+        if key is None:
+            if npsn in self.side:
+                return False
+            self.side.add(npsn)
+            return True
+        if self._bits is None:
+            self._allocate()
+        index = key >> 3
+        mask = 1 << (key & 7)
+        if self._bits[index] & mask:
+            return False
+        self._bits[index] |= mask
+        self._count += 1
+        return True
+
+    def __contains__(self, npsn: str) -> bool:
+        key = npsn_key(npsn)
+        if key is None:
+            return npsn in self.side
+        if self._pending is not None:
+            self._allocate()
+        return self._bits is not None and bool(self._bits[key >> 3] & (1 << (key & 7)))
+
+    def __len__(self) -> int:
+        return self._count + len(self.side)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the bitmap (the side set is reported separately)."""
+        return len(self._bits) if self._bits is not None else 0
+
+    def _allocate(self) -> None:
+        self._bits = bytearray(KEYSPACE // 8)
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            bits = self._bits
+            for key in pending:
+                bits[key >> 3] |= 1 << (key & 7)
+
+    def keys(self) -> array:
+        """Sorted bitmap keys (canonical NPSNs as ints) as an ``array('L')``."""
+        if self._pending is not None:
+            return self._pending
+        keys = array('L')
+        if self._bits is None:
+            return keys
+        words = array('Q', self._bits)
+        if sys.byteorder == 'big':
+            words.byteswap()
+        # compress() finds the non-zero words at C speed; only those are walked
+        for index in compress(range(len(words)), words):
+            word = words[index]
+            base = index * 64
+            while word:
+                low = word & -word
+                keys.append(base + low.bit_length() - 1)
+                word ^= low
+        return keys
+
+    def merge(self, other: 'NpsnSet', sample_size: int = 0) -> Tuple[int, List[str]]:
+        """Add every value of ``other``; return (values already present, a sample of them).
+
+        Costs one step per value of ``other``, so folding per-chunk sets
+        into one stays linear in the total number of rows.
+        """
+        shared = sorted(self.side & other.side)
+        self.side |= other.side
+        count = len(shared)
+        sample = shared[:sample_size]
+        keys = other.keys()
+        if not keys:
+            return count, sample
+        if self._bits is None and self._pending is None and not self._count:
+            self._pending = array('L', keys)
+            self._count = len(keys)
+            return count, sample
+        if self._bits is None:
+            self._allocate()
+        bits = self._bits
+        for key in keys:
+            index = key >> 3
+            mask = 1 << (key & 7)
+            if bits[index] & mask:
+                count += 1
+                if len(sample) < sample_size:
+                    sample.append(f"{key:0{NPSN_DIGITS}d}")
+            else:
+                bits[index] |= mask
+                self._count += 1
+        return count, sample
+
+    def __getstate__(self):
+        return {'keys': self.keys(), 'side': self.side}
+
+    def __setstate__(self, state):
+        self._bits = None
+        self._pending = state['keys']
+        self._count = len(self._pending)
+        self.side = state['side']
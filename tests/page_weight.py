@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Page-weight and compression analyzer for the generated HTML in dist/.
+
+Every page is served on its own, so markup the templates repeat on every
+page (the shared head from head-meta.js, inline <style> and <script>
+blocks, <nav> and <footer>) is paid for once per page. For every page
+the analyzer measures:
+
+- raw bytes, gzip bytes (level 6, what most CDNs apply on the fly) and
+  zlib at level 9, a stand-in for brotli's max-level ratio
+- the bytes in repeated blocks, by kind (head, css, script, nav, footer),
+  and the unique bytes left over
+- the zlib level-9 size once the repeated <style> and <script> blocks are
+  moved to cached external files, the projected saving per page
+
+Pages are grouped by the tiers of tests/dist_audit.py. A block is repeated
+when its exact bytes occur on at least ``min_pages`` pages of an evenly
+spread sample of every tier; head tags count one line at a time, since
+title, description and canonical lines differ per page. A block shared
+only by a few pages that the sample misses is counted as unique.
+
+dist/ is walked once, the sample picks the repeated blocks, and the pages
+are then weighed in batches on a process pool. A tier fails when more of
+its raw bytes than ``max_repeated_share`` are repeated blocks.
+
+Usage:
+    python3 tests/page_weight.py                       # analyze dist/ on all cores
+    python3 tests/page_weight.py --dist build --jobs 8 --top 20 --json
+    python3 tests/page_weight.py --sample 500 --max-repeated-share 0.4
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dist_audit import (  # noqa: E402
+    BATCH_SIZE,
+    DEFAULT_DIST_DIR,
+    PAGE_TIERS,
+    page_tier,
+    walk_dist,
+)
+
+DEFAULT_SAMPLE = 200
+DEFAULT_MIN_PAGES = 2
+DEFAULT_MAX_REPEATED_SHARE = 0.5
+DEFAULT_TOP = 10
+GZIP_LEVEL = 6
+SAMPLE_SIZE = 5
+
+BLOCK_KINDS = ('head', 'css', 'script', 'nav', 'footer')
+# Repeated blocks that can move to a cached file (styles.css, a shared .js)
+EXTERNAL_KINDS = ('css', 'script')
+
+_BLOCK = re.compile(rb'<(style|script|nav|footer)\b[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+_KINDS = {b'style': 'css', b'script': 'script', b'nav': 'nav', b'footer': 'footer'}
+_HEAD_END = b'</head>'
+
+Block = Tuple[str, int, int]
+
+
+def page_blocks(data: bytes) -> List[Block]:
+    """(kind, start, end) of the template blocks in a page, in page order.
+
+    Inline <style>, <script>, <nav> and <footer> elements are whole
+    blocks; the rest of the head up to </head> is split into lines.
+    """
+    head_end = data.find(_HEAD_END)
+    head_end = 0 if head_end < 0 else head_end + len(_HEAD_END)
+    blocks: List[Block] = []
+    position = 0
+    for match in _BLOCK.finditer(data):
+        blocks.extend(_head_lines(data, position, min(match.start(), head_end)))
+        blocks.append((_KINDS[match.group(1).lower()], match.start(), match.end()))
+        position = match.end()
+    blocks.extend(_head_lines(data, position, head_end))
+    return blocks
+
+
+def _head_lines(data: bytes, start: int, end: int) -> List[Block]:
+    lines = []
+    while start < end:
+        newline = data.find(b'\n', start, end)
+        stop = end if newline < 0 else newline + 1
+        lines.append(('head', start, stop))
+        start = stop
+    return lines
+
+
+def block_digest(data: bytes, start: int, end: int) -> bytes:
+    return hashlib.blake2b(memoryview(data)[start:end], digest_size=8).digest()
+
+
+def gzip_size(data: bytes) -> int:
+    """Size of ``data`` as a gzip stream (header and trailer included)."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return len(compressor.compress(data)) + len(compressor.flush())
+
+
+def _read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def sample_pages(pages: List[str], per_tier: int) -> List[str]:
+    """Up to ``per_tier`` pages of every tier, spread evenly over the sorted list."""
+    by_tier: Dict[str, List[str]] = defaultdict(list)
+    for page in pages:
+        by_tier[page_tier(page)].append(page)
+    sample = []
+    for tier_pages in by_tier.values():
+        count = min(per_tier, len(tier_pages))
+        sample.extend(tier_pages[i * len(tier_pages) // count] for i in range(count))
+    return sorted(sample)
+
+
+def find_repeated(dist_dir: str, pages: List[str],
+                  min_pages: int = DEFAULT_MIN_PAGES) -> Dict[bytes, Dict[str, Any]]:
+    """Blocks of ``pages`` whose exact bytes occur on at least ``min_pages`` of them.
+
+    Returns {digest: {kind, bytes, page, preview}} with the first page
+    holding the block.
+    """
+    seen: Counter = Counter()
+    first: Dict[bytes, Dict[str, Any]] = {}
+    for page in pages:
+        try:
+            data = _read(os.path.join(dist_dir, page))
+        except OSError:
+            continue  # weigh_batch reports it
+        digests = set()
+        for kind, start, end in page_blocks(data):
+            digest = block_digest(data, start, end)
+            digests.add(digest)
+            if digest not in first:
+                preview = data[start:min(end, start + 60)].decode('utf-8', 'replace').strip()
+                first[digest] = {'kind': kind, 'bytes': end - start, 'page': page,
+                                 'preview': ' '.join(preview.split())}
+        seen.update(digests)
+    return {digest: first[digest] for digest, count in seen.items() if count >= min_pages}
+
+
+# Set per worker process by _init_worker (inherited, not pickled, under fork)
+_dist_dir = ''
+_repeated: Dict[bytes, str] = {}
+_top = DEFAULT_TOP
+
+
+def _init_worker(dist_dir: str, repeated: Dict[bytes, str], top: int) -> None:
+    global _dist_dir, _repeated, _top
+    _dist_dir, _repeated, _top = dist_dir, repeated, top
+
+
+def weigh_page(data: bytes, tiers: Counter, block_pages: Counter, block_bytes: Counter) -> int:
+    """Add the weights of one page to ``tiers``; returns its zlib level-9 size."""
+    external = []
+    digests: Set[bytes] = set()
+    for kind, start, end in page_blocks(data):
+        digest = block_digest(data, start, end)
+        if digest not in _repeated:
+            continue
+        tiers[kind] += end - start
+        block_bytes[digest] += end - start
+        digests.add(digest)
+        if kind in EXTERNAL_KINDS:
+            external.append((start, end))
+    block_pages.update(digests)
+
+    zlib_max = len(zlib.compress(data, 9))
+    if external:
+        kept, position = [], 0
+        for start, end in external:
+            kept.append(data[position:start])
+            position = end
+        kept.append(data[position:])
+        stripped = b''.join(kept)
+        tiers['external_raw'] += len(data) - len(stripped)
+        tiers['external_zlib_max'] += zlib_max - len(zlib.compress(stripped, 9))
+    tiers['pages'] += 1
+    tiers['raw'] += len(data)
+    tiers['gzip'] += gzip_size(data)
+    tiers['zlib_max'] += zlib_max
+    return zlib_max
+
+
+def weigh_batch(pages: List[str]) -> Tuple[Dict[str, Counter], Counter, Counter,
+                                           List[Tuple[int, str, int]], List[Tuple[str, str]]]:
+    """Weigh a batch of pages.
+
+    Returns ({tier: weights}, pages per repeated block, bytes per repeated
+    block, the ``_top`` heaviest pages as (zlib_max, page, raw), unreadable pages).
+    """
+    tiers: Dict[str, Counter] = defaultdict(Counter)
+    block_pages: Counter = Counter()
+    block_bytes: Counter = Counter()
+    heaviest: List[Tuple[int, str, int]] = []
+    unreadable: List[Tuple[str, str]] = []
+    for page in pages:
+        try:
+            data = _read(os.path.join(_dist_dir, page))
+        except OSError as e:
+            unreadable.append((page, str(e)))
+            continue
+        zlib_max = weigh_page(data, tiers[page_tier(page)], block_pages, block_bytes)
+        entry = (zlib_max, page, len(data))
+        if len(heaviest) < _top:
+            heapq.heappush(heaviest, entry)
+        elif _top:
+            heapq.heappushpop(heaviest, entry)
+    return dict(tiers), block_pages, block_bytes, heaviest, unreadable
+
+
+class WeightReport:
+    """Per-tier weights, repeated blocks and projected savings of one analysis."""
+
+    def __init__(self, max_repeated_share: float = DEFAULT_MAX_REPEATED_SHARE):
+        self.max_repeated_share = max_repeated_share
+        self.pages = 0
+        self.sampled = 0
+        self.seconds = 0.0
+        self.jobs = 1
+        self.tiers: Dict[str, Counter] = defaultdict(Counter)
+        self.blocks: List[Dict[str, Any]] = []
+        self.heaviest: List[Dict[str, Any]] = []
+        self.unreadable: List[str] = []
+
+    def repeated(self, tier: str) -> int:
+        return sum(self.tiers[tier][kind] for kind in BLOCK_KINDS)
+
+    def repeated_share(self, tier: str) -> float:
+        raw = self.tiers[tier]['raw']
+        return self.repeated(tier) / raw if raw else 0.0
+
+    @property
+    def totals(self) -> Counter:
+        totals: Counter = Counter()
+        for weights in self.tiers.values():
+            totals.update(weights)
+        return totals
+
+    @property
+    def over_limit(self) -> List[str]:
+        return [tier for tier in self.tiers
+                if self.repeated_share(tier) > self.max_repeated_share]
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    @property
+    def passed(self) -> bool:
+        return not self.over_limit and not self.unreadable
+
+    @property
+    def errors(self) -> List[str]:
+        errors = []
+        if self.over_limit:
+            sample = [f"{tier}: {self.repeated_share(tier):.0%} repeated"
+                      for tier in self.over_limit[:SAMPLE_SIZE]]
+            errors.append(f"{len(self.over_limit)} tiers over the repeated-bytes limit "
+                          f"({self.max_repeated_share:.0%}). Sample: {sample}")
+        if self.unreadable:
+            errors.append(f"{len(self.unreadable)} unreadable pages. "
+                          f"Sample: {self.unreadable[:SAMPLE_SIZE]}")
+        return errors
+
+    def tier_dict(self, weights: Counter) -> Dict[str, Any]:
+        pages = weights['pages']
+        repeated = {kind: weights[kind] for kind in BLOCK_KINDS}
+        return {
+            'pages': pages,
+            'raw_bytes': weights['raw'],
+            'gzip_bytes': weights['gzip'],
+            'zlib_max_bytes': weights['zlib_max'],
+            'average_raw_bytes': weights['raw'] // pages if pages else 0,
+            'average_gzip_bytes': weights['gzip'] // pages if pages else 0,
+            'average_zlib_max_bytes': weights['zlib_max'] // pages if pages else 0,
+            'repeated_bytes': repeated,
+            'unique_bytes': weights['raw'] - sum(repeated.values()),
+            'repeated_share': round(sum(repeated.values()) / weights['raw'], 4)
+            if weights['raw'] else 0.0,
+            'savings': {'raw_bytes': weights['external_raw'],
+                        'zlib_max_bytes': weights['external_zlib_max']},
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pages': self.pages,
+            'sampled': self.sampled,
+            'seconds': round(self.seconds, 3),
+            'pages_per_second': round(self.pages_per_second, 1),
+            'jobs': self.jobs,
+            'max_repeated_share': self.max_repeated_share,
+            'tiers': {tier: self.tier_dict(weights) for tier, weights in self.tiers.items()},
+            'total': self.tier_dict(self.totals),
+            'blocks': self.blocks,
+            'heaviest': self.heaviest,
+            'passed': self.passed,
+            'errors': self.errors,
+        }
+
+
+def analyze_dist(dist_dir: str, jobs: Optional[int] = None,
+                 sample: int = DEFAULT_SAMPLE, min_pages: int = DEFAULT_MIN_PAGES,
+                 max_repeated_share: float = DEFAULT_MAX_REPEATED_SHARE,
+                 top: int = DEFAULT_TOP, batch_size: int = BATCH_SIZE) -> WeightReport:
+    """Weigh every HTML page under ``dist_dir``."""
+    start = time.perf_counter()
+    report = WeightReport(max_repeated_share)
+    report.jobs = max(1, jobs or os.cpu_count() or 1)
+
+    pages, _, _ = walk_dist(dist_dir)
+    sampled = sample_pages(pages, sample)
+    report.sampled = len(sampled)
+    blocks = find_repeated(dist_dir, sampled, min_pages)
+    repeated = {digest: block['kind'] for digest, block in blocks.items()}
+
+    tiers: Dict[str, Counter] = defaultdict(Counter)
+    block_pages: Counter = Counter()
+    block_bytes: Counter = Counter()
+    heaviest: List[Tuple[int, str, int]] = []
+
+    def collect(result) -> None:
+        batch_tiers, batch_pages, batch_bytes, batch_heaviest, unreadable = result
+        for tier, weights in batch_tiers.items():
+            tiers[tier].update(weights)
+        block_pages.update(batch_pages)
+        block_bytes.update(batch_bytes)
+        heaviest.extend(batch_heaviest)
+        report.unreadable.extend(f"{page} -> {error}" for page, error in unreadable)
+
+    batches = [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+    if report.jobs == 1 or len(batches) <= 1:
+        _init_worker(dist_dir, repeated, top)
+        for batch in batches:
+            collect(weigh_batch(batch))
+    else:
+        # fork shares the block table copy-on-write; spawn has to pickle it
+        method = 'fork' if 'fork' in get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=report.jobs, mp_context=get_context(method),
+                                 initializer=_init_worker,
+                                 initargs=(dist_dir, repeated, top)) as pool:
+            for result in pool.map(weigh_batch, batches):
+                collect(result)
+
+    report.pages = len(pages)
+    report.tiers = defaultdict(Counter, {tier: tiers[tier] for tier in PAGE_TIERS if tier in tiers})
+    report.blocks = [{**blocks[digest], 'pages': block_pages[digest], 'total_bytes': size}
+                     for digest, size in block_bytes.most_common(top)]
+    report.heaviest = [{'page': page, 'tier': page_tier(page), 'raw_bytes': raw,
+                        'zlib_max_bytes': zlib_max}
+                       for zlib_max, page, raw in heapq.nlargest(top, heaviest)]
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _kb(size: float) -> str:
+    return f"{size / 1024:.1f}"
+
+
+def print_report(report: WeightReport, dist_dir: str) -> None:
+    print(f"{dist_dir}: {report.pages} pages in {report.seconds:.2f}s "
+          f"({report.pages_per_second:.0f} pages/s, {report.jobs} jobs, "
+          f"repeated blocks from {report.sampled} sampled pages)")
+    print(f"  {'tier':<10} {'pages':>9} {'raw KB':>8} {'gzip KB':>8} {'zlib-9 KB':>9} "
+          f"{'repeated':>9}  (averages per page)")
+    data = report.to_dict()
+    for tier, stats in list(data['tiers'].items()) + [('total', data['total'])]:
+        print(f"  {tier:<10} {stats['pages']:>9} {_kb(stats['average_raw_bytes']):>8} "
+              f"{_kb(stats['average_gzip_bytes']):>8} {_kb(stats['average_zlib_max_bytes']):>9} "
+              f"{stats['repeated_share']:>9.0%}")
+    total = data['total']
+    print("  repeated bytes: " + ', '.join(
+        f"{kind} {size / 1e6:.1f} MB" for kind, size in total['repeated_bytes'].items())
+        + f"; unique {total['unique_bytes'] / 1e6:.1f} MB")
+    if report.blocks:
+        print("  top repeated blocks:")
+        for block in report.blocks:
+            print(f"    {block['total_bytes'] / 1e6:>8.2f} MB  {block['kind']:<6} "
+                  f"{block['bytes']:>7} B x {block['pages']:<8} {block['preview']}")
+    if report.heaviest:
+        print("  heaviest pages (zlib-9):")
+        for page in report.heaviest:
+            print(f"    {_kb(page['zlib_max_bytes']):>8} KB  {page['page']}")
+    savings = total['savings']
+    if savings['raw_bytes']:
+        print(f"  moving repeated css/script to cached files saves "
+              f"{savings['raw_bytes'] / 1e6:.1f} MB raw, "
+              f"{savings['zlib_max_bytes'] / 1e6:.1f} MB at zlib-9")
+    if report.passed:
+        print("  ✓ Every tier is within the repeated-bytes limit")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Weigh the pages in dist/ raw and compressed, and find repeated blocks'
+    )
+    parser.add_argument('--dist', default=DEFAULT_DIST_DIR, help='Build output directory')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: all cores)')
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help=f'Pages per tier used to find repeated blocks '
+                             f'(default {DEFAULT_SAMPLE})')
+    parser.add_argument('--min-pages', type=int, default=DEFAULT_MIN_PAGES,
+                        help=f'Sampled pages a block must occur on to count as repeated '
+                             f'(default {DEFAULT_MIN_PAGES})')
+    parser.add_argument('--max-repeated-share', type=float, default=DEFAULT_MAX_REPEATED_SHARE,
+                        help=f'Fail a tier whose raw bytes are more repeated than this '
+                             f'(default {DEFAULT_MAX_REPEATED_SHARE})')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP,
+                        help=f'Repeated blocks and heaviest pages to list (default {DEFAULT_TOP})')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dist):
+        print(f"dist directory not found: {args.dist} (run the build first)", file=sys.stderr)
+        sys.exit(2)
+    report = analyze_dist(args.dist, args.jobs, args.sample, args.min_pages,
+                          args.max_repeated_share, args.top)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, args.dist)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Byte-range parallel validation of data/schools.csv.
+
+The file is cut into one byte range per worker process. A cut must land
+on a record boundary, and ``alamat`` may hold newlines inside quotes, so
+``record_ranges`` counts quote characters from the header onwards and
+only cuts at a newline preceded by an even number of them: writeCsv
+(src/core/utils.js) quotes any field with a quote, comma or newline and
+doubles embedded quotes, so in its output a newline is inside a field
+exactly when the quotes before it are unbalanced. Counting is
+``bytes.count`` over 1 MB blocks, so finding the cuts is one C-speed read
+of the file.
+
+Each worker parses its range with ``csv.DictReader`` and feeds a fresh set
+of data checks (tests/data_checks.py). The partial checks come back to
+the parent and are folded in file order with ``DataCheck.merge``: counts
+add, samples concatenate, and NPSN sets report the values two ranges have
+in common as duplicates. The verdicts equal a single-process
+``StreamingValidator`` run; only the samples of duplicates that span two
+ranges may be listed in a different order.
+
+Files below ``MIN_PARALLEL_BYTES``, single-worker runs, files whose quotes
+do not balance (not written by writeCsv) and compressed files (no byte
+offsets to cut at; see tests/compressed.py) are validated in-process.
+
+Usage:
+    python3 tests/parallel_csv.py                  # all CPU cores
+    python3 tests/parallel_csv.py --workers 8 --csv external/schools.csv
+    python3 tests/parallel_csv.py --json
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from typing import Callable, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import compression_of, find_input  # noqa: E402
+from tests.data_checks import (  # noqa: E402
+    DataCheck,
+    StreamingValidator,
+    ValidationReport,
+    default_checks,
+    supports_merge,
+)
+from tests.dataset import DEFAULT_SCHOOLS_PATH  # noqa: E402
+
+BLOCK_SIZE = 1 << 20
+MIN_PARALLEL_BYTES = 4 << 20
+
+Range = Tuple[int, int]
+
+
+def record_ranges(path: str, parts: int,
+                  block_size: int = BLOCK_SIZE) -> Tuple[List[str], List[Range]]:
+    """Return (header fieldnames, up to ``parts`` byte ranges of whole records).
+
+    The ranges cover everything after the header line, in order. Returns a
+    single range when the quotes of the file do not balance.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        fieldnames = next(csv.reader([header.decode('utf-8')]), [])
+        body = size - start
+        targets = [start + body * i // parts for i in range(1, max(1, parts))]
+        cuts: List[int] = []
+        quotes = 0  # quote characters between start and the current block
+        offset = start
+        target = 0
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            position = 0  # where the next newline search starts in this block
+            while target < len(targets):
+                position = max(position, targets[target] - offset)
+                if position >= len(block):
+                    break
+                newline = block.find(b'\n', position)
+                if newline < 0:
+                    position = len(block)
+                    break
+                if (quotes + block.count(b'"', 0, newline)) % 2 == 0:
+                    cuts.append(offset + newline + 1)
+                    # Skip targets that fall before the cut just made
+                    while target < len(targets) and targets[target] <= cuts[-1]:
+                        target += 1
+                position = newline + 1
+            quotes += block.count(b'"')
+            offset += len(block)
+    if quotes % 2:
+        return fieldnames, [(start, size)]
+    bounds = [start] + [cut for cut in cuts if cut < size] + [size]
+    return fieldnames, list(zip(bounds, bounds[1:]))
+
+
+def validate_range(path: str, fieldnames: Sequence[str], byte_range: Range,
+                   checks_factory: Callable[[], List[DataCheck]] = default_checks
+                   ) -> Tuple[int, List[DataCheck]]:
+    """Feed the records in ``byte_range`` to fresh checks; return (rows, checks)."""
+    start, end = byte_range
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    validator = StreamingValidator(checks_factory())
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames=list(fieldnames))
+    report = validator.feed_rows(fieldnames, reader)
+    return report.rows, validator.checks
+
+
+class ParallelValidator:
+    """Validates byte ranges of a CSV in worker processes and merges the checks.
+
+    ``checks_factory`` must be picklable (a module-level function) since
+    every worker builds its own checks, and every check it builds must
+    define ``merge``; a TypeError names the ones that do not.
+    """
+
+    def __init__(self, checks_factory: Callable[[], List[DataCheck]] = default_checks,
+                 workers: Optional[int] = None, min_bytes: int = MIN_PARALLEL_BYTES):
+        unmergeable = [check.name for check in checks_factory() if not supports_merge(check)]
+        if unmergeable:
+            raise TypeError(f"Checks without merge cannot run in parallel: "
+                            f"{', '.join(unmergeable)}")
+        self.checks_factory = checks_factory
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_bytes = min_bytes
+        self.ranges: List[Range] = []
+
+    def run(self, path: str) -> ValidationReport:
+        path = find_input(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV not found: {path}")
+        if (self.workers == 1 or compression_of(path) is not None
+                or os.path.getsize(path) < self.min_bytes):
+            self.ranges = []
+            return StreamingValidator(self.checks_factory()).run(path)
+        fieldnames, self.ranges = record_ranges(path, self.workers)
+        if len(self.ranges) == 1:
+            return StreamingValidator(self.checks_factory()).run(path)
+        method = 'fork' if 'fork' in get_all_start_methods() else 'spawn'
+        count = len(self.ranges)
+        with ProcessPoolExecutor(max_workers=min(self.workers, count),
+                                 mp_context=get_context(method)) as pool:
+            results = pool.map(validate_range, [path] * count, [fieldnames] * count,
+                               self.ranges, [self.checks_factory] * count)
+            rows, checks = next(results)
+            for part_rows, part_checks in results:
+                rows += part_rows
+                for check, part in zip(checks, part_checks):
+                    check.merge(part)
+        return ValidationReport(rows, checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate schools.csv in byte ranges across worker processes'
+    )
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='CSV to validate')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    if not os.path.exists(args.csv):
+        print(f"CSV not found: {args.csv}", file=sys.stderr)
+        sys.exit(2)
+    validator = ParallelValidator(workers=args.workers)
+    start = time.perf_counter()
+    report = validator.run(args.csv)
+    seconds = time.perf_counter() - start
+    if args.json:
+        print(json.dumps({'rows': report.rows, 'seconds': round(seconds, 3),
+                          'workers': validator.workers,
+                          'ranges': [list(byte_range) for byte_range in validator.ranges],
+                          'errors': report.errors, 'passed': report.passed}, indent=2))
+    else:
+        parts = len(validator.ranges) or 1
+        print(f"Rows: {report.rows} in {parts} byte range(s), "
+              f"{validator.workers} worker(s), {seconds:.2f}s")
+        for name, error in report.errors.items():
+            print(f"{'✓ PASS' if error is None else '✗ FAIL'} {name}")
+            if error:
+                print(f"    Error: {error}")
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
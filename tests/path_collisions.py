@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Output-path collision detector for the generated page hierarchy.
+
+Every page the build writes is keyed by a slugified path: school pages by
+``getSchoolRelativePath`` and province, kabupaten and kecamatan pages by
+the slugs of their (exact, trimmed) region names. Two different records or
+region names that slugify to the same path silently overwrite each other
+in dist/. This module reproduces the rules (tests/site_paths.py) and puts
+every generated path into one hash index in a single pass over
+schools.csv, then reports each path claimed more than once:
+
+- distinct_records: different schools (or different rows for one NPSN
+  with different content) writing the same school page
+- duplicate_rows: the same NPSN listed more than once with one path
+- region_names: different region names mapping to one region page, e.g.
+  "Kab. Bandung" and "Kab Bandung", with their school counts and NPSNs
+
+Region pages follow PageBuilder.groupSchoolsBy*: a kabupaten page needs a
+province and kab_kota, a kecamatan page all three.
+
+Usage:
+    python3 tests/path_collisions.py                  # data/schools.csv
+    python3 tests/path_collisions.py --csv external/schools.csv --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import DEFAULT_SCHOOLS_PATH, load_schools  # noqa: E402
+from tests.site_paths import directory_path, school_page_path  # noqa: E402
+
+TIERS = ('homepage', 'province', 'kabupaten', 'kecamatan', 'school')
+NPSN_SAMPLE_SIZE = 5
+
+# A page owner: ('school', record index) or (region tier, region names)
+Owner = Tuple[str, Any]
+
+
+class CollisionReport:
+    """Every path claimed by more than one school row or region."""
+
+    def __init__(self):
+        self.rows = 0
+        self.paths = Counter()
+        self.seconds = 0.0
+        self.groups: List[Dict[str, Any]] = []
+
+    @property
+    def passed(self) -> bool:
+        return not self.groups
+
+    @property
+    def counts(self) -> Counter:
+        return Counter(group['kind'] for group in self.groups)
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{count} {kind.replace('_', ' ')} collisions. Sample: "
+                f"{[group['path'] for group in self.groups if group['kind'] == kind][:5]}"
+                for kind, count in sorted(self.counts.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'paths': dict(self.paths),
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'collisions': dict(self.counts),
+            'groups': self.groups,
+        }
+
+
+class PathIndex:
+    """Every generated page path and what claims it, kept up to date row by row.
+
+    A school claims its page with its record (the tuple of values) and a
+    region with its names, so rows can be added and removed in any order:
+    a region page is claimed by its first school and released with its
+    last. tests/watch.py keeps one resident and applies only the rows each
+    save changed.
+    """
+
+    def __init__(self, fieldnames: Sequence[str]):
+        index = {name: position for position, name in enumerate(fieldnames)}
+        self.positions = [index.get(name, -1) for name in ('npsn', 'nama', 'provinsi',
+                                                           'kab_kota', 'kecamatan')]
+        self.rows = 0
+        self.paths: Counter = Counter({'homepage': 1})
+        self.owners: Dict[str, Owner] = {'index.html': ('homepage', ())}
+        # Paths claimed more than once -> every claimant, in claim order
+        self.collisions: Dict[str, List[Owner]] = {}
+        # Region names -> [page directory, school count]
+        self.regions: Dict[Tuple[str, ...], list] = {}
+
+    def fields(self, record: Tuple[str, ...]) -> Tuple[str, ...]:
+        """(npsn, nama, provinsi, kab_kota, kecamatan), trimmed as parseCsv trims them."""
+        # A missing column reads the appended ''
+        record = record + ('',)
+        return tuple(record[position].strip() for position in self.positions)
+
+    def add(self, records: Iterable[Tuple[str, ...]]) -> None:
+        for record in records:
+            self._update(record, 1)
+
+    def remove(self, records: Iterable[Tuple[str, ...]]) -> None:
+        for record in records:
+            self._update(record, -1)
+
+    def _claim(self, path: str, owner: Owner) -> None:
+        first = self.owners.setdefault(path, owner)
+        if first is owner:
+            self.paths[owner[0]] += 1
+        else:
+            self.collisions.setdefault(path, [first]).append(owner)
+
+    def _release(self, path: str, owner: Owner) -> None:
+        claimants = self.collisions.get(path)
+        if claimants is None:
+            del self.owners[path]
+            self.paths[owner[0]] -= 1
+            return
+        claimants.remove(owner)
+        self.owners[path] = claimants[0]
+        if len(claimants) == 1:
+            del self.collisions[path]
+
+    def _region(self, names: Tuple[str, ...], step: int) -> str:
+        entry = self.regions.get(names)
+        if entry is None:
+            directory = directory_path(*names)
+            entry = self.regions[names] = [directory, 0]
+            self._claim(f"{directory}/index.html", (TIERS[len(names)], names))
+        entry[1] += step
+        if not entry[1]:
+            del self.regions[names]
+            self._release(f"{entry[0]}/index.html", (TIERS[len(names)], names))
+        return entry[0]
+
+    def _update(self, record: Tuple[str, ...], step: int) -> None:
+        self.rows += step
+        npsn, nama, provinsi, kab_kota, kecamatan = self.fields(record)
+        if not provinsi:
+            return
+        self._region((provinsi,), step)
+        if not kab_kota:
+            return
+        self._region((provinsi, kab_kota), step)
+        if not kecamatan:
+            return
+        directory = self._region((provinsi, kab_kota, kecamatan), step)
+        if npsn and nama:
+            path = school_page_path(directory, npsn, nama)
+            if step > 0:
+                self._claim(path, ('school', record))
+            else:
+                self._release(path, ('school', record))
+
+    def report(self, records: Sequence[Tuple[str, ...]]) -> CollisionReport:
+        """The collisions among ``records``, the rows this index holds.
+
+        Only when there are collisions are the rows scanned, for the row
+        numbers of colliding schools and the NPSN samples of colliding regions.
+        """
+        report = CollisionReport()
+        report.rows = self.rows
+        report.paths = +self.paths
+        if self.collisions:
+            rows, samples = self._locate(records)
+            for path in sorted(self.collisions):
+                report.groups.append(self._describe(path, rows, samples))
+        return report
+
+    def _locate(self, records: Sequence[Tuple[str, ...]]):
+        claimants = [owner for owners in self.collisions.values() for owner in owners]
+        schools = {key for tier, key in claimants if tier == 'school'}
+        regions = {key for tier, key in claimants if tier != 'school'}
+        rows: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        samples: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for row, record in enumerate(records):
+            if record in schools:
+                rows[record].append(row)
+            if not regions:
+                continue
+            npsn, _, *names = self.fields(record)
+            for depth in range(1, len(names) + 1):
+                key = tuple(names[:depth])
+                if not key[-1]:
+                    break
+                if key in regions and len(samples[key]) < NPSN_SAMPLE_SIZE:
+                    samples[key].append(npsn)
+        return rows, samples
+
+    def _describe(self, path: str, rows: Dict[Tuple[str, ...], List[int]],
+                  samples: Dict[Tuple[str, ...], List[str]]) -> Dict[str, Any]:
+        members = []
+        # Equal records (duplicate rows) take their row numbers in order
+        taken: Counter = Counter()
+        for tier, key in self.collisions[path]:
+            if tier == 'school':
+                fields = self.fields(key)
+                members.append({'tier': tier, 'row': rows[key][taken[key]] + 1,
+                                'npsn': fields[0], 'nama': fields[1], 'values': key})
+                taken[key] += 1
+            else:
+                entry = self.regions.get(key, ('', 0))
+                members.append({'tier': tier, 'names': list(key), 'schools': entry[1],
+                                'npsns': samples[key]})
+
+        schools = [member for member in members if member['tier'] == 'school']
+        if len(schools) < len(members):
+            kind = 'region_names'
+        elif len({member['npsn'] for member in schools}) == 1 and \
+                len({member['values'] for member in schools}) == 1:
+            kind = 'duplicate_rows'
+        else:
+            kind = 'distinct_records'
+        if len(schools) == len(members):
+            # Claim order follows the edits in watch mode; list rows in CSV order
+            members.sort(key=lambda member: member['row'])
+        for member in schools:
+            del member['values']
+        return {'path': path, 'kind': kind, 'members': members}
+
+
+def find_collisions(csv_path: str) -> CollisionReport:
+    """Index every page path generated from ``csv_path`` and group collisions."""
+    start = time.perf_counter()
+    dataset = load_schools(csv_path)
+    index = PathIndex(dataset.fieldnames)
+    index.add(dataset.records)
+    report = index.report(dataset.records)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: CollisionReport, csv_path: str) -> None:
+    paths = ', '.join(f"{report.paths[tier]} {tier}" for tier in TIERS if report.paths[tier])
+    print(f"{csv_path}: {report.rows} rows, {paths} paths in {report.seconds:.2f}s")
+    for group in report.groups:
+        print(f"  {group['kind']}: {group['path']}")
+        for member in group['members']:
+            if member['tier'] == 'school':
+                print(f"      row {member['row']}: {member['npsn']} {member['nama']!r}")
+            else:
+                print(f"      {' / '.join(member['names'])!r}: {member['schools']} schools "
+                      f"(NPSN {', '.join(member['npsns'])})")
+    if report.passed:
+        print("  ✓ Every generated path is unique")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find colliding page output paths')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='schools.csv to check')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    if not os.path.exists(args.csv):
+        print(f"schools.csv not found: {args.csv}", file=sys.stderr)
+        sys.exit(2)
+    report = find_collisions(args.csv)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.csv)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
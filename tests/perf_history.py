@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Build-performance history in SQLite, with a regression check for CI.
+
+Two kinds of documents are ingested:
+
+- build reports from scripts/build-performance.js (``generateReport``),
+  appended one JSON line per build to ``$BUILD_PERF_REPORT`` by the build
+  orchestrator: total and per-phase duration (``elapsedMs``) and
+  throughput (pages/s) for ``writeSchoolPagesConcurrently``,
+  ``generateKecamatanPages`` and the other timed phases
+- the ``--json`` output of tests/run_tests.py: wall and CPU time of the
+  run and the duration of every test
+
+Each document becomes one run; its numbers become samples of a series
+keyed by (kind, variant, phase, metric), where the variant is the build
+type (full / incremental) or the runner's job count, so unlike runs are
+never compared. Re-ingesting a document already stored is a no-op.
+
+``check`` compares the latest sample of every series with the median and
+MAD (median absolute deviation) of the ``window`` samples before it. A
+sample is a regression when it is worse by more than ``threshold`` scaled
+MADs (a robust z-score) and by at least ``min_change`` of the median;
+durations must also be at least ``min_delta_ms`` slower, so
+sub-millisecond tests cannot fail CI on jitter. Series with fewer than
+``min_samples`` earlier samples are reported but never fail.
+
+Usage:
+    python3 tests/perf_history.py ingest build-perf.jsonl run-tests.json --label $GITHUB_SHA
+    python3 tests/perf_history.py check                  # exit 1 on a regression
+    python3 tests/perf_history.py check --window 30 --threshold 4 --json
+    python3 tests/perf_history.py history writeSchoolPagesConcurrently
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict, deque
+from statistics import median
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dataset import ROOT  # noqa: E402
+
+DEFAULT_DB_PATH = os.path.join(ROOT, '.cache', 'perf', 'history.sqlite')
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_SAMPLES = 5
+DEFAULT_THRESHOLD = 3.5
+DEFAULT_MIN_CHANGE = 0.10
+DEFAULT_MIN_DELTA_MS = 10.0
+# Smallest spread assumed, as a share of the median, so a perfectly steady
+# history (MAD 0) still gives a finite z-score
+SPREAD_FLOOR = 0.01
+# MAD times this estimates the standard deviation of normally spread values
+MAD_TO_SIGMA = 1.4826
+
+# +1 when a larger value is worse, -1 when a smaller one is
+METRICS = {'duration_ms': 1, 'throughput': -1}
+UNITS = {'duration_ms': 'ms', 'throughput': 'pages/s'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    label TEXT,
+    source TEXT,
+    digest TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    phase TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_series ON samples (phase, metric, run_id);
+"""
+
+Sample = Tuple[str, str, float]
+
+
+def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Open (creating when needed) the history database."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def iter_documents(text: str) -> Iterator[Dict[str, Any]]:
+    """JSON objects in ``text``: one document, a list, JSON lines, or the
+    runner's ``--json`` output behind its progress lines."""
+    try:
+        document = json.loads(text)
+    except ValueError:
+        pass
+    else:
+        yield from document if isinstance(document, list) else [document]
+        return
+    decoder = json.JSONDecoder()
+    position = 0
+    while True:
+        start = text.find('{', position)
+        if start < 0:
+            return
+        if start and text[start - 1] != '\n':
+            position = start + 1  # only objects that start a line
+            continue
+        try:
+            document, position = decoder.raw_decode(text, start)
+        except ValueError:
+            position = start + 1
+            continue
+        yield document
+
+
+def build_samples(report: Dict[str, Any]) -> List[Sample]:
+    """Samples of one build-performance.js report."""
+    metrics = report.get('metrics') or {}
+    samples = [('build', 'duration_ms', float(metrics.get('elapsedMs', 0)))]
+    if metrics.get('totalPages'):
+        samples.append(('build', 'throughput', float(metrics.get('throughput', 0))))
+    for name, phase in sorted((report.get('phases') or {}).items()):
+        samples.append((name, 'duration_ms', float(phase.get('elapsedMs', 0))))
+        if phase.get('pages'):
+            samples.append((name, 'throughput', float(phase.get('throughput', 0))))
+    return samples
+
+
+def runner_samples(output: Dict[str, Any]) -> List[Sample]:
+    """Samples of one ``run_tests.py --json`` output."""
+    summary = output.get('summary') or {}
+    samples = [('tests', 'duration_ms', float(summary.get('wall_duration', 0)) * 1000),
+               ('tests:cpu', 'duration_ms', float(summary.get('cpu_time', 0)) * 1000)]
+    for result in output.get('results') or []:
+        samples.append((result['name'], 'duration_ms', float(result.get('duration', 0)) * 1000))
+    return samples
+
+
+def classify(document: Dict[str, Any]) -> Optional[Tuple[str, str, Optional[str], List[Sample]]]:
+    """(kind, variant, timestamp, samples) for a known document, else None."""
+    if 'metrics' in document and 'buildType' in document:
+        return 'build', document['buildType'], document.get('timestamp'), build_samples(document)
+    if 'results' in document and 'summary' in document:
+        summary = document['summary']
+        variant = f"jobs={summary.get('jobs', 1)}" + ('+profile' if summary.get('profile') else '')
+        return 'tests', variant, None, runner_samples(document)
+    return None
+
+
+def ingest(connection: sqlite3.Connection, document: Dict[str, Any],
+           source: Optional[str] = None, label: Optional[str] = None) -> bool:
+    """Store one document as a run; False when unknown or already stored."""
+    found = classify(document)
+    if found is None:
+        return False
+    kind, variant, timestamp, samples = found
+    digest = hashlib.sha256(json.dumps(document, sort_keys=True).encode('utf-8')).hexdigest()
+    recorded_at = timestamp or time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+    with connection:
+        cursor = connection.execute(
+            'INSERT OR IGNORE INTO runs (kind, variant, recorded_at, label, source, digest) '
+            'VALUES (?, ?, ?, ?, ?, ?)', (kind, variant, recorded_at, label, source, digest))
+        if not cursor.rowcount:
+            return False
+        connection.executemany('INSERT INTO samples VALUES (?, ?, ?, ?)',
+                               [(cursor.lastrowid,) + sample for sample in samples])
+    return True
+
+
+def ingest_file(connection: sqlite3.Connection, path: str,
+                label: Optional[str] = None) -> Tuple[int, int]:
+    """Ingest every document in ``path``; returns (stored, skipped)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    stored = skipped = 0
+    for document in iter_documents(text):
+        if isinstance(document, dict) and ingest(connection, document, path, label):
+            stored += 1
+        else:
+            skipped += 1
+    return stored, skipped
+
+
+def baseline(values: List[float]) -> Tuple[float, float]:
+    """(median, MAD) of ``values``."""
+    middle = median(values)
+    return middle, median(abs(value - middle) for value in values)
+
+
+class RegressionReport:
+    """Latest sample of every series against its rolling baseline."""
+
+    def __init__(self, window: int, threshold: float, min_change: float):
+        self.window = window
+        self.threshold = threshold
+        self.min_change = min_change
+        self.runs = 0
+        self.series = 0
+        self.checked = 0
+        self.short: List[str] = []
+        self.regressions: List[Dict[str, Any]] = []
+        self.improvements: List[Dict[str, Any]] = []
+
+    @property
+    def passed(self) -> bool:
+        return not self.regressions
+
+    @property
+    def errors(self) -> List[str]:
+        if not self.regressions:
+            return []
+        return [f"{len(self.regressions)} performance regressions. Sample: "
+                f"{[describe(entry) for entry in self.regressions[:5]]}"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'series': self.series,
+            'checked': self.checked,
+            'window': self.window,
+            'threshold': self.threshold,
+            'min_change': self.min_change,
+            'insufficient_history': len(self.short),
+            'passed': self.passed,
+            'regressions': self.regressions,
+            'improvements': self.improvements,
+            'errors': self.errors,
+        }
+
+
+def describe(entry: Dict[str, Any]) -> str:
+    unit = UNITS[entry['metric']]
+    return (f"{entry['kind']}/{entry['variant']} {entry['phase']} {entry['metric']}: "
+            f"{entry['value']:g} {unit} vs median {entry['median']:g} "
+            f"({entry['change']:+.0%}, z {entry['z']:+.1f})")
+
+
+def check(connection: sqlite3.Connection, window: int = DEFAULT_WINDOW,
+          threshold: float = DEFAULT_THRESHOLD, min_change: float = DEFAULT_MIN_CHANGE,
+          min_samples: int = DEFAULT_MIN_SAMPLES,
+          min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> RegressionReport:
+    """Flag series whose latest sample regressed against the ``window`` before it."""
+    report = RegressionReport(window, threshold, min_change)
+    latest: Dict[Tuple[str, str], int] = {}
+    order = 'ORDER BY r.recorded_at, r.id'
+    for kind, variant, run_id in connection.execute(
+            f"SELECT kind, variant, id FROM runs r {order}"):
+        latest[kind, variant] = run_id
+        report.runs += 1
+
+    series: Dict[Tuple[str, str, str, str], deque] = defaultdict(lambda: deque(maxlen=window + 1))
+    for kind, variant, run_id, phase, metric, value in connection.execute(
+            'SELECT r.kind, r.variant, r.id, s.phase, s.metric, s.value '
+            f"FROM samples s JOIN runs r ON r.id = s.run_id {order}"):
+        series[kind, variant, phase, metric].append((run_id, value))
+
+    report.series = len(series)
+    for (kind, variant, phase, metric), samples in series.items():
+        run_id, value = samples[-1]
+        if run_id != latest[kind, variant] or metric not in METRICS:
+            continue  # the phase did not run in the latest build
+        history = [earlier for _, earlier in list(samples)[:-1]]
+        name = f"{kind}/{variant} {phase} {metric}"
+        if len(history) < min_samples:
+            report.short.append(name)
+            continue
+        report.checked += 1
+        middle, mad = baseline(history)
+        worse = METRICS[metric] * (value - middle)
+        spread = max(MAD_TO_SIGMA * mad, SPREAD_FLOOR * abs(middle)) or 1.0
+        z = worse / spread
+        change = (value - middle) / middle if middle else 0.0
+        entry = {
+            'kind': kind, 'variant': variant, 'phase': phase, 'metric': metric,
+            'value': round(value, 3), 'median': round(middle, 3), 'mad': round(mad, 3),
+            'z': round(z, 2), 'change': round(change, 4),
+            'samples': len(history),
+        }
+        significant = abs(z) >= threshold and abs(change) >= min_change
+        if metric == 'duration_ms' and abs(value - middle) < min_delta_ms:
+            significant = False
+        if significant:
+            (report.regressions if worse > 0 else report.improvements).append(entry)
+    report.regressions.sort(key=lambda entry: -abs(entry['change']))
+    report.improvements.sort(key=lambda entry: -abs(entry['change']))
+    return report
+
+
+def history(connection: sqlite3.Connection, phase: str) -> List[Dict[str, Any]]:
+    """Every stored sample of ``phase``, oldest first."""
+    rows = connection.execute(
+        'SELECT r.recorded_at, r.kind, r.variant, r.label, s.metric, s.value '
+        'FROM samples s JOIN runs r ON r.id = s.run_id WHERE s.phase = ? '
+        'ORDER BY r.recorded_at, r.id, s.metric', (phase,))
+    return [dict(zip(('recorded_at', 'kind', 'variant', 'label', 'metric', 'value'), row))
+            for row in rows]
+
+
+def print_report(report: RegressionReport, db_path: str) -> None:
+    print(f"{db_path}: {report.runs} runs, {report.series} series, "
+          f"{report.checked} checked against the last {report.window} samples")
+    if report.short:
+        print(f"  {len(report.short)} series with too little history to judge")
+    for entry in report.improvements[:5]:
+        print(f"  ↑ {describe(entry)}")
+    if report.passed:
+        print("  ✓ No performance regressions")
+    for entry in report.regressions:
+        print(f"  ✗ {describe(entry)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build-performance history and regression check')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH,
+                        help='History database (default: .cache/perf/history.sqlite)')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    # --json is also accepted after the command, as the usage examples write it
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                        help='Output results as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = commands.add_parser(
+        'ingest', help='Store build-performance reports or run_tests.py --json output',
+        parents=[output])
+    ingest_parser.add_argument('paths', nargs='+')
+    ingest_parser.add_argument('--label', help='Tag the runs (e.g. the commit SHA)')
+    check_parser = commands.add_parser('check', help='Flag regressions in the latest runs',
+                                       parents=[output])
+    check_parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                              help=f'Baseline samples per series (default {DEFAULT_WINDOW})')
+    check_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                              help=f'Robust z-score to flag (default {DEFAULT_THRESHOLD})')
+    check_parser.add_argument('--min-change', type=float, default=DEFAULT_MIN_CHANGE,
+                              help=f'Smallest relative change to flag (default {DEFAULT_MIN_CHANGE})')
+    check_parser.add_argument('--min-samples', type=int, default=DEFAULT_MIN_SAMPLES,
+                              help=f'History needed to judge a series (default {DEFAULT_MIN_SAMPLES})')
+    check_parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                              help=f'Smallest slowdown to flag (default {DEFAULT_MIN_DELTA_MS} ms)')
+    history_parser = commands.add_parser('history', help='Stored samples of one phase',
+                                         parents=[output])
+    history_parser.add_argument('phase')
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        missing = [path for path in args.paths if not os.path.exists(path)]
+        if missing:
+            print(f"Report not found: {missing[0]}", file=sys.stderr)
+            sys.exit(2)
+    connection = connect(args.db)
+    try:
+        if args.command == 'ingest':
+            totals = {path: ingest_file(connection, path, args.label) for path in args.paths}
+            if args.json:
+                print(json.dumps({path: {'stored': stored, 'skipped': skipped}
+                                  for path, (stored, skipped) in totals.items()}, indent=2))
+            else:
+                for path, (stored, skipped) in totals.items():
+                    print(f"{path}: {stored} runs stored, {skipped} skipped")
+        elif args.command == 'check':
+            report = check(connection, args.window, args.threshold, args.min_change,
+                           args.min_samples, args.min_delta_ms)
+            if args.json:
+                print(json.dumps(report.to_dict(), indent=2))
+            else:
+                print_report(report, args.db)
+            sys.exit(0 if report.passed else 1)
+        else:
+            rows = history(connection, args.phase)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                for row in rows:
+                    print(f"{row['recorded_at']}  {row['kind']}/{row['variant']}  "
+                          f"{row['metric']:<12} {row['value']:g}  {row['label'] or ''}")
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
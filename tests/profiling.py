@@ -0,0 +1,112 @@
+"""
+Per-test resource instrumentation for tests/run_tests.py.
+
+Every test is timed with ``perf_counter_ns`` and charged the CPU time of the
+thread that ran it. With ``--profile`` the runner also traces allocations
+(tracemalloc peak and blocks still held when the test returns) and runs the
+test under cProfile, keeping the functions with the most own time. With
+``--profile-dir`` the full pstats dump of each test is written there as
+``<test-name>.prof`` for ``python3 -m pstats`` or snakeviz.
+
+tracemalloc and cProfile are process-wide, so profiled tests must run one
+at a time; the runner falls back to a single job when profiling.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HOTSPOT_COUNT = 5
+
+
+class Measurement:
+    """Resources used by one test call."""
+
+    def __init__(self):
+        self.duration_ns = 0
+        self.cpu_time_ns = 0
+        self.memory_peak: Optional[int] = None
+        self.memory_blocks: Optional[int] = None
+        self.hotspots: Optional[List[Dict[str, Any]]] = None
+        self.profile_path: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'duration_ns': self.duration_ns,
+            'cpu_time': round(self.cpu_time_ns / 1e9, 6),
+        }
+        if self.memory_peak is not None:
+            data['memory_peak'] = self.memory_peak
+            data['memory_blocks'] = self.memory_blocks
+            data['hotspots'] = self.hotspots
+        if self.profile_path:
+            data['profile'] = self.profile_path
+        return data
+
+
+def profile_filename(name: str) -> str:
+    """File-system safe ``.prof`` name for a test."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-').lower()
+    return f"{slug or 'test'}.prof"
+
+
+def hotspots(stats: pstats.Stats, count: int = HOTSPOT_COUNT) -> List[Dict[str, Any]]:
+    """Functions with the most own (non-child) time, highest first."""
+    entries = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        entries.append({
+            'function': f"{os.path.basename(filename)}:{line}({function})",
+            'calls': calls,
+            'own_time': round(own, 6),
+            'cumulative_time': round(cumulative, 6),
+        })
+    entries.sort(key=lambda entry: entry['own_time'], reverse=True)
+    return entries[:count]
+
+
+def measure(func: Callable[[], Any], profile: bool = False,
+            profile_dir: Optional[str] = None,
+            name: str = 'test') -> Tuple[Optional[BaseException], Measurement]:
+    """Call ``func`` and return (exception raised or None, measurement)."""
+    result = Measurement()
+    profiler = None
+    tracing = False
+    if profile:
+        # Leave an outer tracemalloc session (e.g. a benchmark) untouched
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+
+    error: Optional[BaseException] = None
+    cpu_start = time.thread_time_ns()
+    start = time.perf_counter_ns()
+    if profiler:
+        profiler.enable()
+    try:
+        func()
+    except Exception as e:
+        error = e
+    finally:
+        if profiler:
+            profiler.disable()
+        result.duration_ns = time.perf_counter_ns() - start
+        result.cpu_time_ns = time.thread_time_ns() - cpu_start
+
+    if profile:
+        result.memory_peak = tracemalloc.get_traced_memory()[1]
+        result.memory_blocks = len(tracemalloc.take_snapshot().traces)
+        if tracing:
+            tracemalloc.stop()
+        stats = pstats.Stats(profiler)
+        result.hotspots = hotspots(stats)
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            result.profile_path = os.path.join(profile_dir, profile_filename(name))
+            stats.dump_stats(result.profile_path)
+    return error, result
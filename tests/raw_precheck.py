@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Chunked pre-validator for external/raw.csv: is the ETL worth starting?
+
+Predicts what scripts/etl.js will do with a raw dump without running it.
+The file is read in fixed-size chunks and split into lines exactly as
+``parseCsv`` does (the whole text trimmed, then split on ``\\r?\\n``, no
+multi-line fields). The header is resolved once against the
+``rawMappings`` of each field in the exported schema. Every line then goes
+through the same steps as the ETL:
+
+- ``parseCsvLine`` (trimmed values, ``"`` toggles quoting anywhere)
+- ``mapRawField`` (first non-empty mapped column) and ``sanitize``
+- ``normaliseRecord``'s Negeri/Swasta -> N/S status rewrite
+- ``SCHEMA.validateRecord``, compiled from src/core/data-schema.json by
+  tests/schema_validator.py: required fields, numeric NPSN, ALLOWED_VALUES
+  and Indonesia coordinate bounds (zero means unset)
+- ``enforceNpsnUniqueness``: later rows repeating a kept NPSN are dropped
+
+Memory stays constant: one chunk, per-problem counters and samples, and
+the fixed-size NPSN bitmap from tests/npsn_index.py. A compressed dump
+(raw.csv.gz, .bz2, .xz, .zst) is decompressed chunk by chunk as it is
+read (tests/compressed.py).
+
+A header that maps no column to a required field makes every row invalid,
+so the check stops before reading any data.
+
+Usage:
+    python3 tests/raw_precheck.py                         # external/raw.csv
+    python3 tests/raw_precheck.py --raw dump.csv --min-valid 0.95 --json
+    python3 tests/raw_precheck.py --max-rows 100000       # quick look at a huge dump
+    python3 tests/raw_precheck.py --raw dump.csv.xz       # decompressed while streaming
+"""
+
+import argparse
+import codecs
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input, open_binary  # noqa: E402
+from tests.dataset import ROOT  # noqa: E402
+from tests.npsn_index import NpsnSet  # noqa: E402
+from tests.schema_validator import JS_WHITESPACE, compile_validator, load_schema  # noqa: E402
+
+DEFAULT_RAW_PATH = os.path.join(ROOT, 'external', 'raw.csv')
+CHUNK_SIZE = 4 << 20
+SAMPLE_SIZE = 5
+DEFAULT_MIN_VALID = 0.9
+
+SCHEMA = load_schema()
+# data-schema.js fields the ETL maps from raw columns, in FIELDS order
+RAW_MAPPINGS = SCHEMA.raw_mappings
+ALLOWED_VALUES = SCHEMA.allowed_values
+REQUIRED_FIELDS = SCHEMA.required_fields
+FIELDS = tuple(RAW_MAPPINGS)
+_STATUS = FIELDS.index('status')
+_NPSN = FIELDS.index('npsn')
+
+_WHITESPACE_RUN = re.compile(f"[{JS_WHITESPACE}]+")
+_CONTROL = re.compile('[\x00-\x1f]')
+_NON_PRINTABLE = re.compile('[^\x20-\x7e\u00a0-\u017f\u0190-\u024f\u1e00-\u1eff]')
+# Lines whose quotes all wrap whole fields parse the same in csv and parseCsvLine
+_FIELD = r'(?:"[^"]*(?:""[^"]*)*"|[^",]*)'
+_PLAIN_QUOTED = re.compile(f"{_FIELD}(?:,{_FIELD})*")
+
+
+def parse_csv_line(line: str) -> List[str]:
+    """Match utils.js::parseCsvLine."""
+    if '"' not in line:
+        return [value.strip(JS_WHITESPACE) for value in line.split(',')]
+    if _PLAIN_QUOTED.fullmatch(line):
+        return [value.strip(JS_WHITESPACE) for value in next(csv.reader([line]))]
+    result = []
+    current = []
+    in_quotes = False
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == '"' and not in_quotes:
+            in_quotes = True
+        elif char == '"':
+            if i + 1 < len(line) and line[i + 1] == '"':
+                current.append('"')
+                i += 1
+            else:
+                in_quotes = False
+        elif char == ',' and not in_quotes:
+            result.append(''.join(current).strip(JS_WHITESPACE))
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    result.append(''.join(current).strip(JS_WHITESPACE))
+    return result
+
+
+def parse_csv_lines(lines: List[str]) -> List[List[str]]:
+    """parse_csv_line for a batch; csv reads the regular lines in one call."""
+    irregular = [index for index, line in enumerate(lines)
+                 if ('"' in line and not _PLAIN_QUOTED.fullmatch(line)) or '\r' in line]
+    regular = lines
+    if irregular:
+        regular = lines.copy()
+        for index in irregular:
+            regular[index] = ''
+    rows = [[value.strip(JS_WHITESPACE) for value in values] for values in csv.reader(regular)]
+    for index in irregular:
+        rows[index] = parse_csv_line(lines[index])
+    return rows
+
+
+def sanitize(value: str) -> str:
+    """Match etl.js::sanitize."""
+    if value.isascii() and value.isprintable() and '  ' not in value:
+        return value.strip(' ')
+    value = _CONTROL.sub('', _WHITESPACE_RUN.sub(' ', value)).strip(JS_WHITESPACE)
+    return _NON_PRINTABLE.sub('', value)
+
+
+class HeaderMapping:
+    """Raw header resolved once against RAW_MAPPINGS."""
+
+    def __init__(self, header: List[str]):
+        self.header = header
+        # parseCsv builds a plain object, so a repeated column name keeps the last
+        positions = {name: index for index, name in enumerate(header)}
+        self.sources: Dict[str, List[Tuple[str, int]]] = {
+            field: [(name, positions[name]) for name in names if name in positions]
+            for field, names in RAW_MAPPINGS.items()
+        }
+        mapped = {name for sources in self.sources.values() for name, _ in sources}
+        self.unmapped_required = [field for field in REQUIRED_FIELDS if not self.sources[field]]
+        self.ignored_columns = [name for name in dict.fromkeys(header) if name not in mapped]
+        # Position ``width`` is the '' padding that normalise() appends
+        self._width = width = len(header)
+        self._first = itemgetter(*(sources[0][1] if sources else width
+                                   for sources in self.sources.values()))
+        self._fallbacks = [(index, [position for _, position in sources[1:]])
+                           for index, sources in enumerate(self.sources.values())
+                           if len(sources) > 1]
+
+    def normalise(self, values: List[str], clean: bool = False) -> List[str]:
+        """Match etl.js::normaliseRecord (minus the updated_at stamp), in FIELDS order.
+
+        ``clean`` values are already what sanitize() would return.
+        """
+        width = self._width
+        if len(values) != width + 1:
+            values = values[:width] + [''] * (width + 1 - min(len(values), width))
+        record = list(self._first(values))
+        for index, alternates in self._fallbacks:
+            if not record[index]:
+                for position in alternates:
+                    if values[position]:
+                        record[index] = values[position]
+                        break
+        if not clean:
+            record = [sanitize(value) if value else '' for value in record]
+        status = record[_STATUS].lower()
+        if status == 'negeri':
+            record[_STATUS] = 'N'
+        elif status == 'swasta':
+            record[_STATUS] = 'S'
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'columns': self.header,
+            'fields': {field: [name for name, _ in sources]
+                       for field, sources in self.sources.items()},
+            'unmapped_required': self.unmapped_required,
+            'ignored_columns': self.ignored_columns,
+        }
+
+
+def iter_line_batches(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (first line number, lines) per chunk, split like parseCsv's ``text.trim()``.
+
+    Whitespace-only lines at the end of a chunk are held back until a later
+    line shows they are not part of the trailing whitespace trim() removes.
+    """
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    rest = ''
+    number = 1
+    pending: List[str] = []
+    started = False
+    with open_binary(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            text = rest + utf8.decode(chunk, final=not chunk)
+            if not started:
+                text = text.lstrip(JS_WHITESPACE)
+                started = bool(text)
+                if not started and chunk:
+                    rest = ''
+                    continue
+            lines = text.replace('\r\n', '\n').split('\n')
+            rest = lines.pop() if chunk else ''
+            end = len(lines)
+            while end and not lines[end - 1].strip(JS_WHITESPACE):
+                end -= 1
+            if end:
+                batch = pending + lines[:end] if pending else lines[:end]
+                yield number, batch
+                number += len(batch)
+                pending = lines[end:]
+            else:
+                pending.extend(lines)
+            if not chunk:
+                break
+
+
+class PrecheckReport:
+    """Predicted ETL outcome for a raw dump."""
+
+    def __init__(self, min_valid: float = DEFAULT_MIN_VALID):
+        self.min_valid = min_valid
+        self.mapping: Optional[HeaderMapping] = None
+        self.rows = 0
+        self.kept = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self.truncated = False
+        self.seconds = 0.0
+        self.bytes_read = 0
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+        self.distribution: Dict[str, Counter] = {field: Counter() for field in ALLOWED_VALUES}
+
+    def add(self, problem: str, sample: str) -> None:
+        self.counts[problem] += 1
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(sample)
+
+    @property
+    def valid_ratio(self) -> float:
+        return self.kept / self.rows if self.rows else 0.0
+
+    @property
+    def worth_starting(self) -> bool:
+        """The ETL would keep records, and at least ``min_valid`` of them."""
+        if self.mapping is None or self.mapping.unmapped_required:
+            return False
+        return self.kept > 0 and self.valid_ratio >= self.min_valid
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{count} {problem.replace('_', ' ')}. Sample: {self.samples[problem]}"
+                for problem, count in sorted(self.counts.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'worth_starting': self.worth_starting,
+            'rows': self.rows,
+            'kept': self.kept,
+            'rejected': self.rejected,
+            'duplicates': self.duplicates,
+            'valid_ratio': round(self.valid_ratio, 4),
+            'min_valid': self.min_valid,
+            'truncated': self.truncated,
+            'seconds': round(self.seconds, 3),
+            'header': self.mapping.to_dict() if self.mapping else None,
+            'distribution': {field: dict(counts) for field, counts in self.distribution.items()},
+            'problems': dict(self.counts),
+            'errors': self.errors,
+        }
+
+
+def precheck(raw_path: str, min_valid: float = DEFAULT_MIN_VALID,
+             max_rows: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> PrecheckReport:
+    """Stream ``raw_path`` through the ETL's mapping and validation rules."""
+    start = time.perf_counter()
+    raw_path = find_input(raw_path)
+    report = PrecheckReport(min_valid)
+    seen = NpsnSet()
+    batches = iter_line_batches(raw_path, chunk_size)
+    first = next(batches, None)
+    if first is not None:
+        number, lines = first
+        report.mapping = HeaderMapping(parse_csv_line(lines[0]))
+        first = (number + 1, lines[1:])
+    if report.mapping is None or report.mapping.unmapped_required:
+        # Every row would fail SCHEMA.validateRecord; nothing to stream
+        report.seconds = time.perf_counter() - start
+        return report
+
+    mapping = report.mapping
+    validate = compile_validator(FIELDS)
+    distribution = [(FIELDS.index(field), counts) for field, counts in report.distribution.items()]
+    for number, lines in itertools.chain([first], batches):
+        if max_rows is not None and report.rows + len(lines) > max_rows:
+            lines = lines[:max_rows - report.rows]
+            report.truncated = True
+        report.rows += len(lines)
+        for number, line, values in zip(itertools.count(number), lines, parse_csv_lines(lines)):
+            # Printable ASCII with no space runs (once quotes are gone) is
+            # something sanitize() leaves as it is
+            clean = line.isascii() and line.isprintable() and '  ' not in line.replace('"', '')
+            record = mapping.normalise(values, clean)
+            problems = validate(record)
+            npsn = record[_NPSN]
+            if problems:
+                report.rejected += 1
+                for problem, detail in problems:
+                    report.add(problem, f"line {number} ({npsn or 'N/A'}): {detail}")
+                continue
+            for index, counts in distribution:
+                if record[index]:
+                    counts[record[index]] += 1
+            if not seen.add(npsn):
+                report.duplicates += 1
+                report.add('duplicate_npsn', f"line {number}: {npsn}")
+                continue
+            report.kept += 1
+        if report.truncated:
+            break
+    report.bytes_read = os.path.getsize(raw_path)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: PrecheckReport, raw_path: str) -> None:
+    mapping = report.mapping
+    if mapping is None:
+        print(f"{raw_path}: empty file")
+        print("  ✗ The ETL would find no records")
+        return
+    print(f"{raw_path}: {report.rows} rows in {report.seconds:.2f}s"
+          f"{' (stopped at --max-rows)' if report.truncated else ''}")
+    for field, sources in mapping.sources.items():
+        names = ', '.join(name for name, _ in sources) or '(no column)'
+        print(f"  {field:<18} <- {names}")
+    if mapping.ignored_columns:
+        print(f"  ignored columns: {', '.join(mapping.ignored_columns)}")
+    if mapping.unmapped_required:
+        print(f"  ✗ No column for required field(s): {', '.join(mapping.unmapped_required)}")
+        print("  ✗ Not worth starting: the ETL would reject every row")
+        return
+    print(f"  kept {report.kept}, rejected {report.rejected}, duplicate NPSN {report.duplicates} "
+          f"({report.valid_ratio:.1%} valid)")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+    if report.worth_starting:
+        print(f"  ✓ Worth starting the ETL (at least {report.min_valid:.0%} valid)")
+    else:
+        print(f"  ✗ Not worth starting the ETL (needs at least {report.min_valid:.0%} valid)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-validate a raw dump before running the ETL')
+    parser.add_argument('--raw', default=os.environ.get('RAW_DATA_PATH') or DEFAULT_RAW_PATH,
+                        help='Raw CSV (default: RAW_DATA_PATH or external/raw.csv)')
+    parser.add_argument('--min-valid', type=float, default=DEFAULT_MIN_VALID,
+                        help='Fraction of rows the ETL must keep (default: 0.9)')
+    parser.add_argument('--max-rows', type=int, help='Stop after this many data rows')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Read size in bytes')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.raw = find_input(args.raw)
+
+    if not os.path.exists(args.raw):
+        print(f"raw data not found: {args.raw}", file=sys.stderr)
+        sys.exit(2)
+    report = precheck(args.raw, args.min_valid, args.max_rows, args.chunk_size)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.raw)
+    sys.exit(0 if report.worth_starting else 1)
+
+
+if __name__ == '__main__':
+    main()
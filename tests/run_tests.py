@@ -3,10 +3,23 @@
 Standalone test runner for sekolah-pseo Python tests.
 Runs without pytest - uses only Python standard library.
 
+data/schools.csv and external/raw.csv are read from a compressed copy
+(schools.csv.gz, .bz2, .xz, or .zst with zstandard installed) when the
+plain file is absent, decompressed while streaming (tests/compressed.py).
+
 Usage:
     python3 tests/run_tests.py              # Run all tests
     python3 tests/run_tests.py -v           # Verbose output
     python3 tests/run_tests.py --json       # JSON output for CI
+    python3 tests/run_tests.py --columnar   # Vectorized data checks (NumPy)
+    python3 tests/run_tests.py --jobs 4     # Run independent tests concurrently
+    python3 tests/run_tests.py --no-dataset-cache  # Stream schools.csv, skip the cache
+    python3 tests/run_tests.py --incremental  # Re-check only rows changed since last run
+    python3 tests/run_tests.py --workers 16  # Validate schools.csv byte ranges in 16 processes
+    python3 tests/run_tests.py --changed-since origin/main  # Only groups whose inputs changed
+    python3 tests/run_tests.py --watch      # Stay resident; re-run what each save affects
+    python3 tests/run_tests.py --profile --json  # Per-test CPU, memory and hotspots
+    python3 tests/run_tests.py --profile-dir .cache/profiles  # Also dump pstats per test
 """
 
 import os
@@ -16,50 +29,139 @@ import time
 import csv
 import traceback
 import argparse
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.data_checks import (  # noqa: E402
+    ColumnarValidator,
+    StreamingValidator,
+    ValidationReport,
+    default_checks,
+)
+from tests.dataset import load_schools  # noqa: E402
+from tests.enrichment_audit import audit_enrichment  # noqa: E402
+from tests.impact import ImpactPlan  # noqa: E402
+from tests.incremental import IncrementalValidator  # noqa: E402
+from tests.parallel_csv import ParallelValidator  # noqa: E402
+from tests.path_collisions import find_collisions  # noqa: E402
+from tests.profiling import Measurement, measure  # noqa: E402
+from tests.raw_precheck import precheck  # noqa: E402
+from tests.schema_validator import load_schema, validate_csv  # noqa: E402
+from tests.search_payload import validate_payload  # noqa: E402
+from tests.watch import MtimePoller, ResidentSchools  # noqa: E402
 
 
 class TestResult:
     """Represents a single test result."""
     
     def __init__(self, name: str, passed: bool, duration: float = 0.0, 
-                 error: Optional[str] = None):
+                 error: Optional[str] = None,
+                 measurement: Optional[Measurement] = None):
         self.name = name
         self.passed = passed
         self.duration = duration
         self.error = error
+        self.measurement = measurement
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             'name': self.name,
             'passed': self.passed,
             'duration': round(self.duration, 4),
             'error': self.error
         }
+        if self.measurement:
+            data.update(self.measurement.to_dict())
+        return data
+
+
+PendingTest = Tuple[str, Callable, tuple, dict]
 
 
 class TestSuite:
-    """Manages and runs tests."""
+    """Manages and runs tests.
     
-    def __init__(self):
+    With ``jobs`` > 1, ``run_test`` only registers the test; ``run_pending``
+    then executes everything on a thread pool. Tests registered with the
+    same ``group`` run sequentially on one worker, so state they share
+    (such as a parsed dataset) is built once and never raced on. Results
+    are always recorded in registration order.
+    
+    With ``profile`` each test also records tracemalloc peak memory and its
+    cProfile hotspots (dumped to ``profile_dir`` when given). Both tools
+    are process-wide, so profiling always runs one test at a time.
+    """
+    
+    def __init__(self, jobs: int = 1, profile: bool = False,
+                 profile_dir: Optional[str] = None):
         self.results: List[TestResult] = []
         self.setup_failed = False
-    
-    def run_test(self, name: str, test_func, *args, **kwargs) -> TestResult:
-        """Run a single test and record result."""
-        start = time.time()
-        try:
-            test_func(*args, **kwargs)
-            duration = time.time() - start
-            result = TestResult(name, True, duration)
-        except Exception as e:
-            duration = time.time() - start
-            error_msg = f"{type(e).__name__}: {str(e)}"
-            result = TestResult(name, False, duration, error_msg)
+        self.profile = profile or bool(profile_dir)
+        self.profile_dir = profile_dir
+        self.jobs = 1 if self.profile else max(1, jobs)
+        self.wall_duration = 0.0
+        self.skipped: Dict[str, str] = {}
+        self._pending: List[Tuple[Optional[str], PendingTest]] = []
+        self._started = time.perf_counter()
+    
+    def _execute(self, name: str, test_func, args: tuple, kwargs: dict) -> TestResult:
+        error, measurement = measure(lambda: test_func(*args, **kwargs),
+                                     self.profile, self.profile_dir, name)
+        duration = measurement.duration_ns / 1e9
+        if error is None:
+            return TestResult(name, True, duration, measurement=measurement)
+        error_msg = f"{type(error).__name__}: {str(error)}"
+        return TestResult(name, False, duration, error_msg, measurement)
+    
+    def run_test(self, name: str, test_func, *args,
+                 group: Optional[str] = None, **kwargs) -> Optional[TestResult]:
+        """Run a single test and record result.
         
+        When running in parallel the test is queued and None is returned;
+        its result is recorded by ``run_pending``.
+        """
+        if self.jobs > 1:
+            self._pending.append((group, (name, test_func, args, kwargs)))
+            return None
+        result = self._execute(name, test_func, args, kwargs)
         self.results.append(result)
         return result
     
+    def run_pending(self) -> None:
+        """Execute queued tests on the pool and record their results."""
+        pending, self._pending = self._pending, []
+        units: List[List[int]] = []
+        by_group: Dict[str, List[int]] = {}
+        for index, (group, _) in enumerate(pending):
+            if group is None:
+                units.append([index])
+            elif group in by_group:
+                by_group[group].append(index)
+            else:
+                by_group[group] = [index]
+                units.append(by_group[group])
+        
+        slots: List[Optional[TestResult]] = [None] * len(pending)
+        
+        def run_unit(indexes: List[int]) -> None:
+            for index in indexes:
+                slots[index] = self._execute(*pending[index][1])
+        
+        # Largest groups first so a long dataset group never starts last
+        units.sort(key=len, reverse=True)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for future in [pool.submit(run_unit, unit) for unit in units]:
+                future.result()
+        self.results.extend(slots)
+    
+    def finish(self) -> None:
+        """Run anything still queued and record total wall-clock time."""
+        self.run_pending()
+        self.wall_duration = time.perf_counter() - self._started
+    
     def assert_true(self, condition: bool, message: str = ""):
         """Assert that condition is True."""
         if not condition:
@@ -99,7 +201,13 @@ class TestSuite:
             'passed': passed,
             'failed': failed,
             'success_rate': round(passed / len(self.results) * 100, 2) if self.results else 0,
-            'total_duration': round(total_duration, 4)
+            'total_duration': round(total_duration, 4),
+            'wall_duration': round(self.wall_duration, 4),
+            'cpu_time': round(sum(r.measurement.cpu_time_ns for r in self.results
+                                  if r.measurement) / 1e9, 4),
+            'jobs': self.jobs,
+            'profile': self.profile,
+            'skipped_groups': len(self.skipped)
         }
 
 
@@ -137,7 +245,7 @@ def run_project_structure_tests(suite: TestSuite, root: str) -> None:
     suite.run_test(
         "schools.csv data file exists",
         lambda: suite.assert_true(
-            os.path.exists(os.path.join(root, 'data', 'schools.csv')),
+            os.path.exists(find_input(os.path.join(root, 'data', 'schools.csv'))),
             "schools.csv should exist in data/"
         )
     )
@@ -209,8 +317,15 @@ def run_github_workflows_tests(suite: TestSuite, root: str) -> None:
     )
 
 
-def run_data_validation_tests(suite: TestSuite, root: str) -> None:
-    """Run data validation tests."""
+def run_data_validation_tests(suite: TestSuite, root: str,
+                              dataset_cache: bool = True,
+                              resident: Optional[ResidentSchools] = None) -> None:
+    """Run data validation tests.
+    
+    With ``resident`` (watch mode) the schema and path-collision reports
+    come from the resident per-row state, and the other checks load the
+    resident dataset instead of parsing schools.csv.
+    """
     
     suite.run_test(
         "external/ directory exists",
@@ -238,36 +353,69 @@ def run_data_validation_tests(suite: TestSuite, root: str) -> None:
     
     suite.run_test("dist/ directory can be created", test_dist_directory_creation)
     
+    data_path = find_input(os.path.join(root, 'data', 'schools.csv'))
+    
     def test_schools_csv_structure():
-        import csv
-        data_path = os.path.join(root, 'data', 'schools.csv')
         if not os.path.exists(data_path):
             return  # Skip if no data
         
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        
-        if not rows:
+        dataset = load_schools(data_path, use_disk_cache=dataset_cache)
+        if not len(dataset):
             return  # Skip if empty
         
-        required_columns = ['npsn', 'nama', 'provinsi', 'kab_kota', 'kecamatan']
-        first_row = rows[0]
-        
-        for col in required_columns:
-            suite.assert_in(col, first_row, f"Required column '{col}' should exist")
+        for col in load_schema().required_school_fields:
+            suite.assert_in(col, dataset.fieldnames, f"Required column '{col}' should exist")
     
-    suite.run_test("schools.csv has required columns", test_schools_csv_structure)
+    suite.run_test("schools.csv has required columns", test_schools_csv_structure,
+                   group=data_path)
+
+    def test_page_paths_unique():
+        if not os.path.exists(data_path):
+            return  # Skip if no data
+        report = resident.collision_report() if resident else find_collisions(data_path)
+        suite.assert_true(report.passed, '; '.join(report.errors))
+
+    suite.run_test("Generated page paths do not collide", test_page_paths_unique,
+                   group=data_path)
 
+    def test_schema_valid():
+        if not os.path.exists(data_path):
+            return  # Skip if no data
+        report = resident.schema_report() if resident else validate_csv(data_path)
+        suite.assert_true(report.passed, '; '.join(report.errors))
 
-# Indonesia geographic bounds (from scripts/config.js)
-INDONESIA_LAT_MIN = -11
-INDONESIA_LAT_MAX = 6
-INDONESIA_LON_MIN = 95
-INDONESIA_LON_MAX = 141
+    suite.run_test("schools.csv rows pass data-schema.js validation", test_schema_valid,
+                   group=data_path)
+    
+    payload_path = os.path.join(root, 'dist', 'schools.json')
+    
+    def test_search_payload():
+        if not os.path.exists(payload_path) or not os.path.exists(data_path):
+            return  # Skip until a build has produced the payload
+        report = validate_payload(payload_path, data_path)
+        suite.assert_true(report.passed, '; '.join(report.errors))
+    
+    suite.run_test("schools.json search payload matches schools.csv", test_search_payload,
+                   group=data_path)
+    
+    store_path = os.path.join(root, 'data', 'enrichment.json')
+    
+    def test_enrichment_store():
+        if not os.path.exists(store_path) or not os.path.exists(data_path):
+            return  # Skip until an ETL run with --enrich has saved enrichment
+        report = audit_enrichment(store_path, data_path)
+        suite.assert_true(report.passed, '; '.join(report.errors))
+    
+    suite.run_test("enrichment.json entries match schools.csv", test_enrichment_store,
+                   group=data_path)
 
 
-def run_functional_data_tests(suite: TestSuite, root: str) -> None:
+def run_functional_data_tests(suite: TestSuite, root: str,
+                              columnar: bool = False,
+                              dataset_cache: bool = True,
+                              incremental: bool = False,
+                              workers: int = 1,
+                              resident: Optional[ResidentSchools] = None) -> None:
     """Run functional data validation tests beyond basic structure.
     
     These tests validate actual data quality:
@@ -276,8 +424,37 @@ def run_functional_data_tests(suite: TestSuite, root: str) -> None:
     - Coordinate bounds checking
     - NPSN uniqueness
     - Field completeness metrics
+    
+    schools.csv is streamed once through every check in tests/data_checks.py;
+    each test below only reports the verdict of its check. With
+    ``columnar`` the checks run as NumPy column operations when available.
+    With ``incremental`` only rows changed since the previous run are
+    re-checked (tests/incremental.py). With ``workers`` > 1 byte ranges of
+    the file are checked in that many processes (tests/parallel_csv.py).
+    With ``resident`` (watch mode) the verdicts are rebuilt from the
+    resident per-row outcomes (tests/watch.py). Otherwise rows come from the shared
+    cached dataset (tests/dataset.py), or straight from the file when
+    ``dataset_cache`` is off.
     """
-    data_path = os.path.join(root, 'data', 'schools.csv')
+    data_path = find_input(os.path.join(root, 'data', 'schools.csv'))
+    cache: Dict[str, ValidationReport] = {}
+    
+    def report() -> ValidationReport:
+        if 'report' not in cache:
+            if resident is not None:
+                cache['report'] = resident.report()
+            elif incremental:
+                cache['report'], _ = IncrementalValidator().run(data_path)
+            elif workers > 1:
+                cache['report'] = ParallelValidator(workers=workers).run(data_path)
+            elif columnar:
+                cache['report'] = ColumnarValidator(default_checks()).run(data_path)
+            elif dataset_cache:
+                dataset = load_schools(data_path)
+                cache['report'] = StreamingValidator(default_checks()).run_dataset(dataset)
+            else:
+                cache['report'] = StreamingValidator(default_checks()).run(data_path)
+        return cache['report']
     
     # Test 1: ETL Output Validation
     def test_etl_output_exists():
@@ -285,165 +462,15 @@ def run_functional_data_tests(suite: TestSuite, root: str) -> None:
     
     suite.run_test("ETL output file exists", test_etl_output_exists)
     
-    def test_etl_output_has_content():
-        if not os.path.exists(data_path):
-            return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-        suite.assert_true(len(rows) > 1, f"schools.csv should have data rows, found {len(rows)}")
-    
-    suite.run_test("ETL output has content", test_etl_output_has_content)
-    
-    # Test 2: CSV Schema Validation
-    def test_csv_all_required_columns():
-        if not os.path.exists(data_path):
-            return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            headers = reader.fieldnames or []
-        required_cols = ['npsn', 'nama', 'bentuk_pendidikan', 'status', 
-                        'alamat', 'kelurahan', 'kecamatan', 'kab_kota', 
-                        'provinsi', 'lat', 'lon', 'updated_at']
-        for col in required_cols:
-            suite.assert_in(col, headers, f"Required column '{col}' should exist")
-    
-    suite.run_test("CSV has all required columns", test_csv_all_required_columns)
-    
-    def test_csv_lat_lon_numeric():
-        if not os.path.exists(data_path):
-            return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        if not rows:
-            return
-        for row in rows[:10]:
-            lat = row.get('lat', '').strip()
-            lon = row.get('lon', '').strip()
-            if lat:
-                try:
-                    float(lat)
-                except ValueError:
-                    suite.assert_true(False, f"lat '{lat}' should be numeric")
-            if lon:
-                try:
-                    float(lon)
-                except ValueError:
-                    suite.assert_true(False, f"lon '{lon}' should be numeric")
-    
-    suite.run_test("CSV lat/lon are numeric", test_csv_lat_lon_numeric)
-    
-    # Test 3: Coordinate Bounds Validation
-    def test_coordinates_within_indonesia_bounds():
-        if not os.path.exists(data_path):
-            return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        if not rows:
-            return
-        invalid_coords = []
-        for row in rows:
-            lat_str = row.get('lat', '').strip()
-            lon_str = row.get('lon', '').strip()
-            if lat_str and lon_str:
-                try:
-                    lat = float(lat_str)
-                    lon = float(lon_str)
-                    if not (INDONESIA_LAT_MIN <= lat <= INDONESIA_LAT_MAX):
-                        invalid_coords.append(f"lat {lat} out of bounds")
-                    if not (INDONESIA_LON_MIN <= lon <= INDONESIA_LON_MAX):
-                        invalid_coords.append(f"lon {lon} out of bounds")
-                except ValueError:
-                    pass
-        total_with_coords = sum(1 for r in rows if r.get('lat') and r.get('lon'))
-        if invalid_coords:
-            invalid_count = len(invalid_coords)
-            suite.assert_true(
-                invalid_count <= total_with_coords * 0.05,
-                f"Too many invalid coordinates: {invalid_count}/{total_with_coords}. "
-                f"Sample: {invalid_coords[:5]}"
-            )
-    
-    suite.run_test("Coordinates within Indonesia bounds", test_coordinates_within_indonesia_bounds)
-    
-    # Test 4: NPSN Uniqueness
-    def test_npsn_uniqueness():
-        if not os.path.exists(data_path):
-            return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        if not rows:
-            return
-        npsn_values = []
-        for row in rows:
-            npsn = row.get('npsn', '').strip()
-            if npsn:
-                npsn_values.append(npsn)
-        unique_npsn = set(npsn_values)
-        duplicates = len(npsn_values) - len(unique_npsn)
-        total_npsn = len(npsn_values)
-        if duplicates > 0:
-            dup_pct = (duplicates / total_npsn) * 100 if total_npsn > 0 else 0
-            suite.assert_true(
-                dup_pct <= 1.0,
-                f"Found {duplicates} duplicate NPSN values ({dup_pct:.2f}% of total)"
-            )
-    
-    suite.run_test("NPSN values are unique", test_npsn_uniqueness)
-    
-    # Test 5: Field Completeness
-    def test_required_fields_not_empty():
+    # Tests 2-6: schema, coordinates, NPSN and completeness checks
+    def check_passes(name: str):
         if not os.path.exists(data_path):
             return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        if not rows:
-            return
-        required_fields = ['npsn', 'nama', 'provinsi', 'kab_kota']
-        empty_counts = {field: 0 for field in required_fields}
-        for row in rows:
-            for field in required_fields:
-                value = row.get(field, '').strip()
-                if not value:
-                    empty_counts[field] += 1
-        total_rows = len(rows)
-        for field, empty_count in empty_counts.items():
-            empty_pct = (empty_count / total_rows) * 100 if total_rows > 0 else 0
-            suite.assert_true(
-                empty_pct <= 10.0,
-                f"Field '{field}' has {empty_count} empty values ({empty_pct:.2f}%)"
-            )
+        error = report().error_for(name)
+        suite.assert_true(error is None, error or "")
     
-    suite.run_test("Required fields have data", test_required_fields_not_empty)
-    
-    # Test 6: NPSN is Numeric
-    def test_npsn_is_numeric():
-        if not os.path.exists(data_path):
-            return
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        if not rows:
-            return
-        non_numeric_npsn = []
-        for row in rows:
-            npsn = row.get('npsn', '').strip()
-            if npsn and not npsn.isdigit():
-                non_numeric_npsn.append(npsn)
-        total_npsn = len(rows)
-        non_numeric_count = len(non_numeric_npsn)
-        non_numeric_pct = (non_numeric_count / total_npsn) * 100 if total_npsn > 0 else 0
-        suite.assert_true(
-            non_numeric_pct <= 1.0,
-            f"Found {non_numeric_count} non-numeric NPSN values ({non_numeric_pct:.2f}% of total). "
-            f"Sample: {non_numeric_npsn[:5]}"
-        )
-    
-    suite.run_test("NPSN values are numeric", test_npsn_is_numeric)
+    for check in default_checks():
+        suite.run_test(check.name, check_passes, check.name, group=data_path)
     
     # Test 7: Error Handling
     def test_handles_malformed_csv():
@@ -465,39 +492,85 @@ def run_functional_data_tests(suite: TestSuite, root: str) -> None:
     suite.run_test("Handles malformed CSV gracefully", test_handles_malformed_csv)
 
 
-def run_all_tests(root: str) -> TestSuite:
-    """Run all tests and return results."""
-    suite = TestSuite()
+def run_raw_data_tests(suite: TestSuite, root: str) -> None:
+    """Pre-check external/raw.csv the way scripts/etl.js will read it."""
+    
+    raw_path = find_input(os.path.join(root, 'external', 'raw.csv'))
+    
+    def test_raw_precheck():
+        if not os.path.exists(raw_path):
+            return  # Skip until a raw dump has been fetched
+        report = precheck(raw_path)
+        suite.assert_true(report.worth_starting,
+                          f"{report.valid_ratio:.1%} of raw rows valid. " + '; '.join(report.errors))
+    
+    suite.run_test("external/raw.csv is worth running the ETL on", test_raw_precheck)
+
+
+def run_all_tests(root: str, columnar: bool = False, jobs: int = 1,
+                  dataset_cache: bool = True, incremental: bool = False,
+                  profile: bool = False, profile_dir: Optional[str] = None,
+                  workers: int = 1, changed_since: Optional[str] = None,
+                  plan: Optional[ImpactPlan] = None,
+                  resident: Optional[ResidentSchools] = None) -> TestSuite:
+    """Run all tests and return results.
+    
+    With ``changed_since`` (or a ready ``plan``) only the groups whose
+    inputs changed run (tests/impact.py); the others are recorded in
+    ``suite.skipped`` with the reason. ``resident`` serves the schools.csv
+    checks from the watch mode's in-memory state.
+    """
+    suite = TestSuite(jobs=jobs, profile=profile, profile_dir=profile_dir)
+    if plan is None and changed_since:
+        plan = ImpactPlan(root, changed_since)
     
     print("=" * 60)
     print("SEKOLAH-PSEO TEST SUITE")
     print("=" * 60)
     print()
     
+    def start(group: str) -> bool:
+        if plan is None:
+            print(f"Running {group}...")
+            return True
+        run, reason = plan.decisions[group]
+        if run:
+            print(f"Running {group} ({reason})...")
+        else:
+            print(f"Skipping {group}: {reason}")
+            suite.skipped[group] = reason
+        return run
+    
     # Project Structure Tests
-    print("Running Project Structure Tests...")
-    run_project_structure_tests(suite, root)
+    if start("Project Structure Tests"):
+        run_project_structure_tests(suite, root)
     
     # Configuration Tests
-    print("Running Configuration Tests...")
-    run_configuration_tests(suite, root)
+    if start("Configuration Tests"):
+        run_configuration_tests(suite, root)
     
     # JavaScript Tests Check
-    print("Running JavaScript Tests Check...")
-    run_javascript_tests_check(suite, root)
+    if start("JavaScript Tests Check"):
+        run_javascript_tests_check(suite, root)
     
     # GitHub Workflows Tests
-    print("Running GitHub Workflows Tests...")
-    run_github_workflows_tests(suite, root)
+    if start("GitHub Workflows Tests"):
+        run_github_workflows_tests(suite, root)
     
     # Data Validation Tests
-    print("Running Data Validation Tests...")
-    run_data_validation_tests(suite, root)
+    if start("Data Validation Tests"):
+        run_data_validation_tests(suite, root, dataset_cache, resident)
     
     # Functional Data Tests (Issue #294 - Expanded Python test coverage)
-    print("Running Functional Data Tests...")
-    run_functional_data_tests(suite, root)
+    if start("Functional Data Tests"):
+        run_functional_data_tests(suite, root, columnar, dataset_cache, incremental, workers,
+                                  resident)
+    
+    # Raw Data Tests
+    if start("Raw Data Tests"):
+        run_raw_data_tests(suite, root)
     
+    suite.finish()
     return suite
     print("Running Data Validation Tests...")
     run_data_validation_tests(suite, root)
@@ -505,6 +578,19 @@ def run_all_tests(root: str) -> TestSuite:
     return suite
 
 
+def print_measurement(measurement: Optional[Measurement]) -> None:
+    """Print profiling details for one test (only present with --profile)."""
+    if not measurement or measurement.memory_peak is None:
+        return
+    print(f"    CPU {measurement.cpu_time_ns / 1e9:.4f}s, "
+          f"peak memory {measurement.memory_peak / 1024:.1f} KiB, "
+          f"{measurement.memory_blocks} blocks held")
+    for spot in measurement.hotspots or []:
+        print(f"      {spot['own_time']:.4f}s own, {spot['calls']} calls  {spot['function']}")
+    if measurement.profile_path:
+        print(f"    Profile: {measurement.profile_path}")
+
+
 def print_results(suite: TestSuite, verbose: bool = False) -> None:
     """Print test results."""
     summary = suite.get_summary()
@@ -520,6 +606,7 @@ def print_results(suite: TestSuite, verbose: bool = False) -> None:
             print(f"{status} {result.name} ({result.duration:.4f}s)")
             if result.error:
                 print(f"    Error: {result.error}")
+            print_measurement(result.measurement)
     else:
         failed_tests = [r for r in suite.results if not r.passed]
         if failed_tests:
@@ -528,13 +615,23 @@ def print_results(suite: TestSuite, verbose: bool = False) -> None:
                 print(f"  ✗ {result.name}")
                 print(f"    Error: {result.error}")
     
+    if suite.skipped:
+        print("\nSkipped Groups:")
+        for group, reason in suite.skipped.items():
+            print(f"  - {group}: {reason}")
+    
     print()
     print("-" * 60)
     print(f"Total:    {summary['total']}")
     print(f"Passed:   {summary['passed']}")
     print(f"Failed:   {summary['failed']}")
+    if summary['skipped_groups']:
+        print(f"Skipped:  {summary['skipped_groups']} group(s)")
     print(f"Success:  {summary['success_rate']}%")
     print(f"Duration: {summary['total_duration']:.4f}s")
+    print(f"CPU:      {summary['cpu_time']:.4f}s")
+    if summary['jobs'] > 1:
+        print(f"Wall:     {summary['wall_duration']:.4f}s ({summary['jobs']} jobs)")
     print("-" * 60)
     
     if summary['failed'] == 0:
@@ -544,6 +641,49 @@ def print_results(suite: TestSuite, verbose: bool = False) -> None:
     print("=" * 60)
 
 
+def watch_cycle(root: str, poller: MtimePoller, resident: ResidentSchools,
+                **options) -> Optional[TestSuite]:
+    """Re-run the groups affected by the files changed since the last poll.
+    
+    Returns None when nothing changed.
+    """
+    changes = poller.poll()
+    if not changes:
+        return None
+    delta = resident.refresh()
+    if delta and delta.full:
+        print(f"schools.csv re-parsed: {delta.added} rows")
+    elif delta:
+        print(f"schools.csv: {delta.removed} row(s) from row {delta.first + 1} "
+              f"replaced by {delta.added}")
+    plan = ImpactPlan(root, 'the last run', changes=changes)
+    return run_all_tests(root, plan=plan, resident=resident, **options)
+
+
+def watch_tests(root: str, emit: Callable[[TestSuite], None], interval: float = 0.5,
+                **options) -> None:
+    """Run every test once, then re-run what each change affects until interrupted.
+    
+    schools.csv stays parsed in memory with its per-row check outcomes
+    (tests/watch.py); a save re-validates only the rows it changed.
+    """
+    poller = MtimePoller(root)
+    resident = ResidentSchools(find_input(os.path.join(root, 'data', 'schools.csv')))
+    resident.refresh()
+    emit(run_all_tests(root, resident=resident, **options))
+    print(f"Watching {', '.join(poller.patterns)} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            started = time.perf_counter()
+            suite = watch_cycle(root, poller, resident, **options)
+            if suite is not None:
+                emit(suite)
+                print(f"Re-checked in {time.perf_counter() - started:.3f}s")
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Run sekolah-pseo Python tests without pytest'
@@ -552,6 +692,33 @@ def main():
                         help='Verbose output - show all test results')
     parser.add_argument('--json', action='store_true',
                         help='Output results as JSON')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Run data checks as NumPy column operations '
+                             '(falls back to streaming when NumPy is missing)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Run independent tests concurrently on N worker threads')
+    parser.add_argument('--no-dataset-cache', action='store_true',
+                        help='Stream schools.csv directly instead of loading the '
+                             'cached dataset snapshot')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-check only schools.csv rows changed since the last '
+                             'incremental run')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Validate schools.csv as byte ranges in N worker processes')
+    parser.add_argument('--changed-since', metavar='REV',
+                        help='Only run test groups whose inputs changed since this git '
+                             'revision; report the skipped groups and why')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep schools.csv parsed in memory and re-run the tests '
+                             'affected by each change to the watched inputs')
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help='Seconds between mtime polls in --watch mode')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record peak memory (tracemalloc) and cProfile hotspots '
+                             'per test; runs tests one at a time')
+    parser.add_argument('--profile-dir',
+                        help='Write a pstats dump per test to this directory '
+                             '(implies --profile)')
     parser.add_argument('--exit-code', action='store_true', default=True,
                         help='Exit with non-zero code if tests fail')
     
@@ -559,17 +726,33 @@ def main():
     
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
-    try:
-        suite = run_all_tests(root)
-        
+    if (args.profile or args.profile_dir) and args.jobs > 1:
+        print("Profiling runs tests one at a time; ignoring --jobs", file=sys.stderr)
+    
+    def emit(suite: TestSuite) -> None:
         if args.json:
             output = {
                 'results': [r.to_dict() for r in suite.results],
-                'summary': suite.get_summary()
+                'summary': suite.get_summary(),
+                'skipped': suite.skipped
             }
             print(json.dumps(output, indent=2))
         else:
             print_results(suite, args.verbose)
+    
+    options = dict(columnar=args.columnar, jobs=args.jobs,
+                   dataset_cache=not args.no_dataset_cache,
+                   incremental=args.incremental,
+                   profile=args.profile, profile_dir=args.profile_dir,
+                   workers=args.workers)
+    
+    try:
+        if args.watch:
+            watch_tests(root, emit, args.interval, **options)
+            sys.exit(0)
+        
+        suite = run_all_tests(root, changed_since=args.changed_since, **options)
+        emit(suite)
         
         summary = suite.get_summary()
         if args.exit_code and summary['failed'] > 0:
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Schema-driven row validator compiled from src/core/data-schema.json.
+
+``scripts/export-schema.js`` writes the schema in data-schema.js (fields,
+patterns, allowed values, bounds, raw mappings) to data-schema.json, and
+this module is the Python side of it: ``load_schema`` reads the file and
+``compile_validator`` turns it into a function specialised for one column
+layout. The generated source has every field check unrolled with its
+column position, literal bounds, a precompiled pattern and a bound
+frozenset of allowed values, so a row costs no dict lookups and no
+per-field dispatch. A single expression accepts valid rows; only rows
+that fail it are walked again to collect messages.
+
+The checks and messages are those of ``SCHEMA.validateRecord``: required
+fields non-empty and matching their pattern / allowed values, optional
+fields checked only when set, and fields with ``min``/``max`` (lat, lon)
+held to the strict coordinate pattern and bounds unless parseFloat reads
+them as zero, which means unset.
+
+Usage:
+    python3 tests/schema_validator.py                 # validate data/schools.csv
+    python3 tests/schema_validator.py --csv external/schools.csv --json
+    python3 tests/schema_validator.py --source        # print the generated validator
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import DEFAULT_SCHOOLS_PATH, ROOT, load_schools  # noqa: E402
+
+SCHEMA_JSON_PATH = os.path.join(ROOT, 'src', 'core', 'data-schema.json')
+SAMPLE_SIZE = 5
+
+# JavaScript's \s and String.prototype.trim() set (Python's differs: it
+# includes \x1c-\x1f and \x85 but not \ufeff)
+JS_WHITESPACE = ('\t\n\x0b\x0c\r \xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+                 '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000\ufeff')
+_JS_FLOAT_PREFIX = re.compile(r'[+-]?(?:Infinity|(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)')
+
+# (problem, message) pairs; an empty sequence means the row is valid
+Problems = Sequence[Tuple[str, str]]
+
+
+class Schema:
+    """data-schema.json as written by ``getSchemaInfo``."""
+
+    def __init__(self, info: Dict[str, Any]):
+        self.version: str = info['version']
+        self.fields: Dict[str, Dict[str, Any]] = {field['name']: field for field in info['fields']}
+        self.csv_field_order: Tuple[str, ...] = tuple(info['csvFieldOrder'])
+        self.required_fields: Tuple[str, ...] = tuple(info['requiredFields'])
+        self.required_school_fields: Tuple[str, ...] = tuple(info['requiredSchoolFields'])
+        self.bounds: Dict[str, float] = info['indonesiaBounds']
+        self.coordinate_pattern: str = info['coordinatePattern']
+
+    @property
+    def raw_mappings(self) -> Dict[str, Tuple[str, ...]]:
+        """Field -> raw column names, for fields the ETL maps from raw data."""
+        return {name: tuple(field['rawMappings']) for name, field in self.fields.items()
+                if field['rawMappings']}
+
+    @property
+    def allowed_values(self) -> Dict[str, Tuple[str, ...]]:
+        return {name: tuple(field['allowedValues']) for name, field in self.fields.items()
+                if field['allowedValues']}
+
+
+@lru_cache(maxsize=None)
+def load_schema(path: str = SCHEMA_JSON_PATH) -> Schema:
+    with open(path, encoding='utf-8') as f:
+        return Schema(json.load(f))
+
+
+def js_regex(source: str) -> re.Pattern:
+    """Compile a data-schema.js pattern with JavaScript's meaning.
+
+    ``\\d`` is ASCII-only in JavaScript, and ``$`` (without the m flag)
+    only matches at the very end of the string.
+    """
+    if source.endswith('$') and not source.endswith('\\$'):
+        source = source[:-1] + r'\Z'
+    return re.compile(source, re.ASCII)
+
+
+def js_parse_float_is_zero(value: str) -> bool:
+    """True when JavaScript's parseFloat(value) === 0."""
+    match = _JS_FLOAT_PREFIX.match(value.lstrip(JS_WHITESPACE))
+    return bool(match) and 'Infinity' not in match.group() and float(match.group()) == 0
+
+
+def compile_validator(fieldnames: Sequence[str],
+                      schema: Optional[Schema] = None) -> Callable[[Sequence[str]], Problems]:
+    """Generate ``validate(row) -> [(problem, message)]`` for rows laid out as ``fieldnames``.
+
+    Problems are ``missing_<field>``, ``malformed_<field>`` (pattern),
+    ``invalid_<field>`` (allowed values) and ``<field>_out_of_bounds``.
+    A field with no column reads as missing. The generated code is kept
+    on the function as ``source``.
+    """
+    schema = schema or load_schema()
+    position = {name: index for index, name in enumerate(fieldnames)}
+    names = list(schema.fields)
+    variable = {name: f"v{index}" for index, name in enumerate(names)}
+    bindings: Dict[str, Any] = {'_ws': JS_WHITESPACE, '_is_zero': js_parse_float_is_zero,
+                                '_coordinate': js_regex(schema.coordinate_pattern).match}
+
+    def pattern(name: str) -> Optional[str]:
+        source = schema.fields[name]['constraints'].get('pattern')
+        if source is None:
+            return None
+        bindings[f"_pattern_{name}"] = js_regex(source).match
+        return f"_pattern_{name}({variable[name]})"
+
+    def allowed(name: str) -> Optional[str]:
+        values = schema.fields[name]['allowedValues']
+        if not values:
+            return None
+        bindings[f"_allowed_{name}"] = frozenset(values)
+        return f"{variable[name]} in _allowed_{name}"
+
+    def in_bounds(name: str) -> Optional[str]:
+        constraints = schema.fields[name]['constraints']
+        if 'min' not in constraints or 'max' not in constraints:
+            return None
+        v = variable[name]
+        # A valid coordinate is never zero, so the zero test only runs on failures
+        return (f"(_coordinate({v}) and {constraints['min']!r} <= float({v}) "
+                f"<= {constraints['max']!r} or _is_zero({v}))")
+
+    def checks(name: str, required: bool) -> List[Tuple[str, str, str]]:
+        """(expression, problem, message) for a set value, in validateRecord's order."""
+        value = f'"{{{variable[name]}}}"'
+        field = schema.fields[name]
+        constraints = field['constraints']
+        listed = [
+            (pattern(name), f"malformed_{name}",
+             f'Field "{name}" value {value} does not match required pattern'),
+            (allowed(name), f"invalid_{name}",
+             f'Field "{name}" has invalid value {value}; '
+             f"allowed: {', '.join(field['allowedValues'] or ())}"),
+        ]
+        if not required:
+            listed.reverse()
+            listed.append((in_bounds(name), f"{name}_out_of_bounds",
+                           f'Field "{name}" value {value} outside Indonesia bounds '
+                           f"[{constraints.get('min')}, {constraints.get('max')}]"))
+        return [check for check in listed if check[0]]
+
+    required = list(schema.required_fields)
+    optional = [(name, checks(name, False)) for name in names if name not in required]
+    checked = set(required) | {name for name, listed in optional if listed}
+    body = [f"    {variable[name]} = row[{position[name]}].strip(_ws)" if name in position
+            else f"    {variable[name]} = ''" for name in names if name in checked]
+
+    accept = []
+    for name in required:
+        accept.append(variable[name])
+        accept.extend(expression for expression, _, _ in checks(name, True))
+    for name, listed in optional:
+        if listed:
+            accept.append(f"(not {variable[name]} or "
+                          f"{' and '.join(expression for expression, _, _ in listed)})")
+    body.append("    if (" + "\n            and ".join(accept) + "):")
+    body.append("        return ()")
+    body.append("    errors = []")
+
+    def report(listed: List[Tuple[str, str, str]]) -> None:
+        for expression, problem, message in listed:
+            body.append(f"        if not ({expression}):")
+            body.append(f"            errors.append(({problem!r}, f{message!r}))")
+
+    for name in required:
+        body.append(f"    if not {variable[name]}:")
+        body.append(f"        errors.append(('missing_{name}', 'Missing required field \"{name}\"'))")
+        listed = checks(name, True)
+        if listed:
+            body.append("    else:")
+            report(listed)
+    for name, listed in optional:
+        if listed:
+            body.append(f"    if {variable[name]}:")
+            report(listed)
+    body.append("    return errors")
+
+    signature = ', '.join(['row'] + [f"{name}={name}" for name in bindings])
+    source = f"def validate({signature}):\n" + '\n'.join(body) + '\n'
+    namespace: Dict[str, Any] = dict(bindings)
+    exec(compile(source, f"<schema {schema.version} validator>", 'exec'), namespace)
+    validate = namespace['validate']
+    validate.source = source
+    return validate
+
+
+class SchemaReport:
+    """Rows of a CSV that SCHEMA.validateRecord would reject."""
+
+    def __init__(self):
+        self.rows = 0
+        self.invalid = 0
+        self.seconds = 0.0
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, problem: str, sample: str) -> None:
+        self.counts[problem] += 1
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(sample)
+
+    @property
+    def passed(self) -> bool:
+        return not self.invalid
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{count} {problem.replace('_', ' ')}. Sample: {self.samples[problem]}"
+                for problem, count in sorted(self.counts.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'invalid': self.invalid,
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'problems': dict(self.counts),
+            'errors': self.errors,
+        }
+
+
+def validate_csv(csv_path: str, schema: Optional[Schema] = None) -> SchemaReport:
+    """Run the compiled validator over every row of ``csv_path``."""
+    start = time.perf_counter()
+    report = SchemaReport()
+    dataset = load_schools(csv_path)
+    validate = compile_validator(dataset.fieldnames, schema)
+    for row, record in enumerate(dataset.records, 2):
+        problems = validate(record)
+        if problems:
+            report.invalid += 1
+            for problem, message in problems:
+                report.add(problem, f"line {row}: {message}")
+    report.rows = len(dataset.records)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: SchemaReport, csv_path: str) -> None:
+    print(f"{csv_path}: {report.rows} rows validated in {report.seconds:.2f}s")
+    if report.passed:
+        print("  ✓ Every row passes the data-schema.js checks")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a CSV against data-schema.json')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='CSV to validate')
+    parser.add_argument('--schema', default=SCHEMA_JSON_PATH, help='Exported schema JSON')
+    parser.add_argument('--source', action='store_true',
+                        help='Print the validator generated for the CSV header and exit')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    for path, what in ((args.schema, 'schema'), (args.csv, 'CSV')):
+        if not os.path.exists(path):
+            print(f"{what} not found: {path}", file=sys.stderr)
+            sys.exit(2)
+    schema = load_schema(args.schema)
+    if args.source:
+        print(compile_validator(load_schools(args.csv).fieldnames, schema).source, end='')
+        return
+    report = validate_csv(args.csv, schema)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.csv)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite snapshot of data/schools.csv for grouped queries and checks.
+
+The CSV is bulk-loaded into a ``schools`` table (one TEXT column per CSV
+column, values trimmed like parseCsv, CSV order kept in ``rowid``) with
+``executemany`` in batched transactions, then indexed on npsn,
+(provinsi, kab_kota, kecamatan, bentuk_pendidikan) and bentuk_pendidikan.
+Region counts, lookups and hierarchy checks are then index scans instead
+of a full pass over 440k rows.
+
+The database lives next to the dataset snapshots (.cache/datasets/, or
+DATASET_CACHE_DIR) and is rebuilt with the same rules: reused while size
+and mtime match, re-validated by SHA-256 when only the mtime changed, and
+otherwise rebuilt into a temporary file that atomically replaces it.
+
+Grouping follows PageBuilder.groupSchoolsByProvince/Kabupaten/Kecamatan:
+exact (trimmed) names, and rows with an empty level are left out.
+
+Usage:
+    python3 tests/school_db.py counts provinsi
+    python3 tests/school_db.py counts kecamatan --provinsi "Jawa Barat" --kab-kota "Kota Bandung"
+    python3 tests/school_db.py lookup 20219344
+    python3 tests/school_db.py query "SELECT status, COUNT(*) FROM schools GROUP BY status" --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import (  # noqa: E402
+    DEFAULT_CACHE_DIR,
+    DEFAULT_SCHOOLS_PATH,
+    file_sha256,
+    load_schools,
+)
+
+DB_VERSION = 1
+BATCH_SIZE = 10000
+LEVELS = ('provinsi', 'kab_kota', 'kecamatan')
+INDEXES = {
+    'idx_schools_npsn': ('npsn',),
+    # bentuk_pendidikan last makes per-region bentuk counts covering-index scans
+    'idx_schools_region': LEVELS + ('bentuk_pendidikan',),
+    'idx_schools_bentuk': ('bentuk_pendidikan',),
+}
+
+
+def database_path(csv_path: str, cache_dir: Optional[str] = None) -> str:
+    """Cache location of the database built from ``csv_path``."""
+    cache_dir = cache_dir or os.environ.get('DATASET_CACHE_DIR') or DEFAULT_CACHE_DIR
+    key = hashlib.sha256(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(csv_path)}.{key}.sqlite")
+
+
+def quote(identifier: str) -> str:
+    """SQL identifier for a CSV column name."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _read_meta(db_path: str) -> Dict[str, str]:
+    try:
+        connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            return dict(connection.execute('SELECT key, value FROM meta'))
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return {}
+
+
+def build_database(csv_path: str, db_path: str, batch_size: int = BATCH_SIZE) -> None:
+    """Load ``csv_path`` into a fresh database at ``db_path`` (atomic replace)."""
+    dataset = load_schools(csv_path)
+    stat = os.stat(csv_path)
+    columns = dataset.fieldnames
+    missing = [level for level in ('npsn', 'bentuk_pendidikan') + LEVELS if level not in columns]
+    # Indexed columns always exist so the query API works on partial CSVs
+    all_columns = list(columns) + missing
+
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    temp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path, isolation_level=None)
+    try:
+        # The file only becomes visible after a complete build, so skip durability
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+        connection.execute('CREATE TABLE schools ({})'.format(
+            ', '.join(f"{quote(name)} TEXT NOT NULL DEFAULT ''" for name in all_columns)))
+        insert = 'INSERT INTO schools ({}) VALUES ({})'.format(
+            ', '.join(quote(name) for name in columns), ', '.join('?' * len(columns)))
+        records = dataset.records
+        for start in range(0, len(records), batch_size):
+            batch = [tuple(value.strip() for value in record)
+                     for record in records[start:start + batch_size]]
+            connection.execute('BEGIN')
+            connection.executemany(insert, batch)
+            connection.execute('COMMIT')
+        connection.execute('BEGIN')
+        for name, indexed in INDEXES.items():
+            connection.execute(f"CREATE INDEX {name} ON schools "
+                               f"({', '.join(quote(column) for column in indexed)})")
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', [
+            ('version', str(DB_VERSION)),
+            ('source', os.path.abspath(csv_path)),
+            ('size', str(stat.st_size)),
+            ('mtime_ns', str(stat.st_mtime_ns)),
+            ('sha256', file_sha256(csv_path)),
+            ('columns', json.dumps(columns)),
+        ])
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+    finally:
+        connection.close()
+    os.replace(temp_path, db_path)
+
+
+def ensure_database(csv_path: str, db_path: Optional[str] = None,
+                    rebuild: bool = False) -> Tuple[str, bool]:
+    """Return (database path, whether it was rebuilt) for an up-to-date database."""
+    csv_path = find_input(csv_path)
+    db_path = db_path or database_path(csv_path)
+    stat = os.stat(csv_path)
+    meta = {} if rebuild else _read_meta(db_path)
+    if meta.get('version') == str(DB_VERSION) and meta.get('size') == str(stat.st_size):
+        if meta.get('mtime_ns') == str(stat.st_mtime_ns):
+            return db_path, False
+        if meta.get('sha256') == file_sha256(csv_path):
+            connection = sqlite3.connect(db_path)
+            with connection:
+                connection.execute("UPDATE meta SET value = ? WHERE key = 'mtime_ns'",
+                                   (str(stat.st_mtime_ns),))
+            connection.close()
+            return db_path, False
+    build_database(csv_path, db_path)
+    return db_path, True
+
+
+class SchoolDB:
+    """Query API over the indexed snapshot. Rows come back as dicts."""
+
+    def __init__(self, db_path: str):
+        self.path = db_path
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.connection.row_factory = sqlite3.Row
+        meta = dict(self.connection.execute('SELECT key, value FROM meta'))
+        self.columns: List[str] = json.loads(meta['columns'])
+
+    @classmethod
+    def open(cls, csv_path: Optional[str] = None, db_path: Optional[str] = None,
+             rebuild: bool = False) -> 'SchoolDB':
+        """Open the database for ``csv_path``, (re)building it when stale."""
+        db_path, _ = ensure_database(csv_path or DEFAULT_SCHOOLS_PATH, db_path, rebuild)
+        return cls(db_path)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'SchoolDB':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Run read-only SQL against the ``schools`` table."""
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def _rows(self, where: str = '', params: Sequence[Any] = ()) -> List[Dict[str, str]]:
+        columns = ', '.join(quote(name) for name in self.columns)
+        sql = f"SELECT {columns} FROM schools {where} ORDER BY rowid"
+        return self.query(sql, params)
+
+    def count(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM schools').fetchone()[0]
+
+    def lookup(self, npsn: str) -> List[Dict[str, str]]:
+        """Every row with this NPSN, in CSV order (more than one is a duplicate)."""
+        return self._rows('WHERE npsn = ?', (npsn.strip(),))
+
+    def schools_in(self, provinsi: str, kab_kota: Optional[str] = None,
+                   kecamatan: Optional[str] = None) -> List[Dict[str, str]]:
+        """Schools of one region, in CSV order, like the groupSchoolsBy* maps."""
+        where, params = _region_filter(provinsi, kab_kota, kecamatan)
+        return self._rows('WHERE ' + where, params)
+
+    def region_counts(self, level: str = 'provinsi', provinsi: Optional[str] = None,
+                      kab_kota: Optional[str] = None) -> List[Tuple[Any, ...]]:
+        """[(*region names, school count)] for every region at ``level``.
+
+        Regions are keyed by their full path (a kecamatan by provinsi,
+        kab_kota and kecamatan), optionally limited to one parent region.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+        keys = LEVELS[:LEVELS.index(level) + 1]
+        conditions = [f"{key} != ''" for key in keys]
+        params: List[str] = []
+        for key, value in (('provinsi', provinsi), ('kab_kota', kab_kota)):
+            if value is not None:
+                conditions.append(f"{key} = ?")
+                params.append(value)
+        group = ', '.join(keys)
+        sql = (f"SELECT {group}, COUNT(*) FROM schools WHERE {' AND '.join(conditions)} "
+               f"GROUP BY {group} ORDER BY {group}")
+        return [tuple(row) for row in self.connection.execute(sql, params)]
+
+    def bentuk_counts(self, provinsi: Optional[str] = None, kab_kota: Optional[str] = None,
+                      kecamatan: Optional[str] = None) -> Dict[str, int]:
+        """School count per bentuk_pendidikan, nationally or within a region."""
+        where, params = ('', ()) if provinsi is None else _region_filter(provinsi, kab_kota,
+                                                                         kecamatan)
+        sql = (f"SELECT bentuk_pendidikan, COUNT(*) FROM schools "
+               f"{'WHERE ' + where if where else ''} GROUP BY bentuk_pendidikan")
+        return dict(self.connection.execute(sql, params).fetchall())
+
+    def duplicate_npsns(self) -> List[Tuple[str, int]]:
+        """[(npsn, rows)] for every NPSN that appears more than once."""
+        return [tuple(row) for row in self.connection.execute(
+            "SELECT npsn, COUNT(*) AS n FROM schools GROUP BY npsn HAVING n > 1 ORDER BY npsn")]
+
+    def incomplete_hierarchy(self) -> List[Dict[str, str]]:
+        """Rows missing provinsi, kab_kota or kecamatan (left off region pages)."""
+        return self._rows("WHERE provinsi = '' OR kab_kota = '' OR kecamatan = ''")
+
+    def shared_names(self, level: str = 'kecamatan') -> List[Tuple[str, int]]:
+        """[(name, parents)] for region names that appear under more than one parent.
+
+        Legitimate for common kecamatan names, but a kab_kota listed under two
+        provinces usually means a mislabelled province.
+        """
+        if level not in LEVELS[1:]:
+            raise ValueError("level must be 'kab_kota' or 'kecamatan'")
+        parents = ', '.join(LEVELS[:LEVELS.index(level)])
+        sql = (f"SELECT {level}, COUNT(*) FROM (SELECT DISTINCT {parents}, {level} "
+               f"FROM schools WHERE {level} != '') GROUP BY {level} HAVING COUNT(*) > 1 "
+               f"ORDER BY {level}")
+        return [tuple(row) for row in self.connection.execute(sql)]
+
+
+def _region_filter(provinsi: str, kab_kota: Optional[str],
+                   kecamatan: Optional[str]) -> Tuple[str, Tuple[str, ...]]:
+    names = [provinsi, kab_kota, kecamatan]
+    if kecamatan is not None and kab_kota is None:
+        raise ValueError('kecamatan needs kab_kota')
+    used = [(level, name) for level, name in zip(LEVELS, names) if name is not None]
+    return (' AND '.join(f"{level} = ?" for level, _ in used),
+            tuple(name for _, name in used))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indexed SQLite snapshot of schools.csv')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='schools.csv to load')
+    parser.add_argument('--db', help='Database path (default: next to the dataset snapshots)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild even if up to date')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    # --json is also accepted after the command, as the usage examples write it
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                        help='Output results as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('build', help='Create or refresh the database', parents=[output])
+    counts = commands.add_parser('counts', help='School count per region', parents=[output])
+    counts.add_argument('level', choices=LEVELS)
+    counts.add_argument('--provinsi')
+    counts.add_argument('--kab-kota')
+    lookup = commands.add_parser('lookup', help='Rows for an NPSN', parents=[output])
+    lookup.add_argument('npsn')
+    query = commands.add_parser('query', help='Run read-only SQL on the schools table',
+                                parents=[output])
+    query.add_argument('sql')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    if not os.path.exists(args.csv):
+        print(f"schools.csv not found: {args.csv}", file=sys.stderr)
+        sys.exit(2)
+    start = time.perf_counter()
+    db_path, rebuilt = ensure_database(args.csv, args.db, args.rebuild)
+    ready = time.perf_counter()
+    with SchoolDB(db_path) as db:
+        if args.command == 'build':
+            result: Any = {'database': db_path, 'rows': db.count(), 'rebuilt': rebuilt,
+                           'seconds': round(ready - start, 3)}
+        elif args.command == 'counts':
+            result = db.region_counts(args.level, args.provinsi, args.kab_kota)
+        elif args.command == 'lookup':
+            result = db.lookup(args.npsn)
+        else:
+            try:
+                result = db.query(args.sql)
+            except sqlite3.Error as e:
+                print(f"query failed: {e}", file=sys.stderr)
+                sys.exit(2)
+    elapsed = time.perf_counter() - ready
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    elif args.command == 'build':
+        state = 'built' if rebuilt else 'up to date'
+        print(f"{db_path}: {result['rows']} rows, {state} in {result['seconds']:.2f}s")
+    else:
+        for row in result:
+            values = row.values() if isinstance(row, dict) else row
+            print('\t'.join(str(value) for value in values))
+        print(f"{len(result)} rows in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    if args.command == 'lookup' and not result:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Python equivalents of the content hashes used by scripts/manifest.js.
+
+``computeSchoolHash`` serializes each field as "<len>:<value>" joined by
+"|" and takes the MD5 of the UTF-8 text. JavaScript string lengths count
+UTF-16 code units, so non-BMP characters (emoji, some CJK) count as two;
+``js_length`` reproduces that so hashes match byte-for-byte.
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable
+
+# Same order as the relevantFields array in manifest.js::computeSchoolHash
+SCHOOL_HASH_FIELDS = ('npsn', 'nama', 'bentuk_pendidikan', 'status', 'alamat',
+                      'kecamatan', 'kab_kota', 'provinsi', 'lat', 'lon')
+
+
+def js_length(value: str) -> int:
+    """Length of ``value`` as JavaScript's String.prototype.length reports it."""
+    if value.isascii():
+        return len(value)
+    return len(value.encode('utf-16-le')) // 2
+
+
+def length_prefixed(values: Iterable[Any]) -> str:
+    """Serialize values as "<len>:<value>" joined by "|" (None becomes '')."""
+    texts = ['' if value is None else str(value) for value in values]
+    if ''.join(texts).isascii():
+        return '|'.join([f"{len(text)}:{text}" for text in texts])
+    return '|'.join([f"{js_length(text)}:{text}" for text in texts])
+
+
+def record_hash(values: Iterable[Any]) -> str:
+    """MD5 of the length-prefixed serialization of ``values``."""
+    return hashlib.md5(length_prefixed(values).encode('utf-8')).hexdigest()
+
+
+def compute_school_hash(school: Dict[str, Any]) -> str:
+    """Match manifest.js::computeSchoolHash for a school record."""
+    return record_hash(school.get(field) for field in SCHOOL_HASH_FIELDS)
+
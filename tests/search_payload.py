@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Streaming validator for the client-side search payload (dist/schools.json).
+
+``PageBuilder.prepareSchoolDataForSearch`` serializes every school as a flat
+array ordered by SEARCH_DATA_FIELDS, and ``SearchDataService`` writes the
+list to dist/schools.json. This module reads that payload one row at a
+time (incremental JSON decoding, so memory does not grow with file size)
+and checks that:
+
+- every row is an array of SEARCH_DATA_FIELDS strings, in that order
+- ``url`` is the school page path that getSchoolRelativePath produces
+  (and, with --dist, that the page exists)
+- the payload agrees with schools.csv: one row per CSV school with the
+  required path fields, same values, nothing extra
+
+It also reports the bytes each field costs, raw and gzip-compressed on its
+own, so the first-load download can be measured and bounded with
+--max-bytes / --max-gzip-bytes.
+
+Usage:
+    python3 tests/search_payload.py                       # dist/schools.json vs data/schools.csv
+    python3 tests/search_payload.py --dist dist --max-gzip-bytes 2000000
+    python3 tests/search_payload.py --payload build/schools.json --json
+"""
+
+import argparse
+import codecs
+import json
+import os
+import re
+import sys
+import zlib
+from collections import Counter, defaultdict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dataset import DEFAULT_SCHOOLS_PATH, ROOT, load_schools  # noqa: E402
+from tests.site_paths import relative_path  # noqa: E402
+
+# Same order as data-schema.js::SEARCH_DATA_FIELDS
+SEARCH_DATA_FIELDS = ('npsn', 'nama', 'bentuk_pendidikan', 'status', 'alamat',
+                      'kecamatan', 'kab_kota', 'provinsi', 'url')
+ATTRIBUTE_FIELDS = SEARCH_DATA_FIELDS[:-1]
+
+DEFAULT_PAYLOAD_PATH = os.path.join(ROOT, 'dist', 'schools.json')
+READ_CHUNK_SIZE = 1 << 16
+GZIP_LEVEL = 6  # SearchDataService compresses schools.json.gz at level 6
+GZIP_BATCH_ROWS = 10000
+SAMPLE_SIZE = 5
+
+# Characters JSON.stringify escapes inside a string
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+
+class PayloadError(ValueError):
+    """schools.json is not a JSON array that can be read row by row."""
+
+
+def iter_json_array(f, chunk_size: int = READ_CHUNK_SIZE,
+                    on_chunk=None) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array from binary file ``f``.
+
+    Only the current element and one read chunk are held in memory.
+    ``on_chunk`` is called with every raw chunk read (for whole-file stats).
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if on_chunk and chunk:
+            on_chunk(chunk)
+        eof = not chunk
+        buf = buf[pos:] + utf8.decode(chunk, final=eof)
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ''
+
+    if skip_whitespace() != '[':
+        raise PayloadError("payload is not a JSON array")
+    pos += 1
+    if skip_whitespace() == ']':
+        pos += 1
+    else:
+        while True:
+            while True:
+                if not skip_whitespace():
+                    raise PayloadError("truncated or invalid JSON in payload")
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise PayloadError("truncated or invalid JSON in payload")
+                    continue
+                if end == len(buf) and not eof:
+                    # A number or literal may continue in the next chunk
+                    fill()
+                    continue
+                break
+            pos = end
+            yield value
+            separator = skip_whitespace()
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise PayloadError("expected ',' or ']' between payload rows")
+    if skip_whitespace():
+        raise PayloadError("unexpected data after the payload array")
+
+
+def json_size(value: str) -> int:
+    """UTF-8 bytes JSON.stringify spends on ``value``, quotes included."""
+    if value.isascii() and value.isprintable() and '"' not in value and '\\' not in value:
+        return len(value) + 2
+    return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def _payload_row(values: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """Append the url to ATTRIBUTE_FIELDS values; None if a path field is empty."""
+    npsn, nama, _, _, _, kecamatan, kab_kota, provinsi = values
+    if not (npsn and nama and kecamatan and kab_kota and provinsi):
+        return None
+    return values + ('/' + relative_path(provinsi, kab_kota, kecamatan, npsn, nama),)
+
+
+def expected_row(school: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+    """The payload row prepareSchoolDataForSearch emits, or None if skipped."""
+    return _payload_row(tuple(school.get(field) or '' for field in ATTRIBUTE_FIELDS))
+
+
+def expected_from_csv(csv_path: str) -> Tuple[Dict[str, Deque[Tuple[str, ...]]], int]:
+    """Expected rows keyed by NPSN (duplicates queue up), plus skipped count."""
+    dataset = load_schools(csv_path)
+    positions = [dataset.fieldnames.index(field) if field in dataset.fieldnames else None
+                 for field in ATTRIBUTE_FIELDS]
+    expected: Dict[str, Deque[Tuple[str, ...]]] = defaultdict(deque)
+    skipped = 0
+    for record in dataset.records:
+        # parseCsvLine trims every value
+        row = _payload_row(tuple('' if index is None else record[index].strip()
+                                 for index in positions))
+        if row is None:
+            skipped += 1
+        else:
+            expected[row[0]].append(row)
+    return expected, skipped
+
+
+class PayloadReport:
+    """Findings and per-field byte costs for one payload."""
+
+    def __init__(self):
+        self.rows = 0
+        self.file_bytes = 0
+        self.gzip_bytes = 0
+        self.field_bytes = dict.fromkeys(SEARCH_DATA_FIELDS, 0)
+        self.field_gzip_bytes = dict.fromkeys(SEARCH_DATA_FIELDS, 0)
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+        self.field_mismatches: Counter = Counter()
+        self.swapped_fields: Counter = Counter()
+        self.csv_rows_skipped = 0
+
+    def add(self, problem: str, sample: str) -> None:
+        self.counts[problem] += 1
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(sample)
+
+    @property
+    def structure_bytes(self) -> int:
+        """Brackets, commas and whitespace: everything but field values."""
+        return self.file_bytes - sum(self.field_bytes.values())
+
+    @property
+    def errors(self) -> List[str]:
+        messages = []
+        for problem, count in sorted(self.counts.items()):
+            messages.append(f"{count} {problem.replace('_', ' ')}. "
+                            f"Sample: {self.samples[problem]}")
+        for (position, holds), count in self.swapped_fields.most_common():
+            messages.append(f"Position {SEARCH_DATA_FIELDS.index(position)} ({position}) "
+                            f"holds the CSV '{holds}' value in {count} rows")
+        return messages
+
+    @property
+    def passed(self) -> bool:
+        return not self.counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'passed': self.passed,
+            'errors': self.errors,
+            'problems': dict(self.counts),
+            'field_mismatches': dict(self.field_mismatches),
+            'csv_rows_skipped': self.csv_rows_skipped,
+            'bytes': {
+                'total': self.file_bytes,
+                'gzip': self.gzip_bytes,
+                'structure': self.structure_bytes,
+                'fields': self.field_bytes,
+                'fields_gzip': self.field_gzip_bytes,
+            },
+        }
+
+
+class _ColumnStats:
+    """Raw and standalone-gzip bytes of each field, computed in row batches."""
+
+    def __init__(self):
+        self._streams = [zlib.compressobj(GZIP_LEVEL) for _ in SEARCH_DATA_FIELDS]
+        self.raw = [0] * len(SEARCH_DATA_FIELDS)
+        self.gzip = [0] * len(SEARCH_DATA_FIELDS)
+        self._batch: List[List[str]] = []
+
+    def add(self, row: List[str]) -> None:
+        self._batch.append(row)
+        if len(self._batch) >= GZIP_BATCH_ROWS:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        if not self._batch:
+            return
+        for index, column in enumerate(zip(*self._batch)):
+            text = ''.join(column)
+            if _NEEDS_ESCAPE.search(text):
+                self.raw[index] += sum(json_size(value) for value in column)
+            else:
+                self.raw[index] += len(text.encode('utf-8')) + 2 * len(column)
+            data = '\n'.join(column).encode('utf-8') + b'\n'
+            self.gzip[index] += len(self._streams[index].compress(data))
+        self._batch = []
+
+    def finish(self) -> None:
+        self._flush_batch()
+        for index, stream in enumerate(self._streams):
+            self.gzip[index] += len(stream.flush())
+
+
+def validate_payload(payload_path: str, csv_path: Optional[str] = None,
+                     dist_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                     max_gzip_bytes: Optional[int] = None) -> PayloadReport:
+    """Stream ``payload_path`` once and return a PayloadReport."""
+    report = PayloadReport()
+    expected: Dict[str, Deque[Tuple[str, ...]]] = {}
+    if csv_path:
+        expected, report.csv_rows_skipped = expected_from_csv(csv_path)
+
+    whole = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    gzip_size = 0
+
+    def on_chunk(chunk: bytes) -> None:
+        nonlocal gzip_size
+        report.file_bytes += len(chunk)
+        gzip_size += len(whole.compress(chunk))
+
+    columns = _ColumnStats()
+    width = len(SEARCH_DATA_FIELDS)
+    with open(payload_path, 'rb') as f:
+        for index, row in enumerate(iter_json_array(f, on_chunk=on_chunk)):
+            report.rows += 1
+            well_formed = type(row) is list and len(row) == width
+            if well_formed:
+                try:
+                    ''.join(row)  # TypeError unless every value is a string
+                except TypeError:
+                    well_formed = False
+            if not well_formed:
+                report.add('malformed_rows', f"row {index}: {json.dumps(row)[:120]}")
+                continue
+            columns.add(row)
+
+            row = tuple(row)
+            rebuilt = _payload_row(row[:-1])
+            url = row[-1]
+            if rebuilt is None or url != rebuilt[-1]:
+                report.add('wrong_urls', f"{row[0]}: {url!r} != {rebuilt and rebuilt[-1]!r}")
+            elif dist_dir and not os.path.isfile(os.path.join(dist_dir, url[1:])):
+                report.add('missing_pages', url)
+
+            if csv_path:
+                _compare_with_csv(report, expected, row)
+
+    columns.finish()
+    report.gzip_bytes = gzip_size + len(whole.flush())
+    report.field_bytes = dict(zip(SEARCH_DATA_FIELDS, columns.raw))
+    report.field_gzip_bytes = dict(zip(SEARCH_DATA_FIELDS, columns.gzip))
+
+    for npsn, rows in expected.items():
+        for _ in rows:
+            report.add('schools_missing_from_payload', npsn)
+    if max_bytes is not None and report.file_bytes > max_bytes:
+        report.add('over_byte_budget', f"{report.file_bytes} > {max_bytes}")
+    if max_gzip_bytes is not None and report.gzip_bytes > max_gzip_bytes:
+        report.add('over_gzip_budget', f"{report.gzip_bytes} > {max_gzip_bytes}")
+    return report
+
+
+def _compare_with_csv(report: PayloadReport, expected: Dict[str, Deque[Tuple[str, ...]]],
+                      row: Tuple[str, ...]) -> None:
+    queue = expected.get(row[0])
+    if not queue:
+        report.add('rows_not_in_csv', row[0])
+        return
+    want = queue.popleft()
+    if not queue:
+        del expected[row[0]]
+    if want == row:
+        return
+    report.add('rows_differing_from_csv', row[0])
+    for position, (got, wanted) in enumerate(zip(row, want)):
+        if got == wanted:
+            continue
+        field = SEARCH_DATA_FIELDS[position]
+        report.field_mismatches[field] += 1
+        # A value that belongs to another field points at a positional shift
+        for other, candidate in enumerate(want):
+            if other != position and got and got == candidate:
+                report.swapped_fields[(field, SEARCH_DATA_FIELDS[other])] += 1
+                break
+
+
+def print_report(report: PayloadReport, path: str) -> None:
+    print(f"{path}: {report.rows} rows, {report.file_bytes / 1024:.0f} KB "
+          f"({report.gzip_bytes / 1024:.0f} KB gzip)")
+    print(f"  {'field':<20} {'bytes':>12} {'share':>7} {'gzip alone':>12}")
+    for field in SEARCH_DATA_FIELDS:
+        size = report.field_bytes[field]
+        share = size / report.file_bytes * 100 if report.file_bytes else 0
+        print(f"  {field:<20} {size:>12} {share:>6.1f}% {report.field_gzip_bytes[field]:>12}")
+    print(f"  {'(structure)':<20} {report.structure_bytes:>12}")
+    if report.csv_rows_skipped:
+        print(f"  {report.csv_rows_skipped} CSV rows lack path fields and are not expected")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+    if report.passed:
+        print("  ✓ Payload matches")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the schools.json search payload')
+    parser.add_argument('--payload', default=DEFAULT_PAYLOAD_PATH,
+                        help='Search payload to check (default dist/schools.json)')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH,
+                        help='schools.csv to compare against')
+    parser.add_argument('--no-csv', action='store_true',
+                        help='Skip the comparison with schools.csv')
+    parser.add_argument('--dist', help='Also check that every url exists under this directory')
+    parser.add_argument('--max-bytes', type=int, help='Fail above this payload size')
+    parser.add_argument('--max-gzip-bytes', type=int, help='Fail above this gzip size')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.payload):
+        print(f"Payload not found: {args.payload} (run the build first)", file=sys.stderr)
+        sys.exit(2)
+    try:
+        report = validate_payload(args.payload, None if args.no_csv else args.csv,
+                                  args.dist, args.max_bytes, args.max_gzip_bytes)
+    except PayloadError as e:
+        print(f"{args.payload}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, args.payload)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Python equivalents of the slug and output-path rules used by the page build.
+
+``slugify`` mirrors src/core/slugify.js and ``school_relative_path`` mirrors
+``PageBuilder.getSchoolRelativePath``, so Python checks can predict the
+exact file (and URL) every school is written to.
+
+slugify.js strips ``\\p{Diacritic}`` after NFD normalization. Python's
+unicodedata has no Diacritic property, so combining marks, the spacing
+accents in ASCII/Latin-1 and the spacing modifier letters stand in for it.
+That matches for Latin-script names (all of Indonesia's data); a few
+diacritics in other scripts would become hyphens instead of vanishing.
+"""
+
+import posixpath
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+
+from tests.schema_validator import load_schema
+
+REQUIRED_SCHOOL_FIELDS = load_schema().required_school_fields
+
+_SPACING_DIACRITICS = frozenset('^`¨¯´·¸')
+_NON_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def _is_diacritic(char: str) -> bool:
+    return (unicodedata.combining(char) != 0 or char in _SPACING_DIACRITICS
+            or 'ʰ' <= char <= '˿')
+
+
+def slugify(value: Optional[str]) -> str:
+    """Match slugify.js: lowercase ASCII words joined by single hyphens."""
+    if not isinstance(value, str) or not value.strip():
+        return ''
+    if not value.isascii():
+        value = ''.join(c for c in unicodedata.normalize('NFD', value)
+                        if not _is_diacritic(c))
+    elif '^' in value or '`' in value:
+        value = value.replace('^', '').replace('`', '')
+    return _NON_SLUG.sub('-', value.lower()).strip('-') or 'untitled'
+
+
+def missing_path_fields(school: Dict[str, str]) -> list:
+    """Required fields that are empty, in REQUIRED_SCHOOL_FIELDS order."""
+    return [field for field in REQUIRED_SCHOOL_FIELDS if not school.get(field)]
+
+
+# Province, kabupaten and kecamatan names repeat across thousands of schools
+place_slug = lru_cache(maxsize=1 << 16)(slugify)
+
+
+def directory_path(*names: str) -> str:
+    """provinsi/<p>[/kabupaten/<k>[/kecamatan/<c>]] for the given names."""
+    parts = []
+    for label, name in zip(('provinsi', 'kabupaten', 'kecamatan'), names):
+        parts += [label, place_slug(name)]
+    if all(parts):
+        return '/'.join(parts)
+    # path.join drops empty segments
+    return posixpath.normpath(posixpath.join(*parts))
+
+
+def school_page_path(directory: str, npsn: str, nama: str) -> str:
+    """School page path inside its kecamatan ``directory``."""
+    if '/' in npsn:
+        return posixpath.normpath(posixpath.join(directory, f"{npsn}-{slugify(nama)}.html"))
+    return f"{directory}/{npsn}-{slugify(nama)}.html"
+
+
+def relative_path(provinsi: str, kab_kota: str, kecamatan: str, npsn: str, nama: str) -> str:
+    """School page path from already-validated (non-empty) fields."""
+    return school_page_path(directory_path(provinsi, kab_kota, kecamatan), npsn, nama)
+
+
+def school_relative_path(school: Dict[str, str]) -> Optional[str]:
+    """Match PageBuilder.getSchoolRelativePath; None where the JS throws."""
+    if missing_path_fields(school):
+        return None
+    return relative_path(school['provinsi'], school['kab_kota'], school['kecamatan'],
+                         school['npsn'], school['nama'])
+
+
+def school_url(school: Dict[str, str]) -> Optional[str]:
+    """URL used for the school in schools.json ('/' + relative path)."""
+    path = school_relative_path(school)
+    return None if path is None else '/' + path
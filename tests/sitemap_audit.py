@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Streaming auditor for the sharded sitemaps written by scripts/sitemap.js.
+
+Reads dist/sitemap-index.xml and every shard it references one chunk at a
+time: expat confirms each chunk is well-formed XML while regexes pull out
+the completed <url> entries, which are checked and dropped. Memory
+stays flat regardless of shard size. Checks:
+
+- every shard in the index exists, and every sitemap-*.xml is indexed
+- shards hold at most MAX_URLS_PER_SITEMAP URLs (same env var and clamp
+  as src/core/config.js) and at most 50 MB uncompressed
+- no URL appears twice, within or across shards
+- lastmod is a W3C date or datetime
+- with schools.csv, the URLs and lastmod values are the ones
+  collectUrlsFromSchools produces: the homepage and province pages dated
+  with the newest updated_at, and each school page dated with its own
+  updated_at (or that fallback when it has none)
+
+URLs are tracked as 64-bit string hashes rather than strings, which keeps
+a 440k-URL audit to tens of megabytes.
+
+Usage:
+    python3 tests/sitemap_audit.py                    # dist/ vs data/schools.csv
+    python3 tests/sitemap_audit.py --dist build --no-csv --json
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from xml.parsers import expat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dataset import DEFAULT_SCHOOLS_PATH, ROOT, load_schools  # noqa: E402
+from tests.site_paths import place_slug, relative_path  # noqa: E402
+
+DEFAULT_DIST_DIR = os.path.join(ROOT, 'dist')
+INDEX_FILE = 'sitemap-index.xml'
+SHARD_PATTERN = re.compile(r'^sitemap-\d+\.xml$')
+READ_CHUNK_SIZE = 1 << 20
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+SAMPLE_SIZE = 5
+
+# sitemap.js only trusts updated_at values starting with a date
+_DATA_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+# W3C Datetime profile accepted by the sitemap protocol
+_W3C_DATE = re.compile(
+    r'^\d{4}(-\d{2}(-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:\d{2}))?)?)?$')
+_LOC = re.compile(r'<loc>(.*?)</loc>', re.DOTALL)
+_LASTMOD = re.compile(r'<lastmod>(.*?)</lastmod>', re.DOTALL)
+
+
+def max_urls_per_sitemap() -> int:
+    """MAX_URLS_PER_SITEMAP as src/core/config.js resolves it."""
+    try:
+        value = int(os.environ.get('MAX_URLS_PER_SITEMAP', ''))
+    except ValueError:
+        value = 0
+    return min(50000, max(1, value or 50000))
+
+
+def url_key(url: str) -> int:
+    """64-bit key for the seen/expected sets; only compared within one run."""
+    return hash(url)
+
+
+def expected_lastmods(csv_path: str, base_url: str) -> Tuple[Dict[int, str], int]:
+    """{url key: lastmod} that collectUrlsFromSchools yields, plus rows it cannot path.
+
+    The JS throws on a school without the path fields; those rows are
+    counted and left out rather than failing the audit.
+    """
+    dataset = load_schools(csv_path)
+    index = {name: position for position, name in enumerate(dataset.fieldnames)}
+
+    def column(name):
+        position = index.get(name)
+        return [('' if position is None else record[position].strip())
+                for record in dataset.records]
+
+    npsns, names = column('npsn'), column('nama')
+    provinces, kabupaten, kecamatan = column('provinsi'), column('kab_kota'), column('kecamatan')
+    updated = column('updated_at')
+
+    dates = [value for value in updated if _DATA_DATE.match(value)]
+    fallback = max(dates) if dates else time.strftime('%Y-%m-%d', time.gmtime())
+    base = base_url.rstrip('/')
+
+    expected = {url_key(f"{base}/"): fallback}
+    for province in dict.fromkeys(p for p in provinces if p):
+        expected[url_key(f"{base}/provinsi/{place_slug(province)}/")] = fallback
+    unpathable = 0
+    for npsn, nama, prov, kab, kec, date in zip(npsns, names, provinces, kabupaten,
+                                                 kecamatan, updated):
+        if not (npsn and nama and prov and kab and kec):
+            unpathable += 1
+            continue
+        url = f"{base}/{relative_path(prov, kab, kec, npsn, nama)}"
+        expected[url_key(url)] = date if _DATA_DATE.match(date) else fallback
+    return expected, unpathable
+
+
+class SitemapParseError(ValueError):
+    """A sitemap file is not well-formed XML."""
+
+
+class SitemapReport:
+    """Per-shard totals and problems found across the sitemap set."""
+
+    def __init__(self):
+        self.shards: Dict[str, Dict[str, int]] = {}
+        self.urls = 0
+        self.seconds = 0.0
+        self.csv_rows_unpathable = 0
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, problem: str, sample: str) -> None:
+        self.counts[problem] += 1
+        if len(self.samples[problem]) < SAMPLE_SIZE:
+            self.samples[problem].append(sample)
+
+    @property
+    def passed(self) -> bool:
+        return not self.counts
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{count} {problem.replace('_', ' ')}. Sample: {self.samples[problem]}"
+                for problem, count in sorted(self.counts.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'urls': self.urls,
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'shards': self.shards,
+            'csv_rows_unpathable': self.csv_rows_unpathable,
+            'problems': dict(self.counts),
+            'errors': self.errors,
+        }
+
+
+def _text(match: Optional[re.Match]) -> Optional[str]:
+    if match is None:
+        return None
+    text = match.group(1).strip()
+    if text.startswith('<![CDATA[') and text.endswith(']]>'):
+        return text[9:-3]
+    return html.unescape(text) if '&' in text else text
+
+
+@lru_cache(maxsize=None)
+def _item_patterns(item_tag: str) -> Tuple[re.Pattern, re.Pattern]:
+    # The exact layout sitemap.js writes, matched a whole chunk at a time
+    plain = re.compile(rf'<{item_tag}>\s*<loc>\s*([^<&\s]*)\s*</loc>\s*'
+                       rf'(?:(<lastmod>)\s*([^<\s]*)\s*</lastmod>\s*)?</{item_tag}>')
+    # Any other valid layout (attributes, extra children, entities, CDATA)
+    generic = re.compile(rf'<{item_tag}(?:\s[^>]*)?>(.*?)</{item_tag}>', re.DOTALL)
+    return plain, generic
+
+
+def _parse_items(text: str, item_tag: str) -> List[Tuple[Optional[str], Optional[str]]]:
+    plain, generic = _item_patterns(item_tag)
+    closing = f'</{item_tag}>'
+    total = text.count(closing)
+    items = [(loc, lastmod if has_lastmod else None)
+             for loc, has_lastmod, lastmod in plain.findall(text)]
+    if len(items) != total:
+        items = [(_text(_LOC.search(body)), _text(_LASTMOD.search(body)))
+                 for body in generic.findall(text)]
+    if len(items) != total or f':{item_tag}>' in text:
+        raise ValueError(f"unsupported <{item_tag}> layout")
+    return items
+
+
+def iter_loc_batches(path: str, item_tag: str, chunk_size: int = READ_CHUNK_SIZE):
+    """Yield lists of (loc, lastmod) for the <url>/<sitemap> elements in ``path``.
+
+    The file is read in chunks. Each chunk goes through expat (with no
+    Python callbacks, so at C speed) to prove the XML is well formed, and
+    the elements it completes are pulled out with regexes. Only one chunk
+    is held in memory. Namespace-prefixed tags (<sm:url>), which sitemap.js
+    never writes, are refused rather than misread.
+    """
+    closing = f'</{item_tag}>'.encode()
+    parser = expat.ParserCreate()
+    rest = b''
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            try:
+                parser.Parse(chunk, not chunk)
+                buf = rest + chunk
+                if chunk:
+                    # Only whole elements; the partial tail waits for the next read
+                    cut = buf.rfind(closing)
+                    cut = 0 if cut < 0 else cut + len(closing)
+                else:
+                    cut = len(buf)
+                # Cutting after a tag never splits a UTF-8 sequence
+                yield _parse_items(buf[:cut].decode('utf-8'), item_tag)
+            except (expat.ExpatError, ValueError) as e:
+                raise SitemapParseError(f"{os.path.basename(path)}: {e}") from None
+            rest = buf[cut:]
+            if not chunk:
+                break
+
+
+def iter_locs(path: str, item_tag: str, chunk_size: int = READ_CHUNK_SIZE):
+    """Yield (loc, lastmod) for each <url> or <sitemap> element in ``path``."""
+    for batch in iter_loc_batches(path, item_tag, chunk_size):
+        yield from batch
+
+
+def read_index(path: str, report: SitemapReport) -> Tuple[List[str], Optional[str]]:
+    """Shard file names listed in the index, and the site base URL they imply."""
+    shards: List[str] = []
+    base = None
+    for loc, _ in iter_locs(path, 'sitemap'):
+        loc = (loc or '').strip()
+        prefix, _, name = loc.rpartition('/')
+        if not SHARD_PATTERN.match(name):
+            report.add('bad_index_entries', loc)
+            continue
+        if base is None:
+            base = prefix
+        elif prefix != base:
+            report.add('bad_index_entries', loc)
+        shards.append(name)
+    return shards, base
+
+
+def audit_sitemaps(dist_dir: str, csv_path: Optional[str] = None,
+                   max_urls: Optional[int] = None, base_url: Optional[str] = None,
+                   max_bytes: int = MAX_SITEMAP_BYTES) -> SitemapReport:
+    """Audit the sitemap index and every shard under ``dist_dir``."""
+    start = time.perf_counter()
+    report = SitemapReport()
+    max_urls = max_urls or max_urls_per_sitemap()
+    index_path = os.path.join(dist_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        report.add('missing_index', index_path)
+        return report
+
+    try:
+        shards, index_base = read_index(index_path, report)
+    except SitemapParseError as e:
+        report.add('malformed_xml', str(e))
+        return report
+    base_url = (base_url or index_base or '').rstrip('/')
+    on_disk = {name for name in os.listdir(dist_dir) if SHARD_PATTERN.match(name)}
+    for name in sorted(on_disk - set(shards)):
+        report.add('unindexed_shards', name)
+
+    expected: Dict[int, str] = {}
+    if csv_path:
+        expected, report.csv_rows_unpathable = expected_lastmods(csv_path, base_url)
+    seen = set()
+
+    for name in shards:
+        path = os.path.join(dist_dir, name)
+        if not os.path.exists(path):
+            report.add('missing_shards', name)
+            continue
+        size = os.path.getsize(path)
+        count = 0
+        try:
+            for batch in iter_loc_batches(path, 'url'):
+                count += len(batch)
+                for loc, lastmod in batch:
+                    loc = loc or ''
+                    key = url_key(loc)
+                    duplicate = key in seen
+                    if duplicate:
+                        report.add('duplicate_urls', f"{name}: {loc}")
+                    seen.add(key)
+                    if lastmod is not None and not _W3C_DATE.match(lastmod):
+                        report.add('bad_lastmod_format', f"{loc} {lastmod!r}")
+                    if csv_path and not duplicate:
+                        want = expected.pop(key, None)
+                        if want is None:
+                            report.add('unexpected_urls', loc)
+                        elif lastmod != want:
+                            report.add('lastmod_mismatches', f"{loc} {lastmod!r} != {want!r}")
+        except SitemapParseError as e:
+            report.add('malformed_xml', str(e))
+        report.urls += count
+        report.shards[name] = {'urls': count, 'bytes': size}
+        if count > max_urls:
+            report.add('shards_over_url_limit', f"{name}: {count} > {max_urls}")
+        if size > max_bytes:
+            report.add('shards_over_byte_limit', f"{name}: {size} > {max_bytes}")
+
+    if csv_path and expected:
+        report.counts['urls_missing_from_sitemaps'] += len(expected)
+        report.samples['urls_missing_from_sitemaps'].append(
+            f"{len(expected)} expected URLs (homepage, provinces or schools) not listed")
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: SitemapReport, dist_dir: str) -> None:
+    print(f"{dist_dir}: {len(report.shards)} shards, {report.urls} URLs "
+          f"in {report.seconds:.2f}s")
+    for name, stats in report.shards.items():
+        print(f"  {name:<20} {stats['urls']:>7} URLs {stats['bytes'] / 1e6:>8.2f} MB")
+    if report.csv_rows_unpathable:
+        print(f"  {report.csv_rows_unpathable} CSV rows lack path fields "
+              f"(sitemap.js would fail on them)")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+    if report.passed:
+        print("  ✓ Sitemaps match")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit the sharded sitemaps in dist/')
+    parser.add_argument('--dist', default=DEFAULT_DIST_DIR, help='Build output directory')
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH,
+                        help='schools.csv the sitemaps were generated from')
+    parser.add_argument('--no-csv', action='store_true',
+                        help='Skip the URL and lastmod comparison with schools.csv')
+    parser.add_argument('--max-urls', type=int,
+                        help='URL limit per shard (default: MAX_URLS_PER_SITEMAP or 50000)')
+    parser.add_argument('--site-url', help='Site base URL (default: taken from the index)')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dist):
+        print(f"dist directory not found: {args.dist} (run the build first)", file=sys.stderr)
+        sys.exit(2)
+    report = audit_sitemaps(args.dist, None if args.no_csv else args.csv,
+                            args.max_urls, args.site_url)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report, args.dist)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
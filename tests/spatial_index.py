@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Grid spatial index over schools.csv coordinates for coordinate quality checks.
+
+The bounds check in data_checks.py only rejects points outside Indonesia.
+This builds a uniform grid (cells of ``cell_km``, keyed by integer cell
+coordinates in a dict) in one pass over lat/lon and uses it for:
+
+- clusters: cells holding at least ``min_cluster`` schools, with the most
+  common exact coordinate in each, so thousands of schools stacked on one
+  default centroid stand out from a dense city
+- region outliers: schools outside the robust region of their province or
+  kab_kota, i.e. further than ``mad_scale`` scaled MADs (and at least
+  ``min_half_width_km``) from the region's median latitude or longitude,
+  with the province whose region does contain the point when there is one
+- nearest neighbours: ``GridIndex.nearest`` searches rings of cells
+  outwards and stops once no unsearched cell can hold anything closer
+
+Building is one pass plus a median per region, so the whole report is
+near-linear in rows. Coordinates that are empty, zero (unset, as in the
+ETL) or unparsable are left out of the index and counted.
+
+Usage:
+    python3 tests/spatial_index.py                     # clusters and region outliers
+    python3 tests/spatial_index.py --min-cluster 100 --json
+    python3 tests/spatial_index.py --nearest=-6.2,106.8 -k 5
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.compressed import find_input  # noqa: E402
+from tests.dataset import DEFAULT_SCHOOLS_PATH, load_schools  # noqa: E402
+from tests.near_duplicates import KM_PER_DEGREE, haversine_km, parse_coordinate  # noqa: E402
+
+DEFAULT_CELL_KM = 0.5
+DEFAULT_MIN_CLUSTER = 50
+DEFAULT_MAD_SCALE = 5.0
+DEFAULT_MIN_HALF_WIDTH_KM = 10.0
+MIN_REGION_POINTS = 10
+# MAD times this estimates the standard deviation of normally spread values
+MAD_TO_SIGMA = 1.4826
+NPSN_SAMPLE_SIZE = 5
+
+Point = Tuple[float, float]
+Cell = Tuple[int, int]
+
+
+class GridIndex:
+    """Uniform lat/lon grid mapping each cell to the rows located in it."""
+
+    def __init__(self, cell_km: float = DEFAULT_CELL_KM):
+        self.cell_km = cell_km
+        # KM_PER_DEGREE is a lower bound for Indonesia, so a cell never spans
+        # less than cell_km on either axis
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.cells: Dict[Cell, List[int]] = defaultdict(list)
+        self.points: Dict[int, Point] = {}
+        self._extent: Optional[Tuple[int, int, int, int]] = None
+
+    def cell_of(self, point: Point) -> Cell:
+        return int(math.floor(point[0] / self.cell_deg)), int(math.floor(point[1] / self.cell_deg))
+
+    def add(self, row: int, point: Point) -> None:
+        self.cells[self.cell_of(point)].append(row)
+        self.points[row] = point
+        self._extent = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _ring(self, center: Cell, radius: int) -> Iterator[Cell]:
+        y, x = center
+        if radius == 0:
+            yield center
+            return
+        for dx in range(-radius, radius + 1):
+            yield y - radius, x + dx
+            yield y + radius, x + dx
+        for dy in range(-radius + 1, radius):
+            yield y + dy, x - radius
+            yield y + dy, x + radius
+
+    def nearest(self, point: Point, k: int = 1,
+                exclude: Sequence[int] = ()) -> List[Tuple[float, int]]:
+        """The ``k`` closest indexed rows to ``point`` as (km, row), closest first."""
+        if self._extent is None and self.cells:
+            ys = [cell[0] for cell in self.cells]
+            xs = [cell[1] for cell in self.cells]
+            self._extent = (min(ys), max(ys), min(xs), max(xs))
+        if self._extent is None:
+            return []
+        center = self.cell_of(point)
+        low_y, high_y, low_x, high_x = self._extent
+        # Beyond this radius every ring lies outside the occupied cells
+        last = max(abs(center[0] - low_y), abs(center[0] - high_y),
+                   abs(center[1] - low_x), abs(center[1] - high_x))
+        skip = set(exclude)
+        found: List[Tuple[float, int]] = []
+        for radius in range(last + 1):
+            if (2 * radius + 1) ** 2 > 4 * len(self.cells):
+                # Mostly empty rings from here on: a scan of every point is cheaper
+                found = [(haversine_km(point, other), row) for row, other in self.points.items()
+                         if row not in skip]
+                break
+            for cell in self._ring(center, radius):
+                for row in self.cells.get(cell, ()):
+                    if row not in skip:
+                        found.append((haversine_km(point, self.points[row]), row))
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                # Anything in ring radius + 1 is at least radius cells away
+                if found[-1][0] <= radius * self.cell_km:
+                    break
+        found.sort()
+        return found[:k]
+
+
+class RobustRegion:
+    """Median and robust half-widths of a region's latitudes and longitudes."""
+
+    def __init__(self, points: Sequence[Point], mad_scale: float, min_half_width_km: float):
+        lats = [point[0] for point in points]
+        lons = [point[1] for point in points]
+        self.points = len(points)
+        self.median = (statistics.median(lats), statistics.median(lons))
+        floor = min_half_width_km / KM_PER_DEGREE
+        self.half_width = tuple(
+            max(floor, mad_scale * MAD_TO_SIGMA *
+                statistics.median([abs(value - center) for value in values]))
+            for values, center in ((lats, self.median[0]), (lons, self.median[1])))
+
+    def contains(self, point: Point) -> bool:
+        return (abs(point[0] - self.median[0]) <= self.half_width[0]
+                and abs(point[1] - self.median[1]) <= self.half_width[1])
+
+
+class SpatialReport:
+    """Dense clusters and schools outside their region's robust bounds."""
+
+    def __init__(self):
+        self.rows = 0
+        self.located = 0
+        self.seconds = 0.0
+        self.regions = Counter()  # regions with enough points, by level
+        self.clusters: List[Dict[str, Any]] = []
+        self.outliers: List[Dict[str, Any]] = []
+
+    @property
+    def passed(self) -> bool:
+        return not (self.clusters or self.outliers)
+
+    @property
+    def errors(self) -> List[str]:
+        errors = []
+        if self.clusters:
+            sample = [cluster['top_point'] for cluster in self.clusters[:NPSN_SAMPLE_SIZE]]
+            errors.append(f"{len(self.clusters)} dense clusters. Sample: {sample}")
+        if self.outliers:
+            sample = [outlier['npsn'] for outlier in self.outliers[:NPSN_SAMPLE_SIZE]]
+            errors.append(f"{len(self.outliers)} region outliers. Sample: {sample}")
+        return errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'located': self.located,
+            'regions': dict(self.regions),
+            'seconds': round(self.seconds, 3),
+            'passed': self.passed,
+            'clusters': self.clusters,
+            'outliers': self.outliers,
+            'errors': self.errors,
+        }
+
+
+def build_index(csv_path: str, cell_km: float = DEFAULT_CELL_KM):
+    """Return (dataset, index, column getter) with every located row indexed."""
+    dataset = load_schools(csv_path)
+    position = {name: index for index, name in enumerate(dataset.fieldnames)}
+    names = ('npsn', 'nama', 'provinsi', 'kab_kota', 'lat', 'lon')
+    records = dataset.records
+    if any(name not in position for name in names):
+        records = [record + ('',) for record in records]  # a missing column reads ''
+    fields = itemgetter(*(position.get(name, -1) for name in names))
+    index = GridIndex(cell_km)
+    for row, record in enumerate(records):
+        _, _, _, _, lat, lon = fields(record)
+        latitude, longitude = parse_coordinate(lat), parse_coordinate(lon)
+        if latitude is not None and longitude is not None:
+            index.add(row, (latitude, longitude))
+    return records, index, fields
+
+
+def analyse(csv_path: str, cell_km: float = DEFAULT_CELL_KM,
+            min_cluster: int = DEFAULT_MIN_CLUSTER, mad_scale: float = DEFAULT_MAD_SCALE,
+            min_half_width_km: float = DEFAULT_MIN_HALF_WIDTH_KM) -> SpatialReport:
+    """Index ``csv_path`` and report dense clusters and region outliers."""
+    start = time.perf_counter()
+    report = SpatialReport()
+    records, index, fields = build_index(csv_path, cell_km)
+    report.rows = len(records)
+    report.located = len(index)
+
+    for cell, rows in index.cells.items():
+        if len(rows) < min_cluster:
+            continue
+        points = Counter(index.points[row] for row in rows)
+        top_point, top_count = points.most_common(1)[0]
+        provinces = Counter(fields(records[row])[2].strip() for row in rows)
+        report.clusters.append({
+            'cell': list(cell),
+            'schools': len(rows),
+            'top_point': list(top_point),
+            'top_point_schools': top_count,
+            'provinsi': dict(provinces.most_common()),
+            'npsn_sample': [fields(records[row])[0].strip() for row in rows[:NPSN_SAMPLE_SIZE]],
+        })
+    report.clusters.sort(key=lambda cluster: -cluster['schools'])
+
+    by_province: Dict[str, List[Point]] = defaultdict(list)
+    by_kab_kota: Dict[Tuple[str, str], List[Point]] = defaultdict(list)
+    located = []
+    for row, point in index.points.items():
+        _, _, provinsi, kab_kota, _, _ = fields(records[row])
+        provinsi, kab_kota = provinsi.strip(), kab_kota.strip()
+        located.append((row, point, provinsi, kab_kota))
+        if provinsi:
+            by_province[provinsi].append(point)
+            if kab_kota:
+                by_kab_kota[provinsi, kab_kota].append(point)
+
+    def regions(groups) -> Dict[Any, RobustRegion]:
+        return {key: RobustRegion(points, mad_scale, min_half_width_km)
+                for key, points in groups.items() if len(points) >= MIN_REGION_POINTS}
+
+    provinces = regions(by_province)
+    kab_kotas = regions(by_kab_kota)
+    report.regions.update(provinsi=len(provinces), kab_kota=len(kab_kotas))
+    del by_province, by_kab_kota
+
+    for row, point, provinsi, kab_kota in located:
+        level, region = None, None
+        if provinsi in provinces and not provinces[provinsi].contains(point):
+            level, region = 'provinsi', provinces[provinsi]
+        elif (provinsi, kab_kota) in kab_kotas and \
+                not kab_kotas[provinsi, kab_kota].contains(point):
+            level, region = 'kab_kota', kab_kotas[provinsi, kab_kota]
+        if level is None:
+            continue
+        containing = [(haversine_km(point, other.median), name)
+                      for name, other in provinces.items() if other.contains(point)]
+        report.outliers.append({
+            'npsn': fields(records[row])[0].strip(),
+            'nama': fields(records[row])[1].strip(),
+            'row': row + 2,
+            'level': level,
+            'provinsi': provinsi,
+            'kab_kota': kab_kota,
+            'point': list(point),
+            'km_from_median': round(haversine_km(point, region.median), 1),
+            'likely_provinsi': min(containing)[1] if containing else None,
+        })
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_report(report: SpatialReport, csv_path: str) -> None:
+    print(f"{csv_path}: {report.located}/{report.rows} rows located, "
+          f"{report.regions['provinsi']} provinces and {report.regions['kab_kota']} "
+          f"kabupaten/kota with robust regions, in {report.seconds:.2f}s")
+    for cluster in report.clusters:
+        print(f"  cluster of {cluster['schools']} at {cluster['top_point']} "
+              f"({cluster['top_point_schools']} on that exact point): "
+              f"{', '.join(f'{name} {count}' for name, count in cluster['provinsi'].items())}")
+    for outlier in report.outliers:
+        hint = f", inside {outlier['likely_provinsi']}" if outlier['likely_provinsi'] else ''
+        print(f"  row {outlier['row']}: {outlier['npsn']} {outlier['nama']!r} is "
+              f"{outlier['km_from_median']} km from the median of its {outlier['level']} "
+              f"({outlier['kab_kota'] if outlier['level'] == 'kab_kota' else outlier['provinsi']})"
+              f"{hint}")
+    if report.passed:
+        print("  ✓ No dense clusters or region outliers")
+    for error in report.errors:
+        print(f"  ✗ {error}")
+
+
+def parse_point(text: str) -> Point:
+    try:
+        lat, lon = (float(part) for part in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected LAT,LON")
+    return lat, lon
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find coordinate clusters and region outliers in schools.csv'
+    )
+    parser.add_argument('--csv', default=DEFAULT_SCHOOLS_PATH, help='schools.csv to check')
+    parser.add_argument('--cell-km', type=float, default=DEFAULT_CELL_KM,
+                        help=f'Grid cell size (default {DEFAULT_CELL_KM} km)')
+    parser.add_argument('--min-cluster', type=int, default=DEFAULT_MIN_CLUSTER,
+                        help=f'Schools per cell that make a cluster (default {DEFAULT_MIN_CLUSTER})')
+    parser.add_argument('--mad-scale', type=float, default=DEFAULT_MAD_SCALE,
+                        help=f'Robust region half-width in scaled MADs (default {DEFAULT_MAD_SCALE})')
+    parser.add_argument('--min-half-width-km', type=float, default=DEFAULT_MIN_HALF_WIDTH_KM,
+                        help=f'Smallest robust region half-width '
+                             f'(default {DEFAULT_MIN_HALF_WIDTH_KM} km)')
+    parser.add_argument('--nearest', type=parse_point, metavar='LAT,LON',
+                        help='List the schools nearest to a point instead')
+    parser.add_argument('-k', type=int, default=5, help='Schools to list with --nearest')
+    parser.add_argument('--json', action='store_true', help='Output the report as JSON')
+    args = parser.parse_args()
+    args.csv = find_input(args.csv)
+
+    if not os.path.exists(args.csv):
+        print(f"schools.csv not found: {args.csv}", file=sys.stderr)
+        sys.exit(2)
+    if args.nearest:
+        records, index, fields = build_index(args.csv, args.cell_km)
+        nearest = [{'km': round(km, 3), 'npsn': fields(records[row])[0].strip(),
+                    'nama': fields(records[row])[1].strip(), 'point': list(index.points[row])}
+                   for km, row in index.nearest(args.nearest, args.k)]
+        if args.json:
+            print(json.dumps(nearest, indent=2, ensure_ascii=False))
+        else:
+            for school in nearest:
+                print(f"  {school['km']:>9.3f} km  {school['npsn']} {school['nama']}")
+        return
+    report = analyse(args.csv, args.cell_km, args.min_cluster, args.mad_scale,
+                     args.min_half_width_km)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_report(report, args.csv)
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
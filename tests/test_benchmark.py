@@ -0,0 +1,79 @@
+"""
+Tests for the benchmark harness in tests/benchmark.py.
+"""
+
+import gzip
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.benchmark import (  # noqa: E402
+    bench_check_phase,
+    compare,
+    generate_schools_csv,
+    measure_isolated,
+    parse_size,
+)
+from tests.data_checks import StreamingValidator, default_checks  # noqa: E402
+
+
+def test_parse_size_accepts_suffixes():
+    assert parse_size('10k') == 10000
+    assert parse_size('1M') == 1000000
+    assert parse_size('2.5m') == 2500000
+    assert parse_size('440000') == 440000
+
+
+def test_clean_generated_file_passes_every_check(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    generate_schools_csv(path, 500)
+    report = StreamingValidator(default_checks()).run(path)
+    assert report.rows == 500
+    assert report.passed
+
+
+def test_error_rates_trip_the_matching_checks(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    generate_schools_csv(path, 2000, dup_rate=0.05, malformed_rate=0.2, oob_rate=0.2)
+    report = StreamingValidator(default_checks()).run(path)
+    assert report.error_for('NPSN values are unique')
+    assert report.error_for('Coordinates within Indonesia bounds')
+    assert report.error_for('NPSN values are numeric')
+
+
+def test_generation_is_deterministic(tmp_path):
+    first, second = str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')
+    generate_schools_csv(first, 300, seed=7, dup_rate=0.1)
+    generate_schools_csv(second, 300, seed=7, dup_rate=0.1)
+    with open(first, 'rb') as a, open(second, 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_measure_isolated_reports_throughput_and_memory(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    generate_schools_csv(path, 200)
+    result = measure_isolated('check', path, 200, trace=True, target='NPSN values are unique')
+    assert result['rows_per_second'] > 0
+    assert result['peak_rss_bytes'] > 0
+    assert result['alloc_peak_bytes'] > 0
+
+
+def test_check_phase_reads_compressed_input(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    generate_schools_csv(path, 200)
+    with open(path, 'rb') as source, gzip.open(path + '.gz', 'wb') as target:
+        shutil.copyfileobj(source, target)
+    assert bench_check_phase(path + '.gz')['rows'] == bench_check_phase(path)['rows'] == 200
+
+
+def test_compare_reports_ratio_for_matching_sizes():
+    def results(rate):
+        return {'sizes': [{'rows': 10000, 'checks': {'c': {'rows_per_second': rate}},
+                           'validators': {}}]}
+
+    lines = compare(results(200), results(100))
+    assert len(lines) == 1
+    assert '2.00x' in lines[0]
+    assert compare(results(200), {'sizes': []}) == []
@@ -0,0 +1,97 @@
+"""
+Tests for compressed CSV inputs in tests/compressed.py.
+"""
+
+import os
+import shutil
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import compressed  # noqa: E402
+from tests.compressed import (  # noqa: E402
+    UnsupportedCompression,
+    find_input,
+    open_compressed,
+    open_text,
+)
+from tests.data_checks import ColumnarValidator, StreamingValidator, default_checks  # noqa: E402
+from tests.dataset import clear_memory_cache, load_dataset  # noqa: E402
+from tests.incremental import IncrementalValidator  # noqa: E402
+from tests.parallel_csv import ParallelValidator  # noqa: E402
+from tests.raw_precheck import precheck  # noqa: E402
+from tests.schema_validator import validate_csv  # noqa: E402
+from tests.test_data_checks import write_csv  # noqa: E402
+from tests.test_parallel_csv import rows_with_newlines  # noqa: E402
+from tests.test_raw_precheck import raw_row, write_raw  # noqa: E402
+
+
+def compress(path, suffix):
+    """Replace ``path`` by a compressed copy; return the copy's name."""
+    target = path + suffix
+    with open(path, 'rb') as src, open_compressed(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.unlink(path)
+    return target
+
+
+@pytest.mark.parametrize('suffix', ['.gz', '.bz2', '.xz'])
+def test_checks_read_compressed_schools_csv(tmp_path, suffix):
+    plain = write_csv(tmp_path, rows_with_newlines(200))
+    expected = StreamingValidator(default_checks()).run(plain)
+    assert not expected.passed
+    schema = validate_csv(plain)
+    records = load_dataset(plain, use_disk_cache=False).records
+
+    packed = compress(plain, suffix)
+    # The plain name resolves to the compressed copy
+    assert find_input(plain) == packed
+    for validator in (StreamingValidator(default_checks()), ColumnarValidator(default_checks()),
+                      ParallelValidator(workers=2, min_bytes=0)):
+        assert validator.run(plain).errors == expected.errors
+    report, stats = IncrementalValidator(str(tmp_path / 'state')).run(plain)
+    assert report.errors == expected.errors and stats.rows == 200
+    assert load_dataset(plain, cache_dir=str(tmp_path / 'cache')).records == records
+    clear_memory_cache()
+    assert load_dataset(packed, cache_dir=str(tmp_path / 'cache')).from_cache
+    assert validate_csv(packed).errors == schema.errors
+
+
+def test_raw_precheck_streams_compressed_dump(tmp_path):
+    lines = [raw_row(10000000 + i) for i in range(500)] + [raw_row(10000001), raw_row('12a')]
+    plain = write_raw(tmp_path, lines)
+    expected = precheck(plain, chunk_size=64).to_dict()
+    compress(plain, '.xz')
+    report = precheck(plain, chunk_size=64).to_dict()
+    expected['seconds'] = report['seconds']
+    assert report == expected and report['duplicates'] == 1
+
+
+def test_decoding_memory_does_not_grow_with_the_file(tmp_path):
+    path = str(tmp_path / 'big.csv.gz')
+    row = ('10000001,SD Negeri 1,SD,N,"Jl. A,\nB",,Gambir,Jakarta Pusat,DKI Jakarta,'
+           '-6.2,106.8,2026-07-20\n') * 1000
+    with open_compressed(path, 'wb') as f:
+        for _ in range(200):  # ~19 MB decompressed
+            f.write(row.encode('utf-8'))
+    tracemalloc.start()
+    total = 0
+    with open_text(path) as f:
+        for chunk in iter(lambda: f.read(1 << 16), ''):
+            total += len(chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert total == len(row) * 200
+    assert peak < 8 << 20
+
+
+def test_zstd_without_its_module(tmp_path, monkeypatch):
+    monkeypatch.delitem(compressed.CODECS, '.zst', raising=False)
+    path = tmp_path / 'schools.csv'
+    (tmp_path / 'schools.csv.zst').write_bytes(b'')
+    assert find_input(str(path)) == str(path)  # unreadable copies are not picked
+    with pytest.raises(UnsupportedCompression, match='zstandard'):
+        open_text(str(path) + '.zst')
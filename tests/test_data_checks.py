@@ -0,0 +1,117 @@
+"""
+Tests for the single-pass streaming checks in tests/data_checks.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.data_checks import (  # noqa: E402
+    HAS_NUMPY,
+    REQUIRED_COLUMNS,
+    ColumnarValidator,
+    CoordinateBoundsCheck,
+    NpsnNumericCheck,
+    NpsnUniquenessCheck,
+    RequiredFieldsCheck,
+    StreamingValidator,
+    default_checks,
+)
+
+HEADER = ','.join(REQUIRED_COLUMNS)
+
+
+def make_row(npsn, nama='SD Negeri 1', lat='-6.2', lon='106.8'):
+    return f"{npsn},{nama},SD,N,Jl. Test,,Gambir,Jakarta Pusat,DKI Jakarta,{lat},{lon},2026-07-20"
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / 'schools.csv'
+    path.write_text('\n'.join([HEADER] + rows) + '\n', encoding='utf-8')
+    return str(path)
+
+
+class TestStreamingValidator:
+    """Test the single-pass validator against small synthetic files."""
+
+    def test_clean_file_passes_every_check(self, tmp_path):
+        path = write_csv(tmp_path, [make_row(10000000 + i) for i in range(50)])
+        report = StreamingValidator(default_checks()).run(path)
+        assert report.rows == 50
+        assert report.passed, report.errors
+
+    def test_reads_file_once(self, tmp_path, monkeypatch):
+        path = write_csv(tmp_path, [make_row(10000000 + i) for i in range(5)])
+        opened = []
+        real_open = open
+
+        def counting_open(file, *args, **kwargs):
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr('builtins.open', counting_open)
+        StreamingValidator(default_checks()).run(path)
+        assert opened.count(path) == 1
+
+    def test_reports_duplicate_npsn(self, tmp_path):
+        path = write_csv(tmp_path, [make_row(12345678)] * 10)
+        check = NpsnUniquenessCheck()
+        report = StreamingValidator([check]).run(path)
+        assert check.duplicates == 9
+        assert check.samples == ['12345678'] * 5
+        assert 'duplicate NPSN' in report.error_for(check.name)
+
+    def test_reports_out_of_bounds_coordinates_with_samples(self, tmp_path):
+        path = write_csv(tmp_path, [make_row(10000000 + i, lat='40.0') for i in range(10)])
+        check = CoordinateBoundsCheck()
+        report = StreamingValidator([check]).run(path)
+        assert check.invalid == 10
+        assert len(check.samples) == 5
+        assert 'Too many invalid coordinates' in report.error_for(check.name)
+
+    def test_reports_non_numeric_npsn_and_empty_fields(self, tmp_path):
+        path = write_csv(tmp_path, [make_row('ABC', nama='') for _ in range(5)])
+        report = StreamingValidator([NpsnNumericCheck(), RequiredFieldsCheck()]).run(path)
+        assert 'non-numeric NPSN' in report.error_for(NpsnNumericCheck.name)
+        assert "Field 'nama'" in report.error_for(RequiredFieldsCheck.name)
+
+    def test_short_rows_do_not_crash(self, tmp_path):
+        path = write_csv(tmp_path, [make_row(12345678), '87654321,Only Name'])
+        report = StreamingValidator(default_checks()).run(path)
+        assert report.rows == 2
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")
+class TestColumnarValidator:
+    """The NumPy column checks must agree with the streaming checks."""
+
+    def assert_same_verdicts(self, path):
+        streaming = StreamingValidator(default_checks()).run(path)
+        columnar = ColumnarValidator(default_checks()).run(path)
+        assert columnar.rows == streaming.rows
+        assert columnar.errors == streaming.errors
+
+    def test_clean_file(self, tmp_path):
+        self.assert_same_verdicts(write_csv(tmp_path, [make_row(10000000 + i) for i in range(50)]))
+
+    def test_dirty_file(self, tmp_path):
+        rows = [make_row(10000000 + i) for i in range(20)]
+        rows += [make_row(12345678)] * 5
+        rows += [make_row('X12', nama='') for _ in range(3)]
+        rows += [make_row(20000000 + i, lat='40.5', lon='200') for i in range(4)]
+        rows += [make_row(30000000, lat='abc'), make_row(30000001, lat='', lon=''), '3,Short']
+        self.assert_same_verdicts(write_csv(tmp_path, rows))
+
+    def test_header_only_file(self, tmp_path):
+        self.assert_same_verdicts(write_csv(tmp_path, []))
+
+
+def test_columnar_falls_back_without_numpy(tmp_path, monkeypatch):
+    monkeypatch.setattr('tests.data_checks.HAS_NUMPY', False)
+    path = write_csv(tmp_path, [make_row(10000000 + i) for i in range(5)])
+    report = ColumnarValidator(default_checks()).run(path)
+    assert report.rows == 5
+    assert report.passed
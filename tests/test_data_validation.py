@@ -5,7 +5,6 @@ Tests for data validation and ETL processes.
 
 import os
 import sys
-import csv
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,15 +14,9 @@ class TestSchoolsData:
     """Test the schools.csv data file."""
     
     @pytest.fixture
-    def schools_data(self):
-        """Load schools.csv data."""
-        data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'schools.csv')
-        if not os.path.exists(data_path):
-            pytest.skip("schools.csv not found")
-        
-        with open(data_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+    def schools_data(self, schools_dataset):
+        """schools.csv rows from the session-scoped cached dataset."""
+        return schools_dataset.rows
     
     def test_csv_has_required_columns(self, schools_data):
         """Verify CSV has all required columns."""
@@ -0,0 +1,116 @@
+"""
+Tests for the shared cached dataset loader in tests/dataset.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import dataset as dataset_module  # noqa: E402
+from tests.conftest import SCHOOLS_CACHE_DIR  # noqa: E402
+from tests.dataset import clear_memory_cache, load_dataset  # noqa: E402
+
+CSV = "npsn,nama,lat\n12345678,SD Satu,-6.2\n\n87654321,SD Dua\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'schools.csv'
+    path.write_text(CSV, encoding='utf-8')
+    clear_memory_cache()
+    yield str(path)
+    clear_memory_cache()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / 'cache')
+
+
+def count_parses(monkeypatch):
+    calls = []
+    real_parse = dataset_module.parse_csv
+
+    def counting_parse(path):
+        calls.append(path)
+        return real_parse(path)
+
+    monkeypatch.setattr(dataset_module, 'parse_csv', counting_parse)
+    return calls
+
+
+class TestLoadDataset:
+    """Test parsing, in-process reuse and the on-disk snapshot."""
+
+    def test_parses_rows_like_dictreader(self, csv_path, cache_dir):
+        data = load_dataset(csv_path, cache_dir=cache_dir)
+        assert data.fieldnames == ['npsn', 'nama', 'lat']
+        assert data.rows == [
+            {'npsn': '12345678', 'nama': 'SD Satu', 'lat': '-6.2'},
+            {'npsn': '87654321', 'nama': 'SD Dua', 'lat': ''},
+        ]
+        assert not data.from_cache
+
+    def test_reuses_dataset_within_process(self, csv_path, cache_dir, monkeypatch):
+        calls = count_parses(monkeypatch)
+        first = load_dataset(csv_path, cache_dir=cache_dir)
+        assert load_dataset(csv_path, cache_dir=cache_dir) is first
+        assert len(calls) == 1
+
+    def test_reloads_snapshot_in_new_process(self, csv_path, cache_dir, monkeypatch):
+        load_dataset(csv_path, cache_dir=cache_dir)
+        clear_memory_cache()
+        calls = count_parses(monkeypatch)
+        data = load_dataset(csv_path, cache_dir=cache_dir)
+        assert data.from_cache
+        assert len(data) == 2
+        assert calls == []
+
+    def test_touched_but_unchanged_file_hits_by_hash(self, csv_path, cache_dir, monkeypatch):
+        load_dataset(csv_path, cache_dir=cache_dir)
+        clear_memory_cache()
+        stat = os.stat(csv_path)
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        calls = count_parses(monkeypatch)
+        assert load_dataset(csv_path, cache_dir=cache_dir).from_cache
+        assert calls == []
+
+    def test_same_size_edit_invalidates_by_hash(self, csv_path, cache_dir):
+        load_dataset(csv_path, cache_dir=cache_dir)
+        clear_memory_cache()
+        stat = os.stat(csv_path)
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write(CSV.replace('SD Satu', 'SD Ubah'))
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        data = load_dataset(csv_path, cache_dir=cache_dir)
+        assert not data.from_cache
+        assert data.rows[0]['nama'] == 'SD Ubah'
+
+    def test_corrupt_snapshot_is_ignored(self, csv_path, cache_dir):
+        load_dataset(csv_path, cache_dir=cache_dir)
+        clear_memory_cache()
+        for name in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, name), 'wb') as f:
+                f.write(b'not a pickle')
+        data = load_dataset(csv_path, cache_dir=cache_dir)
+        assert not data.from_cache
+        assert len(data) == 2
+
+    def test_snapshots_of_deleted_csvs_are_pruned(self, csv_path, cache_dir, tmp_path):
+        other = tmp_path / 'other.csv'
+        other.write_text(CSV, encoding='utf-8')
+        load_dataset(str(other), cache_dir=cache_dir)
+        with open(os.path.join(cache_dir, 'old.csv.0123456789abcdef.pickle'), 'wb') as f:
+            f.write(b'version 1 snapshot')
+        other.unlink()
+        load_dataset(csv_path, cache_dir=cache_dir)
+        assert [name.split('.')[0] for name in os.listdir(cache_dir)] == ['schools']
+
+
+def test_schools_dataset_is_snapshotted_across_runs(schools_dataset):
+    snapshot = dataset_module._snapshot_path(schools_dataset.path, SCHOOLS_CACHE_DIR)
+    assert os.path.exists(snapshot)
+    assert os.environ['DATASET_CACHE_DIR'] != SCHOOLS_CACHE_DIR
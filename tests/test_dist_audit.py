@@ -0,0 +1,113 @@
+"""
+Tests for the dist/ auditor in tests/dist_audit.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.dist_audit import (  # noqa: E402
+    audit_dist,
+    is_relative_link,
+    link_target,
+    page_tier,
+    page_url,
+)
+
+SCHOOL = 'provinsi/jawa-barat/kabupaten/kota-bandung/kecamatan/cicendo/87654321-sd-negeri-2.html'
+
+
+def page(url, body='', canonical=True, description='Deskripsi'):
+    head = ['<!DOCTYPE html><html><head>', '<title>Halaman</title>',
+            '<link rel="icon" href="/favicon.svg" />']
+    if description is not None:
+        head.append(f'<meta name="description" content="{description}" />')
+    if canonical:
+        href = url if canonical is True else canonical
+        head.append(f'<link rel="canonical" href="https://example.com{href}" />')
+    return ''.join(head) + f'</head><body>{body}</body></html>'
+
+
+@pytest.fixture
+def dist(tmp_path):
+    root = tmp_path / 'dist'
+    files = {
+        'index.html': page('/', '<a href="/provinsi/jawa-barat/">Jawa Barat</a>'),
+        'favicon.svg': '<svg/>',
+        'provinsi/jawa-barat/index.html': page(
+            '/provinsi/jawa-barat/',
+            '<a href="kabupaten/kota-bandung/">ok</a><a href="../../hilang.html">x</a>'),
+        'provinsi/jawa-barat/kabupaten/kota-bandung/index.html': page(
+            '/provinsi/jawa-barat/kabupaten/kota-bandung/', canonical=False),
+        'provinsi/jawa-barat/kabupaten/kota-bandung/kecamatan/cicendo/index.html': page(
+            '/provinsi/jawa-barat/kabupaten/kota-bandung/kecamatan/cicendo/',
+            f'<a href="/{SCHOOL}?x=1#top">ok</a><a href="mailto:a@b.c">m</a>'
+            '<a href="https://other.example/">e</a><a href="#main">f</a>',
+            description=''),
+        SCHOOL: page('/provinsi/salah.html', 'x' * 70000),
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    (root / 'empty.html').write_text('')
+    return str(root)
+
+
+def test_page_tiers_and_urls():
+    assert page_tier('index.html') == 'homepage'
+    assert page_tier('provinsi/a/index.html') == 'province'
+    assert page_tier('provinsi/a/kabupaten/b/index.html') == 'kabupaten'
+    assert page_tier('provinsi/a/kabupaten/b/kecamatan/c/index.html') == 'kecamatan'
+    assert page_tier(SCHOOL) == 'school'
+    assert page_tier('about.html') == 'other'
+    assert page_url('index.html') == '/'
+    assert page_url('provinsi/a/index.html') == '/provinsi/a/'
+    assert page_url(SCHOOL) == '/' + SCHOOL
+
+
+def test_link_rules_match_validate_links():
+    assert is_relative_link('/styles.css')
+    assert is_relative_link('kabupaten/x/')
+    for link in ('', '#', '#main', 'http://x', 'HTTPS://x', 'mailto:a@b', 'tel:1',
+                 'javascript:void(0)', '//cdn.example/x.js'):
+        assert not is_relative_link(link)
+    assert link_target('provinsi/a/index.html', '../../styles.css?v=1') == 'styles.css'
+    assert link_target('provinsi/a/index.html', '/') == '.'
+    assert link_target('provinsi/a/index.html', '/provinsi/a/#x') == 'provinsi/a'
+
+
+def test_audit_reports_every_problem(dist):
+    report = audit_dist(dist, jobs=1)
+    assert report.pages == 6
+    assert report.counts == {
+        'broken_link': 1,
+        'missing_canonical': 2,
+        'missing_description': 2,
+        'missing_title': 1,
+        'wrong_canonical': 1,
+        'over_budget': 1,
+    }
+    assert report.samples['broken_link'] == ['provinsi/jawa-barat/index.html -> ../../hilang.html']
+    assert report.samples['wrong_canonical'] == [
+        f'{SCHOOL} -> https://example.com/provinsi/salah.html']
+    assert report.tiers['school']['pages'] == 1
+    assert report.tiers['other']['pages'] == 1
+    assert report.pages_per_second > 0
+
+
+def test_budget_override(dist):
+    report = audit_dist(dist, jobs=1, budgets={'school': 1 << 20, 'province': 10})
+    assert report.counts['over_budget'] == 1
+    assert report.samples['over_budget'][0].startswith('provinsi/jawa-barat/index.html -> ')
+    assert report.tiers['province']['budget'] == 10
+
+
+def test_process_pool_matches_serial(dist):
+    serial = audit_dist(dist, jobs=1)
+    parallel = audit_dist(dist, jobs=2, batch_size=1)
+    assert parallel.counts == serial.counts
+    assert parallel.tiers == serial.tiers
@@ -0,0 +1,93 @@
+"""
+Tests for the enrichment store audit in tests/enrichment_audit.py.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.enrichment_audit import audit_enrichment  # noqa: E402
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def wikipedia(title, enriched_at='2026-09-01T00:00:00.000Z', extract='Sekolah negeri.'):
+    return {'wikipedia': {'wikipediaUrl': f"https://id.wikipedia.org/wiki/{title}",
+                          'wikipediaTitle': title, 'wikipediaExtract': extract,
+                          'enrichedAt': enriched_at, 'source': 'wikipedia'}}
+
+
+def write_store(tmp_path, members):
+    """Members as saveEnrichmentData writes them (JSON.stringify(data, null, 2))."""
+    os.makedirs(tmp_path, exist_ok=True)
+    path = tmp_path / 'enrichment.json'
+    body = ',\n'.join(f"  {json.dumps(npsn)}: " + json.dumps(entry, indent=2, ensure_ascii=False)
+                      .replace('\n', '\n  ') for npsn, entry in members)
+    path.write_text('{\n' + body + '\n}', encoding='utf-8')
+    return str(path)
+
+
+def test_joins_store_to_schools_and_costs_each_entry(tmp_path):
+    csv_path = write_csv(tmp_path, [make_row(10000000 + i) for i in range(6)] + [make_row(' 12345')])
+    store = write_store(tmp_path, [
+        ('10000000', wikipedia('SD_Négeri_1')),
+        ('10000001', wikipedia('SD_2', enriched_at='2024-05-01T00:00:00.000Z')),
+        ('10000002', {'wikipedia': {'wikipediaTitle': 'no url'}}),
+        ('10000003', wikipedia('SD_4', enriched_at=None)),
+        ('10000004', wikipedia('SD_5', extract='x' * 3000)),
+        ('99999999', wikipedia('Tutup')),
+        ('10000000', wikipedia('SD_Négeri_1')),
+        ('12345', wikipedia('Trimmed')),
+    ])
+    report = audit_enrichment(store, csv_path, now=NOW)
+    data = report.to_dict()
+    assert (report.entries, report.schools, report.matched) == (8, 7, 6)
+    assert {problem: counts['entries'] for problem, counts in data['problems'].items()} == {
+        'orphaned': 1, 'stale': 3, 'oversized': 1, 'duplicate': 1}
+    assert report.stale_reasons == {'expired': 1, 'renders nothing': 1, 'undated': 1}
+    assert report.prune == ['10000001', '10000002', '10000003', '10000004', '99999999']
+    assert report.samples['stale'][0].startswith('10000001: enriched 2024-05-01, ')
+    assert report.bytes['oversized'] > 3000
+
+    # Byte costs are exact: the pruned store, saved again, has the projected size
+    with open(store, encoding='utf-8') as f:
+        kept = json.load(f)
+    for npsn in report.prune:
+        del kept[npsn]
+    pruned = write_store(tmp_path / 'pruned', kept.items())
+    assert os.path.getsize(pruned) == report.projected_bytes
+    assert not report.passed and report.errors[0].startswith('1 orphaned entries (')
+
+
+def test_clean_store_passes_and_broken_store_fails(tmp_path):
+    csv_path = write_csv(tmp_path, [make_row(10000001)])
+    store = write_store(tmp_path, [('10000001', wikipedia('SD_1'))])
+    assert audit_enrichment(store, csv_path, now=NOW).passed
+    with open(store, 'a', encoding='utf-8') as f:
+        f.write(',')
+    report = audit_enrichment(store, csv_path, now=NOW)
+    assert report.malformed and 'returns {}' in report.errors[0]
+
+
+def test_repeated_key_judges_the_last_entry_like_json_parse(tmp_path):
+    csv_path = write_csv(tmp_path, [make_row(12345678), make_row(10000001)])
+    store = write_store(tmp_path, [
+        ('12345678', {'wikipedia': {'wikipediaTitle': 'no url'}}),
+        ('10000001', wikipedia('SD_1')),
+        ('12345678', wikipedia('SD_Baru')),
+    ])
+    report = audit_enrichment(store, csv_path, now=NOW)
+    assert (report.entries, report.matched) == (3, 2)
+    assert report.counts == {'duplicate': 1} and report.prune == []
+    assert report.samples['duplicate'][0].startswith('12345678: ')
+
+    # The earlier entry renders, the last one does not: the last one is stale
+    store = write_store(tmp_path, [('12345678', wikipedia('SD_Lama')),
+                                   ('12345678', {'wikipedia': {'wikipediaTitle': 'no url'}})])
+    report = audit_enrichment(store, csv_path, now=NOW)
+    assert report.counts == {'duplicate': 1, 'stale': 1}
+    assert report.stale_reasons == {'renders nothing': 1} and report.prune == ['12345678']
@@ -0,0 +1,93 @@
+"""
+Tests for incremental validation in tests/incremental.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.data_checks import StreamingValidator, default_checks  # noqa: E402
+from tests.incremental import (  # noqa: E402
+    IncrementalValidator,
+    extract_npsns,
+    split_records,
+)
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+
+def dirty_rows():
+    rows = [make_row(10000000 + i) for i in range(40)]
+    rows += [make_row(12345678)] * 3
+    rows += [make_row('X12', nama='') for _ in range(2)]
+    rows += [make_row(20000000 + i, lat='40.5', lon='200') for i in range(3)]
+    rows += [make_row(30000000, lat='abc'), make_row(30000001, lat='', lon=''), '3,Short']
+    return rows
+
+
+class TestIncrementalValidator:
+    """Verdicts must match a full run while re-checking only changed rows."""
+
+    def run_both(self, path, state):
+        full = StreamingValidator(default_checks()).run(path)
+        report, stats = IncrementalValidator(state).run(path)
+        assert report.rows == full.rows
+        assert report.errors == full.errors
+        return stats
+
+    def test_first_run_checks_everything(self, tmp_path):
+        path = write_csv(tmp_path, dirty_rows())
+        stats = self.run_both(path, str(tmp_path / 'state'))
+        assert not stats.state_loaded
+        assert stats.rechecked == stats.rows == 51
+
+    def test_unchanged_file_reuses_every_row(self, tmp_path):
+        path = write_csv(tmp_path, dirty_rows())
+        state = str(tmp_path / 'state')
+        self.run_both(path, state)
+        stats = self.run_both(path, state)
+        assert stats.state_loaded
+        assert stats.rechecked == 0
+        assert stats.reused == 51
+
+    def test_only_changed_and_new_rows_are_rechecked(self, tmp_path):
+        state = str(tmp_path / 'state')
+        rows = dirty_rows()
+        path = write_csv(tmp_path, rows)
+        self.run_both(path, state)
+
+        rows[0] = make_row(10000000, lat='50.0')   # changed: now out of bounds
+        rows[5] = make_row(10000005, nama='')      # changed: empty name
+        del rows[10]                               # removed
+        rows.append(make_row(40000000))            # new
+        path = write_csv(tmp_path, rows)
+        stats = self.run_both(path, state)
+        assert (stats.rechecked, stats.changed, stats.new, stats.removed) == (3, 2, 1, 1)
+
+    def test_fixed_rows_drop_out_of_aggregates(self, tmp_path):
+        state = str(tmp_path / 'state')
+        rows = [make_row(10000000 + i, lat='40.0') for i in range(10)]
+        self.run_both(write_csv(tmp_path, rows), state)
+        fixed = [make_row(10000000 + i) for i in range(10)]
+        report, _ = IncrementalValidator(state).run(write_csv(tmp_path, fixed))
+        assert report.passed
+
+    def test_quoted_multiline_records(self, tmp_path):
+        rows = [make_row(10000000).replace('Jl. Test', '"Jl. Test,\nBlok ""A"""'),
+                make_row(10000001)]
+        path = write_csv(tmp_path, rows)
+        stats = self.run_both(path, str(tmp_path / 'state'))
+        assert stats.rows == 2
+
+
+class TestRecordSplitting:
+    """Test raw record splitting and NPSN extraction."""
+
+    def test_split_records_handles_quotes_and_blank_lines(self):
+        text = 'a,b\r\n1,"x\ny"\n\n2,"say ""hi"""\n'
+        assert split_records(text) == ['a,b', '1,"x\ny"', '2,"say ""hi"""']
+
+    def test_extract_npsns(self):
+        records = ['123,a', ' 456 ,b', '"789",c', '']
+        assert extract_npsns(records, 0) == ['123', '456', '789', '']
+        assert extract_npsns(['a,123', 'b,"456"', 'c'], 1) == ['123', '456', '']
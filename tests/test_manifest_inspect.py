@@ -0,0 +1,131 @@
+"""
+Tests for the build-manifest inspector in tests/manifest_inspect.py.
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.manifest_inspect import (  # noqa: E402
+    ManifestError,
+    current_schools,
+    inspect_manifest,
+    iter_manifest,
+    iter_members,
+    merge_join,
+)
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+KECAMATAN = 'provinsi/dki-jakarta/kabupaten/jakarta-pusat/kecamatan/gambir'
+
+
+def school_path(npsn, slug):
+    return f"{KECAMATAN}/{npsn}-{slug}.html"
+
+
+def write_manifest(tmp_path, schools, version=2):
+    manifest = {'version': version, 'lastBuild': '2026-07-20T00:00:00.000Z',
+                'schools': {npsn: {'hash': digest, 'builtAt': '2026-07-20T00:00:00.000Z',
+                                   'path': path}
+                            for npsn, digest, path in schools}}
+    path = tmp_path / '.build-manifest.json'
+    path.write_text(json.dumps(manifest, separators=(',', ':')), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def previous(tmp_path):
+    """Manifest of a build of four schools."""
+    csv_path = write_csv(tmp_path, [make_row(10000000 + i, nama=f"SD Negeri {i}")
+                                    for i in range(4)])
+    return write_manifest(tmp_path, current_schools(csv_path))
+
+
+def test_unchanged_csv_rebuilds_nothing(tmp_path, previous):
+    csv_path = write_csv(tmp_path, [make_row(10000000 + i, nama=f"SD Negeri {i}")
+                                    for i in range(4)])
+    report = inspect_manifest(previous, csv_path)
+    assert report.manifest_status == 'ok'
+    assert report.lists == {'changed': [], 'orphaned': [],
+                            'unchanged': ['10000000', '10000001', '10000002', '10000003']}
+
+
+def test_changed_new_and_orphaned_sets(tmp_path, previous):
+    rows = [make_row(10000000, nama='SD Negeri 0'),
+            make_row(10000001, nama='SD Negeri 1', lat='-6.3'),   # content change
+            make_row(10000002, nama='SD Negeri Dua'),             # renamed: new path
+            make_row(10000009, nama='SD Negeri 9')]               # new; 10000003 removed
+    report = inspect_manifest(previous, write_csv(tmp_path, rows))
+    assert report.lists['changed'] == ['10000001', '10000002', '10000009']
+    assert report.lists['unchanged'] == ['10000000']
+    assert report.new == 1
+    assert report.lists['orphaned'] == [school_path(10000002, 'sd-negeri-2'),
+                                        school_path(10000003, 'sd-negeri-3')]
+
+
+def test_missing_or_stale_manifest_means_full_build(tmp_path):
+    csv_path = write_csv(tmp_path, [make_row(10000000)])
+    report = inspect_manifest(str(tmp_path / 'none.json'), csv_path)
+    assert report.manifest_status == 'missing'
+    assert report.lists['changed'] == ['10000000']
+
+    stale = write_manifest(tmp_path, [('10000000', 'x', 'gone.html')], version=1)
+    report = inspect_manifest(stale, csv_path)
+    assert report.manifest_status == 'version 1 discarded'
+    assert report.lists['changed'] == ['10000000'] and report.lists['orphaned'] == []
+
+
+def test_reconciles_against_dist(tmp_path, previous):
+    dist = tmp_path / 'dist'
+    for npsn, slug in [(10000000, 'sd-negeri-0'), (10000003, 'sd-negeri-3'),
+                       (10000005, 'sd-negeri-5')]:
+        page = dist / school_path(npsn, slug)
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text('<html></html>')
+    (dist / KECAMATAN / 'index.html').write_text('<html></html>')
+    rows = [make_row(10000000, nama='SD Negeri 0'), make_row(10000001, nama='SD Negeri 1'),
+            make_row(10000002, nama='SD Negeri 2', lat='-6.3')]
+    report = inspect_manifest(previous, write_csv(tmp_path, rows), str(dist))
+    assert report.pages_checked == 3
+    # 10000002 is missing too, but the next build rewrites it; 10000003 is orphan cleanup's
+    assert report.counts == {'unchanged_pages_missing': 1, 'untracked_pages': 1}
+    assert report.samples['unchanged_pages_missing'] == [school_path(10000001, 'sd-negeri-1')]
+    assert report.samples['untracked_pages'] == [school_path(10000005, 'sd-negeri-5')]
+
+
+def test_iter_manifest_streams_across_chunks():
+    data = {'version': 2, 'schools': {str(i): {'hash': 'h' * 32, 'path': f"p/{i}.html"}
+                                      for i in range(30)}, 'lastBuild': 'later'}
+    header = {}
+    entries = list(iter_manifest(io.BytesIO(json.dumps(data, indent=1).encode()), header,
+                                 chunk_size=7))
+    assert [npsn for npsn, _ in entries] == [str(i) for i in range(30)]
+    assert entries[3][1]['path'] == 'p/3.html'
+    assert header == {'version': 2, 'lastBuild': 'later'}
+    with pytest.raises(ManifestError):
+        list(iter_manifest(io.BytesIO(b'{"version":2,"schools":{"1":{}'), {}))
+
+
+def test_iter_members_sizes_add_up_across_chunks():
+    data = {str(i): {'title': 'Sekolah Négeri ' * (i % 4), 'n': i} for i in range(40)}
+    raw = json.dumps(data, indent=2, ensure_ascii=False).encode()
+    for chunk_size in (1, 5, 1 << 20):
+        members = list(iter_members(io.BytesIO(raw), chunk_size=chunk_size))
+        assert [(key, value) for key, value, _ in members] == list(data.items())
+        assert sum(size for _, _, size in members) == len(raw) - len('{}')
+        # The first member: newline, indent, key, value and comma
+        assert members[0][2] == len(b'\n  "0": ') + len(
+            json.dumps(data['0'], indent=2).replace('\n', '\n  ')) + 1
+
+
+def test_merge_join_outer_rows():
+    left = [('a', 1), ('b', 2), ('b', 3), ('d', 4)]
+    right = [('b', 'x'), ('c', 'y')]
+    assert list(merge_join(left, right)) == [
+        (('a', 1), None), (('b', 2), ('b', 'x')), (('b', 3), ('b', 'x')),
+        (None, ('c', 'y')), (('d', 4), None)]
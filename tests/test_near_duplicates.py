@@ -0,0 +1,96 @@
+"""
+Tests for the near-duplicate school detector in tests/near_duplicates.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.benchmark import generate_schools_csv  # noqa: E402
+from tests.near_duplicates import (  # noqa: E402
+    PAIRWISE_LIMIT,
+    find_near_duplicates,
+    normalize_name,
+)
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+
+def test_normalize_name():
+    assert normalize_name('SD Negeri 4 Sukamaju') == ('4 sukamaju', (4,))
+    assert normalize_name('SDN 04 SUKAMAJU') == ('4 sukamaju', (4,))
+    assert normalize_name('SMP N. 2 Kota-Baru') == ('2 kota baru', (2,))
+    assert normalize_name('SD Negeri') == ('', ())
+
+
+def test_reports_near_duplicates_in_one_block(tmp_path):
+    rows = [
+        make_row(10000001, nama='SD Negeri 4 Sukamaju', lat='-6.2000', lon='106.8000'),
+        make_row(10000002, nama='SDN 04 SUKAMAJU', lat='-6.2010', lon='106.8010'),
+        make_row(10000003, nama='SD Negeri 5 Sukamaju', lat='-6.2000', lon='106.8000'),
+        make_row(10000004, nama='SD Negeri 4 Sukamaju', lat='-6.3000', lon='106.8000'),
+        make_row(10000005, nama='SD Negeri 4 Sukamaju').replace('Gambir', 'Menteng'),
+        make_row(10000006, nama='SD Negeri 4 Sukamaju').replace(',SD,', ',SMP,'),
+        make_row(10000007, nama='SD Negeri 04 Sukamaju', lat='0', lon='0'),
+        make_row(10000002, nama='SDN 4 Sukamaju', lat='-6.2010', lon='106.8010'),
+    ]
+    report = find_near_duplicates(write_csv(tmp_path, rows))
+    pairs = {tuple(pair['npsn']): pair for pair in report.pairs}
+    # 5 is another school number, 10000004 is 11 km away, 10000005/6 are in
+    # other blocks, the repeated 10000002 is left to the NPSN uniqueness
+    # check, and 10000007 has no coordinates so distance cannot rule it out
+    assert [tuple(pair['npsn']) for pair in report.pairs] == [
+        ('10000001', '10000002'), ('10000001', '10000007'), ('10000001', '10000002'),
+        ('10000002', '10000007'), ('10000004', '10000007'), ('10000007', '10000002')]
+    assert pairs['10000001', '10000002']['distance_km'] < 0.2
+    assert pairs['10000001', '10000002']['similarity'] == 1.0
+    assert pairs['10000001', '10000007']['distance_km'] is None
+    assert report.blocks == 3 and not report.passed
+
+
+def test_large_groups_use_minhash_buckets(tmp_path):
+    streets = ['Melati', 'Mawar', 'Kenanga', 'Anggrek', 'Cempaka', 'Dahlia', 'Flamboyan',
+               'Kamboja', 'Teratai', 'Tulip', 'Seroja', 'Bougenville']
+    names = [f'{a} {b}' for a in streets for b in streets if a < b]
+    rows = [make_row(10000000 + i, nama=f'SD Negeri 1 {name}', lat='-6.2', lon='106.8')
+            for i, name in enumerate(names)]
+    rows.append(make_row(10009999, nama=f'SDN 01 {names[0].upper()}',
+                         lat='-6.2001', lon='106.8001'))
+    report = find_near_duplicates(write_csv(tmp_path, rows))
+    assert len(rows) > PAIRWISE_LIMIT and report.groups == {'lsh': 1}
+    assert report.comparisons < len(rows) * (len(rows) - 1) // 2 // 4
+    assert [pair['npsn'] for pair in report.pairs] == [['10000000', '10009999']]
+
+
+def test_pairs_carry_their_own_kecamatan(tmp_path):
+    rows = [make_row(10000001, nama='SD Negeri 4 Sukamaju'),
+            make_row(10000002, nama='SDN 04 SUKAMAJU').replace('Gambir', 'GAMBIR'),
+            make_row(10000003, nama='SD Negeri 4 Harapan').replace('Gambir', 'gambir')]
+    report = find_near_duplicates(write_csv(tmp_path, rows))
+    assert [(pair['npsn'], pair['kecamatan']) for pair in report.pairs] == [
+        (['10000001', '10000002'], 'Gambir')]
+
+
+def test_finds_the_relisted_schools_of_a_generated_dataset(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    generate_schools_csv(path, 3000, near_dup_rate=0.02)
+    with open(path, encoding='utf-8') as f:
+        relisted = sum(1 for line in f if ',SDN ' in line)
+    report = find_near_duplicates(path)
+    assert relisted > 20
+    assert sum('SDN ' in pair['nama'][1] for pair in report.pairs) >= relisted
+
+
+def test_same_named_kecamatan_in_other_kabupaten_are_other_blocks(tmp_path):
+    row = make_row(10000001, nama='SD Negeri 1 Sukamaju', lat='0', lon='0')
+    rows = [row.replace('Gambir,Jakarta Pusat,DKI Jakarta', 'Cicalengka,Kab. Bandung,Jawa Barat'),
+            make_row(10000002, nama='SD Negeri 1 Sukamaju').replace(
+                'Gambir,Jakarta Pusat,DKI Jakarta', 'Cicalengka,Kab. Garut,Jawa Barat'),
+            make_row(10000003, nama='SDN 01 Sukamaju').replace(
+                'Gambir,Jakarta Pusat,DKI Jakarta', 'Cicalengka,Kab. Bandung,Jawa Barat')]
+    report = find_near_duplicates(write_csv(tmp_path, rows))
+    assert report.blocks == 2
+    assert [{key: pair[key] for key in ('npsn', 'provinsi', 'kab_kota', 'kecamatan')}
+            for pair in report.pairs] == [
+        {'npsn': ['10000001', '10000003'], 'provinsi': 'Jawa Barat',
+         'kab_kota': 'Kab. Bandung', 'kecamatan': 'Cicalengka'}]
@@ -0,0 +1,73 @@
+"""
+Tests for the compact NPSN set in tests/npsn_index.py.
+"""
+
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.npsn_index import KEYSPACE, NpsnSet, npsn_key  # noqa: E402
+
+
+class TestNpsnSet:
+    """Test bitmap membership and the side set for non-canonical values."""
+
+    def test_add_reports_repeats(self):
+        seen = NpsnSet()
+        assert seen.add('12345678') is True
+        assert seen.add('12345678') is False
+        assert '12345678' in seen
+        assert '87654321' not in seen
+        assert len(seen) == 1
+
+    def test_keyspace_edges(self):
+        seen = NpsnSet()
+        assert seen.add('00000000')
+        assert seen.add('99999999')
+        assert '00000000' in seen and '99999999' in seen
+        assert len(seen) == 2
+
+    def test_non_canonical_values_use_side_set(self):
+        seen = NpsnSet()
+        for value in ('ABC123', '1234567', '01234567', '123456789', '１２３４５６７８'):
+            assert seen.add(value)
+        assert not seen.add('ABC123')
+        assert seen.side == {'ABC123', '1234567', '123456789', '１２３４５６７８'}
+        assert len(seen) == 5
+
+    def test_memory_is_fixed(self):
+        seen = NpsnSet()
+        assert seen.nbytes == 0
+        for i in range(10000):
+            seen.add(str(10000000 + i))
+        assert seen.nbytes == KEYSPACE // 8
+        assert len(seen) == 10000
+
+    def test_npsn_key(self):
+        assert npsn_key('12345678') == 12345678
+        assert npsn_key('1234567') is None
+        assert npsn_key('1234567A') is None
+
+    def test_merge_reports_shared_values(self):
+        first, second = NpsnSet(), NpsnSet()
+        for value in ('10000001', '10000002', 'X1'):
+            first.add(value)
+        for value in ('10000002', '99999999', 'X1', 'X2'):
+            second.add(value)
+        assert first.merge(second, sample_size=5) == (2, ['X1', '10000002'])
+        assert len(first) == 5
+        assert '99999999' in first and 'X2' in first
+
+    def test_pickles_as_sorted_keys(self):
+        seen = NpsnSet()
+        for value in ('87654321', '00000007', '12345678', 'ABC'):
+            seen.add(value)
+        assert list(seen.keys()) == [7, 12345678, 87654321]
+        copy = pickle.loads(pickle.dumps(seen))
+        assert len(pickle.dumps(seen)) < 1000
+        assert copy.nbytes == 0 and len(copy) == 4
+        assert '12345678' in copy and 'ABC' in copy and '12345679' not in copy
+        assert not copy.add('00000007') and copy.add('00000008')
+        assert NpsnSet().merge(copy) == (0, [])
@@ -0,0 +1,82 @@
+"""
+Tests for the page-weight analyzer in tests/page_weight.py.
+"""
+
+import gzip
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.page_weight import analyze_dist, gzip_size, page_blocks  # noqa: E402
+
+HEAD = ('<!DOCTYPE html>\n<html lang="id">\n<head>\n  <meta charset="utf-8" />\n'
+        '  <link rel="icon" href="/favicon.svg" />\n')
+STYLE = '<style>body { margin: 0; color: #111827; }</style>'
+SCRIPT = ('<script>(function() { var button = document.querySelector(".back-to-top"); '
+          'button.addEventListener("click", function() { window.scrollTo(0, 0); }); })();</script>')
+NAV = '<nav aria-label="Navigasi utama"><a href="/">Beranda</a></nav>'
+FOOTER = '<footer role="contentinfo"><p>&copy; 2026 Sekolah PSEO</p></footer>'
+SCHOOL_DIR = 'provinsi/jawa-barat/kabupaten/kota-bandung/kecamatan/cicendo'
+
+
+def page(title, body):
+    return (f"{HEAD}  <title>{title}</title>\n  {STYLE}\n</head>\n<body>\n{NAV}\n"
+            f"<main>{body}</main>\n{FOOTER}\n{SCRIPT}\n"
+            f'<script type="application/json">{{"nama": "{title}"}}</script>\n</body></html>')
+
+
+def write_dist(tmp_path, files):
+    root = tmp_path / 'dist'
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    return str(root)
+
+
+def test_page_blocks_split_head_lines_and_template_elements():
+    data = page('SD Negeri 1', '<p>Unik</p>').encode()
+    blocks = [(kind, data[start:end].decode()) for kind, start, end in page_blocks(data)]
+    assert blocks[:3] == [('head', '<!DOCTYPE html>\n'), ('head', '<html lang="id">\n'),
+                          ('head', '<head>\n')]
+    assert ('head', '  <title>SD Negeri 1</title>\n') in blocks
+    assert [block for block in blocks if block[0] != 'head'] == [
+        ('css', STYLE), ('nav', NAV), ('footer', FOOTER), ('script', SCRIPT),
+        ('script', '<script type="application/json">{"nama": "SD Negeri 1"}</script>')]
+    head = [text for kind, text in blocks if kind == 'head']
+    assert head[-2:] == ['\n', '</head>']  # the head ends with the </head> tag
+    assert gzip_size(data) == len(gzip.compress(data, 6, mtime=0))
+
+
+def test_attributes_repeated_blocks_per_tier_and_projects_savings(tmp_path):
+    files = {'index.html': page('Beranda', ''.join(f"<li>Provinsi {i * 7919 % 1000}</li>" for i in range(200)))}
+    for i in range(12):
+        files[f"{SCHOOL_DIR}/{10000000 + i}-sd-{i}.html"] = page(
+            f"SD Negeri {i}", f"<dl><dt>NPSN</dt><dd>{10000000 + i}</dd></dl>")
+    dist = write_dist(tmp_path, files)
+    report = analyze_dist(dist, jobs=2, sample=4, batch_size=3, top=3)
+    single = analyze_dist(dist, jobs=1, sample=4, batch_size=3, top=3).to_dict()
+    data = report.to_dict()
+    assert data['tiers'] == single['tiers'] and data['blocks'] == single['blocks']
+
+    school = data['tiers']['school']
+    pages = [content.encode() for name, content in files.items() if name != 'index.html']
+    assert school['pages'] == 12
+    assert school['raw_bytes'] == sum(map(len, pages))
+    assert school['zlib_max_bytes'] == sum(len(zlib.compress(p, 9)) for p in pages)
+    repeated = school['repeated_bytes']
+    assert (repeated['css'], repeated['script'], repeated['nav'], repeated['footer']) == (
+        12 * len(STYLE), 12 * len(SCRIPT), 12 * len(NAV), 12 * len(FOOTER))
+    # Head lines shared by every page; the title line is unique
+    assert repeated['head'] == 12 * (len(HEAD) + len('  \n</head>'))
+    assert school['unique_bytes'] == school['raw_bytes'] - sum(repeated.values())
+    assert school['savings']['raw_bytes'] == 12 * (len(STYLE) + len(SCRIPT))
+    assert 0 < school['savings']['zlib_max_bytes'] < school['savings']['raw_bytes']
+
+    assert data['blocks'][0]['kind'] == 'script' and data['blocks'][0]['pages'] == 13
+    assert data['heaviest'][0]['page'] == 'index.html'
+    assert report.over_limit == ['school'] and not report.passed
+    assert report.errors[0].startswith('1 tiers over the repeated-bytes limit (50%)')
+    assert analyze_dist(dist, jobs=1, max_repeated_share=0.95).passed
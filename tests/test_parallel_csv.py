@@ -0,0 +1,109 @@
+"""
+Tests for the byte-range parallel validator in tests/parallel_csv.py.
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.data_checks import DataCheck, StreamingValidator, default_checks  # noqa: E402
+from tests.parallel_csv import ParallelValidator, record_ranges, validate_range  # noqa: E402
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+MULTILINE_ALAMAT = '"Jl. Test\nRT ""05"",\nGang 2"'
+
+
+def rows_with_newlines(count):
+    rows = []
+    for i in range(count):
+        row = make_row(10000000 + i % 97)  # repeats span every range
+        if i % 3 == 0:
+            row = row.replace('Jl. Test', MULTILINE_ALAMAT)
+        if i % 11 == 0:
+            row = make_row(f'X{i}', lat='91.0')
+        rows.append(row)
+    return rows
+
+
+def test_ranges_cut_on_record_boundaries(tmp_path):
+    path = write_csv(tmp_path, rows_with_newlines(300))
+    with open(path, encoding='utf-8', newline='') as f:
+        header, *expected = list(csv.reader(f))
+    for parts in (1, 2, 5, 16, 400):
+        for block_size in (7, 64, 1 << 20):
+            fieldnames, ranges = record_ranges(path, parts, block_size)
+            assert fieldnames == header
+            assert len(ranges) <= parts
+            assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+            records = []
+            for start, end in ranges:
+                with open(path, 'rb') as f:
+                    f.seek(start)
+                    records += list(csv.reader(f.read(end - start).decode().splitlines(True)))
+            assert records == expected, (parts, block_size)
+
+
+def test_unbalanced_quotes_fall_back_to_one_range(tmp_path):
+    path = write_csv(tmp_path, [make_row(10000001)] * 50 + [make_row(10000002, nama='SD "A')])
+    _, ranges = record_ranges(path, 4)
+    assert len(ranges) == 1
+
+
+def test_merged_report_matches_streaming(tmp_path):
+    path = write_csv(tmp_path, rows_with_newlines(600))
+    expected = StreamingValidator(default_checks()).run(path)
+    validator = ParallelValidator(workers=3, min_bytes=0)
+    report = validator.run(path)
+    assert len(validator.ranges) == 3
+    assert report.rows == expected.rows == 600
+    assert not report.passed
+    for name, error in expected.errors.items():
+        assert (report.errors[name] is None) == (error is None), name
+    unique = report.checks['NPSN values are unique']
+    streamed = expected.checks['NPSN values are unique']
+    assert (unique.total, unique.duplicates) == (streamed.total, streamed.duplicates)
+    assert report.errors['Coordinates within Indonesia bounds'] == \
+        expected.errors['Coordinates within Indonesia bounds']
+    assert report.errors['NPSN values are numeric'] == expected.errors['NPSN values are numeric']
+
+
+def test_merge_is_associative_across_splits(tmp_path):
+    lines = [make_row(10000001), make_row(10000002, lat='abc')] + \
+        [make_row(10000000 + i % 5) for i in range(20)]
+    path = write_csv(tmp_path, lines)
+    fieldnames, ranges = record_ranges(path, 5, block_size=16)
+    parts = [validate_range(path, fieldnames, byte_range) for byte_range in ranges]
+
+    def fold(group):
+        rows, checks = group[0]
+        for part_rows, part_checks in group[1:]:
+            rows += part_rows
+            for check, part in zip(checks, part_checks):
+                check.merge(part)
+        return rows, checks
+
+    left = fold([fold(parts[:2])] + parts[2:])
+    parts = [validate_range(path, fieldnames, byte_range) for byte_range in ranges]
+    right = fold([parts[0], fold(parts[1:])])
+    def without_samples(errors):
+        # Repeats spanning two ranges are sampled after the later range's own
+        return {name: error and error.split(' Sample:')[0] for name, error in errors.items()}
+
+    expected = without_samples(StreamingValidator(default_checks()).run(path).errors)
+    assert expected['CSV lat/lon are numeric'] == "lat 'abc' should be numeric"
+    for rows, checks in (left, right):
+        assert rows == 22
+        assert without_samples({check.name: check.error() for check in checks}) == expected
+
+
+class CountOnlyCheck(DataCheck):
+    name = 'counts rows, cannot merge'
+
+
+def test_checks_without_merge_are_refused_before_any_worker():
+    with pytest.raises(TypeError, match='counts rows, cannot merge'):
+        ParallelValidator(lambda: default_checks() + [CountOnlyCheck()], workers=2)
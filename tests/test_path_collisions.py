@@ -0,0 +1,50 @@
+"""
+Tests for the output-path collision detector in tests/path_collisions.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.path_collisions import find_collisions  # noqa: E402
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+from tests.test_school_db import row  # noqa: E402
+
+
+def test_unique_paths_pass(tmp_path):
+    report = find_collisions(write_csv(tmp_path, [make_row(10000000 + i, nama=f"SD {i}")
+                                                  for i in range(5)]))
+    assert report.passed
+    assert report.paths == {'homepage': 1, 'province': 1, 'kabupaten': 1,
+                            'kecamatan': 1, 'school': 5}
+
+
+def test_school_page_collisions(tmp_path):
+    rows = [make_row(10000001, nama='SD Ñusa'),
+            make_row(10000001, nama='SD Nusa'),         # same slug, different content
+            make_row(10000002), make_row(10000002),     # exact duplicate row
+            make_row('123', nama='4 Maju'),
+            make_row('123-4', nama='Maju'),             # different NPSN, same file name
+            make_row(10000003, nama='')]                # no page, no claim
+    report = find_collisions(write_csv(tmp_path, rows))
+    assert report.counts == {'distinct_records': 2, 'duplicate_rows': 1}
+    kinds = {group['path'].rsplit('/', 1)[1]: group for group in report.groups}
+    assert [m['npsn'] for m in kinds['123-4-maju.html']['members']] == ['123', '123-4']
+    assert [m['row'] for m in kinds['10000002-sd-negeri-1.html']['members']] == [3, 4]
+    assert kinds['10000002-sd-negeri-1.html']['kind'] == 'duplicate_rows'
+
+
+def test_region_name_collisions(tmp_path):
+    rows = [row(10000001, kab_kota='Kab. Bandung', provinsi='Jawa Barat', kecamatan='Cicendo'),
+            row(10000002, kab_kota='Kab Bandung', provinsi='Jawa Barat', kecamatan='Coblong'),
+            row(10000003, kab_kota='Kab Bandung', provinsi='Jawa Barat', kecamatan='Coblong'),
+            row(10000004, provinsi='JAWA BARAT', kab_kota='', kecamatan='')]
+    report = find_collisions(write_csv(tmp_path, rows))
+    assert report.counts == {'region_names': 2}
+    province, kabupaten = report.groups
+    assert province['path'] == 'provinsi/jawa-barat/index.html'
+    assert [(m['names'], m['schools']) for m in province['members']] == [
+        (['Jawa Barat'], 3), (['JAWA BARAT'], 1)]
+    assert kabupaten['path'] == 'provinsi/jawa-barat/kabupaten/kab-bandung/index.html'
+    assert kabupaten['members'][1]['npsns'] == ['10000002', '10000003']
@@ -0,0 +1,88 @@
+"""
+Tests for the build-performance history in tests/perf_history.py.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.perf_history import check, connect, history, ingest, ingest_file, main  # noqa: E402
+
+
+def build_report(day, elapsed_ms, pages_per_s, build_type='full'):
+    pages = int(pages_per_s * elapsed_ms / 1000)
+    return {
+        'buildType': build_type, 'status': 'PASS', 'passed': True,
+        'timestamp': f"2026-09-{day:02d}T02:00:00.000Z",
+        'metrics': {'elapsedMs': elapsed_ms + 500, 'totalPages': pages,
+                    'throughput': round(pages / ((elapsed_ms + 500) / 1000), 2)},
+        'phases': {
+            'writeSchoolPagesConcurrently': {'elapsedMs': elapsed_ms, 'pages': pages,
+                                             'throughput': pages_per_s},
+            'generateKecamatanPages': {'elapsedMs': 400 + day % 3, 'pages': 7000,
+                                       'throughput': round(7000 / (0.4 + day % 3 / 1000), 2)},
+        },
+    }
+
+
+def test_flags_a_throughput_regression_only_in_its_series(tmp_path):
+    path = tmp_path / 'build-perf.jsonl'
+    steady = [build_report(day, 60000 + day * 37 % 500, 7000 + day * 53 % 150) for day in range(1, 13)]
+    # Incremental builds are far faster and must not drag the full baseline
+    steady += [build_report(day, 800, 9000, 'incremental') for day in range(1, 4)]
+    path.write_text('\n'.join(json.dumps(report) for report in steady) + '\n')
+    connection = connect(str(tmp_path / 'history.sqlite'))
+    assert ingest_file(connection, str(path)) == (15, 0)
+    assert ingest_file(connection, str(path)) == (0, 15)  # already stored
+    assert check(connection).passed
+
+    assert ingest(connection, build_report(13, 84000, 5000))
+    report = check(connection)
+    regressed = {(entry['phase'], entry['metric']) for entry in report.regressions}
+    assert regressed == {('writeSchoolPagesConcurrently', 'duration_ms'),
+                         ('writeSchoolPagesConcurrently', 'throughput'),
+                         ('build', 'duration_ms'), ('build', 'throughput')}
+    assert all(entry['variant'] == 'full' for entry in report.regressions)
+    assert 'incremental' in ' '.join(report.short)  # 2 earlier samples: too few to judge
+    assert not report.passed and report.errors[0].startswith('4 performance regressions')
+    assert len(history(connection, 'generateKecamatanPages')) == 2 * 16
+
+
+def test_ingests_runner_json_behind_progress_lines(tmp_path):
+    def output(wall, test_ms):
+        document = {'results': [{'name': 'schools.csv has required columns', 'passed': True,
+                                 'duration': test_ms / 1000},
+                                {'name': 'tiny', 'passed': True, 'duration': 0.0001 * wall}],
+                    'summary': {'wall_duration': wall, 'cpu_time': wall * 0.9, 'jobs': 1,
+                                'profile': False}}
+        return "SEKOLAH-PSEO TEST SUITE\nRunning Project Structure Tests...\n" + \
+            json.dumps(document, indent=2) + '\n'
+
+    connection = connect(str(tmp_path / 'history.sqlite'))
+    for run, wall in enumerate([2.0, 2.1, 1.9, 2.0, 2.05, 1.95, 2.0]):
+        path = tmp_path / f'run{run}.json'
+        path.write_text(output(wall, 800 + run))
+        assert ingest_file(connection, str(path), label=f'sha{run}') == (1, 0)
+    assert check(connection).passed
+
+    path = tmp_path / 'slow.json'
+    path.write_text(output(2.0, 1600))
+    ingest_file(connection, str(path))
+    report = check(connection)
+    # 'tiny' jumped too, but by well under min_delta_ms
+    assert [(entry['kind'], entry['variant'], entry['phase']) for entry in report.regressions] == [
+        ('tests', 'jobs=1', 'schools.csv has required columns')]
+
+
+def test_json_flag_after_the_command(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / 'history.sqlite')
+    monkeypatch.setattr(sys, 'argv', ['perf_history.py', '--db', db, 'check', '--window', '30',
+                                      '--threshold', '4', '--json'])
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 0
+    assert json.loads(capsys.readouterr().out)['passed']
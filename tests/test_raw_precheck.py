@@ -0,0 +1,87 @@
+"""
+Tests for the raw dump pre-validator in tests/raw_precheck.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.raw_precheck import (  # noqa: E402
+    FIELDS,
+    HeaderMapping,
+    iter_line_batches,
+    parse_csv_line,
+    parse_csv_lines,
+    precheck,
+    sanitize,
+)
+
+RAW_HEADER = 'NPSN,nama_sekolah,jenjang,status,provinsi,kota,kecamatan,alamat,lat,lon'
+
+
+def raw_row(npsn, bentuk='SD', status='Negeri', lat='-6.2', lon='106.8', nama='SD Maju'):
+    return f"{npsn},{nama},{bentuk},{status},DKI Jakarta,Jakarta Pusat,Gambir,Jl. Test,{lat},{lon}"
+
+
+def write_raw(tmp_path, lines, header=RAW_HEADER, newline='\n'):
+    path = tmp_path / 'raw.csv'
+    path.write_bytes(newline.join([header] + lines).encode('utf-8'))
+    return str(path)
+
+
+def test_parsing_matches_parse_csv_line():
+    assert parse_csv_line(' a , "b, c" ,"d ""e"""') == ['a', 'b, c', 'd "e"']
+    # A quote anywhere toggles quoting in parseCsvLine; csv would differ
+    assert parse_csv_line('x"a,b"y,z') == ['xa,by', 'z']
+    assert parse_csv_lines(['a,b', 'x"a,b"y,z', '', '"p",q']) == [
+        ['a', 'b'], ['xa,by', 'z'], [], ['p', 'q']]
+    assert sanitize('SD  Negeri\t1') == 'SD Negeri 1'
+    # trim() runs before the non-Latin characters are dropped, as in etl.js
+    assert sanitize('Ñusa 中学') == 'Ñusa '
+
+
+def test_header_resolution():
+    mapping = HeaderMapping(parse_csv_line('npsn,NPSN,Nama,kota,kab_kota,kecamatan,provinsi,x,x'))
+    assert mapping.to_dict()['fields']['kab_kota'] == ['kab_kota', 'kota']
+    assert mapping.unmapped_required == ['bentuk_pendidikan']
+    assert mapping.ignored_columns == ['x']
+    # First non-empty mapping wins, as mapRawField
+    record = dict(zip(FIELDS, mapping.normalise(['', '123', 'SD A', 'Kota B', ''])))
+    assert (record['npsn'], record['kab_kota']) == ('123', 'Kota B')
+
+
+def test_predicts_etl_outcome(tmp_path):
+    lines = [raw_row(10000001),
+             raw_row(10000002, status='swasta', lat='0', lon='0'),  # zero means unset
+             raw_row(10000001),                                     # duplicate NPSN
+             raw_row('12a'),
+             raw_row(10000003, bentuk='TK', lat='7.5'),
+             '',                                                    # blank line mid-file
+             raw_row(10000004, nama='  "SD, Jaya"  ')]
+    report = precheck(write_raw(tmp_path, lines + ['', '  ', ''], newline='\r\n'), min_valid=0.4)
+    assert (report.rows, report.kept, report.rejected, report.duplicates) == (7, 3, 3, 1)
+    assert report.counts == {'malformed_npsn': 1, 'invalid_bentuk_pendidikan': 1,
+                             'lat_out_of_bounds': 1, 'duplicate_npsn': 1, 'missing_npsn': 1,
+                             'missing_nama': 1, 'missing_bentuk_pendidikan': 1,
+                             'missing_provinsi': 1, 'missing_kab_kota': 1,
+                             'missing_kecamatan': 1}
+    assert report.distribution['status'] == {'N': 3, 'S': 1}
+    assert report.samples['duplicate_npsn'] == ['line 4: 10000001']
+    assert report.worth_starting
+    assert not precheck(write_raw(tmp_path, lines), min_valid=0.9).worth_starting
+
+
+def test_chunk_boundaries_and_early_stop(tmp_path):
+    lines = [raw_row(10000000 + i, nama=f'SD Ñ{i}') for i in range(50)]
+    path = write_raw(tmp_path, lines + ['', ''], header='\ufeff ' + RAW_HEADER)
+    batches = list(iter_line_batches(path, chunk_size=7))
+    assert [line for _, batch in batches for line in batch] == [RAW_HEADER] + lines
+    assert [number for number, _ in batches] == sorted({number for number, _ in batches})
+    assert precheck(path, chunk_size=7).kept == 50
+    report = precheck(path, max_rows=10)
+    assert (report.rows, report.kept, report.truncated) == (10, 10, True)
+
+    unmapped = precheck(write_raw(tmp_path, lines, header=RAW_HEADER.replace('kecamatan', 'camat')))
+    assert unmapped.rows == 0 and not unmapped.worth_starting
+    assert unmapped.mapping.unmapped_required == ['kecamatan']
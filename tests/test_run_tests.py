@@ -0,0 +1,194 @@
+"""
+Tests for the standalone runner in tests/run_tests.py: the TestSuite
+scheduler and the --changed-since impact plan (tests/impact.py).
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import impact, run_tests  # noqa: E402
+from tests.test_data_checks import make_row  # noqa: E402
+from tests.test_watch import save  # noqa: E402
+
+
+class TestParallelSuite:
+    """Test --jobs scheduling: ordering, grouping and timing."""
+
+    def test_results_keep_registration_order(self):
+        suite = run_tests.TestSuite(jobs=4)
+        for i in range(12):
+            suite.run_test(f"test {i}", time.sleep, (12 - i) * 0.001)
+        suite.finish()
+        assert [r.name for r in suite.results] == [f"test {i}" for i in range(12)]
+        assert all(r.passed for r in suite.results)
+
+    def test_grouped_tests_share_one_worker(self):
+        suite = run_tests.TestSuite(jobs=4)
+        threads = {}
+
+        def record(name):
+            threads[name] = threading.get_ident()
+
+        for i in range(6):
+            suite.run_test(f"grouped {i}", record, f"grouped {i}", group='dataset')
+        suite.finish()
+        assert len({threads[f"grouped {i}"] for i in range(6)}) == 1
+
+    def test_independent_tests_overlap(self):
+        suite = run_tests.TestSuite(jobs=4)
+        for i in range(4):
+            suite.run_test(f"sleep {i}", time.sleep, 0.05)
+        suite.finish()
+        assert suite.wall_duration < 0.15
+        assert all(r.duration >= 0.05 for r in suite.results)
+
+    def test_failures_are_recorded(self):
+        suite = run_tests.TestSuite(jobs=2)
+        suite.run_test("passes", lambda: None)
+        suite.run_test("fails", suite.assert_true, False, "boom")
+        suite.finish()
+        assert [r.passed for r in suite.results] == [True, False]
+        assert suite.results[1].error == "AssertionError: boom"
+
+    def test_serial_suite_runs_immediately(self):
+        suite = run_tests.TestSuite()
+        result = suite.run_test("passes", lambda: None)
+        assert result is not None and result.passed
+        assert suite.results == [result]
+
+    def test_full_run_matches_serial(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        serial = run_tests.run_all_tests(root)
+        parallel = run_tests.run_all_tests(root, jobs=4)
+        assert [(r.name, r.passed) for r in parallel.results] == \
+            [(r.name, r.passed) for r in serial.results]
+
+
+class TestProfiling:
+    """Test per-test instrumentation behind --profile / --profile-dir."""
+
+    def test_every_result_has_timing_and_cpu(self):
+        suite = run_tests.TestSuite()
+        result = suite.run_test("sleeps", time.sleep, 0.01)
+        data = result.to_dict()
+        assert data['duration_ns'] >= 10_000_000
+        assert data['cpu_time'] < data['duration_ns'] / 1e9
+        assert 'memory_peak' not in data
+
+    def test_profile_records_memory_and_hotspots(self):
+        def allocate():
+            return [bytes(1024) for _ in range(1000)]
+
+        suite = run_tests.TestSuite(jobs=4, profile=True)
+        assert suite.jobs == 1
+        data = suite.run_test("allocates", allocate).to_dict()
+        assert data['memory_peak'] >= 1024 * 1000
+        assert any('allocate' in spot['function'] for spot in data['hotspots'])
+        assert 'profile' not in data
+
+    def test_profile_dir_writes_pstats_dump(self, tmp_path):
+        import pstats
+
+        suite = run_tests.TestSuite(profile_dir=str(tmp_path))
+        result = suite.run_test("Dumps a profile!", sum, range(100))
+        assert result.measurement.profile_path == str(tmp_path / 'dumps-a-profile.prof')
+        assert pstats.Stats(result.measurement.profile_path).total_calls > 0
+
+    def test_failures_are_still_measured(self):
+        suite = run_tests.TestSuite(profile=True)
+        result = suite.run_test("fails", suite.assert_true, False, "boom")
+        assert not result.passed
+        assert result.error == "AssertionError: boom"
+        assert result.measurement.memory_peak is not None
+
+
+class TestChangedSince:
+    """Test --changed-since: which groups run for a diff, and why."""
+
+    @staticmethod
+    def git(root, *args):
+        subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@example.com', *args],
+                       cwd=root, check=True, capture_output=True)
+
+    def make_repo(self, tmp_path):
+        for path, content in [('package.json', '{}'), ('README.md', 'readme'),
+                              ('data/schools.csv', 'npsn\n'), ('scripts/utils.test.js', ''),
+                              ('.github/workflows/on-push.yml', ''), ('docs/a.md', ''),
+                              ('tests/data_checks.py', ''), ('tests/test_data_checks.py', '')]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        self.git(tmp_path, 'init', '-q')
+        self.git(tmp_path, 'add', '.')
+        self.git(tmp_path, 'commit', '-q', '-m', 'base')
+        return tmp_path
+
+    def test_runs_only_groups_reading_changed_inputs(self, tmp_path):
+        root = self.make_repo(tmp_path)
+        (root / 'data' / 'schools.csv').write_text('npsn\n1\n')
+        (root / 'docs' / 'b.md').write_text('new docs are never read')
+        (root / 'tests' / 'test_data_checks.py').write_text('# pytest only')
+        plan = impact.ImpactPlan(str(root), 'HEAD')
+        assert set(plan.skipped) == {'Project Structure Tests', 'Configuration Tests',
+                                     'JavaScript Tests Check', 'GitHub Workflows Tests',
+                                     'Raw Data Tests'}
+        assert plan.decisions['Functional Data Tests'] == (True, 'data/schools.csv changed')
+
+    def test_removals_and_untracked_inputs(self, tmp_path):
+        root = self.make_repo(tmp_path)
+        self.git(root, 'mv', 'scripts/utils.test.js', 'scripts/util.test.js')
+        (root / 'dist').mkdir()
+        (root / 'dist' / 'schools.json').write_text('[]')
+        (root / '.gitignore').write_text('dist/\n')
+        plan = impact.ImpactPlan(str(root), 'HEAD')
+        assert plan.decisions['JavaScript Tests Check'] == \
+            (True, 'scripts/utils.test.js was removed')
+        assert plan.decisions['Data Validation Tests'] == \
+            (True, 'dist/schools.json is not tracked by git')
+        assert not plan.runs('Functional Data Tests')
+        assert not plan.runs('GitHub Workflows Tests')
+
+    def test_runner_changes_and_git_errors_run_everything(self, tmp_path):
+        root = self.make_repo(tmp_path)
+        assert len(impact.ImpactPlan(str(root), 'HEAD').skipped) == len(impact.GROUPS)
+        (root / 'tests' / 'run_tests.py').write_text('')
+        assert not impact.ImpactPlan(str(root), 'HEAD').skipped
+        plan = impact.ImpactPlan(str(root), 'no-such-rev')
+        assert plan.error and not plan.skipped
+
+    def test_suite_reports_skipped_groups(self, tmp_path, capsys):
+        root = self.make_repo(tmp_path)
+        suite = run_tests.run_all_tests(str(root), changed_since='HEAD')
+        assert len(suite.skipped) == len(impact.GROUPS)
+        assert suite.results == [] and suite.get_summary()['skipped_groups'] == len(impact.GROUPS)
+        assert 'Skipping Functional Data Tests: no changes' in capsys.readouterr().out
+
+
+class TestWatch:
+    """Test --watch: a change re-runs only the groups that read it."""
+
+    def test_cycle_reruns_affected_groups_from_resident_rows(self, tmp_path, capsys):
+        (tmp_path / 'data').mkdir()
+        (tmp_path / 'package.json').write_text('{"name": "sekolah-pseo", "version": "1"}')
+        path = str(tmp_path / 'data' / 'schools.csv')
+        rows = [make_row(10000000 + i) for i in range(20)]
+        save(path, rows)
+        poller = run_tests.MtimePoller(str(tmp_path))
+        resident = run_tests.ResidentSchools(path)
+        resident.refresh()
+        assert run_tests.watch_cycle(str(tmp_path), poller, resident) is None
+
+        rows[3] = make_row(10000004, lat='91.0')
+        save(path, rows)
+        suite = run_tests.watch_cycle(str(tmp_path), poller, resident)
+        assert 'schools.csv: 1 row(s) from row 4 replaced by 1' in capsys.readouterr().out
+        assert set(suite.skipped) == {'Project Structure Tests', 'Configuration Tests',
+                                      'JavaScript Tests Check', 'GitHub Workflows Tests',
+                                      'Raw Data Tests'}
+        failed = {r.name for r in suite.results if not r.passed}
+        assert 'NPSN values are unique' in failed
+        assert "schools.csv rows pass data-schema.js validation" in failed
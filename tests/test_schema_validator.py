@@ -0,0 +1,93 @@
+"""
+Tests for the compiled schema validator in tests/schema_validator.py.
+"""
+
+import copy
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.schema_validator import (  # noqa: E402
+    SCHEMA_JSON_PATH,
+    Schema,
+    compile_validator,
+    js_regex,
+    load_schema,
+    validate_csv,
+)
+from tests.test_data_checks import HEADER, make_row, write_csv  # noqa: E402
+
+FIELDNAMES = HEADER.split(',')
+
+
+def problems(row, fieldnames=FIELDNAMES, schema=None):
+    return [problem for problem, _ in compile_validator(fieldnames, schema)(row)]
+
+
+def test_valid_rows_and_messages():
+    validate = compile_validator(FIELDNAMES)
+    assert validate(make_row(10000001).split(',')) == ()
+    row = ' 12a , SD,TK,X,,,Gambir,,DKI Jakarta,7.5,0abc,2026-7-1'.split(',')
+    assert validate(row) == [
+        ('malformed_npsn', 'Field "npsn" value "12a" does not match required pattern'),
+        ('invalid_bentuk_pendidikan', 'Field "bentuk_pendidikan" has invalid value "TK"; '
+                                      'allowed: SD, SMP, SMA, SMK, SLB, SDLB, SMLB, SMPLB'),
+        ('missing_kab_kota', 'Missing required field "kab_kota"'),
+        ('invalid_status', 'Field "status" has invalid value "X"; allowed: N, S'),
+        ('lat_out_of_bounds', 'Field "lat" value "7.5" outside Indonesia bounds [-11, 6]'),
+        ('malformed_updated_at', 'Field "updated_at" value "2026-7-1" does not match required pattern'),
+    ]
+
+
+def test_coordinates_follow_validate_record():
+    def coordinate_problems(lat, lon):
+        return problems(make_row(10000001, lat=lat, lon=lon).split(','))
+
+    # parseFloat reading zero means unset; anything else must be a plain in-bounds decimal
+    for lat in ('0', '-0.0', '0abc', '.0', ''):
+        assert coordinate_problems(lat, '106.8') == []
+    for lat in ('abc', '-6.2e0', 'Infinity', '+1', '1.', '-11.5'):
+        assert coordinate_problems(lat, '106.8') == ['lat_out_of_bounds']
+    assert coordinate_problems('-11', '141') == []
+    # JavaScript's \d and $ are ASCII-only and end-of-string only
+    assert not js_regex('^\\d+$').match('٣')
+    assert not js_regex('^\\d+$').match('123\n')
+
+
+def test_layout_and_schema_changes_flow_through():
+    assert problems(['10000001', 'SD A'], ['npsn', 'nama']) == [
+        'missing_bentuk_pendidikan', 'missing_provinsi', 'missing_kab_kota', 'missing_kecamatan']
+    with open(SCHEMA_JSON_PATH, encoding='utf-8') as f:
+        info = json.load(f)
+    changed = copy.deepcopy(info)
+    fields = {field['name']: field for field in changed['fields']}
+    fields['kelurahan']['allowedValues'] = ['Gambir']
+    fields['lon']['constraints']['max'] = 100
+    row = make_row(10000001).split(',')
+    row[FIELDNAMES.index('kelurahan')] = 'Menteng'
+    assert problems(row) == []
+    assert problems(row, schema=Schema(changed)) == ['invalid_kelurahan', 'lon_out_of_bounds']
+
+
+def test_schema_json_feeds_the_python_checks():
+    from tests.data_checks import INDONESIA_LON_MAX, REQUIRED_COLUMNS
+    from tests.site_paths import REQUIRED_SCHOOL_FIELDS
+
+    schema = load_schema()
+    assert REQUIRED_COLUMNS == list(schema.csv_field_order) == FIELDNAMES
+    assert INDONESIA_LON_MAX == schema.fields['lon']['constraints']['max'] == 141
+    assert REQUIRED_SCHOOL_FIELDS == ('provinsi', 'kab_kota', 'kecamatan', 'npsn', 'nama')
+    assert schema.raw_mappings['kab_kota'] == ('kabupaten', 'kab_kota', 'kota')
+    assert 'updated_at' not in schema.raw_mappings
+
+
+def test_validate_csv(tmp_path):
+    rows = [make_row(10000001), make_row('X1'), make_row(10000003, lat='91.0'),
+            make_row(10000004, nama='')]
+    report = validate_csv(write_csv(tmp_path, rows))
+    assert (report.rows, report.invalid) == (4, 3)
+    assert report.counts == {'malformed_npsn': 1, 'lat_out_of_bounds': 1, 'missing_nama': 1}
+    assert report.samples['malformed_npsn'] == [
+        'line 3: Field "npsn" value "X1" does not match required pattern']
@@ -0,0 +1,84 @@
+"""
+Tests for the SQLite snapshot in tests/school_db.py.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.school_db import SchoolDB, ensure_database, main  # noqa: E402
+from tests.test_data_checks import HEADER  # noqa: E402
+
+
+def row(npsn, bentuk='SD', kecamatan='Gambir', kab_kota='Jakarta Pusat', provinsi='DKI Jakarta'):
+    return f"{npsn},Sekolah {npsn},{bentuk},N,Jl. Test,,{kecamatan},{kab_kota},{provinsi},-6.2,106.8,2026-07-20"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rows = [row(10000001), row(10000002, 'SMP'), row(10000003, kecamatan='Menteng'),
+            row(10000004, kab_kota='Kota Bandung', provinsi='Jawa Barat', kecamatan='Cicendo'),
+            row(10000005, kab_kota='Jakarta Pusat', provinsi='Jawa Barat', kecamatan=' Gambir '),
+            row(10000001, 'SMA'), row(10000006, kecamatan='')]
+    path = tmp_path / 'schools.csv'
+    path.write_text('\n'.join([HEADER] + rows) + '\n', encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def db(csv_path, tmp_path):
+    with SchoolDB.open(csv_path, str(tmp_path / 'schools.sqlite')) as database:
+        yield database
+
+
+def test_region_counts_follow_page_grouping(db):
+    assert db.count() == 7
+    assert db.region_counts() == [('DKI Jakarta', 5), ('Jawa Barat', 2)]
+    assert db.region_counts('kecamatan', provinsi='DKI Jakarta') == [
+        ('DKI Jakarta', 'Jakarta Pusat', 'Gambir', 3),
+        ('DKI Jakarta', 'Jakarta Pusat', 'Menteng', 1)]
+    with pytest.raises(ValueError):
+        db.region_counts('kelurahan')
+
+
+def test_lookups_and_region_rows(db):
+    assert [school['bentuk_pendidikan'] for school in db.lookup(' 10000001')] == ['SD', 'SMA']
+    assert db.lookup('99999999') == []
+    # Values are trimmed like parseCsv, so ' Gambir ' groups with 'Gambir'
+    assert [s['npsn'] for s in db.schools_in('Jawa Barat', 'Jakarta Pusat', 'Gambir')] == ['10000005']
+    assert db.bentuk_counts() == {'SD': 5, 'SMP': 1, 'SMA': 1}
+    assert db.bentuk_counts('DKI Jakarta', 'Jakarta Pusat', 'Gambir') == {'SD': 1, 'SMP': 1, 'SMA': 1}
+
+
+def test_hierarchy_checks(db):
+    assert db.duplicate_npsns() == [('10000001', 2)]
+    assert [school['npsn'] for school in db.incomplete_hierarchy()] == ['10000006']
+    assert db.shared_names('kab_kota') == [('Jakarta Pusat', 2)]
+    assert db.shared_names('kecamatan') == [('Gambir', 2)]
+
+
+def test_rebuilds_only_when_the_csv_changes(csv_path, tmp_path):
+    db_path = str(tmp_path / 'schools.sqlite')
+    assert ensure_database(csv_path, db_path) == (db_path, True)
+    assert ensure_database(csv_path, db_path) == (db_path, False)
+    os.utime(csv_path, ns=(1, 1))  # same content, new mtime: hash check only
+    assert ensure_database(csv_path, db_path) == (db_path, False)
+    with open(csv_path, 'a', encoding='utf-8') as f:
+        f.write(row(10000007) + '\n')
+    assert ensure_database(csv_path, db_path) == (db_path, True)
+    with SchoolDB(db_path) as database:
+        assert database.count() == 8
+
+
+@pytest.mark.parametrize('position', ['before', 'after'])
+def test_json_flag_before_or_after_the_command(csv_path, tmp_path, monkeypatch, capsys, position):
+    command = ['query', 'SELECT COUNT(*) AS n FROM schools']
+    options = ['--csv', csv_path, '--db', str(tmp_path / 'schools.sqlite')]
+    argv = options + (['--json'] + command if position == 'before' else command + ['--json'])
+    monkeypatch.setattr(sys, 'argv', ['school_db.py'] + argv)
+    main()
+    assert json.loads(capsys.readouterr().out) == [{'n': 7}]
@@ -0,0 +1,33 @@
+"""
+Tests for the manifest.js hash port in tests/school_hash.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.school_hash import compute_school_hash, js_length, length_prefixed  # noqa: E402
+
+
+class TestComputeSchoolHash:
+    """Hashes must match scripts/manifest.js::computeSchoolHash exactly."""
+
+    def test_matches_node_output(self):
+        # Expected values produced by manifest.js::computeSchoolHash under Node 20
+        school = {
+            'npsn': '12345678', 'nama': 'SD 😀 Ñ', 'bentuk_pendidikan': 'SD',
+            'status': 'N', 'alamat': 'Jl. |x', 'kecamatan': '', 'kab_kota': 'K',
+            'provinsi': 'P', 'lat': '-6.2', 'lon': '106',
+        }
+        assert compute_school_hash(school) == 'a3bdfc62183e77e87a4a541debcddf62'
+        assert compute_school_hash({'npsn': '1', 'nama': None}) == 'ed75ffa4b8ca16a2067dcf159d25669d'
+
+    def test_js_length_counts_utf16_units(self):
+        assert js_length('abc') == 3
+        assert js_length('Ñ') == 1
+        assert js_length('😀') == 2
+
+    def test_length_prefix_keeps_boundaries(self):
+        assert length_prefixed(['A', 'B', '']) != length_prefixed(['A', '', 'B'])
+        assert length_prefixed(['a|b', None]) == '3:a|b|0:'
@@ -0,0 +1,122 @@
+"""
+Tests for the schools.json payload validator in tests/search_payload.py.
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.search_payload import (  # noqa: E402
+    SEARCH_DATA_FIELDS,
+    PayloadError,
+    expected_row,
+    iter_json_array,
+    validate_payload,
+)
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+
+def schools_csv(tmp_path, count=20):
+    rows = [make_row(10000000 + i, nama=f"SD Negeri {i} Contoh") for i in range(count)]
+    rows.append(make_row(99999999, nama=''))  # skipped by prepareSchoolDataForSearch
+    return write_csv(tmp_path, rows)
+
+
+def payload_for(csv_path):
+    import csv
+    with open(csv_path, encoding='utf-8', newline='') as f:
+        return [list(row) for row in map(expected_row, csv.DictReader(f)) if row]
+
+
+def write_payload(tmp_path, rows):
+    path = tmp_path / 'schools.json'
+    path.write_text(json.dumps(rows, ensure_ascii=False, separators=(',', ':')),
+                    encoding='utf-8')
+    return str(path)
+
+
+class TestIterJsonArray:
+    """The reader must handle rows split across read chunks."""
+
+    def test_small_chunks(self):
+        data = json.dumps([["a", "é"], [], [1, 23456], {"k": "v"}]).encode('utf-8')
+        rows = list(iter_json_array(io.BytesIO(data), chunk_size=3))
+        assert rows == [["a", "é"], [], [1, 23456], {"k": "v"}]
+
+    def test_empty_and_whitespace(self):
+        assert list(iter_json_array(io.BytesIO(b' [ ] \n'))) == []
+
+    @pytest.mark.parametrize('data', [b'{"a": 1}', b'[["a"],', b'[["a"] ["b"]]', b'[] x'])
+    def test_rejects_invalid(self, data):
+        with pytest.raises(PayloadError):
+            list(iter_json_array(io.BytesIO(data), chunk_size=4))
+
+
+class TestValidatePayload:
+
+    def test_matching_payload_passes(self, tmp_path):
+        csv_path = schools_csv(tmp_path)
+        rows = payload_for(csv_path)
+        path = write_payload(tmp_path, rows)
+        report = validate_payload(path, csv_path)
+        assert report.passed, report.errors
+        assert report.rows == 20
+        assert report.csv_rows_skipped == 1
+
+    def test_field_bytes_add_up_to_file_size(self, tmp_path):
+        csv_path = schools_csv(tmp_path, 5)
+        rows = payload_for(csv_path)
+        rows[0][4] = 'Jl. "Kutip" \\ No.\t1 — Ñ'
+        path = write_payload(tmp_path, rows)
+        report = validate_payload(path)
+        # 2 outer brackets, 2 brackets per row, commas between rows and fields
+        assert report.structure_bytes == 2 + 5 * 2 + 4 + 5 * (len(SEARCH_DATA_FIELDS) - 1)
+        assert report.field_bytes['alamat'] > 0
+        assert report.gzip_bytes > 0
+
+    def test_swapped_fields_are_reported(self, tmp_path):
+        csv_path = schools_csv(tmp_path)
+        rows = payload_for(csv_path)
+        for row in rows:
+            row[2], row[3] = row[3], row[2]
+        report = validate_payload(write_payload(tmp_path, rows), csv_path)
+        assert report.counts['rows_differing_from_csv'] == 20
+        assert report.swapped_fields[('bentuk_pendidikan', 'status')] == 20
+        assert report.field_mismatches == {'bentuk_pendidikan': 20, 'status': 20}
+
+    def test_wrong_url_missing_and_extra_rows(self, tmp_path):
+        csv_path = schools_csv(tmp_path)
+        rows = payload_for(csv_path)
+        rows[0][-1] = '/provinsi/x.html'
+        del rows[1]
+        extra = list(rows[2])
+        extra[0] = '55555555'
+        extra[-1] = extra[-1].replace(rows[2][0], '55555555')
+        rows.append(extra)
+        rows.append(['too', 'short'])
+        report = validate_payload(write_payload(tmp_path, rows), csv_path)
+        assert report.counts == {
+            'wrong_urls': 1,
+            'rows_differing_from_csv': 1,
+            'schools_missing_from_payload': 1,
+            'rows_not_in_csv': 1,
+            'malformed_rows': 1,
+        }
+
+    def test_missing_pages_and_budgets(self, tmp_path):
+        csv_path = schools_csv(tmp_path, 2)
+        rows = payload_for(csv_path)
+        dist = tmp_path / 'dist'
+        page = dist / rows[0][-1].lstrip('/')
+        page.parent.mkdir(parents=True)
+        page.write_text('<html></html>')
+        report = validate_payload(write_payload(tmp_path, rows), dist_dir=str(dist),
+                                  max_bytes=100, max_gzip_bytes=10)
+        assert report.samples['missing_pages'] == [rows[1][-1]]
+        assert report.counts['over_byte_budget'] == 1
+        assert report.counts['over_gzip_budget'] == 1
@@ -0,0 +1,58 @@
+"""
+Tests for the slug and page-path ports in tests/site_paths.py.
+
+Expected values were produced by src/core/slugify.js and
+PageBuilder.getSchoolRelativePath.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.site_paths import school_relative_path, school_url, slugify  # noqa: E402
+
+
+@pytest.mark.parametrize('value, slug', [
+    ('SD Negeri 1 Contoh', 'sd-negeri-1-contoh'),
+    ('  SMP  Al-Hikmah  ', 'smp-al-hikmah'),
+    ('Café Müller', 'cafe-muller'),
+    ('a^b`c', 'abc'),
+    ('x¨y´z·w', 'xyzw'),
+    ('naïve façade—résumé', 'naive-facade-resume'),
+    ('Đà Nẵng', 'a-nang'),
+    ('MI Nurul Huda (Cabang 2)', 'mi-nurul-huda-cabang-2'),
+    ('!!!', 'untitled'),
+    ('日本語', 'untitled'),
+    ('   ', ''),
+    (None, ''),
+])
+def test_slugify_matches_js(value, slug):
+    assert slugify(value) == slug
+
+
+def school(**overrides):
+    data = {'npsn': '12345678', 'nama': 'SMA Negeri 1 Jakarta', 'kecamatan': 'Gambir',
+            'kab_kota': 'Jakarta Pusat', 'provinsi': 'DKI Jakarta'}
+    data.update(overrides)
+    return data
+
+
+def test_school_relative_path():
+    assert school_relative_path(school()) == (
+        'provinsi/dki-jakarta/kabupaten/jakarta-pusat/kecamatan/gambir/'
+        '12345678-sma-negeri-1-jakarta.html')
+    assert school_url(school()).startswith('/provinsi/dki-jakarta/')
+
+
+def test_missing_required_field_has_no_path():
+    assert school_relative_path(school(kecamatan='')) is None
+    assert school_url(school(nama='')) is None
+
+
+def test_empty_slug_segments_collapse_like_path_join():
+    assert school_relative_path(school(kecamatan='   ')) == (
+        'provinsi/dki-jakarta/kabupaten/jakarta-pusat/kecamatan/'
+        '12345678-sma-negeri-1-jakarta.html')
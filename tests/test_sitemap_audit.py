@@ -0,0 +1,121 @@
+"""
+Tests for the sitemap auditor in tests/sitemap_audit.py.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.sitemap_audit import (  # noqa: E402
+    SitemapParseError,
+    audit_sitemaps,
+    iter_locs,
+    max_urls_per_sitemap,
+)
+from tests.test_data_checks import make_row, write_csv  # noqa: E402
+
+BASE = 'https://example.com'
+KECAMATAN = f"{BASE}/provinsi/dki-jakarta/kabupaten/jakarta-pusat/kecamatan/gambir"
+DATE = '2026-07-20'
+NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def urlset(entries):
+    body = ''.join(f"<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>"
+                   for loc, lastmod in entries)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{NAMESPACE}">{body}</urlset>'
+
+
+def write_sitemaps(root, shards, indexed=None):
+    root.mkdir(exist_ok=True)
+    for name, entries in shards.items():
+        (root / name).write_text(urlset(entries), encoding='utf-8')
+    listed = ''.join(f"<sitemap><loc>{BASE}/{name}</loc><lastmod>{DATE}</lastmod></sitemap>"
+                     for name in (indexed if indexed is not None else shards))
+    (root / 'sitemap-index.xml').write_text(
+        f'<?xml version="1.0"?><sitemapindex xmlns="{NAMESPACE}">{listed}</sitemapindex>',
+        encoding='utf-8')
+    return str(root)
+
+
+def site_entries(count):
+    entries = [(f"{BASE}/", DATE), (f"{BASE}/provinsi/dki-jakarta/", DATE)]
+    entries += [(f"{KECAMATAN}/{10000000 + i}-sd-negeri-{i}.html", DATE) for i in range(count)]
+    return entries
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    return write_csv(tmp_path, [make_row(10000000 + i, nama=f"SD Negeri {i}") for i in range(6)])
+
+
+def test_matching_sitemaps_pass(tmp_path, csv_path):
+    entries = site_entries(6)
+    dist = write_sitemaps(tmp_path / 'dist', {'sitemap-001.xml': entries[:5],
+                                              'sitemap-002.xml': entries[5:]})
+    report = audit_sitemaps(dist, csv_path)
+    assert report.passed, report.errors
+    assert report.urls == 8
+    assert report.shards['sitemap-002.xml']['urls'] == 3
+
+
+def test_reports_shard_and_url_problems(tmp_path, csv_path):
+    entries = site_entries(6)
+    entries[3] = (entries[3][0], '2026-01-01')
+    entries[4] = (entries[4][0], '20/07/2026')
+    shards = {'sitemap-001.xml': entries[:6] + [entries[0]],
+              'sitemap-002.xml': [(f"{BASE}/lain.html", DATE)],
+              'sitemap-004.xml': []}
+    dist = write_sitemaps(tmp_path / 'dist', shards,
+                          indexed=['sitemap-001.xml', 'sitemap-002.xml', 'sitemap-003.xml'])
+    report = audit_sitemaps(dist, csv_path, max_urls=5)
+    assert report.counts == {
+        'duplicate_urls': 1,
+        'bad_lastmod_format': 1,
+        'lastmod_mismatches': 2,
+        'unexpected_urls': 1,
+        'shards_over_url_limit': 1,
+        'missing_shards': 1,
+        'unindexed_shards': 1,
+        'urls_missing_from_sitemaps': 2,
+    }
+
+
+def test_malformed_and_missing_files(tmp_path):
+    assert audit_sitemaps(str(tmp_path)).counts == {'missing_index': 1}
+    dist = write_sitemaps(tmp_path / 'dist', {'sitemap-001.xml': site_entries(1)})
+    with open(os.path.join(dist, 'sitemap-001.xml'), 'a', encoding='utf-8') as f:
+        f.write('<url>')
+    report = audit_sitemaps(dist)
+    assert report.counts == {'malformed_xml': 1}
+    assert 'sitemap-001.xml' in report.samples['malformed_xml'][0]
+
+
+def test_iter_locs_reads_any_valid_layout_across_chunks(tmp_path):
+    path = tmp_path / 'sitemap-001.xml'
+    path.write_text(
+        f'<urlset xmlns="{NAMESPACE}">\n'
+        '  <url>\n    <loc>https://example.com/a?x=1&amp;y=2</loc>\n'
+        '    <changefreq>weekly</changefreq>\n  </url>\n'
+        '  <url id="b"><lastmod>2026-07-20</lastmod>'
+        '<loc><![CDATA[https://example.com/b]]></loc></url>\n'
+        + ''.join(f'<url><loc>https://example.com/{i}</loc></url>' for i in range(50))
+        + '</urlset>', encoding='utf-8')
+    locs = list(iter_locs(str(path), 'url', chunk_size=64))
+    assert locs[:2] == [('https://example.com/a?x=1&y=2', None),
+                        ('https://example.com/b', '2026-07-20')]
+    assert len(locs) == 52
+
+    path.write_text(f'<s:urlset xmlns:s="{NAMESPACE}"><s:url><s:loc>x</s:loc></s:url></s:urlset>')
+    with pytest.raises(SitemapParseError, match='unsupported'):
+        list(iter_locs(str(path), 'url'))
+
+
+def test_max_urls_follows_config_clamp(monkeypatch):
+    monkeypatch.setenv('MAX_URLS_PER_SITEMAP', '999999')
+    assert max_urls_per_sitemap() == 50000
+    monkeypatch.setenv('MAX_URLS_PER_SITEMAP', '10')
+    assert max_urls_per_sitemap() == 10
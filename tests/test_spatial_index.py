@@ -0,0 +1,63 @@
+"""
+Tests for the grid spatial index in tests/spatial_index.py.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.near_duplicates import haversine_km  # noqa: E402
+from tests.spatial_index import GridIndex, analyse  # noqa: E402
+from tests.test_data_checks import write_csv  # noqa: E402
+
+
+def school(npsn, provinsi, kab_kota, lat, lon):
+    return (f"{npsn},SD {npsn},SD,N,Jl. Test,,Kec,{kab_kota},{provinsi},"
+            f"{lat:.6f},{lon:.6f},2026-07-20")
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(3)
+    index = GridIndex(cell_km=2.0)
+    points = {row: (rng.uniform(-7, -6), rng.uniform(106, 108)) for row in range(2000)}
+    points[2000] = (4.5, 96.0)  # far from everything else
+    for row, point in points.items():
+        index.add(row, point)
+    for query in [(-6.5, 107.0), (-6.0, 106.0), (-8.5, 109.0), (4.4, 96.1)]:
+        expected = sorted((haversine_km(query, point), row) for row, point in points.items())
+        for k in (1, 5):
+            assert index.nearest(query, k) == expected[:k]
+    assert [row for _, row in index.nearest(points[7], 2, exclude=[7])] != [7]
+    assert GridIndex().nearest((0.0, 0.0)) == []
+
+
+def test_reports_clusters_and_region_outliers(tmp_path):
+    rng = random.Random(5)
+    rows = []
+    for i in range(40):
+        rows.append(school(10000000 + i, 'Banten', 'Kab A', -6.2 + rng.uniform(-0.1, 0.1),
+                           106.2 + rng.uniform(-0.1, 0.1)))
+        rows.append(school(10000100 + i, 'Banten', 'Kab B', -6.9 + rng.uniform(-0.1, 0.1),
+                           106.2 + rng.uniform(-0.1, 0.1)))
+        rows.append(school(10000200 + i, 'Jawa Tengah', 'Kab C', -7.2 + rng.uniform(-0.1, 0.1),
+                           110.4 + rng.uniform(-0.1, 0.1)))
+    for i in range(60):  # a default centroid
+        rows.append(school(10000300 + i, 'Papua', 'Kab D', -4.0, 138.0))
+    rows.append(school(10000900, 'Banten', 'Kab A', -7.2, 110.4))   # in Jawa Tengah
+    rows.append(school(10000901, 'Banten', 'Kab A', -6.9, 106.2))   # in Kab B
+    rows.append(school(10000902, 'Banten', 'Kab A', 0, 0).replace('0.000000', ''))
+
+    report = analyse(write_csv(tmp_path, rows))
+    assert (report.rows, report.located) == (183, 182)
+    assert report.regions == {'provinsi': 3, 'kab_kota': 4}
+    assert [(c['schools'], c['top_point_schools'], c['provinsi']) for c in report.clusters] == [
+        (60, 60, {'Papua': 60})]
+    outliers = {outlier['npsn']: outlier for outlier in report.outliers}
+    assert set(outliers) == {'10000900', '10000901'}
+    assert outliers['10000900']['level'] == 'provinsi'
+    assert outliers['10000900']['likely_provinsi'] == 'Jawa Tengah'
+    assert outliers['10000901']['level'] == 'kab_kota'
+    assert outliers['10000901']['likely_provinsi'] == 'Banten'
+    assert not report.passed and len(report.errors) == 2
@@ -0,0 +1,122 @@
+"""
+Tests for the watch mode's resident state in tests/watch.py.
+"""
+
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.data_checks import StreamingValidator, default_checks  # noqa: E402
+from tests.dataset import clear_memory_cache, load_schools, parse_csv  # noqa: E402
+from tests.path_collisions import find_collisions  # noqa: E402
+from tests.schema_validator import compile_validator  # noqa: E402
+from tests.test_data_checks import HEADER, make_row  # noqa: E402
+from tests.watch import Delta, MtimePoller, ResidentSchools  # noqa: E402
+
+
+# Distinct mtimes for every save, even on coarse filesystem clocks
+SAVES = itertools.count(1)
+
+
+def save(path, rows, tail='\n'):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(HEADER + '\n' + '\n'.join(rows) + tail)
+    mtime = next(SAVES) * 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+
+def assert_matches_full_run(resident, path):
+    fieldnames, records = parse_csv(path)
+    assert resident.records == records
+    assert resident.report().errors == StreamingValidator(default_checks()).run(path).errors
+    validate = compile_validator(fieldnames)
+    expected = [(i, list(validate(record))) for i, record in enumerate(records)
+                if validate(record)]
+    assert [(i, list(found)) for i, found in enumerate(resident.problems) if found] == expected
+    collisions = resident.collision_report().to_dict()
+    expected_collisions = find_collisions(path).to_dict()
+    collisions['seconds'] = expected_collisions['seconds']
+    assert collisions == expected_collisions
+
+
+def test_edits_apply_as_row_deltas(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    rows = [make_row(10000000 + i) for i in range(50)]
+    save(path, rows)
+    resident = ResidentSchools(path)
+    assert resident.refresh() == Delta(0, 0, 50, full=True)
+    assert resident.refresh() is None
+
+    rows[20] = make_row(10000020, lat='91.0')
+    save(path, rows)
+    assert resident.refresh() == Delta(20, 1, 1)
+    del rows[5]
+    rows.insert(30, make_row(10000003))
+    save(path, rows)
+    assert resident.refresh() == Delta(5, 26, 26)
+    rows.append(make_row('X1', nama=''))
+    save(path, rows, tail='')
+    assert resident.refresh() == Delta(50, 0, 1)
+    rows[-1] = make_row('X1', nama='SD 1')
+    save(path, rows, tail='')
+    assert resident.refresh() == Delta(50, 1, 1)  # the unterminated last row grew
+    assert_matches_full_run(resident, path)
+    assert resident.schema_report().invalid == 2
+
+    clear_memory_cache()
+    save(path, rows[:3])
+    resident.refresh()
+    assert len(load_schools(path, use_disk_cache=False)) == 3  # served from memory
+
+
+def test_random_edits_match_full_parse(tmp_path):
+    path = str(tmp_path / 'schools.csv')
+    rng = random.Random(7)
+
+    def row():
+        npsn = rng.randint(10000000, 10000040)
+        kind = rng.random()
+        if kind < 0.15:
+            return make_row(npsn, lat='91')
+        if kind < 0.3:
+            return make_row(npsn).replace('Jl. Test', '"Jl. A,\nB ""c"""')
+        if kind < 0.35:
+            return '3,Short'
+        return make_row(npsn)
+
+    rows = [row() for _ in range(30)]
+    save(path, rows)
+    resident = ResidentSchools(path)
+    resident.refresh()
+    for _ in range(80):
+        at = rng.randrange(len(rows) + 1)
+        operation = rng.random()
+        if operation < 0.3 and at < len(rows):
+            rows[at] = row()
+        elif operation < 0.5 and at < len(rows):
+            del rows[at]
+        else:
+            rows[at:at] = [row() for _ in range(rng.randint(1, 3))]
+        save(path, rows, tail=rng.choice(['\n', '\n', '\n\n', '']))
+        resident.refresh()
+        assert_matches_full_run(resident, path)
+
+
+def test_poller_reports_added_modified_and_removed(tmp_path):
+    workflows = tmp_path / '.github' / 'workflows'
+    workflows.mkdir(parents=True)
+    (workflows / 'on-push.yml').write_text('on: push')
+    (tmp_path / 'package.json').write_text('{}')
+    poller = MtimePoller(str(tmp_path))
+    assert poller.poll() == []
+
+    os.utime(tmp_path / 'package.json', ns=(1, 1))
+    (workflows / 'on-push.yml').unlink()
+    (workflows / 'nightly.yml').write_text('on: schedule')
+    (tmp_path / 'README.md').write_text('not watched')
+    assert poller.poll() == [('A', '.github/workflows/nightly.yml'),
+                             ('D', '.github/workflows/on-push.yml'), ('M', 'package.json')]
+    assert poller.poll() == []
@@ -0,0 +1,277 @@
+"""
+Resident state for the standalone runner's ``--watch`` mode.
+
+``MtimePoller`` stats the watched inputs (data/schools.csv, external/raw.csv
+and their compressed copies, data/enrichment.json, package.json,
+.github/workflows/*) and reports what was added, modified or
+removed since the previous poll; tests/impact.py turns that into the test
+groups to re-run.
+
+``ResidentSchools`` keeps data/schools.csv parsed in memory together with
+the per-row outcome of the data checks (``RowFacts`` from
+tests/incremental.py) and of the compiled data-schema.js validator. When the
+file changes, the new bytes are compared with the resident copy: the
+unchanged prefix and suffix are found with block compares, widened to
+record boundaries (quote parity, as in tests/parallel_csv.py), and only the
+records in between are parsed and validated. Their rows are spliced into the
+resident lists and the check verdicts are rebuilt from the few rows with a
+problem, so a save that touches a handful of rows costs a file read and
+two memcmp scans rather than a full parse. The generated page paths are
+kept in a resident ``PathIndex`` (tests/path_collisions.py): the replaced
+rows release their paths and the new rows claim theirs, so the collision
+check also costs only the changed rows. The spliced dataset is handed to
+tests/dataset.py, so every other check that loads schools.csv reads it
+without parsing the file again.
+"""
+
+import glob
+import itertools
+import os
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from tests.compressed import input_variants, open_binary
+from tests.data_checks import LatLonNumericCheck, ValidationReport, default_checks
+from tests.dataset import Dataset, remember_dataset
+from tests.impact import Change
+from tests.incremental import CheckAggregates, RowFacts, parse_record, row_facts
+from tests.path_collisions import CollisionReport, PathIndex
+from tests.schema_validator import Schema, SchemaReport, compile_validator
+
+WATCHED = (input_variants('data/schools.csv') + input_variants('external/raw.csv')
+           + ('data/enrichment.json', 'package.json', '.github/workflows/*'))
+
+COMPARE_BLOCK = 1 << 16
+
+Problems = Optional[Sequence[Tuple[str, str]]]
+
+
+def common_prefix(a: bytes, b: bytes) -> int:
+    """Length of the longest common prefix of ``a`` and ``b``."""
+    limit = min(len(a), len(b))
+    start = 0
+    while start < limit:
+        end = min(start + COMPARE_BLOCK, limit)
+        if a[start:end] != b[start:end]:
+            break
+        start = end
+    else:
+        return limit
+    while a[start] == b[start]:
+        start += 1
+    return start
+
+
+def common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the longest common suffix of ``a`` and ``b``, at most ``limit``."""
+    size = 0
+    while size < limit:
+        step = min(COMPARE_BLOCK, limit - size)
+        if a[len(a) - size - step:len(a) - size] != b[len(b) - size - step:len(b) - size]:
+            break
+        size += step
+    else:
+        return limit
+    while a[len(a) - size - 1] == b[len(b) - size - 1]:
+        size += 1
+    return size
+
+
+def record_offsets(data: bytes, start: int = 0, end: Optional[int] = None) -> List[int]:
+    """Byte offset of every record in ``data[start:end]``.
+
+    Records split as in ``split_records``: a line continues the previous
+    record while that record has an odd count of '"', and blank lines
+    start no record. ``start`` must be a record boundary.
+    """
+    end = len(data) if end is None else end
+    lines = data[start:end].split(b'\n')
+    starts = itertools.accumulate([len(line) + 1 for line in lines[:-1]], initial=start)
+    if b'"' not in data[start:end]:
+        return [offset for offset, line in zip(starts, lines) if line and line != b'\r']
+    offsets = []
+    quoted = False
+    for offset, line in zip(starts, lines):
+        if not quoted and line and line != b'\r':
+            offsets.append(offset)
+        if line.count(b'"') % 2:
+            quoted = not quoted
+    return offsets
+
+
+class Delta(NamedTuple):
+    """Rows ``first`` .. ``first + removed`` were replaced by ``added`` rows."""
+    first: int
+    removed: int
+    added: int
+    full: bool = False
+
+
+class ResidentSchools:
+    """schools.csv and its per-row check outcomes, kept in memory."""
+
+    def __init__(self, path: str, schema: Optional[Schema] = None):
+        self.path = path
+        self.schema = schema
+        self.signature: Optional[Tuple[int, int]] = None
+        self.data = b''
+        self.fieldnames: List[str] = []
+        # Start of every data row, then len(data)
+        self.offsets: List[int] = [0]
+        self.records: List[Tuple[str, ...]] = []
+        self.npsns: List[str] = []
+        self.facts: List[Optional[RowFacts]] = []
+        self.problems: List[Problems] = []
+        self.paths: Optional[PathIndex] = None
+        self._width = 0
+        self._npsn = -1
+        self._validate = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def refresh(self) -> Optional[Delta]:
+        """Bring the resident rows up to date; None when the file is unchanged."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self.signature is None and not self.records:
+                return None
+            delta = Delta(0, len(self.records), 0, full=True)
+            self.__init__(self.path, self.schema)
+            return delta
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == self.signature:
+            return None
+        with open_binary(self.path) as f:
+            data = f.read()
+        # A changed header (or an unterminated one, which may grow) re-parses everything
+        header_end = self.offsets[0]
+        if (self.signature is None or data[:header_end] != self.data[:header_end]
+                or not (self.records or self.data.endswith(b'\n'))):
+            delta = self._load(data)
+        else:
+            delta = self._apply(data)
+        self.signature = signature
+        self.data = data
+        remember_dataset(Dataset(self.path, self.fieldnames, self.records), signature)
+        return delta
+
+    def _load(self, data: bytes) -> Delta:
+        removed = len(self.records)
+        offsets = record_offsets(data) or [len(data)]
+        header = data[offsets[0]:offsets[1] if len(offsets) > 1 else len(data)]
+        self.fieldnames = parse_record(header.decode('utf-8').rstrip('\r\n')) if header else []
+        self._width = len(self.fieldnames)
+        self._npsn = self.fieldnames.index('npsn') if 'npsn' in self.fieldnames else -1
+        self._validate = compile_validator(self.fieldnames, self.schema)
+        self.offsets = offsets[1:] + [len(data)]
+        self.records, self.npsns, self.facts, self.problems = self._parse(data, self.offsets)
+        self.paths = PathIndex(self.fieldnames)
+        self.paths.add(self.records)
+        return Delta(0, removed, len(self.records), full=True)
+
+    def _apply(self, data: bytes) -> Delta:
+        old, offsets = self.data, self.offsets
+        count = len(offsets) - 1
+        shift = len(data) - len(old)
+        prefix = common_prefix(old, data)
+        suffix = common_suffix(old, data, min(len(old), len(data)) - prefix)
+
+        first = bisect_right(offsets, prefix) - 1
+        if not old.endswith(b'\n'):
+            first = min(first, count - 1)  # the unterminated last row may grow
+        last = max(first, bisect_left(offsets, len(old) - suffix))
+        # The old row ``last`` must still start a line in the new bytes
+        while last < count and data[offsets[last] + shift - 1] != ord('\n'):
+            last += 1
+        start, end = offsets[first], offsets[last] + shift
+        if data.count(b'"', start, end) % 2:
+            last, end = count, len(data)
+
+        added = record_offsets(data, start, end)
+        records, npsns, facts, problems = self._parse(data, added + [end])
+        self.offsets[first:] = added + [offset + shift for offset in offsets[last:]]
+        self.paths.remove(self.records[first:last])
+        self.paths.add(records)
+        self.records[first:last] = records
+        self.npsns[first:last] = npsns
+        self.facts[first:last] = facts
+        self.problems[first:last] = problems
+        return Delta(first, last - first, len(records))
+
+    def _parse(self, data: bytes, bounds: List[int]):
+        """Rows between consecutive ``bounds``, with their check outcomes."""
+        width, fieldnames, validate = self._width, self.fieldnames, self._validate
+        records = []
+        for start, end in zip(bounds, bounds[1:]):
+            text = data[start:end].decode('utf-8').rstrip('\r\n')
+            fields = text.split(',') if '"' not in text else parse_record(text)
+            if len(fields) != width:
+                fields = (fields + [''] * width)[:width]
+            records.append(tuple(fields))
+        npsn = self._npsn
+        npsns = [record[npsn].strip() for record in records] if npsn >= 0 else [''] * len(records)
+        facts = [row_facts(dict(zip(fieldnames, record))) for record in records]
+        problems = [validate(record) or None for record in records]
+        return records, npsns, facts, problems
+
+    def report(self) -> ValidationReport:
+        """Verdicts of the default data checks, as a full streaming run gives."""
+        checks = default_checks()
+        aggregates = CheckAggregates(len(self.records))
+        aggregates.add_npsns(self.npsns)
+        for i in [i for i, found in enumerate(self.facts) if found is not None]:
+            aggregates.add_facts(self.npsns[i], self.facts[i])
+        for check in checks:
+            check.begin(self.fieldnames)
+            aggregates.apply(check)
+            if isinstance(check, LatLonNumericCheck):
+                for record in self.records[:check.sample_rows]:
+                    check.feed(dict(zip(self.fieldnames, record)))
+        return ValidationReport(len(self.records), checks)
+
+    def collision_report(self) -> CollisionReport:
+        """The report ``find_collisions`` gives for the resident rows."""
+        if self.paths is None:
+            return CollisionReport()
+        return self.paths.report(self.records)
+
+    def schema_report(self) -> SchemaReport:
+        """The report ``validate_csv`` gives for the resident rows."""
+        report = SchemaReport()
+        report.rows = len(self.records)
+        for i in [i for i, found in enumerate(self.problems) if found]:
+            report.invalid += 1
+            for problem, message in self.problems[i]:
+                report.add(problem, f"line {i + 2}: {message}")
+        return report
+
+
+class MtimePoller:
+    """Reports watched files added, modified or removed between polls."""
+
+    def __init__(self, root: str, patterns: Sequence[str] = WATCHED):
+        self.root = root
+        self.patterns = patterns
+        self.seen = self.snapshot()
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        for pattern in self.patterns:
+            for path in glob.glob(os.path.join(self.root, pattern)):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                found[relative] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def poll(self) -> List[Change]:
+        current = self.snapshot()
+        changes = [('D', path) for path in self.seen if path not in current]
+        changes += [('M' if path in self.seen else 'A', path)
+                    for path, signature in current.items() if self.seen.get(path) != signature]
+        self.seen = current
+        return sorted(changes, key=lambda change: change[1])